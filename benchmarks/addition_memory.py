@@ -0,0 +1,171 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the memory used by each grain and hop addition.
+
+Additions are built with their own Grain and Hop so the ingredient objects
+are counted along with the additions.  The traced memory before and after
+building them is divided by the number of additions.
+
+The baseline is the layout before __slots__, rebuilt here with dict backed
+classes holding the same attributes, and a utilization object for each hop
+addition pointing back at it.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from brew.constants import HOP_TYPE_PELLET
+from brew.constants import IMPERIAL_TYPES
+from brew.constants import IMPERIAL_UNITS
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import Hop
+from brew.hops import HopAddition
+from brew.utilities.malt import ppg_to_hwe
+from brew.yeasts import Yeast
+
+
+class BaselineGrain(object):
+    def __init__(self, name, color, ppg):
+        self.name = name
+        self.color = color
+        self.ppg = ppg
+        self.hwe = ppg_to_hwe(ppg)
+
+
+class BaselineGrainAddition(object):
+    def __init__(self, grain, weight):
+        self.grain = grain
+        self.weight = weight
+        self.grain_type = u"cereal"
+        self.units = IMPERIAL_UNITS
+        self.types = IMPERIAL_TYPES
+
+
+class BaselineHop(object):
+    def __init__(self, name, percent_alpha_acids):
+        self.name = name
+        self.percent_alpha_acids = percent_alpha_acids
+
+
+class BaselineUtilization(object):
+    def __init__(self, hop_addition):
+        self.hop_addition = hop_addition
+        self.units = IMPERIAL_UNITS
+        self.types = IMPERIAL_TYPES
+
+
+class BaselineHopAddition(object):
+    def __init__(self, hop, weight, boil_time):
+        self.hop = hop
+        self.weight = weight
+        self.boil_time = boil_time
+        self.hop_type = HOP_TYPE_PELLET
+        self.utilization_cls_kwargs = {}
+        self.utilization_cls = BaselineUtilization(self)
+        self.units = IMPERIAL_UNITS
+        self.types = IMPERIAL_TYPES
+
+
+class BaselineYeast(object):
+    def __init__(self, name, percent_attenuation):
+        self.name = name
+        self.percent_attenuation = percent_attenuation
+
+
+def make_grain_additions(count):
+    return [
+        GrainAddition(Grain(u"grain", color=2.0, ppg=37.0), weight=float(index))
+        for index in range(count)
+    ]
+
+
+def make_hop_additions(count):
+    return [
+        HopAddition(
+            Hop(u"hop", percent_alpha_acids=0.07),
+            weight=float(index),
+            boil_time=60.0,
+        )
+        for index in range(count)
+    ]
+
+
+def make_yeasts(count):
+    return [Yeast(u"yeast", percent_attenuation=0.75) for _ in range(count)]
+
+
+def make_baseline_grain_additions(count):
+    return [
+        BaselineGrainAddition(BaselineGrain(u"grain", 2.0, 37.0), float(index))
+        for index in range(count)
+    ]
+
+
+def make_baseline_hop_additions(count):
+    return [
+        BaselineHopAddition(BaselineHop(u"hop", 0.07), float(index), 60.0)
+        for index in range(count)
+    ]
+
+
+def make_baseline_yeasts(count):
+    return [BaselineYeast(u"yeast", 0.75) for _ in range(count)]
+
+
+def measure(func, count):
+    """
+    Measure the bytes per object made by func
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = func(count)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return float(after - before) / count
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Addition Memory Benchmark")
+    parser.add_argument(
+        u"-n",
+        u"--count",
+        metavar=u"N",
+        type=int,
+        default=100000,
+        help=u"Number of additions to build (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    print(u"{:<14} {:>14} {:>14} {:>8}".format(u"", u"Baseline", u"Current", u"Saved"))
+    for name, baseline_func, func in [
+        (u"GrainAddition", make_baseline_grain_additions, make_grain_additions),
+        (u"HopAddition", make_baseline_hop_additions, make_hop_additions),
+        (u"Yeast", make_baseline_yeasts, make_yeasts),
+    ]:
+        baseline = measure(baseline_func, args.count)
+        current = measure(func, args.count)
+        print(
+            u"{:<14} {:>8.1f} bytes {:>8.1f} bytes {:>7.1%}".format(
+                name, baseline, current, 1.0 - current / baseline
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the batch IBU engine against HopAddition.get_ibus.
+
+The scalar path builds a HopAddition for each row and calls get_ibus.  The
+batch path calls HopsUtilization.get_ibus_array once with columns of data.
+Both are reported as the best time per addition of three runs so the scalar
+path can be run on a smaller sample.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+
+from brew.constants import HOP_TYPE_LIST
+from brew.hops import Hop
+from brew.hops import HopAddition
+from brew.utilities.arrays import get_numpy
+from brew.utilities.hops import HopsUtilizationGlennTinseth
+from brew.utilities.hops import HopsUtilizationJackieRager
+
+
+def make_columns(count, seed=0):
+    """
+    Make columns of random hop addition data
+    """
+    rand = random.Random(seed)
+    return {
+        u"weight": [rand.uniform(0.1, 4.0) for _ in range(count)],
+        u"percent_alpha_acids": [rand.uniform(0.02, 0.18) for _ in range(count)],
+        u"boil_time": [float(rand.randint(0, 90)) for _ in range(count)],
+        u"hop_type": [rand.choice(HOP_TYPE_LIST) for _ in range(count)],
+        u"sg": [rand.uniform(1.030, 1.120) for _ in range(count)],
+        u"final_volume": [rand.uniform(4.0, 12.0) for _ in range(count)],
+    }
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Batch IBU Benchmark")
+    parser.add_argument(
+        u"-n",
+        u"--count",
+        metavar=u"N",
+        type=int,
+        default=1000000,
+        help=u"Number of additions for the batch path (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-s",
+        u"--scalar-count",
+        metavar=u"N",
+        type=int,
+        default=100000,
+        help=u"Number of additions for the scalar path (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--min-speedup",
+        metavar=u"X",
+        type=float,
+        default=50.0,
+        help=u"Required speedup of the batch path (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    failed = False
+    columns = make_columns(args.count)
+    # The batch path takes columnar arrays when NumPy is installed
+    np = get_numpy()
+    if np is not None:
+        arrays = {key: np.asarray(value) for key, value in columns.items()}
+    else:
+        arrays = columns
+    for utilization_cls in [HopsUtilizationGlennTinseth, HopsUtilizationJackieRager]:
+
+        def scalar():
+            for index in range(args.scalar_count):
+                alpha = columns[u"percent_alpha_acids"][index]
+                hop = Hop(u"hop", percent_alpha_acids=alpha)
+                hop_add = HopAddition(
+                    hop,
+                    weight=columns[u"weight"][index],
+                    boil_time=columns[u"boil_time"][index],
+                    hop_type=columns[u"hop_type"][index],
+                    utilization_cls=utilization_cls,
+                )
+                hop_add.get_ibus(columns[u"sg"][index], columns[u"final_volume"][index])
+
+        def batch():
+            utilization_cls.get_ibus_array(
+                arrays[u"weight"],
+                arrays[u"percent_alpha_acids"],
+                arrays[u"boil_time"],
+                arrays[u"hop_type"],
+                arrays[u"sg"],
+                arrays[u"final_volume"],
+            )
+
+        scalar_time = min(timeit.repeat(scalar, number=1, repeat=3)) / args.scalar_count
+        batch_time = min(timeit.repeat(batch, number=1, repeat=3)) / args.count
+        speedup = scalar_time / batch_time
+        print(
+            u"{:<14} scalar {:>8.3f} us/add  batch {:>8.3f} us/add  {:>6.1f}x".format(
+                str(utilization_cls(None)), scalar_time * 1e6, batch_time * 1e6, speedup
+            )
+        )
+        if speedup < args.min_speedup:
+            failed = True
+
+    if failed:
+        print(u"Batch path is less than {}x faster".format(args.min_speedup))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark the memory use of the recipe pipeline as the input grows.
+
+The input lines are generated as they are read and the output is discarded,
+so the traced peak memory is only what the pipeline itself holds.  The peak
+should stay flat as the number of recipes grows.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from brew.parsers import DataLoader
+from brew.pipeline import run_pipeline
+
+
+RECIPE = {
+    u"name": u"Pale Ale",
+    u"start_volume": 7.0,
+    u"final_volume": 5.0,
+    u"grains": [
+        {u"name": u"pale malt 2-row us", u"data": {u"color": 1.8, u"ppg": 37}, u"weight": 13.96}  # noqa
+    ],
+    u"hops": [
+        {
+            u"name": u"centennial",
+            u"data": {u"percent_alpha_acids": 0.14},
+            u"weight": 0.57,
+            u"boil_time": 60.0,
+        }
+    ],
+    u"yeast": {u"name": u"Wyeast 1056", u"data": {u"percent_attenuation": 0.75}},
+}
+
+
+class MemoryLoader(DataLoader):
+    """
+    A loader that keeps no data so only the pipeline is measured.
+    """
+
+    def __init__(self):
+        pass
+
+    def get_item(self, dir_suffix, item_name):
+        return {}
+
+
+class NullOutput(object):
+    def write(self, value):
+        pass
+
+
+def iter_lines(count, interval, samples):
+    """
+    Generate lines of recipes and sample the traced memory as they are read
+    """
+    line = json.dumps(RECIPE) + u"\n"
+    for index in range(1, count + 1):
+        if index % interval == 0:
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            samples.append(current)
+            print(u"{:>10} recipes: {:>10} bytes".format(index, current))
+        yield line
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Recipe Pipeline Memory Benchmark")
+    parser.add_argument(
+        u"-n",
+        u"--count",
+        metavar=u"N",
+        type=int,
+        default=1000000,
+        help=u"Number of recipes to stream (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--samples",
+        metavar=u"S",
+        type=int,
+        default=10,
+        help=u"Number of memory samples to take (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-w",
+        u"--workers",
+        metavar=u"N",
+        type=int,
+        default=1,
+        help=u"Number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--max-growth",
+        metavar=u"B",
+        type=int,
+        default=64 * 1024,
+        help=u"Allowed memory growth in bytes (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    loader = MemoryLoader()
+    interval = max(args.count // args.samples, 1)
+    samples = []
+    tracemalloc.start()
+    run_pipeline(
+        iter_lines(args.count, interval, samples),
+        NullOutput(),
+        loader,
+        processes=args.workers,
+    )
+    tracemalloc.stop()
+
+    growth = max(samples) - samples[0] if samples else 0
+    print(u"Max growth: {} bytes".format(growth))
+    if growth > args.max_growth:
+        print(u"Memory grew by more than {} bytes".format(args.max_growth))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
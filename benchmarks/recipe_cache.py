@@ -0,0 +1,119 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark cache hits on the Recipe derived metrics against a recompute.
+
+A hit only compares the recipe cache version with the current version, so
+it must cost less than computing the metric again.  The recompute clears
+the cache before each call.  Both are reported as the best time per call of
+three runs.
+"""
+
+import argparse
+import sys
+import timeit
+
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import Hop
+from brew.hops import HopAddition
+from brew.recipes import Recipe
+from brew.yeasts import Yeast
+
+
+def make_recipe(grains, hops):
+    """
+    Make a recipe with the given number of grain and hop additions
+    """
+    return Recipe(
+        u"cache benchmark",
+        grain_additions=[
+            GrainAddition(
+                Grain(u"grain {}".format(index), color=2.0 + index % 10, ppg=37.0),
+                weight=12.0 / grains,
+            )
+            for index in range(grains)
+        ],
+        hop_additions=[
+            HopAddition(
+                Hop(u"hop {}".format(index), percent_alpha_acids=0.05),
+                weight=2.0 / hops,
+                boil_time=float(60 - index % 60),
+            )
+            for index in range(hops)
+        ],
+        yeast=Yeast(u"Wyeast 1056", percent_attenuation=0.75),
+    )
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Recipe Cache Benchmark")
+    parser.add_argument(
+        u"-g",
+        u"--grains",
+        metavar=u"N",
+        type=int,
+        default=20,
+        help=u"Number of grain additions (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-p",
+        u"--hops",
+        metavar=u"N",
+        type=int,
+        default=10,
+        help=u"Number of hop additions (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-n",
+        u"--number",
+        metavar=u"N",
+        type=int,
+        default=10000,
+        help=u"Number of calls for each metric (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    failed = False
+    recipe = make_recipe(args.grains, args.hops)
+    metrics = [
+        (u"og", recipe.get_original_gravity),
+        (u"ibu", recipe.get_total_ibu),
+        (u"color", recipe.get_total_wort_color),
+    ]
+    for name, metric in metrics:
+
+        def recompute():
+            recipe.invalidate_cache()
+            metric()
+
+        metric()
+        hit_time = min(timeit.repeat(metric, number=args.number, repeat=3))
+        recompute_time = min(timeit.repeat(recompute, number=args.number, repeat=3))
+        hit_time /= args.number
+        recompute_time /= args.number
+        print(
+            u"{:<6} hit {:>8.3f} us  recompute {:>8.3f} us  {:>6.1f}x".format(
+                name, hit_time * 1e6, recompute_time * 1e6, recompute_time / hit_time
+            )
+        )
+        if hit_time >= recompute_time:
+            failed = True
+
+    if failed:
+        print(u"A cache hit costs as much as a recompute")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
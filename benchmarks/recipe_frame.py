@@ -0,0 +1,120 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark RecipeFrame metrics against Recipe.to_dict.
+
+The scalar path calls to_dict on each recipe.  The columnar path builds a
+RecipeFrame and computes the metrics of every recipe at once.  Both are
+reported as time per recipe.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+
+from brew.constants import HOP_TYPE_LIST
+from brew.frames import RecipeFrame
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import Hop
+from brew.hops import HopAddition
+from brew.recipes import Recipe
+from brew.yeasts import Yeast
+
+
+def make_recipes(count, seed=0):
+    """
+    Make random recipes
+    """
+    rand = random.Random(seed)
+    pale = Grain(u"pale 2-row", color=2.0, ppg=37.0)
+    crystal = Grain(u"crystal C20", color=20.0, ppg=35.0)
+    centennial = Hop(u"centennial", percent_alpha_acids=0.14)
+    cascade = Hop(u"cascade", percent_alpha_acids=0.07)
+    yeast = Yeast(u"Wyeast 1056", percent_attenuation=0.75)
+    recipes = []
+    for index in range(count):
+        grain_additions = [
+            GrainAddition(pale, weight=rand.uniform(8.0, 16.0)),
+            GrainAddition(crystal, weight=rand.uniform(0.25, 1.5)),
+        ]
+        hop_additions = [
+            HopAddition(
+                hop,
+                weight=rand.uniform(0.25, 2.0),
+                boil_time=float(rand.randint(0, 60)),
+                hop_type=rand.choice(HOP_TYPE_LIST),
+            )
+            for hop in [centennial, cascade]
+        ]
+        recipes.append(
+            Recipe(
+                u"recipe {}".format(index),
+                grain_additions=grain_additions,
+                hop_additions=hop_additions,
+                yeast=yeast,
+                start_volume=7.0,
+                final_volume=5.0,
+            )
+        )
+    return recipes
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"RecipeFrame Benchmark")
+    parser.add_argument(
+        u"-n",
+        u"--count",
+        metavar=u"N",
+        type=int,
+        default=10000,
+        help=u"Number of recipes (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--min-speedup",
+        metavar=u"X",
+        type=float,
+        default=20.0,
+        help=u"Required speedup of the columnar path (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    recipes = make_recipes(args.count)
+    frame = RecipeFrame.from_recipes(recipes)
+
+    def scalar():
+        for recipe in recipes:
+            recipe.to_dict()
+
+    def columnar():
+        frame._metrics = None
+        frame.get_metrics()
+
+    build_time = timeit.timeit(lambda: RecipeFrame.from_recipes(recipes), number=1)
+    scalar_time = timeit.timeit(scalar, number=1) / args.count
+    columnar_time = min(timeit.repeat(columnar, number=1, repeat=3)) / args.count
+    speedup = scalar_time / columnar_time
+    print(u"build    {:>8.3f} us/recipe".format(build_time / args.count * 1e6))
+    print(
+        u"scalar   {:>8.3f} us/recipe  columnar {:>8.3f} us/recipe  {:>6.1f}x".format(
+            scalar_time * 1e6, columnar_time * 1e6, speedup
+        )
+    )
+    if speedup < args.min_speedup:
+        print(u"Columnar path is less than {}x faster".format(args.min_speedup))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Regression benchmark for memory use when parsing many recipes in one process.
+
+Each recipe is parsed, formatted and then discarded.  Every recipe uses
+ingredient names that have not been seen before so that any state shared
+between recipes shows up as growth.  The traced memory is sampled as the run
+progresses and the benchmark fails if it grows by more than the allowed
+amount after the warm up.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from brew.parsers import DataLoader
+from brew.parsers import parse_recipe
+
+
+RECIPE = {
+    u"name": u"Pale Ale",
+    u"start_volume": 7.0,
+    u"final_volume": 5.0,
+    u"grains": [
+        {
+            u"name": u"pale malt 2-row us",
+            u"data": {u"color": 1.8, u"ppg": 37},
+            u"weight": 13.96,
+        },
+        {
+            u"name": u"caramel crystal malt 20l",
+            u"data": {u"color": 20.0, u"ppg": 35},
+            u"weight": 0.78,
+        },
+    ],
+    u"hops": [
+        {
+            u"name": u"centennial",
+            u"data": {u"percent_alpha_acids": 0.14},
+            u"weight": 0.57,
+            u"boil_time": 60.0,
+        },
+        {
+            u"name": u"cascade us",
+            u"data": {u"percent_alpha_acids": 0.07},
+            u"weight": 0.76,
+            u"boil_time": 5.0,
+        },
+    ],
+    u"yeast": {u"name": u"Wyeast 1056", u"data": {u"percent_attenuation": 0.75}},
+    u"data": {u"brew_house_yield": 0.70, u"units": u"imperial"},
+}
+
+
+def make_recipe(index):
+    """
+    Make a recipe with ingredient names unique to the index
+    """
+    recipe = dict(RECIPE)
+    for key in [u"grains", u"hops"]:
+        recipe[key] = []
+        for item in RECIPE[key]:
+            item = dict(item)
+            item[u"name"] = u"{} {}".format(item[u"name"], index)
+            recipe[key].append(item)
+    return recipe
+
+
+class MemoryLoader(DataLoader):
+    """
+    A loader that keeps no data so only the recipes are measured.
+    """
+
+    def __init__(self):
+        pass
+
+    def get_item(self, dir_suffix, item_name):
+        return {}
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Recipe Memory Benchmark")
+    parser.add_argument(
+        u"-n",
+        u"--count",
+        metavar=u"N",
+        type=int,
+        default=1000000,
+        help=u"Number of recipes to parse (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--samples",
+        metavar=u"S",
+        type=int,
+        default=10,
+        help=u"Number of memory samples to take (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--max-growth",
+        metavar=u"B",
+        type=int,
+        default=64 * 1024,
+        help=u"Allowed memory growth in bytes (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    loader = MemoryLoader()
+    interval = max(args.count // args.samples, 1)
+
+    # Warm up so one time allocations are not counted as growth
+    parse_recipe(make_recipe(0), loader).format()
+    gc.collect()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    samples = []
+    for index in range(1, args.count + 1):
+        parse_recipe(make_recipe(index), loader).format()
+        if index % interval == 0:
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            samples.append(current - baseline)
+            print(u"{:>10} recipes: {:>10} bytes".format(index, current - baseline))
+    tracemalloc.stop()
+
+    growth = max(samples) if samples else 0
+    print(u"Max growth: {} bytes".format(growth))
+    if growth > args.max_growth:
+        print(u"Memory grew by more than {} bytes".format(args.max_growth))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
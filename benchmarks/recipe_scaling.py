@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark how Recipe.to_dict() and Recipe.format() scale with the number of
+grain and hop additions.
+
+The time per addition should stay roughly constant as the number of
+additions grows.  The cache is cleared before every call so each timing
+includes computing the totals.
+"""
+
+import argparse
+import timeit
+
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import Hop
+from brew.hops import HopAddition
+from brew.recipes import Recipe
+from brew.yeasts import Yeast
+
+
+def make_recipe(count):
+    """
+    Make a recipe with the given number of grain and hop additions
+    """
+    grain_additions = []
+    hop_additions = []
+    for index in range(count):
+        grain = Grain(u"grain {}".format(index), color=2.0 + index % 20, ppg=37.0)
+        grain_additions.append(GrainAddition(grain, weight=10.0 / count))
+        hop = Hop(u"hop {}".format(index), percent_alpha_acids=0.07)
+        hop_additions.append(
+            HopAddition(hop, weight=1.0 / count, boil_time=float(index % 60))
+        )
+    return Recipe(
+        u"scaling {}".format(count),
+        grain_additions=grain_additions,
+        hop_additions=hop_additions,
+        yeast=Yeast(u"Wyeast 1056"),
+    )
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Recipe Scaling Benchmark")
+    parser.add_argument(
+        u"-c",
+        u"--counts",
+        metavar=u"N",
+        type=int,
+        nargs=u"+",
+        default=[1, 10, 100, 1000, 10000],
+        help=u"Number of additions to time (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-r",
+        u"--repeat",
+        metavar=u"R",
+        type=int,
+        default=3,
+        help=u"Number of times to repeat each timing (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    print(
+        u"{:>10} {:>14} {:>14} {:>14}".format(
+            u"additions", u"to_dict (s)", u"format (s)", u"per add (us)"
+        )
+    )
+    for count in args.counts:
+        recipe = make_recipe(count)
+
+        def to_dict():
+            recipe.invalidate_cache()
+            recipe.to_dict()
+
+        def format_recipe():
+            recipe.invalidate_cache()
+            recipe.format()
+
+        to_dict_time = min(timeit.repeat(to_dict, number=1, repeat=args.repeat))
+        format_time = min(timeit.repeat(format_recipe, number=1, repeat=args.repeat))
+        print(
+            u"{:>10} {:>14.6f} {:>14.6f} {:>14.2f}".format(
+                count, to_dict_time, format_time, to_dict_time / count * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Run the benchmark suite and write the results as JSON.
+
+The benchmarks in the suite package are asv style classes.  Every
+``time_*`` method is timed for every combination of the class ``params``.
+The results can be compared with a baseline file written by an earlier run
+to catch regressions before a release.
+"""
+
+import argparse
+import datetime
+import importlib
+import inspect
+import itertools
+import json
+import math
+import os
+import platform
+import re
+import sys
+import timeit
+
+#: The modules in the suite package holding benchmarks
+SUITE_MODULES = [
+    u"bench_cli",
+    u"bench_parsers",
+    u"bench_recipes",
+    u"bench_styles",
+    u"bench_utilities",
+]
+
+
+def iter_benchmarks(pattern=None):
+    """
+    Find the benchmarks in the suite
+
+    :param str pattern: A regular expression the benchmark name must match
+    :return: The name, class and method name of each benchmark
+    :rtype: generator
+    """
+    for module_name in SUITE_MODULES:
+        module = importlib.import_module(u"suite.{}".format(module_name))
+        classes = inspect.getmembers(module, inspect.isclass)
+        for class_name, cls in sorted(classes):
+            if cls.__module__ != module.__name__:
+                continue
+            for method_name in sorted(dir(cls)):
+                if not method_name.startswith(u"time_"):
+                    continue
+                name = u"{}.{}.{}".format(module_name, class_name, method_name)
+                if pattern and not re.search(pattern, name):
+                    continue
+                yield name, cls, method_name
+
+
+def iter_params(cls):
+    """
+    Get every combination of the parameters of a benchmark class
+
+    :return: The parameters and their display values by name
+    :rtype: generator
+    """
+    params = getattr(cls, u"params", [])
+    if not params:
+        yield (), {}
+        return
+    if not isinstance(params[0], list):
+        params = [params]
+    names = getattr(cls, u"param_names", None)
+    if not names:
+        names = [u"param{}".format(i + 1) for i in range(len(params))]
+    for values in itertools.product(*params):
+        labels = {}
+        for name, value in zip(names, values):
+            labels[name] = getattr(value, u"__name__", value)
+        yield values, labels
+
+
+def get_number(func, min_time):
+    """
+    Get the number of calls that take at least min_time seconds
+    """
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time or number >= 1000000:
+            return number
+        number *= 10 if elapsed < min_time / 10.0 else 2
+
+
+def run_benchmark(cls, method_name, values, repeat, min_time):
+    """
+    Time one benchmark method with one set of parameters
+
+    :return: The timings in seconds per call or None if the setup skipped it
+    :rtype: dict
+    """
+    bench = cls()
+    try:
+        if hasattr(bench, u"setup"):
+            bench.setup(*values)
+    except NotImplementedError:
+        return None
+    try:
+        method = getattr(bench, method_name)
+
+        def func():
+            method(*values)
+
+        number = get_number(func, min_time)
+        times = [t / number for t in timeit.repeat(func, number=number, repeat=repeat)]
+    finally:
+        if hasattr(bench, u"teardown"):
+            bench.teardown(*values)
+    mean = sum(times) / len(times)
+    stddev = math.sqrt(sum((t - mean) ** 2 for t in times) / len(times))
+    return {
+        u"min": min(times),
+        u"mean": mean,
+        u"stddev": stddev,
+        u"number": number,
+        u"repeat": repeat,
+    }
+
+
+def get_key(result):
+    return (result[u"name"], json.dumps(result[u"params"], sort_keys=True))
+
+
+def compare(results, baseline, max_regression):
+    """
+    Compare results with a baseline
+
+    :param list results: The results of this run
+    :param list baseline: The results of an earlier run
+    :param float max_regression: The largest allowed ratio of the minimum times
+    :return: The results which are slower than allowed and their ratio
+    :rtype: list
+    """  # noqa
+    baseline = dict((get_key(result), result) for result in baseline)
+    regressions = []
+    for result in results:
+        base = baseline.get(get_key(result))
+        if base is None:
+            continue
+        ratio = result[u"min"] / base[u"min"]
+        if ratio > max_regression:
+            regressions.append((result, ratio))
+    return regressions
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Benchmark Suite")
+    parser.add_argument(
+        u"-o",
+        u"--output",
+        metavar=u"FILE",
+        type=argparse.FileType(u"w"),
+        default=sys.stdout,
+        help=u"Output for results as JSON (default: stdout)",
+    )
+    parser.add_argument(
+        u"-b",
+        u"--bench",
+        metavar=u"REGEX",
+        type=str,
+        help=u"Only run benchmarks with a name matching REGEX",
+    )
+    parser.add_argument(
+        u"-r",
+        u"--repeat",
+        metavar=u"N",
+        type=int,
+        default=5,
+        help=u"Number of timings of each benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--min-time",
+        metavar=u"S",
+        type=float,
+        default=0.05,
+        help=u"Minimum seconds for each timing (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--compare",
+        metavar=u"FILE",
+        type=argparse.FileType(u"r"),
+        help=u"Baseline results to compare with",
+    )
+    parser.add_argument(
+        u"--max-regression",
+        metavar=u"X",
+        type=float,
+        default=1.2,
+        help=u"Largest allowed slowdown against the baseline (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for name, cls, method_name in iter_benchmarks(args.bench):
+        for values, labels in iter_params(cls):
+            timing = run_benchmark(
+                cls, method_name, values, args.repeat, args.min_time
+            )
+            if timing is None:
+                continue
+            result = {u"name": name, u"params": labels}
+            result.update(timing)
+            results.append(result)
+            sys.stderr.write(
+                u"{} {} {:.3f} us\n".format(
+                    name, json.dumps(labels, sort_keys=True), timing[u"min"] * 1e6
+                )
+            )
+
+    out = {
+        u"python": platform.python_version(),
+        u"implementation": platform.python_implementation(),
+        u"machine": platform.machine(),
+        u"platform": platform.platform(),
+        u"date": datetime.datetime.utcnow().isoformat(),
+        u"results": results,
+    }
+    args.output.write(json.dumps(out, indent=2, sort_keys=True))
+    args.output.write(u"\n")
+    args.output.flush()
+
+    if args.compare:
+        baseline = json.loads(args.compare.read())[u"results"]
+        regressions = compare(results, baseline, args.max_regression)
+        for result, ratio in regressions:
+            name, params = get_key(result)
+            sys.stderr.write(
+                u"Regression {} {} is {:.2f}x slower\n".format(name, params, ratio)
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the recipe, utility, parser and CLI hot paths.
+
+The benchmarks are written in the style of asv.  Each class may have
+``params`` and ``param_names``, a ``setup`` and ``teardown`` called with the
+parameters, and ``time_*`` methods which are timed.  Run them with
+``benchmarks/run_suite.py`` to get the results as JSON, or with asv.
+"""
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the brew.cli entry points
+
+Each main is called with its arguments in sys.argv and its output written
+to os.devnull, so the time includes parsing the arguments.
+"""
+import json
+import os
+import sys
+
+from brew.cli import abv
+from brew.cli import gravity_volume
+from brew.cli import pack_data
+from brew.cli import recipes
+from brew.cli import sugar
+from brew.cli import temp
+from brew.cli import yeast
+
+from .common import make_data_dir
+from .common import make_recipe_dict
+from .common import remove_dir
+
+
+class CLIBenchmark(object):
+    #: The CLI module with a main
+    module = None
+    #: The arguments passed to main
+    argv = []
+
+    def setup(self):
+        if self.module is None:
+            # Skip the base classes
+            raise NotImplementedError()
+        self.devnull = open(os.devnull, u"w")
+        self.saved = (sys.argv, sys.stdout)
+        sys.argv = [self.module.__name__] + self.get_argv()
+
+    def teardown(self):
+        sys.argv, sys.stdout = self.saved
+        self.devnull.close()
+
+    def get_argv(self):
+        return list(self.argv)
+
+    def time_main(self):
+        sys.stdout = self.devnull
+        try:
+            self.module.main()
+        finally:
+            sys.stdout = self.saved[1]
+
+
+class TimeABV(CLIBenchmark):
+    module = abv
+    argv = [u"-o", u"1.057", u"-f", u"1.013", u"-v"]
+
+
+class TimeGravityVolume(CLIBenchmark):
+    module = gravity_volume
+    argv = [u"-o", u"7.0", u"-f", u"5.0", u"-g", u"1.050"]
+
+
+class TimeSugar(CLIBenchmark):
+    module = sugar
+    argv = [u"-s", u"1.057"]
+
+
+class TimeTemp(CLIBenchmark):
+    module = temp
+    argv = [u"-c", u"65.0"]
+
+
+class TimeYeast(CLIBenchmark):
+    module = yeast
+    argv = [u"--og", u"1.057", u"--fv", u"5.0"]
+
+
+class DataDirBenchmark(CLIBenchmark):
+    def setup(self):
+        self.data_dir = make_data_dir(8)
+        try:
+            super(DataDirBenchmark, self).setup()
+        except NotImplementedError:
+            remove_dir(self.data_dir)
+            raise
+
+    def teardown(self):
+        super(DataDirBenchmark, self).teardown()
+        remove_dir(self.data_dir)
+
+
+class TimePackData(DataDirBenchmark):
+    module = pack_data
+
+    def get_argv(self):
+        output = os.path.join(self.data_dir, u"packed.jsonl")
+        return [u"-d", self.data_dir, u"-o", output]
+
+
+class TimeRecipes(DataDirBenchmark):
+    module = recipes
+
+    def get_argv(self):
+        filename = os.path.join(self.data_dir, u"recipes.jsonl")
+        with open(filename, u"w") as f:
+            for _ in range(100):
+                f.write(json.dumps(make_recipe_dict(8)))
+                f.write(u"\n")
+        return [filename, u"-d", self.data_dir, u"-o", os.devnull]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for brew.parsers
+"""
+from brew.parsers import JSONDataLoader
+from brew.parsers import parse_recipe
+
+from .common import RECIPE_SIZES
+from .common import make_data_dir
+from .common import make_recipe_dict
+from .common import remove_dir
+
+
+class TimeParseRecipe(object):
+    params = RECIPE_SIZES
+    param_names = [u"size"]
+
+    def setup(self, size):
+        self.data_dir = make_data_dir(size)
+        self.recipe = make_recipe_dict(size)
+        self.loader = JSONDataLoader(self.data_dir)
+        # Warm the loader cache
+        parse_recipe(self.recipe, self.loader)
+
+    def teardown(self, size):
+        remove_dir(self.data_dir)
+
+    def time_parse_recipe(self, size):
+        parse_recipe(self.recipe, self.loader)
+
+    def time_parse_recipe_cold(self, size):
+        parse_recipe(self.recipe, JSONDataLoader(self.data_dir))
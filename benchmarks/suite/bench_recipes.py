@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for brew.recipes
+
+The Recipe caches its derived metrics, so after the first call the plain
+benchmarks measure cache hits.  The _cold variants clear the cache inside
+each call to measure the full calculation.
+"""
+from .common import RECIPE_SIZES
+from .common import make_recipe
+
+
+class TimeRecipe(object):
+    params = RECIPE_SIZES
+    param_names = [u"size"]
+
+    def setup(self, size):
+        self.recipe = make_recipe(size)
+
+    def time_to_dict(self, size):
+        self.recipe.to_dict()
+
+    def time_to_dict_cold(self, size):
+        self.recipe.invalidate_cache()
+        self.recipe.to_dict()
+
+    def time_to_json(self, size):
+        self.recipe.to_json()
+
+    def time_to_json_cold(self, size):
+        self.recipe.invalidate_cache()
+        self.recipe.to_json()
+
+    def time_format(self, size):
+        self.recipe.format()
+
+    def time_format_cold(self, size):
+        self.recipe.invalidate_cache()
+        self.recipe.format()
+
+    def time_format_short(self, size):
+        self.recipe.format(short=True)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for brew.styles
+"""
+from brew.styles import StyleFactory
+
+from .common import make_styles_file
+from .common import remove_dir
+
+
+class TimeStyleFactory(object):
+    params = [10, 100, 1000]
+    param_names = [u"styles"]
+
+    def setup(self, styles):
+        self.data_dir, self.filename = make_styles_file(styles)
+        self.factory = StyleFactory(self.filename)
+        self.factory.create_style(1, u"A")
+
+    def teardown(self, styles):
+        remove_dir(self.data_dir)
+
+    def time_create_style(self, styles):
+        self.factory.create_style(1, u"A")
+
+    def time_create_style_cold(self, styles):
+        self.factory._styles = {}
+        self.factory.create_style(1, u"A")
+
+    def time_load(self, styles):
+        StyleFactory(self.filename).create_style(1, u"A")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for brew.utilities
+"""
+from brew.constants import IMPERIAL_UNITS
+from brew.constants import SI_UNITS
+from brew.utilities import hops
+from brew.utilities.hops import HopsUtilizationGlennTinseth
+from brew.utilities.hops import HopsUtilizationJackieRager
+from brew.utilities.yeast import KaiserYeastModel
+from brew.utilities.yeast import WhiteYeastModel
+
+
+class TimeUtilizationTable(object):
+    params = [
+        [HopsUtilizationGlennTinseth, HopsUtilizationJackieRager],
+        [10, 100],
+    ]
+    param_names = [u"model", u"size"]
+
+    def setup(self, model, size):
+        self.gravity_list = [1.030 + 0.090 * i / size for i in range(size)]
+        self.boil_time_list = [90.0 * i / size for i in range(size)]
+
+    def time_get_utilization_table(self, model, size):
+        model.get_utilization_table(self.gravity_list, self.boil_time_list)
+
+    def time_get_utilization_table_cold(self, model, size):
+        hops._UTILIZATION_TABLES.clear()
+        model.get_utilization_table(self.gravity_list, self.boil_time_list)
+
+
+class TimeYeastModel(object):
+    params = [
+        [KaiserYeastModel, WhiteYeastModel],
+        [IMPERIAL_UNITS, SI_UNITS],
+    ]
+    param_names = [u"model", u"units"]
+
+    def setup(self, model, units):
+        self.model = model(units=units)
+
+    def time_get_yeast_pitch_rate(self, model, units):
+        self.model.get_yeast_pitch_rate()
+
+    def time_get_starter_volume(self, model, units):
+        self.model.get_starter_volume(available_cells=200.0)
+
+    def time_get_resulting_pitch_rate(self, model, units):
+        self.model.get_resulting_pitch_rate(starter_cell_count=400.0)
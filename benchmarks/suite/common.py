@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic recipes and data for the benchmarks
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import Hop
+from brew.hops import HopAddition
+from brew.parsers import DataLoader
+from brew.recipes import Recipe
+from brew.yeasts import Yeast
+
+#: The number of grains and hops in the small, medium and large recipes
+RECIPE_SIZES = [2, 8, 32]
+
+
+def make_grains(count):
+    """
+    Make grains with a spread of colors
+    """
+    return [
+        Grain(
+            u"grain {}".format(index),
+            color=2.0 + 3.0 * (index % 10),
+            ppg=37.0 - (index % 5),
+        )
+        for index in range(count)
+    ]
+
+
+def make_hops(count):
+    """
+    Make hops with a spread of alpha acids
+    """
+    return [
+        Hop(u"hop {}".format(index), percent_alpha_acids=0.04 + 0.01 * (index % 10))
+        for index in range(count)
+    ]
+
+
+def make_recipe(size):
+    """
+    Make a recipe with size grain and hop additions
+    """
+    grain_weight = 12.0 / size
+    hop_weight = 2.0 / size
+    grain_additions = [
+        GrainAddition(grain, weight=grain_weight) for grain in make_grains(size)
+    ]
+    hop_additions = [
+        HopAddition(hop, weight=hop_weight, boil_time=float(60 - index % 60))
+        for index, hop in enumerate(make_hops(size))
+    ]
+    return Recipe(
+        u"recipe {}".format(size),
+        grain_additions=grain_additions,
+        hop_additions=hop_additions,
+        yeast=Yeast(u"Wyeast 1056", percent_attenuation=0.75),
+        start_volume=7.0,
+        final_volume=5.0,
+    )
+
+
+def make_recipe_dict(size):
+    """
+    Make a recipe in the format read by parse_recipe
+
+    The grain, hop and yeast data is found in a directory made by
+    make_data_dir.
+    """
+    recipe = make_recipe(size)
+    return {
+        u"name": recipe.name,
+        u"start_volume": recipe.start_volume,
+        u"final_volume": recipe.final_volume,
+        u"grains": [
+            {u"name": grain_add.grain.name, u"weight": grain_add.weight}
+            for grain_add in recipe.grain_additions
+        ],
+        u"hops": [
+            {
+                u"name": hop_add.hop.name,
+                u"weight": hop_add.weight,
+                u"boil_time": hop_add.boil_time,
+            }
+            for hop_add in recipe.hop_additions
+        ],
+        u"yeast": {u"name": recipe.yeast.name},
+    }
+
+
+def _write_json(data_dir, dir_suffix, name, data):
+    path = os.path.join(data_dir, dir_suffix)
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    filename = u"{}.json".format(DataLoader.format_name(name))
+    with open(os.path.join(path, filename), u"w") as f:
+        f.write(json.dumps(data))
+
+
+def make_data_dir(size):
+    """
+    Make a temporary data directory for the recipes from make_recipe_dict
+
+    The caller removes it with remove_dir.
+    """
+    data_dir = tempfile.mkdtemp(prefix=u"brewday-bench-")
+    recipe = make_recipe(size)
+    for grain_add in recipe.grain_additions:
+        grain = grain_add.grain
+        _write_json(
+            data_dir,
+            u"cereals",
+            grain.name,
+            {u"name": grain.name, u"color": grain.color, u"ppg": grain.ppg},
+        )
+    for hop_add in recipe.hop_additions:
+        hop = hop_add.hop
+        _write_json(
+            data_dir,
+            u"hops",
+            hop.name,
+            {u"name": hop.name, u"percent_alpha_acids": hop.percent_alpha_acids},
+        )
+    yeast = recipe.yeast
+    _write_json(
+        data_dir,
+        u"yeast",
+        yeast.name,
+        {u"name": yeast.name, u"percent_attenuation": yeast.percent_attenuation},
+    )
+    return data_dir
+
+
+def make_styles(count):
+    """
+    Make count styles in the format read by StyleFactory
+    """
+    styles = {}
+    for index in range(count):
+        category = u"{}".format(index // 5 + 1)
+        subcategory = u"ABCDE"[index % 5]
+        og = 1.030 + 0.002 * (index % 20)
+        styles.setdefault(category, {})[subcategory] = {
+            u"style": u"Style {}{}".format(category, subcategory),
+            u"category": category,
+            u"subcategory": subcategory,
+            u"og": [og, og + 0.015],
+            u"fg": [1.006, 1.016],
+            u"abv": [0.03 + 0.002 * (index % 20), 0.05 + 0.002 * (index % 20)],
+            u"ibu": [10 + index % 40, 30 + index % 40],
+            u"color": [2 + index % 30, 8 + index % 30],
+        }
+    return styles
+
+
+def make_styles_file(count):
+    """
+    Write count styles to a temporary directory
+
+    :return: The directory and the styles file
+    :rtype: tuple
+    """
+    data_dir = tempfile.mkdtemp(prefix=u"brewday-bench-")
+    filename = os.path.join(data_dir, u"styles.json")
+    with open(filename, u"w") as f:
+        f.write(json.dumps(make_styles(count)))
+    return data_dir, filename
+
+
+def remove_dir(path):
+    """
+    Remove a temporary directory
+    """
+    shutil.rmtree(path, ignore_errors=True)
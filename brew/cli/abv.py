@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 import argparse
+import csv
+import json
 import sys
 
 from brew.constants import HYDROMETER_ADJUSTMENT_TEMP
@@ -7,31 +9,52 @@ from brew.constants import IMPERIAL_UNITS
 from brew.constants import SI_UNITS
 from brew.utilities.abv import alcohol_by_volume_alternative
 from brew.utilities.abv import alcohol_by_volume_standard
+from brew.utilities.arrays import as_array
+from brew.utilities.arrays import get_numpy
+from brew.utilities.batch import BATCH_FORMATS
+from brew.utilities.batch import get_batch_format
+from brew.utilities.batch import iter_batch_rows
+from brew.utilities.batch import iter_chunks
+from brew.utilities.batch import positive_int
 from brew.utilities.sugar import hydrometer_adjustment
+from brew.utilities.sugar import hydrometer_adjustment_array
 from brew.utilities.sugar import refractometer_adjustment
+from brew.utilities.sugar import refractometer_adjustment_array
 
+#: The columns written for each row in batch mode
+BATCH_COLUMNS = [
+    u"line",
+    u"og",
+    u"fg",
+    u"og_temp",
+    u"fg_temp",
+    u"refractometer",
+    u"og_adjusted",
+    u"fg_adjusted",
+    u"abv",
+    u"error",
+]
 
-def get_abv(
+
+def adjust_gravities(
     og,
     fg,
     og_temp=HYDROMETER_ADJUSTMENT_TEMP,
     fg_temp=HYDROMETER_ADJUSTMENT_TEMP,
-    alternative=False,
     refractometer=False,
     units=IMPERIAL_UNITS,
-    verbose=False,
 ):
     """
-    Get Alcohol by Volume for CLI Utility
+    Check the gravities and adjust them for temperature and the refractometer
 
     og - Original Specific Gravity
     fg - Final Specific Gravity
     og_temp - Temperature of reading for og
     fg_temp - Temperature of reading for fg
-    alternative - Use alternative ABV calculation
     refractometer - Adjust for using a refractometer for readings
     units - Type of units to use in calculations
-    verbose - Return verbose information about calculations
+
+    Returns the adjusted og and fg
     """
     # Gravity is required for calculation
     if not og:
@@ -55,6 +78,39 @@ def get_abv(
     # Adjust the final gravity if using a refractometer
     if refractometer:
         fg = refractometer_adjustment(og, fg)
+    return og, fg
+
+
+def get_abv(
+    og,
+    fg,
+    og_temp=HYDROMETER_ADJUSTMENT_TEMP,
+    fg_temp=HYDROMETER_ADJUSTMENT_TEMP,
+    alternative=False,
+    refractometer=False,
+    units=IMPERIAL_UNITS,
+    verbose=False,
+):
+    """
+    Get Alcohol by Volume for CLI Utility
+
+    og - Original Specific Gravity
+    fg - Final Specific Gravity
+    og_temp - Temperature of reading for og
+    fg_temp - Temperature of reading for fg
+    alternative - Use alternative ABV calculation
+    refractometer - Adjust for using a refractometer for readings
+    units - Type of units to use in calculations
+    verbose - Return verbose information about calculations
+    """
+    og, fg = adjust_gravities(
+        og,
+        fg,
+        og_temp=og_temp,
+        fg_temp=fg_temp,
+        refractometer=refractometer,
+        units=units,
+    )
 
     # Calculate the ABV
     if alternative:
@@ -77,19 +133,220 @@ def get_abv(
         return abv
 
 
+def get_abv_batch(
+    og, fg, og_temp, fg_temp, refractometer, alternative=False, units=IMPERIAL_UNITS
+):
+    """
+    Get Alcohol by Volume for many readings at once
+
+    og - Original Specific Gravity for each reading, None if missing
+    fg - Final Specific Gravity for each reading, None if missing
+    og_temp - Temperature of reading for each og
+    fg_temp - Temperature of reading for each fg
+    refractometer - Adjust for using a refractometer for each reading
+    alternative - Use alternative ABV calculation
+    units - Type of units to use in calculations
+
+    Returns lists of the adjusted og, the adjusted fg, the ABV and the error
+    for each reading.  The error is None for a valid reading.  Otherwise it
+    is the message get_abv raises and the values are None.
+
+    With NumPy the readings are evaluated in one vectorized pass and only
+    the invalid readings are evaluated one at a time for their errors.
+    """
+    if units not in [IMPERIAL_UNITS, SI_UNITS]:
+        raise Exception(
+            u"Units must be in either {} or {}".format(IMPERIAL_UNITS, SI_UNITS)  # noqa
+        )
+    abv_fn = alcohol_by_volume_standard
+    if alternative:
+        abv_fn = alcohol_by_volume_alternative
+
+    count = len(og)
+    np = get_numpy()
+    if np is None or not count:
+        og_out = [None] * count
+        fg_out = [None] * count
+        abv_out = [None] * count
+        invalid = range(count)
+    else:
+        og_array = as_array(og)
+        fg_array = as_array(fg)
+        refractometer = np.asarray(refractometer, dtype=bool)
+        with np.errstate(invalid=u"ignore", divide=u"ignore", over=u"ignore"):
+            og_adj = hydrometer_adjustment_array(og_array, og_temp, units=units)
+            fg_adj = hydrometer_adjustment_array(fg_array, fg_temp, units=units)
+            fg_refr = refractometer_adjustment_array(og_adj, fg_adj)
+            fg_final = np.ma.where(refractometer, fg_refr, fg_adj)
+            abv = abv_fn(og_adj, fg_final)
+            invalid = (
+                np.isnan(og_array)
+                | np.isnan(fg_array)
+                | (og_array == 0.0)
+                | (fg_array == 0.0)
+                | (og_array < fg_array)
+                | np.ma.getmaskarray(og_adj)
+                | np.ma.getmaskarray(fg_adj)
+                | (refractometer & np.ma.getmaskarray(fg_refr))
+                | ~np.isfinite(np.ma.filled(abv, np.nan))
+            )
+        og_out = np.ma.filled(og_adj, np.nan).tolist()
+        fg_out = np.ma.filled(fg_final, np.nan).tolist()
+        abv_out = np.ma.filled(abv, np.nan).tolist()
+        invalid = np.flatnonzero(invalid).tolist()
+
+    errors = [None] * count
+    for index in invalid:
+        try:
+            og_adj, fg_adj = adjust_gravities(
+                og[index],
+                fg[index],
+                og_temp=og_temp[index],
+                fg_temp=fg_temp[index],
+                refractometer=refractometer[index],
+                units=units,
+            )
+            abv = abv_fn(og_adj, fg_adj)
+        except Exception as e:
+            og_adj, fg_adj, abv = None, None, None
+            errors[index] = u"{}".format(e)
+        og_out[index] = og_adj
+        fg_out[index] = fg_adj
+        abv_out[index] = abv
+    return og_out, fg_out, abv_out, errors
+
+
+def _parse_float(value, default=None):
+    if value is None or value == u"":
+        return default
+    return float(value)
+
+
+def _parse_flag(value, default=False):
+    if value is None or value == u"":
+        return default
+    flag = u"{}".format(value).strip().lower()
+    if flag in [u"1", u"true", u"t", u"yes", u"y"]:
+        return True
+    if flag in [u"0", u"false", u"f", u"no", u"n"]:
+        return False
+    raise ValueError(u"Refractometer flag '{}' must be true or false".format(value))
+
+
+def run_batch(
+    lines,
+    output,
+    fmt=u"csv",
+    og_temp=HYDROMETER_ADJUSTMENT_TEMP,
+    fg_temp=HYDROMETER_ADJUSTMENT_TEMP,
+    alternative=False,
+    refractometer=False,
+    units=IMPERIAL_UNITS,
+    chunksize=10000,
+):
+    """
+    Get Alcohol by Volume for each row of a CSV or NDJSON input
+
+    lines - Lines of input, such as an open file
+    output - The stream to write results to in the same format
+    fmt - The format, 'csv' or 'ndjson'
+    og_temp - Temperature of reading for og when a row has none
+    fg_temp - Temperature of reading for fg when a row has none
+    alternative - Use alternative ABV calculation
+    refractometer - Adjust for using a refractometer when a row has no flag
+    units - Type of units to use in calculations
+    chunksize - The number of rows evaluated at once
+
+    Each row has og and fg and may have og_temp, fg_temp and refractometer.
+    A result with the columns in BATCH_COLUMNS is written for every row in
+    the order read.  Rows which cannot be calculated have an error and do
+    not stop the batch.
+
+    Returns the number of rows and errors
+    """
+    if fmt not in BATCH_FORMATS:
+        raise Exception(u"Format must be one of {}".format(u", ".join(BATCH_FORMATS)))
+    if chunksize < 1:
+        raise Exception(u"Chunksize must be at least 1")
+    if units not in [IMPERIAL_UNITS, SI_UNITS]:
+        raise Exception(
+            u"Units must be in either {} or {}".format(IMPERIAL_UNITS, SI_UNITS)  # noqa
+        )
+    writer = None
+    if fmt == u"csv":
+        writer = csv.writer(output, lineterminator=u"\n")
+        writer.writerow(BATCH_COLUMNS)
+
+    stats = {u"rows": 0, u"errors": 0}
+    rows = iter_batch_rows(lines, fmt=fmt)
+    for _, chunk in iter_chunks(rows, chunksize):
+        readings = []
+        for index, (line_number, row, error) in enumerate(chunk):
+            if error is None:
+                try:
+                    readings.append(
+                        (
+                            _parse_float(row.get(u"og")),
+                            _parse_float(row.get(u"fg")),
+                            _parse_float(row.get(u"og_temp"), og_temp),
+                            _parse_float(row.get(u"fg_temp"), fg_temp),
+                            _parse_flag(row.get(u"refractometer"), refractometer),
+                        )
+                    )
+                except (TypeError, ValueError) as e:
+                    error = e
+            chunk[index] = (line_number, error)
+        columns = list(zip(*readings)) or [[]] * 5
+        batch = get_abv_batch(*columns, alternative=alternative, units=units)
+        results = iter(zip(readings, *batch))
+        records = []
+        for line_number, error in chunk:
+            if error is None:
+                values, og_adj, fg_adj, abv, message = next(results)
+            else:
+                values, og_adj, fg_adj, abv = (None,) * 5, None, None, None
+                message = u"{}".format(error)
+            if message is not None:
+                stats[u"errors"] += 1
+            records.append((line_number,) + values + (og_adj, fg_adj, abv, message))
+        stats[u"rows"] += len(records)
+        if writer is not None:
+            writer.writerows(records)
+            continue
+        for record in records:
+            output.write(json.dumps(dict(zip(BATCH_COLUMNS, record)), sort_keys=True))
+            output.write(u"\n")
+    return stats
+
+
+class ABVArgumentParser(argparse.ArgumentParser):
+    """
+    Require the gravities unless reading a batch from an input file
+    """
+
+    def parse_args(self, args=None, namespace=None):
+        args = super(ABVArgumentParser, self).parse_args(args, namespace)
+        if getattr(args, u"input", None) is None:
+            missing = [
+                flag
+                for flag, value in [(u"-o/--og", args.og), (u"-f/--fg", args.fg)]
+                if value is None
+            ]
+            if missing:
+                self.error(
+                    u"the following arguments are required: {}".format(
+                        u", ".join(missing)
+                    )
+                )
+        return args
+
+
 def get_parser():
-    parser = argparse.ArgumentParser(description=u"ABV Calculator")
+    parser = ABVArgumentParser(description=u"ABV Calculator")
     parser.add_argument(
-        u"-o",
-        u"--og",
-        metavar=u"O",
-        type=float,
-        required=True,
-        help=u"Original Gravity",
-    )
-    parser.add_argument(
-        u"-f", u"--fg", metavar=u"F", type=float, required=True, help=u"Final Gravity"
+        u"-o", u"--og", metavar=u"O", type=float, help=u"Original Gravity"
     )
+    parser.add_argument(u"-f", u"--fg", metavar=u"F", type=float, help=u"Final Gravity")
     parser.add_argument(
         u"--og-temp",
         metavar=u"T",
@@ -128,9 +385,64 @@ def get_parser():
     parser.add_argument(
         u"-v", u"--verbose", action=u"store_true", default=False, help=u"Verbose Output"
     )
+    # The batch options are only in the namespace when they are given
+    parser.add_argument(
+        u"-i",
+        u"--input",
+        metavar=u"FILE",
+        type=argparse.FileType(u"r"),
+        default=argparse.SUPPRESS,
+        help=u"Calculate each row of a CSV or NDJSON file, - for stdin",
+    )
+    parser.add_argument(
+        u"--format",
+        choices=BATCH_FORMATS,
+        default=argparse.SUPPRESS,
+        help=u"Format of the input and output (default: from the file name)",
+    )
+    parser.add_argument(
+        u"--output",
+        metavar=u"FILE",
+        type=argparse.FileType(u"w"),
+        default=argparse.SUPPRESS,
+        help=u"Output for batch results (default: stdout)",
+    )
+    parser.add_argument(
+        u"--chunksize",
+        metavar=u"N",
+        type=positive_int,
+        default=argparse.SUPPRESS,
+        help=u"Rows calculated at a time in batch mode (default: 10000)",
+    )
     return parser
 
 
+def run_batch_main(args):
+    """
+    Run the batch mode of main
+    """
+    fmt = getattr(args, u"format", None) or get_batch_format(args.input.name)
+    output = getattr(args, u"output", sys.stdout)
+    try:
+        stats = run_batch(
+            args.input,
+            output,
+            fmt=fmt,
+            og_temp=args.og_temp,
+            fg_temp=args.fg_temp,
+            alternative=args.alternative,
+            refractometer=args.refractometer,
+            units=args.units,
+            chunksize=getattr(args, u"chunksize", 10000),
+        )
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    output.flush()
+    if stats[u"errors"]:
+        sys.exit(1)
+
+
 def main(parser_fn=get_parser, parser_kwargs=None):
     parser = None
     if not parser_kwargs:
@@ -138,6 +450,9 @@ def main(parser_fn=get_parser, parser_kwargs=None):
     else:
         parser = parser_fn(**parser_kwargs)
     args = parser.parse_args()
+    if getattr(args, u"input", None) is not None:
+        run_batch_main(args)
+        return
     try:
         out = get_abv(
             args.og,
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Client for the calculation server
+
+Requests and responses are single lines of JSON.  A request names a
+calculation and its parameters::
+
+    {"id": 1, "method": "get_abv", "params": {"og": 1.057, "fg": 1.013}}
+
+The response holds either the result or the error::
+
+    {"id": 1, "result": 0.05775}
+    {"id": 1, "error": "Exception: Original gravity required"}
+
+The fast paths are the :class:`Client` library in a long running Python
+process, which keeps its connection open for many calculations, or writing
+requests to the socket directly, such as with nc or socat::
+
+    $ echo '{"id": 1, "method": "get_abv", "params": {"og": 1.057, "fg": 1.013}}' \\
+        | nc -U /tmp/brewd.sock
+    $ echo '{"id": 1, "method": "get_abv", "params": {"og": 1.057, "fg": 1.013}}' \\
+        | socat - TCP:127.0.0.1:8733
+
+The brewcall command starts Python for each call like the other command
+line utilities, so it is for trying the server rather than for speed.
+"""
+import argparse
+import json
+import socket
+import sys
+
+from brew.exceptions import ServerException
+
+#: The default address of the calculation server
+DEFAULT_HOST = u"127.0.0.1"
+#: The default port of the calculation server
+DEFAULT_PORT = 8733
+
+
+class Client(object):
+    """
+    A connection to the calculation server
+
+    Connect to a Unix socket with path or to a TCP port with host and port.
+    Each method of the server can be called as :meth:`call` or as an
+    attribute of the client::
+
+        with Client(path=u"/tmp/brewd.sock") as client:
+            abv = client.get_abv(og=1.057, fg=1.013)
+    """
+
+    def __init__(self, path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=10.0):
+        """
+        :param str path: The Unix socket of the server (optional)
+        :param str host: The host of the server
+        :param int port: The port of the server
+        :param float timeout: Seconds to wait for the server
+        """
+        self.path = path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.socket = None
+        self.reader = None
+        self.request_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getattr__(self, name):
+        if name.startswith(u"_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        return method
+
+    def connect(self):
+        """
+        Connect to the server
+        """
+        if self.path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = self.path
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (self.host, self.port)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(address)
+        except Exception:
+            sock.close()
+            raise
+        self.socket = sock
+        self.reader = sock.makefile(u"rb")
+
+    def close(self):
+        """
+        Close the connection to the server
+        """
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def call(self, method, *args, **kwargs):
+        """
+        Make a calculation on the server
+
+        :param str method: The name of the calculation
+        :param args: Positional parameters of the calculation
+        :param kwargs: Keyword parameters of the calculation
+        :return: The result of the calculation
+        :raises ServerException: If the calculation fails on the server
+        :raises ValueError: If both args and kwargs are given
+        """
+        if args and kwargs:
+            raise ValueError(u"Use either positional or keyword parameters")
+        if self.socket is None:
+            self.connect()
+        self.request_id += 1
+        request = {
+            u"id": self.request_id,
+            u"method": method,
+            u"params": list(args) if args else kwargs,
+        }
+        try:
+            self.socket.sendall(json.dumps(request).encode(u"utf-8") + b"\n")
+            line = self.reader.readline()
+        except Exception:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ServerException(u"Connection closed by the server")
+        response = json.loads(line.decode(u"utf-8"))
+        if response.get(u"error") is not None:
+            raise ServerException(response[u"error"])
+        return response.get(u"result")
+
+
+def parse_param(param):
+    """
+    Parse a NAME=VALUE parameter
+
+    :param str param: The parameter
+    :return: The name and the value, decoded as JSON when possible
+    :rtype: tuple
+    :raises ValueError: If there is no equals sign
+    """
+    if u"=" not in param:
+        raise ValueError(u"Parameter '{}' must be NAME=VALUE".format(param))
+    name, value = param.split(u"=", 1)
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return name, value
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Calculation Client")
+    parser.add_argument(
+        u"method", metavar=u"METHOD", type=str, help=u"Calculation, eg get_abv"
+    )
+    parser.add_argument(
+        u"params",
+        metavar=u"NAME=VALUE",
+        type=str,
+        nargs=u"*",
+        help=u"Parameters of the calculation, eg og=1.057",
+    )
+    parser.add_argument(
+        u"-s", u"--socket", metavar=u"PATH", type=str, help=u"Unix socket of the server"
+    )
+    parser.add_argument(
+        u"--host",
+        metavar=u"HOST",
+        type=str,
+        default=DEFAULT_HOST,
+        help=u"Host of the server (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-p",
+        u"--port",
+        metavar=u"PORT",
+        type=int,
+        default=DEFAULT_PORT,
+        help=u"Port of the server (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+    try:
+        params = dict(parse_param(param) for param in args.params)
+        with Client(path=args.socket, host=args.host, port=args.port) as client:
+            out = client.call(args.method, **params)
+        print(out)
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,279 @@
 # -*- coding: utf-8 -*-
 import argparse
+import csv
+import json
 import sys
 
-from brew.utilities.sugar import sg_to_gu
-from brew.utilities.sugar import gu_to_sg
+from brew.utilities.arrays import as_array
+from brew.utilities.arrays import get_numpy
+from brew.utilities.batch import BATCH_FORMATS
+from brew.utilities.batch import get_batch_format
+from brew.utilities.batch import iter_batch_rows
+from brew.utilities.batch import iter_chunks
+from brew.utilities.batch import iter_range
+from brew.utilities.batch import positive_int
+from brew.utilities.dilution import dilute_gravity
+from brew.utilities.dilution import dilute_gravity_array
+from brew.utilities.dilution import volume_for_gravity
+from brew.utilities.dilution import volume_for_gravity_array
+
+#: The columns written for each row in batch mode
+BATCH_COLUMNS = [
+    u"line",
+    u"original_volume",
+    u"gravity",
+    u"final_volume",
+    u"final_gravity",
+    u"top_up",
+    u"error",
+]
 
 
 def get_gravity(original_volume, final_volume, gravity):
     """
     Convert gravity at original volume to gravity at final volume
     """
-    return gu_to_sg(sg_to_gu(gravity) * original_volume / final_volume)
+    return dilute_gravity(original_volume, final_volume, gravity)
+
+
+def get_dilution(original_volume, gravity, final_volume=None, target_gravity=None):
+    """
+    Plan a dilution or concentration to a final volume or a target gravity
+
+    original_volume - The volume at the gravity
+    gravity - Specific Gravity at the original volume
+    final_volume - The volume after adding or removing water
+    target_gravity - The Specific Gravity wanted instead of a final volume
+
+    Returns the final volume, the final gravity and the water to add, which
+    is negative when the volume must be boiled down
+    """
+    if original_volume is None:
+        raise Exception(u"Original volume required")
+    if gravity is None:
+        raise Exception(u"Gravity required")
+    if final_volume is None and target_gravity is None:
+        raise Exception(u"Final volume or target gravity required")
+    if final_volume is not None and target_gravity is not None:
+        raise Exception(u"Provide only one of final volume or target gravity")
+    if final_volume is None:
+        final_volume = volume_for_gravity(original_volume, gravity, target_gravity)
+        final_gravity = target_gravity
+    else:
+        final_gravity = dilute_gravity(original_volume, final_volume, gravity)
+    return final_volume, final_gravity, final_volume - original_volume
+
+
+def get_dilution_batch(original_volume, gravity, final_volume, target_gravity):
+    """
+    Plan dilutions or concentrations for many records at once
+
+    original_volume - The volume at the gravity for each record, None if missing
+    gravity - Specific Gravity for each record, None if missing
+    final_volume - The final volume for each record, None if missing
+    target_gravity - The target gravity for each record, None if missing
+
+    Each record has either a final volume or a target gravity.
+
+    Returns lists of the final volume, the final gravity, the water to add
+    and the error for each record.  The error is None for a valid record.
+    Otherwise it is the message get_dilution raises and the values are None.
+
+    With NumPy the records are evaluated in one vectorized pass and only
+    the invalid records are evaluated one at a time for their errors.
+    """  # noqa
+    count = len(original_volume)
+    np = get_numpy()
+    if np is None or not count:
+        volume_out = [None] * count
+        gravity_out = [None] * count
+        top_up_out = [None] * count
+        invalid = range(count)
+    else:
+        ov_array = as_array(original_volume)
+        g_array = as_array(gravity)
+        fv_array = as_array(final_volume)
+        tg_array = as_array(target_gravity)
+        has_volume = ~np.isnan(fv_array)
+        has_target = ~np.isnan(tg_array)
+        with np.errstate(invalid=u"ignore", divide=u"ignore", over=u"ignore"):
+            diluted = dilute_gravity_array(ov_array, fv_array, g_array)
+            volume = volume_for_gravity_array(ov_array, g_array, tg_array)
+            final_volume_array = np.ma.where(has_volume, fv_array, volume)
+            final_gravity_array = np.ma.where(has_volume, diluted, tg_array)
+            top_up = final_volume_array - ov_array
+            invalid = (
+                np.isnan(ov_array)
+                | np.isnan(g_array)
+                | (has_volume == has_target)
+                | np.ma.getmaskarray(final_volume_array)
+                | np.ma.getmaskarray(final_gravity_array)
+                | ~np.isfinite(np.ma.filled(final_gravity_array, np.nan))
+                | ~np.isfinite(np.ma.filled(top_up, np.nan))
+            )
+        volume_out = np.ma.filled(final_volume_array, np.nan).tolist()
+        gravity_out = np.ma.filled(final_gravity_array, np.nan).tolist()
+        top_up_out = np.ma.filled(top_up, np.nan).tolist()
+        invalid = np.flatnonzero(invalid).tolist()
+
+    errors = [None] * count
+    for index in invalid:
+        try:
+            out = get_dilution(
+                original_volume[index],
+                gravity[index],
+                final_volume=final_volume[index],
+                target_gravity=target_gravity[index],
+            )
+        except Exception as e:
+            out = (None, None, None)
+            errors[index] = u"{}".format(e)
+        volume_out[index], gravity_out[index], top_up_out[index] = out
+    return volume_out, gravity_out, top_up_out, errors
+
+
+def iter_grid_rows(original_volume, gravity, start, stop, step):
+    """
+    Get the rows for a grid of candidate final volumes
+
+    original_volume - The volume at the gravity
+    gravity - Specific Gravity at the original volume
+    start - The first final volume
+    stop - The last final volume
+    step - The difference between final volumes
+
+    Yields the row number, the row and the error like iter_batch_rows
+    """
+    volumes = iter_range(start, stop, step)
+    for row_number, volume in enumerate(volumes, 1):
+        row = {
+            u"original_volume": original_volume,
+            u"gravity": gravity,
+            u"final_volume": volume,
+        }
+        yield row_number, row, None
+
+
+def _parse_float(value):
+    if value is None or value == u"":
+        return None
+    return float(value)
+
+
+def run_batch(rows, output, fmt=u"csv", target_gravity=None, chunksize=10000):
+    """
+    Plan a dilution or concentration for each row of a batch
+
+    rows - The rows, such as from iter_batch_rows or iter_grid_rows
+    output - The stream to write results to
+    fmt - The format, 'csv' or 'ndjson'
+    target_gravity - Target gravity for rows with no final_volume or target_gravity
+    chunksize - The number of rows evaluated at once
+
+    Each row has original_volume, gravity and either final_volume or
+    target_gravity.  A result with the columns in BATCH_COLUMNS is written
+    for every row in the order read.  Rows which cannot be planned have an
+    error and do not stop the batch.
+
+    Returns the number of rows and errors
+    """  # noqa
+    if fmt not in BATCH_FORMATS:
+        raise Exception(u"Format must be one of {}".format(u", ".join(BATCH_FORMATS)))
+    if chunksize < 1:
+        raise Exception(u"Chunksize must be at least 1")
+    writer = None
+    if fmt == u"csv":
+        writer = csv.writer(output, lineterminator=u"\n")
+        writer.writerow(BATCH_COLUMNS)
+
+    stats = {u"rows": 0, u"errors": 0}
+    for _, chunk in iter_chunks(rows, chunksize):
+        records = []
+        for index, (line_number, row, error) in enumerate(chunk):
+            if error is None:
+                try:
+                    final_volume = _parse_float(row.get(u"final_volume"))
+                    target = _parse_float(row.get(u"target_gravity"))
+                    if final_volume is None and target is None:
+                        target = target_gravity
+                    records.append(
+                        (
+                            _parse_float(row.get(u"original_volume")),
+                            _parse_float(row.get(u"gravity")),
+                            final_volume,
+                            target,
+                        )
+                    )
+                except (TypeError, ValueError) as e:
+                    error = e
+            chunk[index] = (line_number, error)
+        columns = list(zip(*records)) or [[]] * 4
+        results = iter(zip(records, *get_dilution_batch(*columns)))
+        lines = []
+        for line_number, error in chunk:
+            if error is None:
+                values, volume, gravity, top_up, message = next(results)
+                values = values[:2]
+            else:
+                values, volume, gravity, top_up = (None, None), None, None, None
+                message = u"{}".format(error)
+            if message is not None:
+                stats[u"errors"] += 1
+            lines.append((line_number,) + values + (volume, gravity, top_up, message))
+        stats[u"rows"] += len(lines)
+        if writer is not None:
+            writer.writerows(lines)
+            continue
+        for line in lines:
+            output.write(json.dumps(dict(zip(BATCH_COLUMNS, line)), sort_keys=True))
+            output.write(u"\n")
+    return stats
+
+
+class GravityVolumeArgumentParser(argparse.ArgumentParser):
+    """
+    Require the volumes and gravity unless reading a batch from an input file
+
+    A grid gives the final volumes so it cannot be used with a target gravity.
+    """
+
+    def parse_args(self, args=None, namespace=None):
+        args = super(GravityVolumeArgumentParser, self).parse_args(args, namespace)
+        if (
+            getattr(args, u"grid", None) is not None
+            and getattr(args, u"target_gravity", None) is not None
+        ):
+            self.error(
+                u"argument --grid: not allowed with argument -t/--target-gravity"
+            )
+        if getattr(args, u"input", None) is not None:
+            return args
+        required = [
+            (u"-o/--original-volume", args.original_volume),
+            (u"-g/--gravity", args.gravity),
+        ]
+        if (
+            getattr(args, u"grid", None) is None
+            and getattr(args, u"target_gravity", None) is None
+        ):
+            required.append((u"-f/--final-volume", args.final_volume))
+        missing = [flag for flag, value in required if value is None]
+        if missing:
+            self.error(
+                u"the following arguments are required: {}".format(
+                    u", ".join(missing)
+                )
+            )
+        return args
 
 
 def get_parser():
-    parser = argparse.ArgumentParser(description=u"Gravity-Volume Conversion")
+    parser = GravityVolumeArgumentParser(description=u"Gravity-Volume Conversion")
     parser.add_argument(
         u"-o",
         u"--original-volume",
         metavar=u"V",
         type=float,
-        required=True,
         help=u"Original Volume",
     )
     parser.add_argument(
@@ -28,15 +281,84 @@ def get_parser():
         u"--final-volume",
         metavar=u"V",
         type=float,
-        required=True,
         help=u"Final Volume",
     )
+    parser.add_argument(u"-g", u"--gravity", metavar=u"G", type=float, help=u"Gravity")
+    # The planning options are only in the namespace when they are given
+    parser.add_argument(
+        u"-t",
+        u"--target-gravity",
+        metavar=u"G",
+        type=float,
+        default=argparse.SUPPRESS,
+        help=u"Find the final volume for a target gravity instead",
+    )
+    parser.add_argument(
+        u"--grid",
+        metavar=(u"START", u"STOP", u"STEP"),
+        type=float,
+        nargs=3,
+        default=argparse.SUPPRESS,
+        help=u"Plan each final volume from START to STOP by STEP",
+    )
+    parser.add_argument(
+        u"-i",
+        u"--input",
+        metavar=u"FILE",
+        type=argparse.FileType(u"r"),
+        default=argparse.SUPPRESS,
+        help=u"Plan each row of a CSV or NDJSON file, - for stdin",
+    )
+    parser.add_argument(
+        u"--format",
+        choices=BATCH_FORMATS,
+        default=argparse.SUPPRESS,
+        help=u"Format of the input and output (default: from the file name)",
+    )
+    parser.add_argument(
+        u"--output",
+        metavar=u"FILE",
+        type=argparse.FileType(u"w"),
+        default=argparse.SUPPRESS,
+        help=u"Output for batch results (default: stdout)",
+    )
     parser.add_argument(
-        u"-g", u"--gravity", metavar=u"G", type=float, required=True, help=u"Gravity"
+        u"--chunksize",
+        metavar=u"N",
+        type=positive_int,
+        default=argparse.SUPPRESS,
+        help=u"Rows planned at a time in batch mode (default: 10000)",
     )
     return parser
 
 
+def run_batch_main(args):
+    """
+    Run the batch and grid modes of main
+    """
+    output = getattr(args, u"output", sys.stdout)
+    try:
+        if getattr(args, u"input", None) is not None:
+            fmt = getattr(args, u"format", None) or get_batch_format(args.input.name)
+            rows = iter_batch_rows(args.input, fmt=fmt)
+        else:
+            fmt = getattr(args, u"format", None) or get_batch_format(output.name)
+            rows = iter_grid_rows(args.original_volume, args.gravity, *args.grid)
+        stats = run_batch(
+            rows,
+            output,
+            fmt=fmt,
+            target_gravity=getattr(args, u"target_gravity", None),
+            chunksize=getattr(args, u"chunksize", 10000),
+        )
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    output.flush()
+    if stats[u"errors"]:
+        sys.exit(1)
+
+
 def main(parser_fn=get_parser, parser_kwargs=None):
     parser = None
     if not parser_kwargs:
@@ -44,6 +366,23 @@ def main(parser_fn=get_parser, parser_kwargs=None):
     else:
         parser = parser_fn(**parser_kwargs)
     args = parser.parse_args()
+    if (
+        getattr(args, u"input", None) is not None
+        or getattr(args, u"grid", None) is not None
+    ):
+        run_batch_main(args)
+        return
+    target_gravity = getattr(args, u"target_gravity", None)
+    if target_gravity is not None:
+        try:
+            volume, _, top_up = get_dilution(
+                args.original_volume, args.gravity, target_gravity=target_gravity
+            )
+        except Exception as e:
+            print(e)
+            sys.exit(1)
+        print(u"Final Volume\tTop Up\n{:0.3f}\t{:0.3f}".format(volume, top_up))
+        return
     if not all([args.original_volume, args.final_volume, args.gravity]):
         print("Please provide all arguments")
         sys.exit(1)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import sys
+
+from brew.parsers import PackedDataLoader
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Pack a Data Directory")
+    parser.add_argument(
+        u"-d",
+        u"--data-dir",
+        metavar=u"DIR",
+        type=str,
+        required=True,
+        help=u"Data directory with cereals, hops and yeast",
+    )
+    parser.add_argument(
+        u"-o",
+        u"--output",
+        metavar=u"FILE",
+        type=str,
+        required=True,
+        help=u"Packed data file to write",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+    if not (args.data_dir and args.output):
+        print(u"Please provide all arguments")
+        sys.exit(1)
+    if not os.path.isdir(args.data_dir):
+        print(u"Directory '{}' does not exist".format(args.data_dir))
+        sys.exit(1)
+    count = PackedDataLoader.build(args.data_dir, args.output)
+    print(u"Packed {} items into {}".format(count, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import argparse
+import sys
+
+from brew.exceptions import DataLoaderException
+from brew.parsers import JSONDataLoader
+from brew.parsers import PackedDataLoader
+from brew.pipeline import run_pipeline
+from brew.utilities.batch import positive_int
+
+
+def get_loader(data_dir=None, index_file=None, packed=None):
+    """
+    Get a loader for a data directory or a packed data file
+    """
+    if packed:
+        return PackedDataLoader(packed)
+    return JSONDataLoader(data_dir, index_file=index_file)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Recipe Pipeline")
+    parser.add_argument(
+        u"input",
+        metavar=u"FILE",
+        type=argparse.FileType(u"r"),
+        nargs=u"?",
+        default=sys.stdin,
+        help=u"Recipes as newline delimited JSON (default: stdin)",
+    )
+    parser.add_argument(
+        u"-o",
+        u"--output",
+        metavar=u"FILE",
+        type=argparse.FileType(u"w"),
+        default=sys.stdout,
+        help=u"Output for recipes as newline delimited JSON (default: stdout)",
+    )
+    parser.add_argument(
+        u"-e",
+        u"--errors",
+        metavar=u"FILE",
+        type=argparse.FileType(u"w"),
+        default=sys.stderr,
+        help=u"Output for errors as newline delimited JSON (default: stderr)",
+    )
+    parser.add_argument(
+        u"-d", u"--data-dir", metavar=u"DIR", type=str, help=u"Data directory"
+    )
+    parser.add_argument(
+        u"-i",
+        u"--index-file",
+        metavar=u"FILE",
+        type=str,
+        help=u"Index file for the data directory",
+    )
+    parser.add_argument(
+        u"-p", u"--packed", metavar=u"FILE", type=str, help=u"Packed data file"
+    )
+    parser.add_argument(
+        u"-w",
+        u"--workers",
+        metavar=u"N",
+        type=positive_int,
+        default=1,
+        help=u"Number of worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-c",
+        u"--chunksize",
+        metavar=u"N",
+        type=positive_int,
+        default=100,
+        help=u"Recipes sent to a worker at a time (default: %(default)s)",
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+    if not (args.data_dir or args.packed):
+        print(u"Must provide a data directory or a packed data file")
+        sys.exit(1)
+    try:
+        loader = get_loader(
+            data_dir=args.data_dir, index_file=args.index_file, packed=args.packed
+        )
+    except DataLoaderException as e:
+        print(e)
+        sys.exit(1)
+    stats = run_pipeline(
+        args.input,
+        args.output,
+        loader,
+        errors=args.errors,
+        processes=args.workers,
+        chunksize=args.chunksize,
+    )
+    args.output.flush()
+    if stats[u"errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Calculation Server
+
+Serve the calculations of the command line utilities from one long running
+process so each calculation does not pay for starting Python.  Clients only
+avoid that cost when they do not start Python themselves, see
+:mod:`brew.cli.client` for the fast paths.  The server
+listens on a Unix socket or a loopback TCP port and handles any number of
+clients at once with asyncio.  Listening on other addresses must be allowed
+explicitly.  See :mod:`brew.cli.client` for the protocol.
+"""
+import argparse
+import errno
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+
+from brew.cli.abv import get_abv
+from brew.cli.client import DEFAULT_HOST
+from brew.cli.client import DEFAULT_PORT
+from brew.cli.gravity_volume import get_gravity
+from brew.cli.sugar import get_sugar_conversion
+from brew.cli.temp import get_temp_conversion
+from brew.cli.yeast import get_yeast_pitch_calculation
+from brew.exceptions import ServerException
+from brew.utilities.yeast import KaiserYeastModel
+from brew.utilities.yeast import WhiteYeastModel
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    asyncio = None
+
+#: The largest request in bytes, longer requests close the connection
+MAX_REQUEST_SIZE = 65536
+
+#: The most bytes buffered for a client before reading from it pauses
+MAX_BUFFER_SIZE = 1048576
+
+#: The yeast growth models by name
+YEAST_MODELS = {u"white": WhiteYeastModel, u"kaiser": KaiserYeastModel}
+
+
+def get_yeast_model_pitch_calculation(model=u"white", **kwargs):
+    """
+    Get the yeast pitch calculation with the growth model given by name
+
+    :param str model: The yeast growth model, 'white' or 'kaiser'
+    :param kwargs: The arguments of get_yeast_pitch_calculation
+    :return: The yeast pitch calculation
+    :rtype: str
+    """
+    if model not in YEAST_MODELS:
+        raise Exception(
+            u"Unknown Yeast Growth Model '{}', must be 'white' or 'kaiser'".format(
+                model
+            )
+        )  # noqa
+    return get_yeast_pitch_calculation(model_cls=YEAST_MODELS[model], **kwargs)
+
+
+#: The calculations served by name
+METHODS = {
+    u"get_abv": get_abv,
+    u"get_gravity": get_gravity,
+    u"get_sugar_conversion": get_sugar_conversion,
+    u"get_temp_conversion": get_temp_conversion,
+    u"get_yeast_pitch_calculation": get_yeast_model_pitch_calculation,
+}
+
+
+def handle_request(line, methods=None):
+    """
+    Make the calculation for one request
+
+    :param bytes line: The request as JSON
+    :param dict methods: The calculations by name (default: METHODS)
+    :return: The response
+    :rtype: dict
+
+    Errors are returned in the response instead of being raised.
+    """
+    if methods is None:
+        methods = METHODS
+    request_id = None
+    try:
+        request = json.loads(line.decode(u"utf-8"))
+        if not isinstance(request, dict):
+            raise ValueError(u"Request must be a JSON object")
+        request_id = request.get(u"id")
+        method = methods.get(request.get(u"method"))
+        if method is None:
+            raise ValueError(u"Unknown method '{}'".format(request.get(u"method")))
+        params = request.get(u"params", {})
+        if isinstance(params, dict):
+            result = method(**params)
+        elif isinstance(params, list):
+            result = method(*params)
+        else:
+            raise ValueError(u"Params must be a JSON object or array")
+    except Exception as e:
+        return {
+            u"id": request_id,
+            u"error": u"{}: {}".format(type(e).__name__, e),
+        }
+    return {u"id": request_id, u"result": result}
+
+
+class CalculationProtocol(asyncio.Protocol if asyncio else object):
+    """
+    Answer the requests from one client
+
+    Each line received is a request and each response is written as a
+    line in the same order.  While the client is not reading the responses
+    the requests are left in the buffer, and reading from the client pauses
+    while the buffer is over MAX_BUFFER_SIZE.
+    """
+
+    def __init__(self, methods=None):
+        """
+        :param dict methods: The calculations by name (default: METHODS)
+        """
+        self.methods = methods
+        self.transport = None
+        self.buffer = b""
+        self.writing_paused = False
+        self.reading_paused = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+    def data_received(self, data):
+        self.buffer += data
+        self.handle_buffer()
+
+    def pause_writing(self):
+        self.writing_paused = True
+
+    def resume_writing(self):
+        self.writing_paused = False
+        self.handle_buffer()
+
+    def handle_buffer(self):
+        """
+        Answer the requests in the buffer until writing pauses
+        """
+        start = 0
+        while self.transport is not None and not self.writing_paused:
+            index = self.buffer.find(b"\n", start)
+            if index < 0:
+                break
+            line = self.buffer[start:index]
+            start = index + 1
+            if line.strip():
+                self.write(handle_request(line, methods=self.methods))
+        self.buffer = self.buffer[start:]
+        if self.transport is None:
+            return
+        if not self.writing_paused and len(self.buffer) > MAX_REQUEST_SIZE:
+            self.write(
+                {
+                    u"id": None,
+                    u"error": u"Request is longer than {} bytes".format(
+                        MAX_REQUEST_SIZE
+                    ),
+                }
+            )
+            self.transport.close()
+            return
+        over_limit = len(self.buffer) > MAX_BUFFER_SIZE
+        if over_limit and not self.reading_paused:
+            self.transport.pause_reading()
+            self.reading_paused = True
+        elif not over_limit and self.reading_paused:
+            self.transport.resume_reading()
+            self.reading_paused = False
+
+    def write(self, response):
+        self.transport.write(json.dumps(response).encode(u"utf-8") + b"\n")
+
+
+def remove_socket(path):
+    """
+    Remove a Unix socket file
+    """
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def remove_stale_socket(path):
+    """
+    Remove a Unix socket file left by a server which has stopped
+
+    :param str path: The Unix socket
+    :raises ServerException: If a server is still listening on the socket
+
+    The socket is only removed when connecting to it is refused.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except OSError:
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except socket.error as e:
+        if e.errno == errno.ECONNREFUSED:
+            remove_socket(path)
+        return
+    finally:
+        sock.close()
+    raise ServerException(u"A server is already listening on '{}'".format(path))
+
+
+def is_loopback(host):
+    """
+    Determine if a host only resolves to loopback addresses
+
+    :param str host: The host name or address
+    :return: True if every address of the host is a loopback address
+    :rtype: bool
+    """
+    if not host:
+        return False
+    try:
+        addresses = set(info[4][0] for info in socket.getaddrinfo(host, None))
+    except (socket.error, UnicodeError):
+        return False
+    if not addresses:
+        return False
+    return all(
+        address.startswith(u"127.") or address == u"::1" for address in addresses
+    )
+
+
+def start_server(
+    loop,
+    path=None,
+    host=DEFAULT_HOST,
+    port=DEFAULT_PORT,
+    methods=None,
+    allow_remote=False,
+):
+    """
+    Start serving calculations on an event loop
+
+    :param loop: The asyncio event loop
+    :param str path: The Unix socket to listen on (optional)
+    :param str host: The host to listen on when there is no path
+    :param int port: The port to listen on when there is no path, 0 picks a free port
+    :param dict methods: The calculations by name (default: METHODS)
+    :param bool allow_remote: Allow a host which is not a loopback address
+    :return: The server
+    :rtype: asyncio.AbstractServer
+    :raises RuntimeError: If asyncio is not available
+    :raises ServerException: If the host is not a loopback address and remote clients are not allowed
+    :raises ServerException: If a server is already listening on the Unix socket
+    """  # noqa
+    if asyncio is None:
+        raise RuntimeError(u"The server requires asyncio")
+    if not path and not allow_remote and not is_loopback(host):
+        raise ServerException(
+            u"Host '{}' is not a loopback address, use --allow-remote to "
+            u"listen on it".format(host)
+        )
+
+    def factory():
+        return CalculationProtocol(methods=methods)
+
+    if path:
+        remove_stale_socket(path)
+        create = loop.create_unix_server(factory, path)
+    else:
+        create = loop.create_server(factory, host, port)
+    return loop.run_until_complete(create)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=u"Calculation Server")
+    parser.add_argument(
+        u"-s", u"--socket", metavar=u"PATH", type=str, help=u"Unix socket to listen on"
+    )
+    parser.add_argument(
+        u"--host",
+        metavar=u"HOST",
+        type=str,
+        default=DEFAULT_HOST,
+        help=u"Host to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"-p",
+        u"--port",
+        metavar=u"PORT",
+        type=int,
+        default=DEFAULT_PORT,
+        help=u"Port to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        u"--allow-remote",
+        action=u"store_true",
+        default=False,
+        help=u"Allow a host which is not a loopback address, the server has no authentication",  # noqa
+    )
+    return parser
+
+
+def main(parser_fn=get_parser, parser_kwargs=None):
+    parser = None
+    if not parser_kwargs:
+        parser = parser_fn()
+    else:
+        parser = parser_fn(**parser_kwargs)
+    args = parser.parse_args()
+    if asyncio is None:
+        print(u"The server requires Python 3.4 or later")
+        sys.exit(1)
+
+    loop = asyncio.new_event_loop()
+    try:
+        server = start_server(
+            loop,
+            path=args.socket,
+            host=args.host,
+            port=args.port,
+            allow_remote=args.allow_remote,
+        )
+    except (IOError, OSError, ServerException) as e:
+        print(e)
+        loop.close()
+        sys.exit(1)
+    if args.socket:
+        print(u"Serving on {}".format(args.socket))
+    else:
+        host, port = server.sockets[0].getsockname()[:2]
+        print(u"Serving on {}:{}".format(host, port))
+    sys.stdout.flush()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, loop.stop)
+    except (AttributeError, NotImplementedError):
+        pass
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+        if args.socket:
+            remove_socket(args.socket)
+
+
+if __name__ == "__main__":
+    main()
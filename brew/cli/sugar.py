@@ -1,14 +1,37 @@
 # -*- coding: utf-8 -*-
 import argparse
+import csv
+import json
+import math
 import sys
 import textwrap
 
+from brew.utilities.arrays import as_array
+from brew.utilities.arrays import get_numpy
+from brew.utilities.batch import iter_chunks
+from brew.utilities.batch import iter_range
+from brew.utilities.batch import positive_int
 from brew.utilities.sugar import brix_to_plato
+from brew.utilities.sugar import brix_to_plato_array
 from brew.utilities.sugar import brix_to_sg
+from brew.utilities.sugar import brix_to_sg_array
 from brew.utilities.sugar import plato_to_brix
+from brew.utilities.sugar import plato_to_brix_array
 from brew.utilities.sugar import plato_to_sg
+from brew.utilities.sugar import plato_to_sg_array
 from brew.utilities.sugar import sg_to_brix
+from brew.utilities.sugar import sg_to_brix_array
 from brew.utilities.sugar import sg_to_plato
+from brew.utilities.sugar import sg_to_plato_array
+
+#: The sugar units accepted as input
+SUGAR_UNITS = [u"b", u"p", u"s"]
+
+#: The table formats, npz requires NumPy
+TABLE_FORMATS = [u"csv", u"ndjson", u"npz"]
+
+#: The columns of a conversion table
+TABLE_COLUMNS = [u"sg", u"plato", u"brix", u"error"]
 
 
 def get_sugar_conversion(brix_in, plato_in, sg_in, sugar_out):
@@ -55,6 +78,162 @@ def get_sugar_conversion(brix_in, plato_in, sg_in, sugar_out):
         return out
 
 
+def get_sugar_table(values, sugar_in=u"s"):
+    """
+    Convert many values of one sugar unit to all units at once
+
+    values - The values as a sequence or NumPy array
+    sugar_in - Type of the values ('b', 'p' or 's')
+
+    Returns the SG, Plato and Brix columns.  With NumPy the columns are
+    masked arrays evaluated in one vectorized pass, otherwise they are
+    lists.  Only the Brix converted from SG or Plato is range checked, a
+    result above 40 degBx is masked or None.  Brix values given as input
+    are converted whatever their value.
+    """
+    if sugar_in not in SUGAR_UNITS:
+        raise Exception(u"Input must be one of {}".format(u", ".join(SUGAR_UNITS)))
+    np = get_numpy()
+    if np is not None:
+        values = as_array(values)
+    else:
+        values = list(values)
+    if sugar_in == u"b":
+        columns = [brix_to_sg_array(values), brix_to_plato_array(values), values]
+    elif sugar_in == u"p":
+        columns = [plato_to_sg_array(values), values, plato_to_brix_array(values)]
+    else:
+        columns = [values, sg_to_plato_array(values), sg_to_brix_array(values)]
+    if np is not None:
+        columns = [np.ma.asarray(column) for column in columns]
+    return columns
+
+
+def get_table_format(filename):
+    """
+    Get the table format from a file name
+
+    filename - The name of the file
+
+    Returns 'npz' for .npz files, 'ndjson' for .ndjson, .jsonl and .json
+    files, otherwise 'csv'
+    """
+    name = filename.lower()
+    if name.endswith(u".npz"):
+        return u"npz"
+    if name.endswith((u".ndjson", u".jsonl", u".json")):
+        return u"ndjson"
+    return u"csv"
+
+
+def iter_sugar_values(lines):
+    """
+    Read the values of a stream
+
+    lines - Lines of values separated by whitespace or commas
+
+    Yields each value.  A token which is not a number yields a ValueError in
+    place of the value so the stream continues.  Blank lines are skipped.
+    """
+    for line_number, line in enumerate(lines, 1):
+        for token in line.replace(u",", u" ").split():
+            try:
+                value = float(token)
+            except ValueError:
+                value = None
+            if value is None or math.isnan(value) or math.isinf(value):
+                yield ValueError(
+                    u"Line {}: '{}' is not a number".format(line_number, token)
+                )
+                continue
+            yield value
+
+
+def _column_list(column):
+    np = get_numpy()
+    if np is None:
+        return column
+    mask = np.ma.getmaskarray(column).tolist()
+    values = np.ma.filled(column, np.nan).tolist()
+    return [None if invalid else value for value, invalid in zip(values, mask)]
+
+
+def run_sugar_table(values, output, sugar_in=u"s", fmt=u"csv", chunksize=10000):
+    """
+    Write a table converting each value to SG, Plato and Brix
+
+    values - An iterable of values, such as from iter_sugar_values
+    output - The stream to write the table to, binary for npz
+    sugar_in - Type of the values ('b', 'p' or 's')
+    fmt - The format, 'csv', 'ndjson' or 'npz'
+    chunksize - The number of values converted at once
+
+    The table has the columns in TABLE_COLUMNS and a row for every value.
+    Values out of range are empty in CSV, null in NDJSON and NaN in npz.
+    An exception in place of a value gives a row with only the error and
+    does not stop the table.  CSV and NDJSON are written as each chunk is
+    converted.  The npz format is a NumPy archive with an array for each
+    column and is written at the end.
+
+    Returns the number of rows and errors
+    """
+    if fmt not in TABLE_FORMATS:
+        raise Exception(u"Format must be one of {}".format(u", ".join(TABLE_FORMATS)))
+    if chunksize < 1:
+        raise Exception(u"Chunksize must be at least 1")
+    if sugar_in not in SUGAR_UNITS:
+        raise Exception(u"Input must be one of {}".format(u", ".join(SUGAR_UNITS)))
+    np = get_numpy()
+    if fmt == u"npz" and np is None:
+        raise Exception(u"The npz format requires NumPy")
+    writer = None
+    if fmt == u"csv":
+        writer = csv.writer(output, lineterminator=u"\n")
+        writer.writerow(TABLE_COLUMNS)
+
+    stats = {u"rows": 0, u"errors": 0}
+    arrays = [[] for _ in TABLE_COLUMNS]
+    for _, chunk in iter_chunks(values, chunksize):
+        errors = [
+            u"{}".format(value) if isinstance(value, Exception) else None
+            for value in chunk
+        ]
+        valid = [value for value, error in zip(chunk, errors) if error is None]
+        stats[u"rows"] += len(chunk)
+        stats[u"errors"] += len(chunk) - len(valid)
+        columns = get_sugar_table(valid, sugar_in=sugar_in)
+        if fmt == u"npz":
+            selected = np.array([error is None for error in errors], dtype=bool)
+            for array, column in zip(arrays, columns):
+                filled = np.full(len(chunk), np.nan)
+                filled[selected] = np.ma.filled(column.astype(float), np.nan)
+                array.append(filled)
+            arrays[-1].append(np.array([error or u"" for error in errors]))
+            continue
+        columns = [iter(_column_list(column)) for column in columns]
+        records = [
+            (None, None, None, error)
+            if error is not None
+            else tuple(next(column) for column in columns) + (None,)
+            for error in errors
+        ]
+        if writer is not None:
+            writer.writerows(records)
+            continue
+        for record in records:
+            output.write(json.dumps(dict(zip(TABLE_COLUMNS, record)), sort_keys=True))
+            output.write(u"\n")
+    if fmt == u"npz":
+        np.savez(
+            output,
+            **dict(
+                (name, np.concatenate(array) if array else np.zeros(0))
+                for name, array in zip(TABLE_COLUMNS, arrays)
+            )
+        )
+    return stats
+
+
 def get_parser():
     parser = argparse.ArgumentParser(description=u"Sugar Conversion")
     parser.add_argument(
@@ -73,9 +252,91 @@ def get_parser():
         type=str,
         help=u"Desired Output (b, p, s accepted)",
     )
+    # The table options are only in the namespace when they are given
+    parser.add_argument(
+        u"-i",
+        u"--input",
+        metavar=u"FILE",
+        type=argparse.FileType(u"r"),
+        default=argparse.SUPPRESS,
+        help=u"Convert each value of a file to a table, - for stdin",
+    )
+    parser.add_argument(
+        u"-r",
+        u"--range",
+        metavar=(u"START", u"STOP", u"STEP"),
+        type=float,
+        nargs=3,
+        default=argparse.SUPPRESS,
+        help=u"Convert each value from START to STOP by STEP to a table",
+    )
+    parser.add_argument(
+        u"--in",
+        dest=u"sugar_in",
+        choices=SUGAR_UNITS,
+        default=argparse.SUPPRESS,
+        help=u"Unit of the table values (default: s)",
+    )
+    parser.add_argument(
+        u"--format",
+        choices=TABLE_FORMATS,
+        default=argparse.SUPPRESS,
+        help=u"Format of the table (default: from the output name or csv)",
+    )
+    parser.add_argument(
+        u"--output",
+        metavar=u"FILE",
+        type=str,
+        default=argparse.SUPPRESS,
+        help=u"Output for the table (default: stdout)",
+    )
+    parser.add_argument(
+        u"--chunksize",
+        metavar=u"N",
+        type=positive_int,
+        default=argparse.SUPPRESS,
+        help=u"Values converted at a time for a table (default: 10000)",
+    )
     return parser
 
 
+def run_table_main(args):
+    """
+    Run the table mode of main
+    """
+    filename = getattr(args, u"output", None)
+    fmt = getattr(args, u"format", None) or get_table_format(filename or u"")
+    try:
+        if getattr(args, u"input", None) is not None:
+            values = iter_sugar_values(args.input)
+        else:
+            values = iter_range(*args.range)
+        if filename:
+            output = open(filename, u"wb" if fmt == u"npz" else u"w")
+        elif fmt == u"npz":
+            output = getattr(sys.stdout, u"buffer", sys.stdout)
+        else:
+            output = sys.stdout
+        try:
+            stats = run_sugar_table(
+                values,
+                output,
+                sugar_in=getattr(args, u"sugar_in", u"s"),
+                fmt=fmt,
+                chunksize=getattr(args, u"chunksize", 10000),
+            )
+        finally:
+            if filename:
+                output.close()
+            else:
+                output.flush()
+    except Exception as e:
+        print(e)
+        sys.exit(1)
+    if stats[u"errors"]:
+        sys.exit(1)
+
+
 def main(parser_fn=get_parser, parser_kwargs=None):
     parser = None
     if not parser_kwargs:
@@ -84,6 +345,16 @@ def main(parser_fn=get_parser, parser_kwargs=None):
         parser = parser_fn(**parser_kwargs)
     args = parser.parse_args()
 
+    table = [getattr(args, u"input", None), getattr(args, u"range", None)]
+    if any(arg is not None for arg in table):
+        if sum(arg is not None for arg in table) != 1 or any(
+            [args.brix, args.plato, args.sg]
+        ):
+            print(u"Must provide only one of a value, an input file or a range")
+            sys.exit(1)
+        run_table_main(args)
+        return
+
     if sum(bool(arg) for arg in [args.brix, args.plato, args.sg]) != 1:
         print(u"Must provide only one of Brix, Plato or Specific Gravity")
         sys.exit(1)
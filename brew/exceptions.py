@@ -7,6 +7,7 @@ __all__ = [
     u"GrainException",
     u"HopException",
     u"RecipeException",
+    u"ServerException",
     u"StyleException",
     u"SugarException",
     u"ValidatorException",
@@ -38,6 +39,10 @@ class RecipeException(BrewdayException):
     pass
 
 
+class ServerException(BrewdayException):
+    pass
+
+
 class StyleException(BrewdayException):
     pass
 
@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar storage for many recipes.
+
+A :class:`RecipeFrame` holds the grain additions, hop additions, yeast and
+volumes of many recipes as flat arrays.  The additions of every recipe are
+stored one after the other and each recipe has an offset into them.  The
+metrics from :meth:`brew.recipes.Recipe.to_dict` are computed for every
+recipe at once using the formulas in :mod:`brew.utilities`.
+
+NumPy is required to use a RecipeFrame.
+"""
+from .constants import BOIL_EVAPORATION
+from .constants import GRAIN_TYPE_CEREAL
+from .constants import GRAIN_TYPE_DME
+from .constants import GRAIN_TYPE_LME
+from .constants import HOP_TYPE_PELLET
+from .constants import HOP_UTILIZATION_SCALE_PELLET
+from .constants import IMPERIAL_UNITS
+from .constants import PPG_CEREAL
+from .constants import PPG_DME
+from .constants import SI_UNITS
+from .exceptions import ColorException
+from .grains import Grain
+from .grains import GrainAddition
+from .hops import Hop
+from .hops import HopAddition
+from .parsers import MemoizedLoader
+from .parsers import parse_recipe
+from .recipes import Recipe
+from .utilities.abv import alcohol_by_volume_alternative
+from .utilities.abv import alcohol_by_volume_standard
+from .utilities.abv import alcohol_by_weight
+from .utilities.arrays import get_numpy
+from .utilities.color import calculate_mcu_array
+from .utilities.color import calculate_srm_array
+from .utilities.color import calculate_srm_models_array
+from .utilities.color import srm_to_ebc
+from .utilities.malt import hwe_to_basis
+from .utilities.sugar import gu_to_sg
+from .yeasts import Yeast
+
+__all__ = [u"RecipeFrame"]
+
+
+class RecipeFrame(object):
+    """
+    A columnar store of many recipes.
+
+    Recipe columns have one value per recipe.  Grain and hop columns have one
+    value per addition, and ``grain_offsets[i]:grain_offsets[i + 1]`` are the
+    grain additions of recipe ``i``.  The same holds for ``hop_offsets``.
+    """
+
+    #: Columns with one value per recipe
+    RECIPE_COLUMNS = (
+        u"name",
+        u"start_volume",
+        u"final_volume",
+        u"brew_house_yield",
+        u"units",
+        u"yeast_name",
+        u"percent_attenuation",
+    )
+    #: Columns with one value per grain addition
+    GRAIN_COLUMNS = (
+        u"grain_name",
+        u"color",
+        u"ppg",
+        u"hwe",
+        u"grain_weight",
+        u"grain_type",
+    )
+    #: Columns with one value per hop addition
+    HOP_COLUMNS = (
+        u"hop_name",
+        u"percent_alpha_acids",
+        u"hop_weight",
+        u"boil_time",
+        u"hop_type",
+        u"utilization",
+        u"utilization_cls_kwargs",
+    )
+    #: Columns of floats, all others are objects
+    FLOAT_COLUMNS = frozenset(
+        [
+            u"start_volume",
+            u"final_volume",
+            u"brew_house_yield",
+            u"percent_attenuation",
+            u"color",
+            u"ppg",
+            u"hwe",
+            u"grain_weight",
+            u"percent_alpha_acids",
+            u"hop_weight",
+            u"boil_time",
+        ]
+    )
+
+    def __init__(self, columns, grain_offsets, hop_offsets):
+        """
+        :param dict columns: The recipe, grain and hop columns by name
+        :param grain_offsets: The offset of each recipe's grain additions
+        :param hop_offsets: The offset of each recipe's hop additions
+        :raises ImportError: If NumPy is not installed
+        """
+        np = get_numpy()
+        if np is None:
+            raise ImportError(u"RecipeFrame requires NumPy")
+        self.columns = {}
+        for name in self.RECIPE_COLUMNS + self.GRAIN_COLUMNS + self.HOP_COLUMNS:
+            dtype = float if name in self.FLOAT_COLUMNS else object
+            values = columns[name]
+            column = np.empty(len(values), dtype=dtype)
+            column[:] = values
+            self.columns[name] = column
+        self.grain_offsets = np.asarray(grain_offsets, dtype=np.intp)
+        self.hop_offsets = np.asarray(hop_offsets, dtype=np.intp)
+        self._metrics = None
+
+    def __len__(self):
+        return len(self.columns[u"name"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @classmethod
+    def from_recipes(cls, recipes):
+        """
+        Build a frame from recipes
+
+        :param iterable recipes: Recipe objects
+        :return: The frame
+        :rtype: RecipeFrame
+        """
+        names = cls.RECIPE_COLUMNS + cls.GRAIN_COLUMNS + cls.HOP_COLUMNS
+        columns = {name: [] for name in names}
+        grain_offsets = [0]
+        hop_offsets = [0]
+        for recipe in recipes:
+            columns[u"name"].append(recipe.name)
+            columns[u"start_volume"].append(recipe.start_volume)
+            columns[u"final_volume"].append(recipe.final_volume)
+            columns[u"brew_house_yield"].append(recipe.brew_house_yield)
+            columns[u"units"].append(recipe.units)
+            columns[u"yeast_name"].append(recipe.yeast.name)
+            columns[u"percent_attenuation"].append(recipe.yeast.percent_attenuation)
+            for grain_add in recipe.grain_additions:
+                columns[u"grain_name"].append(grain_add.grain.name)
+                columns[u"color"].append(grain_add.grain.color)
+                columns[u"ppg"].append(grain_add.grain.ppg)
+                columns[u"hwe"].append(grain_add.grain.hwe)
+                columns[u"grain_weight"].append(grain_add.weight)
+                columns[u"grain_type"].append(grain_add.grain_type)
+            for hop_add in recipe.hop_additions:
+                columns[u"hop_name"].append(hop_add.hop.name)
+                columns[u"percent_alpha_acids"].append(hop_add.hop.percent_alpha_acids)
+                columns[u"hop_weight"].append(hop_add.weight)
+                columns[u"boil_time"].append(hop_add.boil_time)
+                columns[u"hop_type"].append(hop_add.hop_type)
+                columns[u"utilization"].append(hop_add.utilization)
+                columns[u"utilization_cls_kwargs"].append(
+                    hop_add.utilization_cls_kwargs
+                )
+            grain_offsets.append(len(columns[u"grain_name"]))
+            hop_offsets.append(len(columns[u"hop_name"]))
+        return cls(columns, grain_offsets, hop_offsets)
+
+    @classmethod
+    def from_dicts(cls, recipes, loader, **kwargs):
+        """
+        Build a frame from python Dicts in the format of parse_recipe
+
+        :param iterable recipes: Representations of recipes
+        :param DataLoader loader: A class to load additional information
+        :param kwargs: Other arguments to :meth:`brew.parsers.parse_recipe`
+        :return: The frame
+        :rtype: RecipeFrame
+
+        Each ingredient is looked up with the loader only once.
+        """
+        loader = MemoizedLoader(loader)
+        for key in [u"cereals_loader", u"hops_loader", u"yeast_loader"]:
+            if kwargs.get(key) is not None:
+                kwargs[key] = MemoizedLoader(kwargs[key])
+        return cls.from_recipes(
+            parse_recipe(recipe, loader, **kwargs) for recipe in recipes
+        )
+
+    def get_recipe(self, index):
+        """
+        Build the Recipe at an index
+
+        :param int index: The index of the recipe
+        :return: The recipe
+        :rtype: Recipe
+        """
+        c = self.columns
+        units = c[u"units"][index]
+        grain_additions = []
+        for i in range(self.grain_offsets[index], self.grain_offsets[index + 1]):
+            grain = Grain(c[u"grain_name"][i], color=c[u"color"][i], ppg=c[u"ppg"][i])
+            grain_additions.append(
+                GrainAddition(
+                    grain,
+                    weight=float(c[u"grain_weight"][i]),
+                    grain_type=c[u"grain_type"][i],
+                    units=units,
+                )
+            )
+        hop_additions = []
+        for i in range(self.hop_offsets[index], self.hop_offsets[index + 1]):
+            hop = Hop(
+                c[u"hop_name"][i],
+                percent_alpha_acids=float(c[u"percent_alpha_acids"][i]),
+            )
+            hop_additions.append(
+                HopAddition(
+                    hop,
+                    weight=float(c[u"hop_weight"][i]),
+                    boil_time=float(c[u"boil_time"][i]),
+                    hop_type=c[u"hop_type"][i],
+                    utilization_cls=type(c[u"utilization"][i]),
+                    utilization_cls_kwargs=c[u"utilization_cls_kwargs"][i],
+                    units=units,
+                )
+            )
+        yeast = Yeast(
+            c[u"yeast_name"][index],
+            percent_attenuation=float(c[u"percent_attenuation"][index]),
+        )
+        return Recipe(
+            c[u"name"][index],
+            grain_additions=grain_additions,
+            hop_additions=hop_additions,
+            yeast=yeast,
+            brew_house_yield=float(c[u"brew_house_yield"][index]),
+            start_volume=float(c[u"start_volume"][index]),
+            final_volume=float(c[u"final_volume"][index]),
+            units=units,
+        )
+
+    def to_recipes(self):
+        """
+        Build every Recipe in the frame
+
+        :return: The recipes
+        :rtype: generator
+        """
+        for index in range(len(self)):
+            yield self.get_recipe(index)
+
+    def _get_recipe_index(self, offsets):
+        """
+        Get the index of the recipe of each addition
+
+        :param numpy.ndarray offsets: The addition offsets
+        :return: The recipe index of each addition
+        :rtype: numpy.ndarray
+        """
+        np = get_numpy()
+        return np.repeat(np.arange(len(self)), np.diff(offsets))
+
+    def _sum_by_recipe(self, recipe_index, values):
+        np = get_numpy()
+        return np.bincount(recipe_index, weights=values, minlength=len(self))
+
+    def get_metrics(self, evaporation=BOIL_EVAPORATION):
+        """
+        Get the metrics of every recipe
+
+        :param float evaporation: Percent water evaporation during boil
+        :return: Arrays of recipe, grain and hop metrics by name
+        :rtype: dict
+
+        The recipe metrics have one value per recipe and the grain and hop
+        metrics one value per addition.  Colors outside the range of a model
+        are masked.
+        """
+        if self._metrics is not None and self._metrics[0] == evaporation:
+            return self._metrics[1]
+        np = get_numpy()
+        c = self.columns
+        with np.errstate(divide=u"ignore", invalid=u"ignore"):
+            metrics = self._get_metrics(np, c, evaporation)
+        self._metrics = (evaporation, metrics)
+        return metrics
+
+    def _get_metrics(self, np, c, evaporation):
+        grain_recipe = self._get_recipe_index(self.grain_offsets)
+        hop_recipe = self._get_recipe_index(self.hop_offsets)
+        units = c[u"units"]
+        grain_units = units[grain_recipe]
+        grain_type = c[u"grain_type"]
+        weight = c[u"grain_weight"]
+        bhy = c[u"brew_house_yield"]
+        final_volume = c[u"final_volume"]
+
+        # Gravity, the same as Recipe.get_total_points
+        extract = (grain_type == GRAIN_TYPE_DME) | (grain_type == GRAIN_TYPE_LME)
+        gu = np.where(grain_units == SI_UNITS, c[u"hwe"], c[u"ppg"]) * weight
+        efficiency = np.where(extract, 1.0, bhy[grain_recipe])
+        total_points = self._sum_by_recipe(grain_recipe, gu * efficiency)
+        og_gu = total_points / final_volume
+        bg_gu = total_points / ((1.0 - evaporation) * c[u"start_volume"])
+        fg_gu = og_gu * (1.0 - c[u"percent_attenuation"])
+        og = gu_to_sg(og_gu)
+        bg = gu_to_sg(bg_gu)
+        fg = gu_to_sg(fg_gu)
+        abv_standard = alcohol_by_volume_standard(og, fg)
+        abv_alternative = alcohol_by_volume_alternative(og, fg)
+
+        # Weights, the same as GrainAddition.get_dme_weight and get_cereal_weight
+        dry_weight = np.where(
+            grain_type == GRAIN_TYPE_DME, weight, weight * c[u"ppg"] / PPG_DME
+        )
+        cereal_weight = np.where(
+            grain_type == GRAIN_TYPE_CEREAL, weight, weight * c[u"ppg"] / PPG_CEREAL
+        )
+        total_dry_weight = self._sum_by_recipe(grain_recipe, dry_weight)
+        total_grain_weight = self._sum_by_recipe(grain_recipe, cereal_weight)
+
+        # Color
+        mcu = np.empty(len(weight))
+        for unit in [IMPERIAL_UNITS, SI_UNITS]:
+            selected = grain_units == unit
+            mcu[selected] = calculate_mcu_array(
+                cereal_weight[selected],
+                c[u"color"][selected],
+                final_volume[grain_recipe][selected],
+                units=unit,
+            )
+        total_mcu = self._sum_by_recipe(grain_recipe, mcu)
+        srm_models = calculate_srm_models_array(total_mcu)
+
+        # Bitterness, grouped by utilization class and units
+        utilization = c[u"utilization"]
+        boil_time = c[u"boil_time"]
+        hop_bg = bg[hop_recipe]
+        ibus = np.zeros(len(boil_time))
+        hop_utilization = np.zeros(len(boil_time))
+        keys = [(type(util), util.units) for util in utilization]
+        for utilization_cls, unit in set(keys):
+            selected = np.array(
+                [key == (utilization_cls, unit) for key in keys], dtype=bool
+            )
+            ibus[selected] = utilization_cls.get_ibus_array(
+                c[u"hop_weight"][selected],
+                c[u"percent_alpha_acids"][selected],
+                boil_time[selected],
+                c[u"hop_type"][selected],
+                hop_bg[selected],
+                final_volume[hop_recipe][selected],
+                units=unit,
+            )
+            hop_utilization[selected] = utilization_cls.get_percent_utilization_array(
+                hop_bg[selected], boil_time[selected]
+            )
+        # Utilization is 10% higher for pellet vs whole/plug
+        hop_utilization = np.where(
+            c[u"hop_type"] == HOP_TYPE_PELLET,
+            hop_utilization * HOP_UTILIZATION_SCALE_PELLET,
+            hop_utilization,
+        )
+        total_ibu = self._sum_by_recipe(hop_recipe, ibus)
+
+        return {
+            u"original_gravity": og,
+            u"boil_gravity": bg,
+            u"final_gravity": fg,
+            u"abv_standard": abv_standard,
+            u"abv_alternative": abv_alternative,
+            u"abw_standard": alcohol_by_weight(abv_standard),
+            u"abw_alternative": alcohol_by_weight(abv_alternative),
+            u"total_ibu": total_ibu,
+            u"bu_to_gu": total_ibu / bg_gu,
+            u"total_dry_weight": total_dry_weight,
+            u"total_grain_weight": total_grain_weight,
+            u"total_mcu": total_mcu,
+            u"srm_morey": srm_models[u"morey"],
+            u"srm_daniels": srm_models[u"daniels"],
+            u"srm_mosher": srm_models[u"mosher"],
+            u"dry_weight": dry_weight,
+            u"cereal_weight": cereal_weight,
+            u"mcu": mcu,
+            u"wort_color_srm": calculate_srm_array(mcu),
+            u"working_yield": hwe_to_basis(c[u"hwe"]) * bhy[grain_recipe],
+            u"percent_malt_bill": dry_weight / total_dry_weight[grain_recipe],
+            u"ibus": ibus,
+            u"utilization": hop_utilization,
+        }
+
+    def to_dict(self, index, evaporation=BOIL_EVAPORATION):
+        """
+        Get the recipe at an index in the format of Recipe.to_dict
+
+        :param int index: The index of the recipe
+        :param float evaporation: Percent water evaporation during boil
+        :return: The recipe
+        :rtype: dict
+        :raises ColorException: If the color of a grain addition is above SRM 50.0
+        """  # noqa
+        c = self.columns
+        m = self.get_metrics(evaporation=evaporation)
+        units = c[u"units"][index]
+
+        color_map = {u"srm": {}, u"ebc": {}}
+        for model in [u"morey", u"daniels", u"mosher"]:
+            srm = m[u"srm_{}".format(model)][index]
+            if srm is get_numpy().ma.masked:
+                color_map[u"srm"][model] = u"N/A"
+                color_map[u"ebc"][model] = u"N/A"
+            else:
+                color_map[u"srm"][model] = round(float(srm), 1)
+                color_map[u"ebc"][model] = round(srm_to_ebc(float(srm)), 1)
+
+        recipe_dict = {
+            u"name": c[u"name"][index],
+            u"start_volume": round(float(c[u"start_volume"][index]), 2),
+            u"final_volume": round(float(c[u"final_volume"][index]), 2),
+            u"data": {
+                u"brew_house_yield": round(float(c[u"brew_house_yield"][index]), 3),
+                u"units": units,
+                u"total_wort_color_map": color_map,
+            },
+            u"grains": [],
+            u"hops": [],
+            u"yeast": {
+                u"name": c[u"yeast_name"][index],
+                u"data": {
+                    u"percent_attenuation": float(c[u"percent_attenuation"][index])
+                },
+            },
+        }
+        for key, places in [
+            (u"original_gravity", 3),
+            (u"boil_gravity", 3),
+            (u"final_gravity", 3),
+            (u"abv_standard", 4),
+            (u"abv_alternative", 4),
+            (u"abw_standard", 4),
+            (u"abw_alternative", 4),
+            (u"total_ibu", 1),
+            (u"bu_to_gu", 1),
+        ]:
+            recipe_dict[u"data"][key] = round(float(m[key][index]), places)
+
+        for i in range(self.grain_offsets[index], self.grain_offsets[index + 1]):
+            wort_color_srm = m[u"wort_color_srm"][i]
+            if wort_color_srm is get_numpy().ma.masked:
+                raise ColorException(u"Morey equation does not work above SRM 50.0")
+            wort_color_srm = float(wort_color_srm)
+            recipe_dict[u"grains"].append(
+                {
+                    u"name": c[u"grain_name"][i],
+                    u"data": {
+                        u"color": round(float(c[u"color"][i]), 1),
+                        u"ppg": round(float(c[u"ppg"][i]), 2),
+                        u"hwe": round(float(c[u"hwe"][i]), 2),
+                        u"working_yield": round(float(m[u"working_yield"][i]), 3),
+                        u"percent_malt_bill": round(
+                            float(m[u"percent_malt_bill"][i]), 3
+                        ),
+                        u"wort_color_srm": round(wort_color_srm, 1),
+                        u"wort_color_ebc": round(srm_to_ebc(wort_color_srm), 1),
+                    },
+                    u"weight": round(float(c[u"grain_weight"][i]), 2),
+                    u"grain_type": c[u"grain_type"][i],
+                    u"units": units,
+                }
+            )
+        for i in range(self.hop_offsets[index], self.hop_offsets[index + 1]):
+            recipe_dict[u"hops"].append(
+                {
+                    u"name": c[u"hop_name"][i],
+                    u"data": {
+                        u"percent_alpha_acids": round(
+                            float(c[u"percent_alpha_acids"][i]), 3
+                        ),
+                        u"ibus": round(float(m[u"ibus"][i]), 1),
+                        u"utilization": round(float(m[u"utilization"][i]), 3),
+                    },
+                    u"weight": round(float(c[u"hop_weight"][i]), 2),
+                    u"boil_time": round(float(c[u"boil_time"][i]), 1),
+                    u"hop_type": c[u"hop_type"][i],
+                    u"utilization_cls": str(c[u"utilization"][i]),
+                    u"utilization_cls_kwargs": c[u"utilization_cls_kwargs"][i],
+                    u"units": units,
+                }
+            )
+        return recipe_dict
+
+    def to_dicts(self, evaporation=BOIL_EVAPORATION):
+        """
+        Get every recipe in the format of Recipe.to_dict
+
+        :param float evaporation: Percent water evaporation during boil
+        :return: The recipes
+        :rtype: generator
+        """
+        for index in range(len(self)):
+            yield self.to_dict(index, evaporation=evaporation)
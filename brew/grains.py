@@ -20,6 +20,7 @@ from .exceptions import GrainException
 from .utilities.malt import hwe_to_basis
 from .utilities.malt import hwe_to_ppg
 from .utilities.malt import ppg_to_hwe
+from .utilities.versions import Versioned
 from .validators import validate_optional_fields
 from .validators import validate_percentage
 from .validators import validate_required_fields
@@ -28,11 +29,13 @@ from .validators import validate_units
 __all__ = [u"Grain", u"GrainAddition"]
 
 
-class Grain(object):
+class Grain(Versioned):
     """
     A representation of a type of grain.
     """
 
+    __slots__ = (u"name", u"color", u"ppg", u"hwe")
+
     def __init__(self, name, color=None, ppg=None, hwe=None):
         """
         :param str name: The name of the grain
@@ -140,11 +143,13 @@ class Grain(object):
         return Grain(self.name, color=self.color, ppg=ppg)
 
 
-class GrainAddition(object):
+class GrainAddition(Versioned):
     """
     A representation of the grain as added to a Recipe.
     """
 
+    __slots__ = (u"grain", u"weight", u"grain_type", u"units", u"types")
+
     def __init__(
         self, grain, weight=None, grain_type=GRAIN_TYPE_CEREAL, units=IMPERIAL_UNITS
     ):
@@ -13,6 +13,7 @@ from .constants import SI_UNITS
 from .constants import WEIGHT_TOLERANCE
 from .exceptions import HopException
 from .utilities.hops import HopsUtilizationGlennTinseth
+from .utilities.versions import Versioned
 from .validators import validate_hop_type
 from .validators import validate_optional_fields
 from .validators import validate_percentage
@@ -22,11 +23,13 @@ from .validators import validate_units
 __all__ = [u"Hop", u"HopAddition"]
 
 
-class Hop(object):
+class Hop(Versioned):
     """
     A representation of a type of Hop.
     """
 
+    __slots__ = (u"name", u"percent_alpha_acids")
+
     def __init__(self, name, percent_alpha_acids=None):
         """
         :param str name: The name of the hop
@@ -91,11 +94,26 @@ class Hop(object):
         return msg
 
 
-class HopAddition(object):
+class HopAddition(Versioned):
     """
     A representation of the Hop as added to a Recipe.
+
+    Hop additions with the same utilization class and kwargs share one
+    utilization object, see :meth:`HopsUtilization.get_shared`.  The
+    utilization_cls attribute gives a copy of it bound to the hop addition.
     """
 
+    __slots__ = (
+        u"hop",
+        u"weight",
+        u"boil_time",
+        u"hop_type",
+        u"utilization_cls_kwargs",
+        u"utilization",
+        u"units",
+        u"types",
+    )
+
     def __init__(
         self,
         hop,
@@ -120,13 +138,25 @@ class HopAddition(object):
         self.boil_time = boil_time
         self.hop_type = validate_hop_type(hop_type)
         self.utilization_cls_kwargs = utilization_cls_kwargs or {}
-        self.utilization_cls = utilization_cls(
-            self, **self.utilization_cls_kwargs
-        )  # noqa
+        self.utilization = utilization_cls.get_shared(**self.utilization_cls_kwargs)
 
         # Manage units
         self.set_units(units)
 
+    @property
+    def utilization_cls(self):
+        """
+        The utilization object bound to this hop addition
+
+        :return: A copy of the shared utilization object
+        :rtype: HopsUtilization
+        """
+        return self.utilization.bind(self)
+
+    @utilization_cls.setter
+    def utilization_cls(self, utilization):
+        self.utilization = utilization
+
     def set_units(self, units):
         """
         Set the units and unit types
@@ -183,9 +213,9 @@ class HopAddition(object):
             out = u"{0}, boil_time={1}".format(out, self.boil_time)
         if self.hop_type:
             out = u"{0}, hop_type='{1}'".format(out, self.hop_type)
-        if self.utilization_cls:
+        if self.utilization:
             out = u"{0}, utilization_cls={1}".format(
-                out, type(self.utilization_cls).__name__
+                out, type(self.utilization).__name__
             )  # noqa
         if self.utilization_cls_kwargs:
             out = u"{0}, utilization_cls_kwargs={1}".format(
@@ -219,7 +249,7 @@ class HopAddition(object):
             u"weight": round(self.weight, 2),
             u"boil_time": round(self.boil_time, 1),
             u"hop_type": self.hop_type,
-            u"utilization_cls": str(self.utilization_cls),
+            u"utilization_cls": str(self.utilization),
             u"utilization_cls_kwargs": self.utilization_cls_kwargs,
             u"units": self.units,
         }
@@ -264,7 +294,7 @@ class HopAddition(object):
         :return: The IBUs of the wort
         :rtype: float
         """
-        return self.utilization_cls.get_ibus(sg, final_volume)
+        return self.utilization.get_ibus(sg, final_volume, hop_addition=self)
 
     def get_alpha_acid_units(self):
         """
@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in call counts and latency for the public entry points of brew.
+
+Nothing is recorded until :meth:`enable` is called.  Enabling replaces the
+public functions and methods of the instrumented modules with wrappers that
+time each call, and :meth:`disable` puts the original objects back, so when
+instrumentation is off there is no overhead at all.
+
+Each call is added to in-process totals, read with :meth:`get_stats`, and
+passed to every sink.  A sink receives each call with :meth:`Sink.emit` and
+the totals with :meth:`Sink.flush` when :meth:`flush` is called.
+
+Times are inclusive, so a call to :meth:`brew.parsers.parse_recipe` also
+counts the time spent in the loader and in the recipe classes.  Generator
+functions count the time spent producing items, not the time the caller
+spends between items.  Worker processes started while instrumentation is
+enabled keep their own totals.
+"""
+import functools
+import importlib
+import inspect
+import os
+import socket
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from timeit import default_timer
+
+__all__ = [
+    u"INSTRUMENTED_MODULES",
+    u"Sink",
+    u"CallbackSink",
+    u"PrometheusFileSink",
+    u"StatsdSink",
+    u"enable",
+    u"disable",
+    u"is_enabled",
+    u"instrumented",
+    u"get_stats",
+    u"reset_stats",
+    u"flush",
+]
+
+#: The modules whose public functions and methods are instrumented
+INSTRUMENTED_MODULES = (
+    u"brew.recipes",
+    u"brew.parsers",
+    u"brew.styles",
+    u"brew.utilities.abv",
+    u"brew.utilities.arrays",
+    u"brew.utilities.color",
+    u"brew.utilities.dilution",
+    u"brew.utilities.efficiency",
+    u"brew.utilities.hops",
+    u"brew.utilities.malt",
+    u"brew.utilities.sugar",
+    u"brew.utilities.temperature",
+    u"brew.utilities.yeast",
+)
+
+_LOCK = threading.Lock()
+#: Call count and total seconds by function name
+_STATS = {}
+#: The sinks receiving each call
+_SINKS = ()
+#: The replaced attributes as (owner, name, original)
+_PATCHES = []
+
+
+class Sink(object):
+    """
+    Base class for receiving instrumentation data.
+    """
+
+    def emit(self, name, seconds):
+        """
+        Receive one call
+
+        :param str name: The full name of the function
+        :param float seconds: The time the call took
+        """
+        pass
+
+    def flush(self, stats):
+        """
+        Receive the totals
+
+        :param dict stats: The totals from :meth:`get_stats`
+        """
+        pass
+
+
+class CallbackSink(Sink):
+    """
+    Call a function with the name and time of each call.
+    """
+
+    def __init__(self, callback):
+        """
+        :param callback: Called with the function name and the time in seconds
+        """  # noqa
+        self.callback = callback
+
+    def emit(self, name, seconds):
+        self.callback(name, seconds)
+
+
+class PrometheusFileSink(Sink):
+    """
+    Write the totals to a file in the Prometheus text format.
+
+    The file can be read by the node exporter textfile collector.  It is
+    replaced atomically on each flush.
+    """
+
+    def __init__(self, filename, prefix=u"brew"):
+        """
+        :param str filename: The file to write
+        :param str prefix: The prefix of the metric names
+        """
+        self.filename = filename
+        self.prefix = prefix
+
+    @classmethod
+    def format_label(cls, value):
+        """
+        Escape a label value
+
+        :param str value: The label value
+        :return: The escaped value
+        :rtype: str
+        """
+        return (
+            value.replace(u"\\", u"\\\\").replace(u'"', u'\\"').replace(u"\n", u"\\n")
+        )
+
+    def format(self, stats):
+        """
+        Format the totals
+
+        :param dict stats: The totals from :meth:`get_stats`
+        :return: The totals in the Prometheus text format
+        :rtype: str
+        """
+        metrics = [
+            (u"calls_total", u"count", u"Number of calls"),
+            (u"call_seconds_total", u"seconds", u"Total time of calls in seconds"),
+        ]
+        lines = []
+        for suffix, key, description in metrics:
+            metric = u"{}_{}".format(self.prefix, suffix)
+            lines.append(u"# HELP {} {}".format(metric, description))
+            lines.append(u"# TYPE {} counter".format(metric))
+            for name in sorted(stats):
+                lines.append(
+                    u'{}{{function="{}"}} {!r}'.format(
+                        metric, self.format_label(name), stats[name][key]
+                    )
+                )
+        return u"\n".join(lines) + u"\n"
+
+    def flush(self, stats):
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, path = tempfile.mkstemp(dir=directory, suffix=u".tmp")
+        try:
+            with os.fdopen(fd, u"w") as f:
+                f.write(self.format(stats))
+            os.rename(path, self.filename)
+        except Exception:
+            os.remove(path)
+            raise
+
+
+class StatsdSink(Sink):
+    """
+    Send each call as a statsd timer over UDP.
+
+    Sending is best effort, errors from the socket are ignored.
+    """
+
+    def __init__(self, host=u"127.0.0.1", port=8125, prefix=u"brew"):
+        """
+        :param str host: The statsd host
+        :param int port: The statsd port
+        :param str prefix: The prefix of the metric names
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format(self, name, seconds):
+        """
+        Format one call
+
+        :param str name: The full name of the function
+        :param float seconds: The time the call took
+        :return: The call as a statsd timer line
+        :rtype: str
+        """
+        return u"{}.{}:{:.6f}|ms".format(self.prefix, name, seconds * 1000.0)
+
+    def emit(self, name, seconds):
+        line = self.format(name, seconds)
+        try:
+            self.socket.sendto(line.encode(u"utf-8"), self.address)
+        except (IOError, OSError):
+            pass
+
+    def close(self):
+        self.socket.close()
+
+
+def _record(name, seconds):
+    with _LOCK:
+        stat = _STATS.get(name)
+        if stat is None:
+            _STATS[name] = [1, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+    for sink in _SINKS:
+        sink.emit(name, seconds)
+
+
+def _wrap(name, func):
+    """
+    Wrap a function so each call is recorded under name
+    """
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            generator = func(*args, **kwargs)
+            elapsed = 0.0
+            try:
+                while True:
+                    start = default_timer()
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += default_timer() - start
+                    yield item
+            finally:
+                generator.close()
+                _record(name, elapsed)
+
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = default_timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, default_timer() - start)
+
+    return wrapper
+
+
+def _patch(owner, attr, value):
+    # Use the attribute itself rather than the bound classmethod
+    _PATCHES.append((owner, attr, vars(owner)[attr]))
+    setattr(owner, attr, value)
+
+
+def _patch_class(cls, prefix):
+    for attr, value in sorted(vars(cls).items()):
+        if attr.startswith(u"_"):
+            continue
+        name = u"{}.{}".format(prefix, attr)
+        if isinstance(value, (classmethod, staticmethod)):
+            _patch(cls, attr, type(value)(_wrap(name, value.__func__)))
+        elif inspect.isfunction(value):
+            _patch(cls, attr, _wrap(name, value))
+
+
+def _patch_modules(modules):
+    wrappers = {}
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        for attr, value in sorted(vars(module).items()):
+            if attr.startswith(u"_"):
+                continue
+            if getattr(value, u"__module__", None) != module_name:
+                continue
+            name = u"{}.{}".format(module_name, attr)
+            if inspect.isclass(value):
+                _patch_class(value, name)
+            elif inspect.isfunction(value):
+                wrapper = _wrap(name, value)
+                wrappers[id(value)] = (value, wrapper)
+                _patch(module, attr, wrapper)
+    # Replace the functions imported by name into other modules
+    for module_name, module in sorted(sys.modules.items()):
+        if module is None or not module_name.startswith(u"brew"):
+            continue
+        for attr, value in sorted(vars(module).items()):
+            original, wrapper = wrappers.get(id(value), (None, None))
+            if original is value:
+                _patch(module, attr, wrapper)
+
+
+def _restore():
+    while _PATCHES:
+        owner, attr, original = _PATCHES.pop()
+        setattr(owner, attr, original)
+
+
+def enable(sinks=None, modules=INSTRUMENTED_MODULES):
+    """
+    Start recording calls
+
+    :param list sinks: The sinks receiving each call (optional)
+    :param list modules: The names of the modules to instrument
+    :raises RuntimeError: If instrumentation is already enabled
+
+    Functions and classes defined in each module are instrumented unless
+    their name starts with an underscore.  Functions imported by name into
+    other brew modules are replaced there too.
+    """
+    global _SINKS
+    with _LOCK:
+        if _PATCHES:
+            raise RuntimeError(u"Instrumentation is already enabled")
+        try:
+            _patch_modules(modules)
+        except Exception:
+            _restore()
+            raise
+        _SINKS = tuple(sinks or ())
+
+
+def disable():
+    """
+    Stop recording calls and restore the original functions
+
+    The totals are kept until :meth:`reset_stats` is called.
+    """
+    global _SINKS
+    with _LOCK:
+        _restore()
+        _SINKS = ()
+
+
+def is_enabled():
+    """
+    :return: True if calls are being recorded
+    :rtype: bool
+    """
+    return bool(_PATCHES)
+
+
+@contextmanager
+def instrumented(sinks=None, modules=INSTRUMENTED_MODULES):
+    """
+    Record calls inside a with block
+
+    :param list sinks: The sinks receiving each call (optional)
+    :param list modules: The names of the modules to instrument
+
+    The sinks are flushed when the block exits.
+    """
+    enable(sinks=sinks, modules=modules)
+    try:
+        yield
+    finally:
+        sinks = _SINKS
+        disable()
+        flush(sinks=sinks)
+
+
+def get_stats():
+    """
+    Get the totals for each function called
+
+    :return: The call count and total seconds by function name
+    :rtype: dict
+    """
+    with _LOCK:
+        return dict(
+            (name, {u"count": count, u"seconds": seconds})
+            for name, (count, seconds) in _STATS.items()
+        )
+
+
+def reset_stats():
+    """
+    Clear the totals
+    """
+    with _LOCK:
+        _STATS.clear()
+
+
+def flush(sinks=None):
+    """
+    Send the totals to the sinks
+
+    :param list sinks: The sinks to flush (default: the enabled sinks)
+    """
+    if sinks is None:
+        sinks = _SINKS
+    stats = get_stats()
+    for sink in sinks:
+        sink.flush(stats)
@@ -1,46 +1,124 @@
 # -*- coding: utf-8 -*-
 import glob
 import json
+import mmap
+import multiprocessing
 import os
+import sqlite3
+import time
 import warnings
+from collections import deque
+from collections import namedtuple
+from collections import OrderedDict
 
+from .exceptions import BrewdayException
 from .exceptions import DataLoaderException
 from .grains import Grain
 from .grains import GrainAddition
 from .hops import Hop
 from .hops import HopAddition
 from .recipes import Recipe
+from .utilities.batch import get_file_stamp
+from .utilities.batch import iter_chunks
 from .yeasts import Yeast
 
 __all__ = [
     u"DataLoader",
     u"JSONDataLoader",
+    u"PackedDataLoader",
+    u"MemoizedLoader",
+    u"ParseResult",
     u"parse_cereals",
     u"parse_hops",
     u"parse_yeast",
     u"parse_recipe",
+    u"parse_recipes",
 ]
 
+#: The result of parsing one record with parse_recipes
+ParseResult = namedtuple(u"ParseResult", [u"index", u"recipe", u"error"])
+
+#: Errors in a record which are reported instead of raised by parse_recipes
+PARSE_ERRORS = (BrewdayException, KeyError, TypeError, ValueError)
+
+#: The number of items kept by a MemoizedLoader over an unbounded loader
+MEMOIZED_MAX_ENTRIES = 10000
+
 
 class DataLoader(object):
     """
     Base class for loading data from data files inside the data_dir.
+
+    Loaded items are cached per loader instance by file path.  Each cached
+    item is checked against the file's modification time and size so that
+    changes on disk are picked up.
+
+    An optional index file can be built with :meth:`build_index`.  It is a
+    SQLite database holding the data for every item in the data_dir so that
+    a new process can resolve items without listing directories or reading
+    the individual data files.  Entries in the index that no longer match
+    the file on disk are ignored and the file is read instead.
+
+    The item cache can be bounded by a number of entries, a number of bytes
+    or both.  The size of an item is the size of its data file.  When the
+    cache is over either limit the least recently used items are evicted.
+
+    The item cache is checked before the index file or the directory.  A
+    cached item's file is only checked again once stamp_ttl seconds have
+    passed since it was last checked, by default on every lookup.
     """
 
-    #: A local cache of loaded data
-    DATA = {}
     #: The expected file extension (json, xml, csv)
     EXT = ""
 
-    def __init__(self, data_dir):
+    def __init__(
+        self,
+        data_dir,
+        index_file=None,
+        max_entries=None,
+        max_bytes=None,
+        stamp_ttl=0.0,
+    ):
         """
         :param str data_dir: The directory where the data resides
-        """
+        :param str index_file: An index file built by build_index (optional)
+        :param int max_entries: The maximum number of cached items (optional)
+        :param int max_bytes: The maximum size of cached items in bytes (optional)
+        :param float stamp_ttl: Seconds before a cached item's file is checked again (optional)
+        """  # noqa
         if not os.path.isdir(data_dir):
             raise DataLoaderException(
                 u"Directory '{}' does not exist".format(data_dir)
             )  # noqa
         self.data_dir = data_dir
+        self.index_file = index_file
+        self._index_conn = None
+        self._init_cache(max_entries, max_bytes, stamp_ttl)
+
+    def _init_cache(self, max_entries=None, max_bytes=None, stamp_ttl=0.0):
+        """
+        Set up the item cache
+
+        :param int max_entries: The maximum number of cached items
+        :param int max_bytes: The maximum size of cached items in bytes
+        :param float stamp_ttl: Seconds before a cached item's file is checked again
+        """  # noqa
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stamp_ttl = stamp_ttl
+        #: Item data by key as (stamp, data, filename, checked) in least
+        #: recently used order
+        self._items = OrderedDict()
+        self._items_bytes = 0
+        self._cache_stats = {u"hits": 0, u"misses": 0, u"evictions": 0}
+        #: Item filenames by item directory as (stamp, {name: filename})
+        self._listings = {}
+
+    def __getstate__(self):
+        # The index connection cannot be shared with another process
+        state = self.__dict__.copy()
+        state[u"_index_conn"] = None
+        return state
 
     @classmethod
     def format_name(cls, name):
@@ -57,6 +135,222 @@ class DataLoader(object):
         """
         raise NotImplementedError
 
+    @classmethod
+    def get_stamp(cls, filename):
+        """
+        Get the modification time and size of a file
+
+        :param str filename: The filename of the file
+        :return: The modification time and size or None if it does not exist
+        :rtype: tuple
+        """
+        return get_file_stamp(filename)
+
+    def clear_cache(self):
+        """
+        Clear the cached items and directory listings
+        """
+        self._items = OrderedDict()
+        self._items_bytes = 0
+        self._listings = {}
+
+    def get_cache_stats(self):
+        """
+        Get statistics about the item cache
+
+        :return: The cache hits, misses, evictions, entries and bytes
+        :rtype: dict
+        """
+        stats = dict(self._cache_stats)
+        stats[u"entries"] = len(self._items)
+        stats[u"bytes"] = self._items_bytes
+        return stats
+
+    def reset_cache_stats(self):
+        """
+        Reset the statistics about the item cache
+        """
+        self._cache_stats = {u"hits": 0, u"misses": 0, u"evictions": 0}
+
+    @classmethod
+    def _get_item_bytes(cls, stamp):
+        if stamp is None:
+            return 0
+        return stamp[1]
+
+    def _get_cached_item(self, key, stamp=None):
+        """
+        Get an item from the cache if it matches the stamp
+
+        :param key: The cache key of the item
+        :param tuple stamp: The stamp to match (default: the stamp of the item's file once stamp_ttl has passed)
+        :return: The cached (stamp, data, filename, checked) or None
+        :rtype: tuple
+        """  # noqa
+        cached = self._items.pop(key, None)
+        if cached is None:
+            self._cache_stats[u"misses"] += 1
+            return None
+        if stamp is None:
+            now = time.time()
+            if now - cached[3] < self.stamp_ttl:
+                stamp = cached[0]
+            else:
+                stamp = self.get_stamp(cached[2])
+                cached = cached[:3] + (now,)
+        if cached[0] != stamp:
+            self._items_bytes -= self._get_item_bytes(cached[0])
+            self._cache_stats[u"misses"] += 1
+            return None
+        # Re-insert to mark the item as most recently used
+        self._items[key] = cached
+        self._cache_stats[u"hits"] += 1
+        return cached
+
+    def _is_over_limit(self):
+        if self.max_entries is not None and len(self._items) > self.max_entries:
+            return True
+        if self.max_bytes is not None and self._items_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _set_cached_item(self, key, stamp, data, item_filename=None):
+        """
+        Add an item to the cache and evict items over the limits
+
+        :param key: The cache key of the item
+        :param tuple stamp: The modification time and size of the file
+        :param data: The item data
+        :param str item_filename: The filename of the item (optional)
+        """
+        self._items[key] = (stamp, data, item_filename, time.time())
+        self._items_bytes += self._get_item_bytes(stamp)
+        while self._items and self._is_over_limit():
+            _, evicted = self._items.popitem(last=False)
+            self._items_bytes -= self._get_item_bytes(evicted[0])
+            self._cache_stats[u"evictions"] += 1
+
+    def _get_listing(self, item_dir):
+        """
+        Get the item filenames in a directory
+
+        :param str item_dir: The item directory
+        :return: The item filenames by name
+        :rtype: dict
+        """
+        stamp = self.get_stamp(item_dir)
+        cached = self._listings.get(item_dir)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        listing = {}
+        ext_len = len(self.EXT) + 1
+        for item in glob.glob("{}*.{}".format(item_dir, self.EXT)):
+            filename = os.path.basename(item)[:-ext_len]
+            listing[filename] = os.path.join(
+                item_dir, "{}.{}".format(filename, self.EXT)
+            )  # noqa
+        self._listings[item_dir] = (stamp, listing)
+        return listing
+
+    def _get_index(self):
+        """
+        Get a connection to the index file
+
+        :return: The connection or None if there is no index
+        :rtype: sqlite3.Connection
+        """
+        if self._index_conn is None and self.index_file:
+            if os.path.exists(self.index_file):
+                self._index_conn = sqlite3.connect(self.index_file)
+        return self._index_conn
+
+    def _get_index_item(self, dir_suffix, name):
+        """
+        Get an item from the index file if it matches the file on disk
+
+        :param str dir_suffix: The directory name suffix
+        :param str name: The formatted name of the item
+        :return: The filename, stamp and data or None if not indexed
+        :rtype: tuple
+        """
+        conn = self._get_index()
+        if conn is None:
+            return None
+        row = conn.execute(
+            u"SELECT path, mtime, size, data FROM items "
+            u"WHERE dir = ? AND name = ?",
+            (os.path.normpath(dir_suffix), name),
+        ).fetchone()
+        if row is None:
+            return None
+        item_filename = os.path.join(self.data_dir, row[0])
+        stamp = self.get_stamp(item_filename)
+        if stamp != (row[1], row[2]):
+            return None
+        return item_filename, stamp, json.loads(row[3])
+
+    def iter_data_files(self):
+        """
+        Iterate over the data files in each directory of the data_dir
+
+        :return: The directory name, item name and filename of each data file
+        :rtype: generator
+        """
+        ext_len = len(self.EXT) + 1
+        for dir_name in sorted(os.listdir(self.data_dir)):
+            item_dir = os.path.join(self.data_dir, dir_name)
+            if not os.path.isdir(item_dir):
+                continue
+            pattern = os.path.join(item_dir, "*.{}".format(self.EXT))
+            for item in sorted(glob.glob(pattern)):
+                yield dir_name, os.path.basename(item)[:-ext_len], item
+
+    def build_index(self, index_file=None):
+        """
+        Build an index file of all the items in the data_dir
+
+        :param str index_file: The index file to write (default: the loader's index_file)
+        :return: The number of items in the index
+        :rtype: int
+        :raises DataLoaderException: If no index file is given
+        """  # noqa
+        index_file = index_file or self.index_file
+        if not index_file:
+            raise DataLoaderException(u"No index file given")
+        if self._index_conn is not None:
+            self._index_conn.close()
+            self._index_conn = None
+
+        tmp_file = u"{}.tmp".format(index_file)
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        conn = sqlite3.connect(tmp_file)
+        conn.execute(
+            u"CREATE TABLE items (dir TEXT, name TEXT, path TEXT, mtime REAL, "
+            u"size INTEGER, data TEXT, PRIMARY KEY (dir, name))"
+        )
+        count = 0
+        for dir_name, name, item in self.iter_data_files():
+            stamp = self.get_stamp(item)
+            conn.execute(
+                u"INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    dir_name,
+                    name,
+                    os.path.relpath(item, self.data_dir),
+                    stamp[0],
+                    stamp[1],
+                    json.dumps(self.read_data(item), sort_keys=True),
+                ),
+            )
+            count += 1
+        conn.commit()
+        conn.close()
+        os.rename(tmp_file, index_file)
+        self.index_file = index_file
+        return count
+
     def get_item(self, dir_suffix, item_name):
         """
         :param str dir_suffix: The directory name suffix
@@ -65,37 +359,54 @@ class DataLoader(object):
         :raises DataLoaderException: If item directory does not exist
         :raises Warning: If item not found in the directory
         """
+        # Check the cache before the index file and the directory
+        name = self.format_name(item_name)
+        key = (os.path.normpath(dir_suffix), name)
+        cached = self._get_cached_item(key)
+        if cached is not None:
+            return cached[1]
+
         item_dir = os.path.join(self.data_dir, dir_suffix)
         if not os.path.isdir(item_dir):
             raise DataLoaderException(
                 u"Item directory '{}' does not exist".format(item_dir)
             )  # noqa
 
-        # Cache the directory
-        if dir_suffix not in self.DATA:
-            self.DATA[dir_suffix] = {}
-            for item in glob.glob("{}*.{}".format(item_dir, self.EXT)):
-                ext_len = len(self.EXT) + 1
-                filename = os.path.basename(item)[:-ext_len]
-                self.DATA[dir_suffix][filename] = {}
+        indexed = self._get_index_item(dir_suffix, name)
+        if indexed is not None:
+            item_filename, stamp, data = indexed
+            self._set_cached_item(key, stamp, data, item_filename)
+            return data
 
-        name = self.format_name(item_name)
-        if name not in self.DATA[dir_suffix]:
+        item_filename = self._get_listing(item_dir).get(name)
+        if item_filename is None:
             warnings.warn(
                 u"Item from {} dir not found: {}".format(dir_suffix, name)  # noqa
             )
             return {}
 
-        # Cache file data
-        if not self.DATA[dir_suffix][name]:
-            item_filename = os.path.join(
-                item_dir, "{}.{}".format(name, self.EXT)
-            )  # noqa
-            data = self.read_data(item_filename)
-            self.DATA[dir_suffix][name] = data
-            return data
-        else:
-            return self.DATA[dir_suffix][name]
+        # Cache file data until the file changes
+        stamp = self.get_stamp(item_filename)
+        data = self.read_data(item_filename)
+        self._set_cached_item(key, stamp, data, item_filename)
+        return data
+
+    def preload(self, dir_suffix, item_names):
+        """
+        Load items into the cache ahead of use
+
+        :param str dir_suffix: The directory name suffix
+        :param list item_names: The names of the items to load
+        :return: The number of items found
+        :rtype: int
+        """
+        count = 0
+        for item_name in item_names:
+            with warnings.catch_warnings():
+                warnings.simplefilter(u"ignore")
+                if self.get_item(dir_suffix, item_name):
+                    count += 1
+        return count
 
 
 class JSONDataLoader(DataLoader):
@@ -118,6 +429,183 @@ class JSONDataLoader(DataLoader):
         return data
 
 
+class PackedDataLoader(DataLoader):
+    """
+    Load data from a single packed file built by :meth:`build`.
+
+    The packed file is JSON Lines.  The first line is a header holding the
+    offset and length of every item relative to the end of the header.  Each
+    following line is the data for one item.  The file is memory mapped so an
+    item is found with a dict lookup and parsed from a slice of the map
+    without opening a file per item.
+    """
+
+    #: The format name stored in the header
+    FORMAT = u"brewday-packed"
+    #: The format version stored in the header
+    VERSION = 1
+
+    def __init__(self, filename, max_entries=None, max_bytes=None):
+        """
+        :param str filename: The packed data file
+        :param int max_entries: The maximum number of cached items (optional)
+        :param int max_bytes: The maximum size of cached items in bytes (optional)
+        """  # noqa
+        if not os.path.isfile(filename):
+            raise DataLoaderException(u"File '{}' does not exist".format(filename))
+        self.filename = filename
+        self.data_dir = None
+        self.index_file = None
+        self._index_conn = None
+        self._mmap = None
+        self._index = None
+        self._data_start = 0
+        self._init_cache(max_entries, max_bytes)
+
+    def __getstate__(self):
+        # The memory map cannot be shared with another process
+        state = super(PackedDataLoader, self).__getstate__()
+        state[u"_mmap"] = None
+        return state
+
+    @classmethod
+    def build(cls, data_dir, filename, loader_cls=None):
+        """
+        Build a packed file from the items in a data directory
+
+        :param str data_dir: The directory where the data resides
+        :param str filename: The packed file to write
+        :param DataLoader loader_cls: The loader for the data files (default: JSONDataLoader)
+        :return: The number of items in the packed file
+        :rtype: int
+        """  # noqa
+        if loader_cls is None:
+            loader_cls = JSONDataLoader
+        loader = loader_cls(data_dir)
+
+        index = {}
+        lines = []
+        offset = 0
+        for dir_name, name, item in loader.iter_data_files():
+            line = json.dumps(loader.read_data(item), sort_keys=True).encode(u"utf-8")
+            index.setdefault(dir_name, {})[name] = [offset, len(line)]
+            lines.append(line)
+            offset += len(line) + 1
+
+        header = {u"format": cls.FORMAT, u"version": cls.VERSION, u"index": index}
+        tmp_file = u"{}.tmp".format(filename)
+        with open(tmp_file, "wb") as f:
+            f.write(json.dumps(header, sort_keys=True).encode(u"utf-8"))
+            f.write(b"\n")
+            for line in lines:
+                f.write(line)
+                f.write(b"\n")
+        os.rename(tmp_file, filename)
+        return len(lines)
+
+    def _open(self):
+        """
+        Memory map the packed file and read the header
+        """
+        with open(self.filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = json.loads(self._mmap.readline().decode(u"utf-8"))
+        version = (header.get(u"format"), header.get(u"version"))
+        if version != (self.FORMAT, self.VERSION):
+            raise DataLoaderException(
+                u"File '{}' is not a packed data file".format(self.filename)
+            )
+        self._index = header[u"index"]
+        self._data_start = self._mmap.tell()
+
+    def reload(self):
+        """
+        Reopen the packed file and clear the cache after it is rebuilt
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = None
+        self._init_cache(self.max_entries, self.max_bytes)
+
+    def get_item(self, dir_suffix, item_name):
+        """
+        :param str dir_suffix: The directory name suffix
+        :param str item_name: The name of the item to load
+        :return: The item as a python dict
+        :raises DataLoaderException: If item directory does not exist
+        :raises Warning: If item not found in the directory
+        """
+        if self._mmap is None:
+            self._open()
+
+        dir_name = os.path.normpath(dir_suffix)
+        if dir_name not in self._index:
+            raise DataLoaderException(
+                u"Item directory '{}' does not exist".format(dir_suffix)
+            )  # noqa
+
+        name = self.format_name(item_name)
+        entry = self._index[dir_name].get(name)
+        if entry is None:
+            warnings.warn(
+                u"Item from {} dir not found: {}".format(dir_suffix, name)  # noqa
+            )
+            return {}
+
+        # The offset and length stand in for the stamp of a data file
+        key = os.path.join(dir_name, name)
+        stamp = tuple(entry)
+        cached = self._get_cached_item(key, stamp)
+        if cached is not None:
+            return cached[1]
+        start = self._data_start + entry[0]
+        end = start + entry[1]
+        data = json.loads(self._mmap[start:end].decode(u"utf-8"))
+        self._set_cached_item(key, stamp, data)
+        return data
+
+
+class MemoizedLoader(object):
+    """
+    Wrap a loader so that each item is looked up only once.
+
+    Items are kept by directory suffix and formatted name and the least
+    recently used are evicted once there are more than max_entries.  Items
+    that were not found are looked up again each time.
+    """
+
+    def __init__(self, loader, max_entries=None):
+        """
+        :param DataLoader loader: The loader to wrap
+        :param int max_entries: The maximum number of items kept (default: the loader's max_entries or MEMOIZED_MAX_ENTRIES)
+        """  # noqa
+        self.loader = loader
+        if max_entries is None:
+            max_entries = getattr(loader, u"max_entries", None)
+        if max_entries is None:
+            max_entries = MEMOIZED_MAX_ENTRIES
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+
+    def get_item(self, dir_suffix, item_name):
+        """
+        :param str dir_suffix: The directory name suffix
+        :param str item_name: The name of the item to load
+        :return: The item as a python dict
+        """
+        key = (dir_suffix, self.loader.format_name(item_name))
+        data = self._items.pop(key, None)
+        if data is None:
+            data = self.loader.get_item(dir_suffix, item_name)
+            if not data:
+                return data
+        # Re-insert to mark the item as most recently used
+        self._items[key] = data
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+        return data
+
+
 def parse_cereals(cereal, loader, dir_suffix="cereals/"):
     """
     Parse grains data from a recipe
@@ -315,3 +803,139 @@ def parse_recipe(
 
     beer = Recipe(recipe[u"name"], **recipe_kwargs)
     return beer
+
+
+def _memoize_loaders(loader, cereals_loader=None, hops_loader=None, yeast_loader=None):
+    """
+    Wrap each distinct loader in a MemoizedLoader
+
+    :return: The wrapped loader, cereals, hops and yeast loaders
+    :rtype: tuple
+    """
+    loaders = [
+        loader,
+        cereals_loader or loader,
+        hops_loader or loader,
+        yeast_loader or loader,
+    ]
+    memoized = {}
+    for item in loaders:
+        if id(item) not in memoized:
+            memoized[id(item)] = MemoizedLoader(item)
+    return tuple(memoized[id(item)] for item in loaders)
+
+
+def _parse_chunk(start, recipes, loaders, dir_suffixes):
+    """
+    Parse a chunk of recipes and report the result of each
+
+    :param int start: The index of the first recipe in the chunk
+    :param list recipes: The recipes to parse
+    :param tuple loaders: The loader, cereals, hops and yeast loaders
+    :param tuple dir_suffixes: The cereals, hops and yeast directory suffixes
+    :return: The results in order
+    :rtype: list(ParseResult)
+    """
+    loader, cereals_loader, hops_loader, yeast_loader = loaders
+    cereals_dir_suffix, hops_dir_suffix, yeast_dir_suffix = dir_suffixes
+    results = []
+    for index, recipe in enumerate(recipes, start):
+        try:
+            beer = parse_recipe(
+                recipe,
+                loader,
+                cereals_loader=cereals_loader,
+                hops_loader=hops_loader,
+                yeast_loader=yeast_loader,
+                cereals_dir_suffix=cereals_dir_suffix,
+                hops_dir_suffix=hops_dir_suffix,
+                yeast_dir_suffix=yeast_dir_suffix,
+            )
+        except PARSE_ERRORS as e:
+            results.append(ParseResult(index, None, e))
+        else:
+            results.append(ParseResult(index, beer, None))
+    return results
+
+
+#: The memoized loaders and directory suffixes in a worker process
+_WORKER_STATE = {}
+
+
+def _init_worker(loaders, dir_suffixes):
+    _WORKER_STATE[u"loaders"] = _memoize_loaders(*loaders)
+    _WORKER_STATE[u"dir_suffixes"] = dir_suffixes
+
+
+def _parse_chunk_worker(start, recipes):
+    return _parse_chunk(
+        start, recipes, _WORKER_STATE[u"loaders"], _WORKER_STATE[u"dir_suffixes"]
+    )
+
+
+def parse_recipes(
+    recipes,
+    loader,
+    cereals_loader=None,
+    hops_loader=None,
+    yeast_loader=None,
+    cereals_dir_suffix="cereals/",
+    hops_dir_suffix="hops/",
+    yeast_dir_suffix="yeast/",
+    processes=1,
+    chunksize=100,
+    max_pending=None,
+):
+    """
+    Parse many recipes from an iterable of python Dicts
+
+    :param iterable recipes: Representations of recipes
+    :param DataLoader loader: A class to load additional information
+    :param DataLoader cereal_loader: A class to load additional information specific to cereals
+    :param DataLoader hops_loader: A class to load additional information specific to hops
+    :param DataLoader yeast_loader: A class to load additional information specific to yeast
+    :param int processes: The number of worker processes, 1 parses in this process
+    :param int chunksize: The number of recipes sent to a worker at a time
+    :param int max_pending: The maximum number of chunks being parsed at once (default: twice the processes)
+    :return: The result of each recipe in order
+    :rtype: generator of ParseResult
+
+    Each result has the index of the record, the parsed recipe and the
+    error.  If a record cannot be parsed the recipe is None and the error is
+    the exception that was raised, otherwise the error is None.
+
+    Item lookups are made once per batch, or once per worker process when
+    a process pool is used.  The recipes are read from the iterable as the
+    results are consumed so only a bounded number are held in memory.  The
+    loaders must be picklable to use a process pool.
+    """  # noqa
+    loaders = (loader, cereals_loader, hops_loader, yeast_loader)
+    dir_suffixes = (cereals_dir_suffix, hops_dir_suffix, yeast_dir_suffix)
+    if chunksize < 1:
+        raise ValueError(u"Chunk size must be at least 1")
+
+    if processes is None or processes <= 1:
+        memoized = _memoize_loaders(*loaders)
+        for start, chunk in iter_chunks(recipes, chunksize):
+            for result in _parse_chunk(start, chunk, memoized, dir_suffixes):
+                yield result
+        return
+
+    if max_pending is None:
+        max_pending = processes * 2
+    pool = multiprocessing.Pool(
+        processes, initializer=_init_worker, initargs=(loaders, dir_suffixes)
+    )
+    try:
+        pending = deque()
+        for start, chunk in iter_chunks(recipes, chunksize):
+            pending.append(pool.apply_async(_parse_chunk_worker, (start, chunk)))
+            if len(pending) >= max_pending:
+                for result in pending.popleft().get():
+                    yield result
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
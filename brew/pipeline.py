@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Stream recipes from newline delimited JSON to newline delimited JSON.
+
+Each input line holds one recipe in the format accepted by
+:meth:`brew.parsers.parse_recipe`.  Each parsed recipe is written as one line
+of :meth:`brew.recipes.Recipe.to_json` output.  Lines are read only as fast as
+the output is written, so memory use does not depend on the size of the
+input.
+"""
+import json
+from collections import deque
+
+from .parsers import parse_recipes
+
+__all__ = [u"iter_records", u"format_error", u"run_pipeline"]
+
+
+def iter_records(lines, on_error=None, line_numbers=None):
+    """
+    Decode recipes from lines of JSON
+
+    :param iterable lines: Lines of JSON
+    :param on_error: Called with the line number and exception for each line that cannot be decoded
+    :param deque line_numbers: The line number of each decoded record is appended here
+    :return: The decoded records
+    :rtype: generator
+
+    Blank lines are skipped.  Line numbers start at 1.
+    """  # noqa
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            if on_error is not None:
+                on_error(line_number, e)
+            continue
+        if line_numbers is not None:
+            line_numbers.append(line_number)
+        yield record
+
+
+def format_error(line_number, error):
+    """
+    Format an error as a line of JSON
+
+    :param int line_number: The line number of the record
+    :param Exception error: The error
+    :return: The error as JSON
+    :rtype: str
+    """
+    return json.dumps(
+        {
+            u"line": line_number,
+            u"error": u"{}: {}".format(type(error).__name__, error),
+        },
+        sort_keys=True,
+    )
+
+
+def run_pipeline(
+    lines,
+    output,
+    loader,
+    errors=None,
+    processes=1,
+    chunksize=100,
+    max_pending=None,
+):
+    """
+    Parse recipes from lines of JSON and write them as lines of JSON
+
+    :param iterable lines: Lines of JSON, such as an open file
+    :param file output: The stream to write recipes to
+    :param DataLoader loader: A class to load additional information
+    :param file errors: The stream to write errors to (optional)
+    :param int processes: The number of worker processes, 1 parses in this process
+    :param int chunksize: The number of recipes sent to a worker at a time
+    :param int max_pending: The maximum number of chunks being parsed at once
+    :return: The number of records, recipes written and errors
+    :rtype: dict
+
+    Lines which are not JSON or are not valid recipes are written to the
+    errors stream with their line number and do not stop the pipeline.
+    """  # noqa
+    stats = {u"records": 0, u"recipes": 0, u"errors": 0}
+
+    def on_error(line_number, error):
+        stats[u"records"] += 1
+        stats[u"errors"] += 1
+        if errors is not None:
+            errors.write(format_error(line_number, error))
+            errors.write(u"\n")
+
+    line_numbers = deque()
+    records = iter_records(lines, on_error=on_error, line_numbers=line_numbers)
+    results = parse_recipes(
+        records,
+        loader,
+        processes=processes,
+        chunksize=chunksize,
+        max_pending=max_pending,
+    )
+    for result in results:
+        line_number = line_numbers.popleft()
+        if result.error is not None:
+            on_error(line_number, result.error)
+            continue
+        stats[u"records"] += 1
+        stats[u"recipes"] += 1
+        output.write(result.recipe.to_json())
+        output.write(u"\n")
+    return stats
@@ -13,8 +13,12 @@ from .constants import HOPS_CONSTANT_IMPERIAL
 from .constants import HOPS_CONSTANT_SI
 from .constants import IMPERIAL_TYPES
 from .constants import IMPERIAL_UNITS
+from .constants import KG_PER_POUND
 from .constants import LITER_PER_GAL
+from .constants import MG_PER_OZ
+from .constants import OZ_PER_MG
 from .constants import PPG_DME
+from .constants import POUND_PER_KG
 from .constants import PPG_CEREAL
 from .constants import SI_TYPES
 from .constants import SI_UNITS
@@ -30,15 +34,16 @@ from .utilities.abv import alcohol_by_weight
 from .utilities.abv import final_gravity_from_abv_standard
 from .utilities.color import calculate_mcu
 from .utilities.color import calculate_srm
-from .utilities.color import calculate_srm_daniels
-from .utilities.color import calculate_srm_morey
-from .utilities.color import calculate_srm_mosher
+from .utilities.color import calculate_srm_models
 from .utilities.color import srm_to_ebc
+from .utilities.color import srm_to_mcu
 from .utilities.efficiency import get_wort_correction
 from .utilities.hops import HopsUtilizationGlennTinseth
 from .utilities.sugar import gu_to_sg
 from .utilities.sugar import sg_to_gu
 from .utilities.sugar import sg_to_plato
+from .utilities.versions import VersionedList
+from .utilities.versions import get_version
 from .validators import validate_grain_type
 from .validators import validate_hop_type
 from .validators import validate_optional_fields
@@ -46,16 +51,31 @@ from .validators import validate_percentage
 from .validators import validate_required_fields
 from .validators import validate_units
 
-__all__ = [u"Recipe", u"RecipeBuilder"]
+__all__ = [u"Recipe", u"RecipeBuilder", u"scale_recipes"]
 
 
 class Recipe(object):
     """
     A representation of a Recipe that can be brewed to make beer.
+
+    Derived metrics such as the total points, boil gravity, IBUs and color
+    are cached on the recipe.  The cache is cleared whenever one of the
+    attributes in ``CACHE_ATTRS`` is assigned and whenever the additions or
+    the yeast are changed in place, see :func:`~brew.utilities.versions.get_version`.
     """
 
-    grain_lookup = {}
-    hop_lookup = {}
+    #: Attributes which invalidate the derived metrics cache when set
+    CACHE_ATTRS = frozenset(
+        [
+            u"grain_additions",
+            u"hop_additions",
+            u"yeast",
+            u"brew_house_yield",
+            u"start_volume",
+            u"final_volume",
+            u"units",
+        ]
+    )
 
     def __init__(
         self,
@@ -81,6 +101,11 @@ class Recipe(object):
         :raises RecipeException: If the units of any GrainAddition is not the same as the units of the Recipe
         :raises RecipeException: If the units of any HopAddition is not the same as the units of the Recipe
         """  # noqa
+        self._cache = {}
+        self._cache_version = None
+        self._cache_stats = {u"hits": 0, u"misses": 0, u"invalidations": 0}
+        self._cache_recomputes = {}
+
         self.name = name
         if grain_additions is None:
             grain_additions = []
@@ -97,11 +122,8 @@ class Recipe(object):
         # Manage units
         self.set_units(units)
 
-        # For each grain and hop:
-        # 1. Add to lookup
-        # 2. Ensure all units are the same
+        # Ensure all units are the same for each grain and hop
         for grain_add in self.grain_additions:
-            self.grain_lookup[grain_add.grain.name] = grain_add
             if grain_add.units != self.units:
                 raise RecipeException(
                     u"{}: Grain addition units must be in '{}' not '{}'".format(  # noqa
@@ -109,9 +131,6 @@ class Recipe(object):
                     )
                 )
         for hop_add in self.hop_additions:
-            # The same hops may be used several times, so we must distinguish
-            hop_key = u"{}_{}".format(hop_add.hop.name, hop_add.boil_time)
-            self.hop_lookup[hop_key] = hop_add
             if hop_add.units != self.units:
                 raise RecipeException(
                     u"{}: Hop addition units must be in '{}' not '{}'".format(  # noqa
@@ -119,6 +138,51 @@ class Recipe(object):
                     )
                 )
 
+    def __setattr__(self, name, value):
+        # Lists of additions bump the version when changed in place
+        if name in (u"grain_additions", u"hop_additions"):
+            if not isinstance(value, VersionedList):
+                value = VersionedList(value)
+        super(Recipe, self).__setattr__(name, value)
+        if name in self.CACHE_ATTRS:
+            self.invalidate_cache()
+
+    @property
+    def grain_lookup(self):
+        """
+        The grain additions of this recipe by grain name
+
+        :return: The grain additions by name
+        :rtype: dict
+
+        The lookup is cached with the derived metrics so it follows changes
+        to the grain additions, including changes in place.
+        """
+        return self._get_cached((u"grain_lookup",), self._get_grain_lookup)
+
+    def _get_grain_lookup(self):
+        return {ga.grain.name: ga for ga in self.grain_additions}
+
+    @property
+    def hop_lookup(self):
+        """
+        The hop additions of this recipe by hop name and boil time
+
+        :return: The hop additions by '<name>_<boil_time>'
+        :rtype: dict
+
+        The lookup is cached with the derived metrics so it follows changes
+        to the hop additions, including changes in place.
+        """
+        return self._get_cached((u"hop_lookup",), self._get_hop_lookup)
+
+    def _get_hop_lookup(self):
+        # The same hops may be used several times, so we must distinguish
+        return {
+            u"{}_{}".format(ha.hop.name, ha.boil_time): ha
+            for ha in self.hop_additions
+        }
+
     def __str__(self):
         if sys.version_info[0] >= 3:
             return self.__unicode__()
@@ -172,6 +236,59 @@ class Recipe(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def invalidate_cache(self):
+        """
+        Clear the cache of derived metrics
+
+        This is called automatically when any attribute in ``CACHE_ATTRS`` is
+        set or when :func:`~brew.utilities.versions.get_version` changes.
+        """
+        if self._cache:
+            self._cache_stats[u"invalidations"] += 1
+        self._cache = {}
+
+    def get_cache_stats(self):
+        """
+        Get statistics about the derived metrics cache
+
+        :return: The cache hits, misses, invalidations and recomputes by metric
+        :rtype: dict
+        """
+        stats = dict(self._cache_stats)
+        stats[u"recomputes"] = dict(self._cache_recomputes)
+        return stats
+
+    def reset_cache_stats(self):
+        """
+        Reset the statistics about the derived metrics cache
+        """
+        self._cache_stats = {u"hits": 0, u"misses": 0, u"invalidations": 0}
+        self._cache_recomputes = {}
+
+    def _get_cached(self, key, func, *args):
+        """
+        Get a derived metric from the cache or compute and store it
+
+        :param key: The cache key, the first element is the metric name
+        :param func: The function used to compute the metric
+        :return: The derived metric
+        """
+        version = get_version()
+        if version != self._cache_version:
+            self.invalidate_cache()
+            self._cache_version = version
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self._cache_stats[u"misses"] += 1
+            name = key[0]
+            self._cache_recomputes[name] = self._cache_recomputes.get(name, 0) + 1
+            value = func(*args)
+            self._cache[key] = value
+            return value
+        self._cache_stats[u"hits"] += 1
+        return value
+
     def set_units(self, units):
         """
         Set the units and unit types
@@ -210,6 +327,103 @@ class Recipe(object):
             units=units,
         )
 
+    def scale(
+        self, final_volume=None, start_volume=None, brew_house_yield=None, units=None
+    ):
+        """
+        Scale the recipe to new equipment
+
+        :param float final_volume: The final volume of the wort in the new units (default: the same volume)
+        :param float start_volume: The starting volume of the wort in the new units (default: the same ratio to the final volume)
+        :param float brew_house_yield: The brew house yield (default: the same yield)
+        :param str units: The units (default: the same units)
+        :return: The scaled Recipe
+        :rtype: Recipe
+
+        Grain weights change so that the original gravity stays the same.
+        Each hop weight changes so that its IBUs at the new boil gravity stay
+        the same.  The scaled recipe shares the Grain, Hop and Yeast objects
+        of this recipe.
+        """  # noqa
+        if units is None:
+            units = self.units
+        validate_units(units)
+        volume_factor = 1.0
+        grain_factor = 1.0
+        hop_factor = 1.0
+        if units != self.units:
+            if units == SI_UNITS:
+                volume_factor = LITER_PER_GAL
+                grain_factor = KG_PER_POUND
+                hop_factor = MG_PER_OZ
+            else:
+                volume_factor = GAL_PER_LITER
+                grain_factor = POUND_PER_KG
+                hop_factor = OZ_PER_MG
+        if brew_house_yield is None:
+            brew_house_yield = self.brew_house_yield
+        validate_percentage(brew_house_yield)
+        current_volume = self.final_volume * volume_factor
+        if final_volume is None:
+            final_volume = current_volume
+        if start_volume is None:
+            start_volume = self.start_volume * volume_factor
+            start_volume *= final_volume / current_volume
+        volume_ratio = final_volume / current_volume
+
+        grain_additions = []
+        for grain_add in self.grain_additions:
+            weight = grain_add.weight * grain_factor * volume_ratio
+            # DME and LME are 100% efficient in disolving in water
+            if grain_add.grain_type not in [GRAIN_TYPE_DME, GRAIN_TYPE_LME]:
+                weight *= self.brew_house_yield / brew_house_yield
+            grain_additions.append(
+                GrainAddition(
+                    grain_add.grain,
+                    weight=weight,
+                    grain_type=grain_add.grain_type,
+                    units=units,
+                )
+            )
+
+        bg = self.get_boil_gravity()
+        scaled_bg = gu_to_sg(
+            self.get_original_gravity_units()
+            * final_volume
+            / ((1.0 - BOIL_EVAPORATION) * start_volume)
+        )
+        hop_additions = []
+        for hop_add in self.hop_additions:
+            utilization_cls_kwargs = hop_add.utilization_cls_kwargs
+            if units != self.units:
+                utilization_cls_kwargs = dict(utilization_cls_kwargs, units=units)
+            scaled_add = HopAddition(
+                hop_add.hop,
+                weight=hop_add.weight * hop_factor * volume_ratio,
+                boil_time=hop_add.boil_time,
+                hop_type=hop_add.hop_type,
+                utilization_cls=type(hop_add.utilization),
+                utilization_cls_kwargs=utilization_cls_kwargs,
+                units=units,
+            )
+            # IBUs are proportional to the weight of the hops
+            ibus = hop_add.get_ibus(bg, self.final_volume)
+            scaled_ibus = scaled_add.get_ibus(scaled_bg, final_volume)
+            if scaled_ibus:
+                scaled_add.weight *= ibus / scaled_ibus
+            hop_additions.append(scaled_add)
+
+        return Recipe(
+            self.name,
+            grain_additions=grain_additions,
+            hop_additions=hop_additions,
+            yeast=self.yeast,
+            brew_house_yield=brew_house_yield,
+            start_volume=start_volume,
+            final_volume=final_volume,
+            units=units,
+        )
+
     def get_total_points(self):
         """
         Get the total points of the recipe
@@ -217,6 +431,9 @@ class Recipe(object):
         :return: PPG or HWE depending on the units of the Recipe
         :rtype: float
         """
+        return self._get_cached((u"total_points",), self._get_total_points)
+
+    def _get_total_points(self):
         total_points = 0
         for grain_add in self.grain_additions:
             # DME and LME are 100% efficient in disolving in water
@@ -257,6 +474,13 @@ class Recipe(object):
         :return: The boil gravity units
         :rtype: float
         """
+        return self._get_cached(
+            (u"boil_gravity_units", evaporation),
+            self._get_boil_gravity_units,
+            evaporation,
+        )
+
+    def _get_boil_gravity_units(self, evaporation):
         return self.get_total_points() / (
             (1.0 - evaporation) * self.start_volume
         )  # noqa
@@ -391,10 +615,7 @@ class Recipe(object):
         :return: The total weight of the DME
         :rtype: float
         """
-        weights = []
-        for grain_add in self.grain_additions:
-            weights.append(self.get_grain_add_dry_weight(grain_add))
-        return sum(weights)
+        return self._get_grain_aggregates()[u"total_dry_weight"]
 
     def get_grain_add_cereal_weight(self, grain_add, ppg=PPG_CEREAL):
         """
@@ -418,10 +639,7 @@ class Recipe(object):
         :return: The total weight of the Cereal
         :rtype: float
         """
-        weights = []
-        for grain_add in self.grain_additions:
-            weights.append(self.get_grain_add_cereal_weight(grain_add))
-        return sum(weights)
+        return self._get_grain_aggregates()[u"total_grain_weight"]
 
     def get_percent_ibus(self, hop_add):
         """
@@ -442,9 +660,7 @@ class Recipe(object):
         :return: The total IBU for the Recipe
         :rtype: float
         """
-        bg = self.get_boil_gravity()
-        fv = self.final_volume
-        return sum([hop_add.get_ibus(bg, fv) for hop_add in self.hop_additions])
+        return self._get_hop_aggregates()[u"total_ibu"]
 
     @property
     def ibu(self):
@@ -487,6 +703,15 @@ class Recipe(object):
         mcu = self.get_wort_color_mcu(grain_add)
         return calculate_srm(mcu)
 
+    def get_total_wort_color_mcu(self):
+        """
+        Get the Total Color of the Wort in Malt Color Units
+
+        :return: The total MCU of the wort
+        :rtype: float
+        """
+        return self._get_grain_aggregates()[u"total_mcu"]
+
     def get_total_wort_color(self):
         """
         Get the Total Color of the Wort in SRM using Morey Power Equation
@@ -494,8 +719,7 @@ class Recipe(object):
         :return: The total color of the wort in SRM
         :rtype: float
         """
-        mcu = sum([self.get_wort_color_mcu(ga) for ga in self.grain_additions])
-        return calculate_srm(mcu)
+        return calculate_srm(self.get_total_wort_color_mcu())
 
     @property
     def color(self):
@@ -508,49 +732,22 @@ class Recipe(object):
         :return: A map of wort color in SRM and EBC by method (Morey, Daniels, and Mosher)
         :rtype: dict
         """  # noqa
-        mcu = sum([self.get_wort_color_mcu(ga) for ga in self.grain_additions])
-
-        srm_morey = u"N/A"
-        srm_daniels = u"N/A"
-        srm_mosher = u"N/A"
-
-        ebc_morey = u"N/A"
-        ebc_daniels = u"N/A"
-        ebc_mosher = u"N/A"
-
-        try:
-            srm_morey = calculate_srm_morey(mcu)
-            ebc_morey = round(srm_to_ebc(srm_morey), 1)
-            srm_morey = round(srm_morey, 1)
-        except ColorException:
-            pass
-
-        try:
-            srm_daniels = calculate_srm_daniels(mcu)
-            ebc_daniels = round(srm_to_ebc(srm_daniels), 1)
-            srm_daniels = round(srm_daniels, 1)
-        except ColorException:
-            pass
-
-        try:
-            srm_mosher = calculate_srm_mosher(mcu)
-            ebc_mosher = round(srm_to_ebc(srm_mosher), 1)
-            srm_mosher = round(srm_mosher, 1)
-        except ColorException:
-            pass
-
-        return {
-            u"srm": {
-                u"morey": srm_morey,
-                u"daniels": srm_daniels,
-                u"mosher": srm_mosher,
-            },
-            u"ebc": {
-                u"morey": ebc_morey,
-                u"daniels": ebc_daniels,
-                u"mosher": ebc_mosher,
-            },
-        }
+        color_map = self._get_cached(
+            (u"total_wort_color_map",), self._get_total_wort_color_map
+        )
+        return {key: dict(value) for key, value in color_map.items()}
+
+    def _get_total_wort_color_map(self):
+        srm_models = calculate_srm_models(self.get_total_wort_color_mcu())
+        color_map = {u"srm": {}, u"ebc": {}}
+        for model, srm in srm_models.items():
+            if srm is None:
+                color_map[u"srm"][model] = u"N/A"
+                color_map[u"ebc"][model] = u"N/A"
+            else:
+                color_map[u"srm"][model] = round(srm, 1)
+                color_map[u"ebc"][model] = round(srm_to_ebc(srm), 1)
+        return color_map
 
     def get_grain_additions_by_type(self, grain_type):
         """
@@ -578,6 +775,72 @@ class Recipe(object):
             hop_add for hop_add in self.hop_additions if hop_add.hop_type == hop_type
         ]  # noqa
 
+    def _get_grain_aggregates(self):
+        """
+        Get the per addition values and totals for the grains
+
+        :return: Lists of dry weights and MCU by addition and their totals
+        :rtype: dict
+        """
+        return self._get_cached((u"grain_aggregates",), self._aggregate_grains)
+
+    def _aggregate_grains(self):
+        # A single pass over the grains, shares are computed from the totals
+        dry_weights = []
+        mcus = []
+        total_dry_weight = 0.0
+        total_grain_weight = 0.0
+        total_mcu = 0.0
+        for grain_add in self.grain_additions:
+            dry_weight = self.get_grain_add_dry_weight(grain_add)
+            cereal_weight = self.get_grain_add_cereal_weight(grain_add)
+            mcu = calculate_mcu(
+                cereal_weight,
+                grain_add.grain.color,
+                self.final_volume,
+                units=self.units,
+            )
+            dry_weights.append(dry_weight)
+            mcus.append(mcu)
+            total_dry_weight += dry_weight
+            total_grain_weight += cereal_weight
+            total_mcu += mcu
+        return {
+            u"dry_weights": dry_weights,
+            u"mcus": mcus,
+            u"total_dry_weight": total_dry_weight,
+            u"total_grain_weight": total_grain_weight,
+            u"total_mcu": total_mcu,
+        }
+
+    def _get_hop_aggregates(self):
+        """
+        Get the per addition values and totals for the hops
+
+        :return: Lists of IBUs and utilization by addition and the total IBUs
+        :rtype: dict
+        """
+        return self._get_cached((u"hop_aggregates",), self._aggregate_hops)
+
+    def _aggregate_hops(self):
+        bg = self.get_boil_gravity()
+        fv = self.final_volume
+        ibus = []
+        utilizations = []
+        total_ibu = 0.0
+        for hop_add in self.hop_additions:
+            ibu = hop_add.get_ibus(bg, fv)
+            utilization = hop_add.utilization.get_percent_utilization(
+                bg, hop_add.boil_time
+            )
+            # Utilization is 10% higher for pellet vs whole/plug
+            if hop_add.hop_type == HOP_TYPE_PELLET:
+                utilization *= HOP_UTILIZATION_SCALE_PELLET
+            ibus.append(ibu)
+            utilizations.append(utilization)
+            total_ibu += ibu
+        return {u"ibus": ibus, u"utilizations": utilizations, u"total_ibu": total_ibu}
+
     def to_dict(self):
         og = self.og
         bg = self.bg
@@ -609,14 +872,18 @@ class Recipe(object):
             u"yeast": {},
         }
 
-        for grain_add in self.grain_additions:
+        grain_aggregates = self._get_grain_aggregates()
+        total_dry_weight = grain_aggregates[u"total_dry_weight"]
+        for index, grain_add in enumerate(self.grain_additions):
             grain = grain_add.to_dict()
-            wort_color_srm = self.get_wort_color(grain_add)
+            wort_color_srm = calculate_srm(grain_aggregates[u"mcus"][index])
             wort_color_ebc = srm_to_ebc(wort_color_srm)
             working_yield = round(
                 grain_add.grain.get_working_yield(self.brew_house_yield), 3
             )  # noqa
-            percent_malt_bill = round(self.get_percent_malt_bill(grain_add), 3)
+            percent_malt_bill = round(
+                grain_aggregates[u"dry_weights"][index] / total_dry_weight, 3
+            )
             grain[u"data"].update(
                 {
                     u"working_yield": working_yield,
@@ -627,18 +894,11 @@ class Recipe(object):
             )
             recipe_dict[u"grains"].append(grain)
 
-        for hop_add in self.hop_additions:
+        hop_aggregates = self._get_hop_aggregates()
+        for index, hop_add in enumerate(self.hop_additions):
             hop = hop_add.to_dict()
-
-            ibus = hop_add.get_ibus(bg, self.final_volume)
-
-            utilization = hop_add.utilization_cls.get_percent_utilization(
-                bg, hop_add.boil_time
-            )
-            # Utilization is 10% higher for pellet vs whole/plug
-            if hop_add.hop_type == HOP_TYPE_PELLET:
-                utilization *= HOP_UTILIZATION_SCALE_PELLET
-
+            ibus = hop_aggregates[u"ibus"][index]
+            utilization = hop_aggregates[u"utilizations"][index]
             hop[u"data"].update(
                 {u"ibus": round(ibus, 1), u"utilization": round(utilization, 3)}
             )
@@ -784,14 +1044,156 @@ class Recipe(object):
         return msg
 
 
+def _get_dot_range(direction, lower, upper):
+    """
+    Get the lowest and highest dot product of a direction with percentages
+
+    :param list direction: The coefficients of the dot product
+    :param list lower: The lowest percentage of each item
+    :param list upper: The highest percentage of each item
+    :return: The lowest and highest dot product when the percentages sum to 1.0
+    :rtype: tuple
+    """  # noqa
+    order = sorted(range(len(direction)), key=lambda index: direction[index])
+    extremes = []
+    for indexes in [order, order[::-1]]:
+        # Fill the items in order of their coefficient from the lower bounds
+        remaining = 1.0 - sum(lower)
+        dot = sum(d * lo for d, lo in zip(direction, lower))
+        for index in indexes:
+            amount = min(upper[index] - lower[index], remaining)
+            dot += direction[index] * amount
+            remaining -= amount
+        extremes.append(dot)
+    return tuple(extremes)
+
+
+def _solve_shift(values, lower, upper):
+    """
+    Find the shift of the values which sums to 1.0 within the bounds
+
+    :param list values: The values to shift
+    :param list lower: The lowest value of each item
+    :param list upper: The highest value of each item
+    :return: The shift
+    :rtype: float
+
+    The sum of the bounded values is piecewise linear in the shift, so it is
+    solved exactly between the two breakpoints either side of 1.0.
+    """
+
+    def get_sum(shift):
+        return sum(
+            min(max(v + shift, lo), up) for v, lo, up in zip(values, lower, upper)
+        )
+
+    points = sorted(
+        set(lo - v for v, lo in zip(values, lower))
+        | set(up - v for v, up in zip(values, upper))
+    )
+    low, low_sum = points[0], get_sum(points[0])
+    for high in points[1:]:
+        high_sum = get_sum(high)
+        if high_sum >= 1.0:
+            if high_sum == low_sum:
+                return high
+            return low + (high - low) * (1.0 - low_sum) / (high_sum - low_sum)
+        low, low_sum = high, high_sum
+    return low
+
+
+def _project_percentages(
+    percent_list, lower, upper, direction=None, tolerance=1e-9, max_iterations=100
+):
+    """
+    Find the percentages closest to a list that meet bounds and constraints
+
+    :param list percent_list: The preferred percentages
+    :param list lower: The lowest percentage of each item
+    :param list upper: The highest percentage of each item
+    :param list direction: Coefficients whose dot product with the percentages must be zero
+    :param float tolerance: The largest error allowed in a constraint
+    :param int max_iterations: The most bisection steps to try
+    :return: The percentages or None if the constraints cannot be met
+    :rtype: list
+    :raises RecipeException: If the constraints are not met within the tolerance
+
+    The percentages always sum to 1.0.  This is a bounded least squares
+    problem.  Whether it can be solved is checked first from the range of
+    the sum and the dot product within the bounds.  The solution is the
+    preferred percentages shifted along the constraints and then bounded,
+    the shift along the sum is solved exactly and the shift along the
+    direction by bisection.
+    """  # noqa
+    count = len(percent_list)
+    if sum(lower) > 1.0 + tolerance or sum(upper) < 1.0 - tolerance:
+        return None
+    if direction is not None:
+        low, high = _get_dot_range(direction, lower, upper)
+        if low > tolerance or high < -tolerance:
+            return None
+        # Remove the part of the direction along the sum so that the shifts
+        # along both constraints are independent
+        mean = sum(direction) / count
+        direction = [d - mean for d in direction]
+        norm = sum(d * d for d in direction) ** 0.5
+        if norm <= tolerance:
+            if abs(mean) > tolerance:
+                return None
+            direction = None
+        else:
+            direction = [d / norm for d in direction]
+            # The constraint is a dot product of zero with the original
+            # direction, which is the mean term when the percentages sum to 1
+            offset = -mean / norm
+
+    def get_percents(step):
+        values = list(percent_list)
+        if step:
+            values = [v + step * d for v, d in zip(values, direction)]
+        shift = _solve_shift(values, lower, upper)
+        return [min(max(v + shift, lo), up) for v, lo, up in zip(values, lower, upper)]
+
+    def get_error(values):
+        error = sum(d * v for d, v in zip(direction, values)) - offset
+        if abs(error) <= tolerance:
+            return 0.0
+        return error
+
+    current = get_percents(0.0)
+    if direction is not None:
+        # The dot product only grows with the step, so bracket it and bisect
+        low, high = -1.0, 1.0
+        while get_error(get_percents(low)) > 0 and low > -1e18:
+            low *= 2.0
+        while get_error(get_percents(high)) < 0 and high < 1e18:
+            high *= 2.0
+        for _ in range(max_iterations):
+            step = (low + high) / 2.0
+            current = get_percents(step)
+            error = get_error(current)
+            if not error:
+                break
+            if error < 0:
+                low = step
+            else:
+                high = step
+        else:
+            raise RecipeException(
+                u"The percentages did not converge within {} iterations".format(
+                    max_iterations
+                )
+            )
+    if abs(sum(current) - 1.0) > tolerance:
+        raise RecipeException(u"The percentages do not sum to 1.0")
+    return current
+
+
 class RecipeBuilder(object):
     """
     A class for building recipes
     """
 
-    grain_lookup = {}
-    hop_lookup = {}
-
     def __init__(
         self,
         name,
@@ -834,12 +1236,9 @@ class RecipeBuilder(object):
         # Manage units
         self.set_units(units)
 
-        # For each grain and hop:
-        # Add to lookup
-        for grain in self.grain_list:
-            self.grain_lookup[grain.name] = grain
-        for hop in self.hop_list:
-            self.hop_lookup[hop.name] = hop
+        # For each grain and hop add to the lookups owned by this builder
+        self.grain_lookup = {grain.name: grain for grain in self.grain_list}
+        self.hop_lookup = {hop.name: hop for hop in self.hop_list}
 
     def __str__(self):
         if sys.version_info[0] >= 3:
@@ -1037,6 +1436,139 @@ class RecipeBuilder(object):
             hop_additions.append(hop_add)
         return hop_additions
 
+    def solve_additions(
+        self,
+        target_og=None,
+        target_srm=None,
+        target_bu_to_gu=None,
+        percent_list=None,
+        percent_bounds=None,
+        fixed_percents=None,
+        hop_percent_list=None,
+        boil_time_list=None,
+        hop_type=HOP_TYPE_PELLET,
+        utilization_cls=HopsUtilizationGlennTinseth,
+    ):
+        """
+        Calculate GrainAdditions and HopAdditions that meet several targets
+
+        :param float target_og: The Original Gravity Target (default: self.target_og)
+        :param float target_srm: The Color Target in SRM using the Morey Equation (optional)
+        :param float target_bu_to_gu: The BU to GU Ratio Target (default: from self.target_ibu)
+        :param list percent_list: The preferred percentage of each Grain (default: equal percentages)
+        :param dict percent_bounds: The lowest and highest percentage by Grain name
+        :param dict fixed_percents: The exact percentage by Grain name, such as for a base malt
+        :param list hop_percent_list: The percentage of the IBUs from each Hop
+        :param list boil_time_list: A list of boil times mapped to each Hop
+        :param str hop_type: The type of every Hop
+        :param HopsUtilization utilization_cls: The utilization class used for calculation
+        :return: A list of Grain Additions and a list of Hop Additions
+        :rtype: tuple
+        :raises RecipeException: If a Grain name is not in self.grain_list
+        :raises RecipeException: If a list does not match the length of self.grain_list or self.hop_list
+        :raises RecipeException: If the targets cannot be met within the percentage bounds
+        :raises RecipeException: If the percentages do not meet the targets to within 1e-9
+
+        Grain percentages are by weight.  They are the percentages closest to
+        percent_list that give the target color within the bounds.  The total
+        grain weight then gives the target gravity.  Hop weights give the IBUs
+        for the target BU to GU ratio at the boil gravity of the recipe.
+        Without hop_percent_list no hop additions are made.
+        """  # noqa
+        if target_og is None:
+            target_og = self.target_og
+        count = len(self.grain_list)
+        if not count:
+            raise RecipeException(u"The grain_list must not be empty")
+
+        if percent_list is None:
+            percent_list = [1.0 / count] * count
+        if len(percent_list) != count:
+            raise RecipeException(
+                u"The length of percent_list must equal length of self.grain_list"
+            )  # noqa
+        lower = [0.0] * count
+        upper = [1.0] * count
+        names = [grain.name for grain in self.grain_list]
+        bounds = dict(percent_bounds or {})
+        for name, percent in (fixed_percents or {}).items():
+            bounds[name] = (percent, percent)
+        for name, (low, high) in bounds.items():
+            if name not in self.grain_lookup:
+                raise RecipeException(u"Grain '{}' is not in grain_list".format(name))
+            validate_percentage(low)
+            validate_percentage(high)
+            index = names.index(name)
+            lower[index] = low
+            upper[index] = high
+
+        # Pick the attribute based on units
+        if self.units == IMPERIAL_UNITS:
+            attr = u"ppg"
+        if self.units == SI_UNITS:
+            attr = u"hwe"
+        points = [
+            getattr(grain, attr) * self.brew_house_yield for grain in self.grain_list
+        ]
+
+        direction = None
+        if target_srm is not None:
+            try:
+                ratio = srm_to_mcu(target_srm) / sg_to_gu(target_og)
+            except ColorException as e:
+                raise RecipeException(str(e))
+            # MCU per unit weight in one unit volume, the volume cancels out
+            colors = [
+                calculate_mcu(1.0, grain.color, 1.0, units=self.units)
+                for grain in self.grain_list
+            ]
+            direction = [c - ratio * p for c, p in zip(colors, points)]
+        percents = _project_percentages(percent_list, lower, upper, direction)
+        if percents is None:
+            raise RecipeException(
+                u"The targets cannot be met within the percentage bounds"
+            )
+
+        total_points = sg_to_gu(target_og) * self.final_volume
+        total_weight = total_points / sum(p * q for p, q in zip(percents, points))
+        grain_additions = [
+            GrainAddition(grain, weight=percent * total_weight, units=self.units)
+            for grain, percent in zip(self.grain_list, percents)
+        ]
+
+        hop_additions = []
+        if hop_percent_list is None:
+            return grain_additions, hop_additions
+        if len(hop_percent_list) != len(self.hop_list):
+            raise RecipeException(
+                u"The length of hop_percent_list must equal length of self.hop_list"
+            )  # noqa
+        if boil_time_list is None or len(boil_time_list) != len(self.hop_list):
+            raise RecipeException(
+                u"The length of boil_time_list must equal length of self.hop_list"  # noqa
+            )
+        bg_gu = total_points / ((1.0 - BOIL_EVAPORATION) * self.start_volume)
+        if target_bu_to_gu is None:
+            target_ibu = self.target_ibu
+        else:
+            target_ibu = target_bu_to_gu * bg_gu
+        for hop, percent, boil_time in zip(
+            self.hop_list, hop_percent_list, boil_time_list
+        ):
+            kwargs = {
+                u"boil_time": boil_time,
+                u"hop_type": hop_type,
+                u"utilization_cls": utilization_cls,
+                u"units": self.units,
+            }
+            # IBUs are proportional to the weight of the hops
+            ibus = HopAddition(hop, weight=1.0, **kwargs).get_ibus(
+                gu_to_sg(bg_gu), self.final_volume
+            )
+            weight = target_ibu * validate_percentage(percent) / ibus
+            hop_additions.append(HopAddition(hop, weight=weight, **kwargs))
+        return grain_additions, hop_additions
+
     def get_yeast_attenuation(self, abv):
         """
         Estimate yeast attenuation given a target abv
@@ -1051,3 +1583,28 @@ class RecipeBuilder(object):
         fg = final_gravity_from_abv_standard(self.target_og, abv)
         attenuation = 1.0 - sg_to_gu(fg) / sg_to_gu(self.target_og)
         return attenuation
+
+
+def scale_recipes(
+    recipes, final_volume=None, start_volume=None, brew_house_yield=None, units=None
+):
+    """
+    Scale many recipes to new equipment
+
+    :param iterable recipes: Recipe objects
+    :param float final_volume: The final volume of the wort in the new units
+    :param float start_volume: The starting volume of the wort in the new units
+    :param float brew_house_yield: The brew house yield
+    :param str units: The units
+    :return: The scaled recipes in order
+    :rtype: generator
+
+    See :meth:`Recipe.scale`.  The recipes are scaled as they are consumed.
+    """
+    for recipe in recipes:
+        yield recipe.scale(
+            final_volume=final_volume,
+            start_volume=start_volume,
+            brew_house_yield=brew_house_yield,
+            units=units,
+        )
@@ -1,13 +1,60 @@
 # -*- coding: utf-8 -*-
+import bisect
 import json
+import math
+import multiprocessing
+import os
 import sys
 import textwrap
+import threading
+from collections import deque
+from collections import namedtuple
 
 from .exceptions import ColorException
 from .exceptions import StyleException
+from .utilities.abv import alcohol_by_volume_standard
+from .utilities.arrays import get_numpy
+from .utilities.batch import get_file_stamp
+from .utilities.batch import iter_chunks
 from .validators import validate_required_fields
 
-__all__ = [u"Style"]
+__all__ = [
+    u"Style",
+    u"StyleFactory",
+    u"StyleIndex",
+    u"StyleMatch",
+    u"StyleScanner",
+    u"STYLE_METRICS",
+    u"get_recipe_metrics",
+    u"get_style_index",
+]
+
+#: The recipe metrics compared against a style, in order
+STYLE_METRICS = (u"og", u"fg", u"abv", u"ibu", u"color")
+
+#: A style that a recipe matches with the distance of each metric from the
+#: center of the style range
+StyleMatch = namedtuple(u"StyleMatch", [u"style", u"distance", u"distances"])
+
+
+def get_recipe_metrics(recipe):
+    """
+    Get the metrics of a recipe that are compared against a style
+
+    :param Recipe recipe: A Recipe object
+    :return: The og, fg, abv, ibu and color of the recipe
+    :rtype: tuple
+
+    Each metric is calculated once.  The color is None if it cannot be
+    calculated.
+    """
+    og = recipe.og
+    fg = recipe.fg
+    try:
+        color = recipe.color
+    except ColorException:
+        color = None
+    return (og, fg, alcohol_by_volume_standard(og, fg), recipe.ibu, color)
 
 
 class Style(object):
@@ -266,15 +313,16 @@ class Style(object):
         :return: Errors
         :rtype: list
         """
+        og, fg, abv, ibu, color = get_recipe_metrics(recipe)
         errors = []
-        errors.extend(self.og_errors(recipe.og))
-        errors.extend(self.fg_errors(recipe.fg))
-        errors.extend(self.abv_errors(recipe.abv))
-        errors.extend(self.ibu_errors(recipe.ibu))
-        try:
-            errors.extend(self.color_errors(recipe.color))
-        except ColorException:
+        errors.extend(self.og_errors(og))
+        errors.extend(self.fg_errors(fg))
+        errors.extend(self.abv_errors(abv))
+        errors.extend(self.ibu_errors(ibu))
+        if color is None:
             errors.extend(["Color cannot be calculated"])
+        else:
+            errors.extend(self.color_errors(color))
         return errors
 
     def to_dict(self):
@@ -331,24 +379,63 @@ class Style(object):
 
 
 class StyleFactory(object):
-    def __init__(self, filename):
+    """
+    Create styles from a JSON file
+
+    Each style is created and validated once and the same Style object is
+    returned on later calls, so styles from a factory should not be
+    modified.  A factory may be shared between threads.
+
+    The whole file is read and parsed at once, either when the factory is
+    made or with lazy when the first style is created.  Categories are not
+    parsed separately.
+    """
+
+    def __init__(self, filename, lazy=False):
         """
         :param str filename: The filename of a JSON file containing Styles
+        :param bool lazy: Read the whole file when the first style is created
         """
         self.filename = filename
-        with open(filename, "r") as f:
-            self.data = json.loads(f.read())
-
-    def create_style(self, category, subcategory):
-        """
-        Create a style given a category and subcategory.
-
-        :param int category: The Style Category
-        :param str subcategory: The Style Subcategory
-        :return: A Style Object
-        :rtype: Style
-        """
-        data = self.data.get(str(category), {}).get(subcategory, None)
+        self._data = None
+        self._styles = {}
+        self._lock = threading.RLock()
+        if not lazy:
+            self._load()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state[u"_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _load(self):
+        with self._lock:
+            if self._data is None:
+                with open(self.filename, "r") as f:
+                    self._data = json.loads(f.read())
+        return self._data
+
+    @property
+    def data(self):
+        data = self._data
+        if data is None:
+            data = self._load()
+        return data
+
+    def clear_cache(self):
+        """
+        Forget the created styles and read the file again when next needed
+        """
+        with self._lock:
+            self._data = None
+            self._styles = {}
+
+    def _build_style(self, category, subcategory):
+        data = self.data[category][subcategory]
         return Style(
             data["style"],
             category=data["category"],
@@ -360,6 +447,50 @@ class StyleFactory(object):
             color=data["color"],
         )
 
+    def create_style(self, category, subcategory):
+        """
+        Create a style given a category and subcategory.
+
+        :param int category: The Style Category
+        :param str subcategory: The Style Subcategory
+        :return: A Style Object
+        :rtype: Style
+        :raises StyleException: If the style does not exist or is not valid
+        """
+        key = (str(category), subcategory)
+        style = self._styles.get(key)
+        if style is None:
+            # Only styles in the file are cached, including invalid ones
+            if subcategory not in self.data.get(key[0], {}):
+                raise StyleException(u"Style {}{} does not exist".format(*key))
+            with self._lock:
+                style = self._styles.get(key)
+                if style is None:
+                    try:
+                        style = self._build_style(*key)
+                    except StyleException as e:
+                        style = e
+                    self._styles[key] = style
+        if isinstance(style, StyleException):
+            raise StyleException(*style.args)
+        return style
+
+    def iter_styles(self):
+        """
+        Create every style in the file
+
+        :return: The styles in category and subcategory order
+        :rtype: generator
+
+        Styles which cannot be parsed are skipped.
+        """
+        for category in sorted(self.data.keys(), key=int):
+            for subcategory in sorted(self.data[category].keys()):
+                try:
+                    yield self.create_style(category, subcategory)
+                except StyleException:
+                    continue
+
     def format(self):
         msg = []
         for category in sorted(self.data.keys(), key=int):
@@ -374,3 +505,400 @@ class StyleFactory(object):
                         "{}{} {} - Not parseable".format(category, subcategory, name)
                     )
         return "\n".join(msg)
+
+
+class StyleScanner(object):
+    """
+    Match recipes against many styles at once
+
+    The distance of a metric is how far it is from the center of the style
+    range, in units of half the range.  A metric within the style range has a
+    distance of at most 1.0.  Styles are ranked by the length of the vector of
+    metric distances.
+    """
+
+    def __init__(self, styles):
+        """
+        :param list(Style) styles: The styles to match against
+        """
+        self.styles = list(styles)
+        lower = [[getattr(s, m)[0] for m in STYLE_METRICS] for s in self.styles]
+        upper = [[getattr(s, m)[1] for m in STYLE_METRICS] for s in self.styles]
+        np = get_numpy()
+        if np is not None:
+            lower = np.array(lower, dtype=float).reshape(-1, len(STYLE_METRICS))
+            upper = np.array(upper, dtype=float).reshape(-1, len(STYLE_METRICS))
+            self.center = (lower + upper) / 2.0
+            self.half_width = (upper - lower) / 2.0
+        else:
+            self.center = [
+                [(lo + up) / 2.0 for lo, up in zip(los, ups)]
+                for los, ups in zip(lower, upper)
+            ]
+            self.half_width = [
+                [(up - lo) / 2.0 for lo, up in zip(los, ups)]
+                for los, ups in zip(lower, upper)
+            ]
+
+    def __len__(self):
+        return len(self.styles)
+
+    @classmethod
+    def from_factory(cls, factory):
+        """
+        Create a scanner for every style in a StyleFactory
+
+        :param StyleFactory factory: The style factory
+        :return: The scanner
+        :rtype: StyleScanner
+
+        Styles which cannot be parsed are skipped.
+        """
+        return cls(factory.iter_styles())
+
+    @classmethod
+    def _get_distance(cls, value, center, half_width):
+        if value is None:
+            return float(u"inf")
+        if half_width == 0:
+            return 0.0 if value == center else float(u"inf")
+        return abs(value - center) / half_width
+
+    def get_distances(self, metrics):
+        """
+        Get the distance of each metric from each style
+
+        :param tuple metrics: The og, fg, abv, ibu and color of a recipe
+        :return: One row of metric distances per style
+        :rtype: numpy.ndarray or list
+        """
+        np = get_numpy()
+        if np is None:
+            return [
+                [
+                    self._get_distance(value, c, w)
+                    for value, c, w in zip(metrics, centers, half_widths)
+                ]
+                for centers, half_widths in zip(self.center, self.half_width)
+            ]
+        values = np.array(
+            [np.nan if value is None else value for value in metrics], dtype=float
+        )
+        with np.errstate(divide=u"ignore", invalid=u"ignore"):
+            offset = np.abs(values - self.center)
+            distances = np.where(offset == 0, 0.0, offset / self.half_width)
+        return np.where(np.isnan(distances), np.inf, distances)
+
+    def scan_metrics(self, metrics, max_distance=1.0, limit=None):
+        """
+        Rank the styles that match recipe metrics
+
+        :param tuple metrics: The og, fg, abv, ibu and color of a recipe
+        :param float max_distance: The largest distance of any metric from a matching style
+        :param int limit: The maximum number of matches to return
+        :return: The matching styles, closest first
+        :rtype: list(StyleMatch)
+        """  # noqa
+        distances = self.get_distances(metrics)
+        np = get_numpy()
+        if np is None:
+            ranked = [
+                (math.sqrt(sum(d * d for d in row)), index)
+                for index, row in enumerate(distances)
+                if max(row) <= max_distance
+            ]
+            ranked.sort()
+        else:
+            indexes = np.flatnonzero(np.max(distances, axis=1) <= max_distance)
+            totals = np.sqrt(np.sum(distances[indexes] ** 2, axis=1))
+            order = np.argsort(totals, kind=u"stable")
+            ranked = zip(totals[order].tolist(), indexes[order].tolist())
+        matches = []
+        for total, index in ranked:
+            if limit is not None and len(matches) >= limit:
+                break
+            row = [float(d) for d in distances[index]]
+            matches.append(
+                StyleMatch(self.styles[index], total, dict(zip(STYLE_METRICS, row)))
+            )
+        return matches
+
+    def scan(self, recipe, max_distance=1.0, limit=None):
+        """
+        Rank the styles that match a recipe
+
+        :param Recipe recipe: A Recipe object
+        :param float max_distance: The largest distance of any metric from a matching style
+        :param int limit: The maximum number of matches to return
+        :return: The matching styles, closest first
+        :rtype: list(StyleMatch)
+        """  # noqa
+        return self.scan_metrics(
+            get_recipe_metrics(recipe), max_distance=max_distance, limit=limit
+        )
+
+    def _scan_chunk(self, recipes, max_distance, limit):
+        return [
+            self.scan(recipe, max_distance=max_distance, limit=limit)
+            for recipe in recipes
+        ]
+
+    def scan_recipes(
+        self,
+        recipes,
+        max_distance=1.0,
+        limit=None,
+        processes=1,
+        chunksize=100,
+        max_pending=None,
+    ):
+        """
+        Rank the styles that match many recipes
+
+        :param iterable recipes: Recipe objects
+        :param float max_distance: The largest distance of any metric from a matching style
+        :param int limit: The maximum number of matches to return per recipe
+        :param int processes: The number of worker processes, 1 scans in this process
+        :param int chunksize: The number of recipes sent to a worker at a time
+        :param int max_pending: The maximum number of chunks being scanned at once (default: twice the processes)
+        :return: The matching styles of each recipe in order
+        :rtype: generator of list(StyleMatch)
+        """  # noqa
+        if chunksize < 1:
+            raise ValueError(u"Chunk size must be at least 1")
+
+        if processes is None or processes <= 1:
+            for _, chunk in iter_chunks(recipes, chunksize):
+                for matches in self._scan_chunk(chunk, max_distance, limit):
+                    yield matches
+            return
+
+        if max_pending is None:
+            max_pending = processes * 2
+        pool = multiprocessing.Pool(
+            processes,
+            initializer=_init_scanner_worker,
+            initargs=(self, max_distance, limit),
+        )
+        try:
+            pending = deque()
+            for _, chunk in iter_chunks(recipes, chunksize):
+                pending.append(pool.apply_async(_scan_chunk_worker, (chunk,)))
+                if len(pending) >= max_pending:
+                    for matches in pending.popleft().get():
+                        yield matches
+            while pending:
+                for matches in pending.popleft().get():
+                    yield matches
+        finally:
+            pool.terminate()
+            pool.join()
+
+
+_SCANNER_STATE = {}
+
+
+def _init_scanner_worker(scanner, max_distance, limit):
+    _SCANNER_STATE[u"scanner"] = scanner
+    _SCANNER_STATE[u"max_distance"] = max_distance
+    _SCANNER_STATE[u"limit"] = limit
+
+
+def _scan_chunk_worker(recipes):
+    return _SCANNER_STATE[u"scanner"]._scan_chunk(
+        recipes, _SCANNER_STATE[u"max_distance"], _SCANNER_STATE[u"limit"]
+    )
+
+
+class StyleIndex(object):
+    """
+    An index of style ranges to find the styles that fit a beer
+
+    The lower and upper bound of each metric are kept in sorted order.  A
+    query uses a binary search on each bound to count the styles that could
+    match and only checks the styles of the most selective bound.
+    """
+
+    def __init__(self, styles):
+        """
+        :param list(Style) styles: The styles to index
+        """
+        self.styles = list(styles)
+        self.scanner = StyleScanner(self.styles)
+        self.lower = {}
+        self.upper = {}
+        for metric in STYLE_METRICS:
+            lower = sorted(
+                (getattr(style, metric)[0], index)
+                for index, style in enumerate(self.styles)
+            )
+            upper = sorted(
+                (getattr(style, metric)[1], index)
+                for index, style in enumerate(self.styles)
+            )
+            self.lower[metric] = ([v for v, _ in lower], [i for _, i in lower])
+            self.upper[metric] = ([v for v, _ in upper], [i for _, i in upper])
+
+    def __len__(self):
+        return len(self.styles)
+
+    @classmethod
+    def from_factory(cls, factory):
+        """
+        Create an index of every style in a StyleFactory
+
+        :param StyleFactory factory: The style factory
+        :return: The index
+        :rtype: StyleIndex
+
+        Styles which cannot be parsed are skipped.
+        """
+        return cls(factory.iter_styles())
+
+    def _get_candidates(self, metrics):
+        """
+        Get the styles allowed by the most selective bound
+
+        :param dict metrics: Metric values by name
+        :return: The indexes of the candidate styles
+        :rtype: list
+        """
+        candidates = range(len(self.styles))
+        for metric, value in metrics.items():
+            values, indexes = self.lower[metric]
+            # Styles with a lower bound at or below the value
+            end = bisect.bisect_right(values, value)
+            if end < len(candidates):
+                candidates = indexes[:end]
+            values, indexes = self.upper[metric]
+            # Styles with an upper bound at or above the value
+            start = bisect.bisect_left(values, value)
+            if len(values) - start < len(candidates):
+                candidates = indexes[start:]
+        return candidates
+
+    def _get_metrics(self, og, fg, abv, ibu, color):
+        metrics = dict(zip(STYLE_METRICS, (og, fg, abv, ibu, color)))
+        return {key: value for key, value in metrics.items() if value is not None}
+
+    def get_styles(self, og=None, fg=None, abv=None, ibu=None, color=None):
+        """
+        Get the styles that fit a beer
+
+        :param float og: Original Gravity
+        :param float fg: Final Gravity
+        :param float abv: Alcohol by Volume
+        :param float ibu: IBU
+        :param float color: Color in SRM
+        :return: The styles with every given metric in range, in index order
+        :rtype: list(Style)
+
+        Metrics which are None are not checked.
+        """
+        metrics = self._get_metrics(og, fg, abv, ibu, color)
+        matches = []
+        for index in sorted(self._get_candidates(metrics)):
+            style = self.styles[index]
+            if all(
+                getattr(style, metric)[0] <= value <= getattr(style, metric)[1]
+                for metric, value in metrics.items()
+            ):
+                matches.append(style)
+        return matches
+
+    def get_nearest_styles(
+        self, og=None, fg=None, abv=None, ibu=None, color=None, limit=1
+    ):
+        """
+        Get the styles closest to a beer
+
+        :param float og: Original Gravity
+        :param float fg: Final Gravity
+        :param float abv: Alcohol by Volume
+        :param float ibu: IBU
+        :param float color: Color in SRM
+        :param int limit: The maximum number of styles to return
+        :return: The closest styles first
+        :rtype: list(StyleMatch)
+
+        The distance of each metric is measured from the center of the
+        style range as in :class:`StyleScanner`.  Metrics which are None are
+        not measured.
+        """
+        metrics = self._get_metrics(og, fg, abv, ibu, color)
+        given = [i for i, metric in enumerate(STYLE_METRICS) if metric in metrics]
+        values = tuple(metrics.get(metric) for metric in STYLE_METRICS)
+        distances = self.scanner.get_distances(values)
+        ranked = []
+        for index, row in enumerate(distances):
+            row = [float(row[i]) for i in given]
+            ranked.append((math.sqrt(sum(d * d for d in row)), index, row))
+        ranked.sort(key=lambda item: item[:2])
+        return [
+            StyleMatch(
+                self.styles[index],
+                total,
+                dict(zip([STYLE_METRICS[i] for i in given], row)),
+            )
+            for total, index, row in ranked[:limit]
+        ]
+
+    def find_styles(
+        self, og=None, fg=None, abv=None, ibu=None, color=None, nearest=1
+    ):
+        """
+        Get the styles that fit a beer or the closest styles if none fit
+
+        :param float og: Original Gravity
+        :param float fg: Final Gravity
+        :param float abv: Alcohol by Volume
+        :param float ibu: IBU
+        :param float color: Color in SRM
+        :param int nearest: The number of closest styles to return if none fit
+        :return: The styles
+        :rtype: list(Style)
+        """
+        styles = self.get_styles(og=og, fg=fg, abv=abv, ibu=ibu, color=color)
+        if styles or not nearest:
+            return styles
+        matches = self.get_nearest_styles(
+            og=og, fg=fg, abv=abv, ibu=ibu, color=color, limit=nearest
+        )
+        return [match.style for match in matches]
+
+    def find_recipe_styles(self, recipe, nearest=1):
+        """
+        Get the styles that fit a recipe or the closest styles if none fit
+
+        :param Recipe recipe: A Recipe object
+        :param int nearest: The number of closest styles to return if none fit
+        :return: The styles
+        :rtype: list(Style)
+        """
+        og, fg, abv, ibu, color = get_recipe_metrics(recipe)
+        return self.find_styles(
+            og=og, fg=fg, abv=abv, ibu=ibu, color=color, nearest=nearest
+        )
+
+
+_STYLE_INDEXES = {}
+
+
+def get_style_index(filename):
+    """
+    Get the index of a style file
+
+    :param str filename: The filename of a JSON file containing Styles
+    :return: The index
+    :rtype: StyleIndex
+
+    The index is built once and reused until the file changes.
+    """
+    key = os.path.abspath(filename)
+    stamp = get_file_stamp(key)
+    cached = _STYLE_INDEXES.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    index = StyleIndex.from_factory(StyleFactory(filename))
+    _STYLE_INDEXES[key] = (stamp, index)
+    return index
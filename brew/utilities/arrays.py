@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for the array versions of the utilities.
+
+NumPy is an optional dependency.  When it is installed the array functions
+evaluate in a single vectorized pass and return masked arrays where values
+are out of range.  Without NumPy they fall back to calling the scalar
+function for each value and return lists with ``None`` for masked values.
+"""
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+__all__ = [u"get_numpy", u"as_array", u"masked", u"map_scalar"]
+
+
+def get_numpy():
+    """
+    Get the NumPy module if it is installed
+
+    :return: The NumPy module or None
+    """
+    return numpy
+
+
+def is_sequence(values):
+    """
+    Determine if values is a sequence rather than a single value
+
+    :param values: A value, sequence, NumPy array or buffer
+    :return: True if values can be iterated over, otherwise False
+    :rtype: bool
+    """
+    if isinstance(values, (str, bytes)):
+        return False
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.ndim > 0
+    return hasattr(values, u"__iter__")
+
+
+def as_array(values):
+    """
+    Convert values to a NumPy array of floats
+
+    :param values: A value, sequence, NumPy array or buffer
+    :return: The values as an array of floats
+    :rtype: numpy.ndarray
+    """
+    if isinstance(values, memoryview):
+        values = values.tolist()
+    return numpy.asarray(values, dtype=float)
+
+
+def masked(values, mask):
+    """
+    Mask values which are out of range
+
+    :param numpy.ndarray values: The computed values
+    :param numpy.ndarray mask: True where the value is not valid
+    :return: The values with the invalid entries masked
+    :rtype: numpy.ma.MaskedArray
+    """
+    mask = numpy.broadcast_to(mask, numpy.shape(values))
+    return numpy.ma.masked_array(values, mask=mask)
+
+
+def map_scalar(func, columns, exceptions=(), kwargs=None):
+    """
+    Apply a scalar function to each row of the columns
+
+    :param func: The scalar function
+    :param list columns: The positional arguments to the function as values or sequences
+    :param tuple exceptions: Exceptions which mask the value instead of being raised
+    :param dict kwargs: Keyword arguments passed to every call
+    :return: A list of values or a single value if no column is a sequence
+    :rtype: list
+
+    Single values are repeated for the length of the sequences.  Masked values
+    are returned as ``None``.
+    """  # noqa
+    kwargs = kwargs or {}
+    sequences = [is_sequence(column) for column in columns]
+    if not any(sequences):
+        try:
+            return func(*columns, **kwargs)
+        except exceptions:
+            return None
+
+    columns = [
+        list(column) if sequence else column
+        for column, sequence in zip(columns, sequences)
+    ]
+    length = max(
+        len(column) for column, sequence in zip(columns, sequences) if sequence
+    )
+    columns = [
+        column if sequence else [column] * length
+        for column, sequence in zip(columns, sequences)
+    ]
+    out = []
+    for row in zip(*columns):
+        try:
+            out.append(func(*row, **kwargs))
+        except exceptions:
+            out.append(None)
+    return out
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for processing data files and records in batches.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+
+__all__ = [
+    u"BATCH_FORMATS",
+    u"get_batch_format",
+    u"get_file_stamp",
+    u"iter_batch_rows",
+    u"iter_chunks",
+    u"iter_range",
+    u"positive_int",
+]
+
+#: The formats of batch input and output
+BATCH_FORMATS = [u"csv", u"ndjson"]
+
+
+def get_file_stamp(filename):
+    """
+    Get the modification time and size of a file
+
+    :param str filename: The filename of the file
+    :return: The modification time and size or None if it does not exist
+    :rtype: tuple
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime, stat.st_size)
+
+
+def iter_chunks(items, chunksize):
+    """
+    Split an iterable into chunks
+
+    :param items: The items to split
+    :param int chunksize: The number of items in each chunk
+    :return: The index of the first item and the items in each chunk
+    :rtype: generator
+    """
+    start = 0
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunksize:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def get_batch_format(filename):
+    """
+    Get the batch format from a file name
+
+    :param str filename: The name of the file
+    :return: 'ndjson' for .ndjson, .jsonl and .json files, otherwise 'csv'
+    :rtype: str
+    """
+    if filename.lower().endswith((u".ndjson", u".jsonl", u".json")):
+        return u"ndjson"
+    return u"csv"
+
+
+def iter_batch_rows(lines, fmt=u"csv"):
+    """
+    Read the rows of a batch
+
+    :param lines: Lines of CSV with a header row or lines of JSON objects
+    :param str fmt: The format, 'csv' or 'ndjson'
+    :return: The line number, the row and the error for each row
+    :rtype: generator
+
+    Lines of JSON which cannot be decoded have no row.  Blank lines are
+    skipped.
+    """
+    if fmt == u"csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(u"Row must be a JSON object")
+        except ValueError as e:
+            yield line_number, None, e
+            continue
+        yield line_number, row, None
+
+
+def iter_range(start, stop, step):
+    """
+    Get the values of a range including the stop value
+
+    :param float start: The first value
+    :param float stop: The last value
+    :param float step: The difference between values
+    :return: The values
+    :rtype: generator
+    :raises ValueError: If the step is zero or goes away from the stop value
+
+    Each value is computed from start and rounded to 10 decimal places so
+    error does not accumulate.
+    """
+    if not step:
+        raise ValueError(u"Step must not be zero")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    if count < 1:
+        raise ValueError(u"Step must go from start towards stop")
+    return (round(start + index * step, 10) for index in range(count))
+
+
+def positive_int(value):
+    """
+    Parse a command line option which must be a whole number of at least one
+
+    :param str value: The option value
+    :return: The number
+    :rtype: int
+    :raises argparse.ArgumentTypeError: If the number is less than one
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(u"must be at least 1: '{}'".format(value))
+    return number
@@ -5,6 +5,10 @@ from ..constants import POUND_PER_KG
 from ..constants import SI_UNITS
 from ..exceptions import ColorException
 from ..validators import validate_units
+from .arrays import as_array
+from .arrays import get_numpy
+from .arrays import map_scalar
+from .arrays import masked
 
 __all__ = [
     u"srm_to_ebc",
@@ -17,12 +21,32 @@ __all__ = [
     u"calculate_srm_morey_hybrid",
     u"calculate_srm_morey",
     u"calculate_srm",
+    u"srm_to_mcu",
     u"lovibond_to_srm",
     u"srm_to_lovibond",
     u"srm_to_a430",
     u"ebc_to_a430",
+    u"calculate_srm_models",
+    u"calculate_mcu_array",
+    u"calculate_srm_mosher_array",
+    u"calculate_srm_daniels_array",
+    u"calculate_srm_daniels_power_array",
+    u"calculate_srm_noonan_power_array",
+    u"calculate_srm_morey_hybrid_array",
+    u"calculate_srm_morey_array",
+    u"calculate_srm_array",
+    u"calculate_srm_models_array",
 ]
 
+#: Below this MCU the Mosher equation does not work
+MCU_MIN_MOSHER = 7.0
+
+#: Below this MCU the Daniels equation does not work
+MCU_MIN_DANIELS = 11.0
+
+#: Above this SRM the power equations do not work
+SRM_MAX = 50.0
+
 
 def srm_to_ebc(srm):
     """
@@ -77,7 +101,7 @@ def calculate_srm_mosher(mcu):
     :rtype: float
     :raises ColorException: If the MCU is < 7.0
     """  # noqa
-    if mcu < 7.0:
+    if mcu < MCU_MIN_MOSHER:
         raise ColorException(u"Mosher equation does not work for MCU < 7.0")
     srm = (mcu * 0.3) + 4.7
     return srm
@@ -92,7 +116,7 @@ def calculate_srm_daniels(mcu):
     :rtype: float
     :raises ColorException: If the MCU is < 11.0
     """  # noqa
-    if mcu < 11.0:
+    if mcu < MCU_MIN_DANIELS:
         raise ColorException(u"Daniels equation does not work for MCU < 11.0")
     srm = (mcu * 0.2) + 8.4
     return srm
@@ -108,7 +132,7 @@ def calculate_srm_daniels_power(mcu):
     :raises ColorException: If the SRM is > 50.0
     """  # noqa
     srm = 1.73 * (mcu ** 0.64) - 0.27
-    if srm > 50.0:
+    if srm > SRM_MAX:
         raise ColorException(
             u"Daniels Power equation does not work above SRM 50.0"
         )  # noqa
@@ -125,7 +149,7 @@ def calculate_srm_noonan_power(mcu):
     :raises ColorException: If the SRM is > 50.0
     """  # noqa
     srm = 15.03 * (mcu ** 0.27) - 15.53
-    if srm > 50.0:
+    if srm > SRM_MAX:
         raise ColorException(
             u"Noonan Power equation does not work above SRM 50.0"
         )  # noqa
@@ -187,7 +211,7 @@ def calculate_srm_morey(mcu):
     * http://beersmith.com/blog/2008/04/29/beer-color-understanding-srm-lovibond-and-ebc/
     """  # noqa
     srm = 1.4922 * (mcu ** 0.6859)
-    if srm > 50.0:
+    if srm > SRM_MAX:
         raise ColorException(u"Morey equation does not work above SRM 50.0")
     return srm
 
@@ -204,6 +228,20 @@ def calculate_srm(mcu):
     return calculate_srm_morey(mcu)
 
 
+def srm_to_mcu(srm):
+    """
+    Get the MCU that gives an SRM Color using the Morey Power Equation
+
+    :param float srm: SRM Color
+    :return: The Malt Color Units
+    :rtype: float
+    :raises ColorException: If the SRM is < 0.0 or > 50.0
+    """
+    if srm < 0.0 or srm > SRM_MAX:
+        raise ColorException(u"Morey equation only works from SRM 0.0 to 50.0")
+    return (srm / 1.4922) ** (1.0 / 0.6859)
+
+
 def lovibond_to_srm(lovibond):
     """
     Convert deg Lovibond to SRM
@@ -264,3 +302,177 @@ def ebc_to_a430(ebc, dilution=1.0):
     * https://en.wikipedia.org/wiki/Standard_Reference_Method
     """  # noqa
     return srm_to_a430(ebc_to_srm(ebc), dilution=dilution)
+
+
+def calculate_srm_models(mcu):
+    """
+    Calculate SRM with the Morey, Daniels and Mosher Equations
+
+    :param float mcu: The Malt Color Units
+    :return: SRM Color by model name, None where the model does not work
+    :rtype: dict
+
+    The range of each model is checked before it is calculated so no
+    ColorException is raised.
+    """
+    srm_morey = 1.4922 * (mcu ** 0.6859)
+    return {
+        u"morey": srm_morey if srm_morey <= SRM_MAX else None,
+        u"daniels": (mcu * 0.2) + 8.4 if mcu >= MCU_MIN_DANIELS else None,
+        u"mosher": (mcu * 0.3) + 4.7 if mcu >= MCU_MIN_MOSHER else None,
+    }
+
+
+def calculate_mcu_array(grain_weight, beer_color, final_volume, units=IMPERIAL_UNITS):
+    """
+    Calculate MCU from Grain for many values
+
+    :param grain_weight: Grain weights in lbs or kg as a sequence, NumPy array or buffer
+    :param beer_color: Beer colors in deg Lovibond as a sequence, NumPy array or buffer
+    :param final_volume: Final Volumes in gal or liters as a sequence, NumPy array or buffer
+    :param str units: The units
+    :return: The Malt Color Units
+    :rtype: numpy.ndarray or list
+    """  # noqa
+    validate_units(units)
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            calculate_mcu,
+            [grain_weight, beer_color, final_volume],
+            kwargs={u"units": units},
+        )
+    return calculate_mcu(
+        as_array(grain_weight), as_array(beer_color), as_array(final_volume), units
+    )
+
+
+def calculate_srm_mosher_array(mcu):
+    """
+    Mosher Equation for SRM for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the MCU is < 7.0
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(calculate_srm_mosher, [mcu], exceptions=(ColorException,))
+    mcu = as_array(mcu)
+    return masked((mcu * 0.3) + 4.7, mcu < MCU_MIN_MOSHER)
+
+
+def calculate_srm_daniels_array(mcu):
+    """
+    Daniels Equation for SRM for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the MCU is < 11.0
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(calculate_srm_daniels, [mcu], exceptions=(ColorException,))
+    mcu = as_array(mcu)
+    return masked((mcu * 0.2) + 8.4, mcu < MCU_MIN_DANIELS)
+
+
+def calculate_srm_daniels_power_array(mcu):
+    """
+    Daniels Power Equation for SRM for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the SRM is > 50.0
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            calculate_srm_daniels_power, [mcu], exceptions=(ColorException,)
+        )
+    srm = 1.73 * (as_array(mcu) ** 0.64) - 0.27
+    return masked(srm, srm > SRM_MAX)
+
+
+def calculate_srm_noonan_power_array(mcu):
+    """
+    Noonan Power Equation for SRM for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the SRM is > 50.0
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            calculate_srm_noonan_power, [mcu], exceptions=(ColorException,)
+        )
+    srm = 15.03 * (as_array(mcu) ** 0.27) - 15.53
+    return masked(srm, srm > SRM_MAX)
+
+
+def calculate_srm_morey_hybrid_array(mcu):
+    """
+    A hybrid approach used by Morey for SRM for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the MCU is outside the range of the hybrid
+    :rtype: numpy.ma.MaskedArray or list
+
+    See :func:`calculate_srm_morey_hybrid` for the ranges of each equation.
+    """  # noqa
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            calculate_srm_morey_hybrid, [mcu], exceptions=(ColorException,)
+        )
+    mcu = as_array(mcu)
+    srm = np.select(
+        [mcu < 10, mcu < 37], [mcu, (mcu * 0.2) + 8.4], default=(mcu * 0.3) + 4.7
+    )
+    invalid = (mcu <= 0) | (mcu >= 50) | ((10 <= mcu) & (mcu < MCU_MIN_DANIELS))
+    return masked(srm, invalid)
+
+
+def calculate_srm_morey_array(mcu):
+    """
+    Morey Equation for SRM for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the SRM is > 50.0
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(calculate_srm_morey, [mcu], exceptions=(ColorException,))
+    srm = 1.4922 * (as_array(mcu) ** 0.6859)
+    return masked(srm, srm > SRM_MAX)
+
+
+def calculate_srm_array(mcu):
+    """
+    General SRM calculation using the Morey Power Equation for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color with values masked where the SRM is > 50.0
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    return calculate_srm_morey_array(mcu)
+
+
+def calculate_srm_models_array(mcu):
+    """
+    Calculate SRM with the Morey, Daniels and Mosher Equations for many values
+
+    :param mcu: The Malt Color Units as a sequence, NumPy array or buffer
+    :return: SRM Color by model name with values masked where the model does not work
+    :rtype: dict
+    """  # noqa
+    np = get_numpy()
+    if np is not None:
+        mcu = as_array(mcu)
+    return {
+        u"morey": calculate_srm_morey_array(mcu),
+        u"daniels": calculate_srm_daniels_array(mcu),
+        u"mosher": calculate_srm_mosher_array(mcu),
+    }
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Dilution and concentration of wort or beer.
+
+The sugar in a volume does not change when water is added or boiled off,
+so the gravity units times the volume stays the same.
+"""
+from ..exceptions import SugarException
+from .arrays import as_array
+from .arrays import get_numpy
+from .arrays import map_scalar
+from .arrays import masked
+from .sugar import gu_to_sg
+from .sugar import sg_to_gu
+
+__all__ = [
+    u"dilute_gravity",
+    u"volume_for_gravity",
+    u"top_up_volume",
+    u"dilute_gravity_array",
+    u"volume_for_gravity_array",
+    u"top_up_volume_array",
+]
+
+
+def dilute_gravity(original_volume, final_volume, gravity):
+    """
+    Gravity after diluting or concentrating to a new volume
+
+    :param float original_volume: The volume at the gravity
+    :param float final_volume: The volume after adding or removing water
+    :param float gravity: Specific Gravity at the original volume
+    :return: Specific Gravity at the final volume
+    :rtype: float
+    :raises SugarException: If a volume is not greater than zero
+    """
+    if original_volume <= 0.0 or final_volume <= 0.0:
+        raise SugarException(u"Volumes must be greater than zero")
+    return gu_to_sg(sg_to_gu(gravity) * original_volume / final_volume)
+
+
+def volume_for_gravity(original_volume, gravity, target_gravity):
+    """
+    Volume to dilute or concentrate to for a target gravity
+
+    :param float original_volume: The volume at the gravity
+    :param float gravity: Specific Gravity at the original volume
+    :param float target_gravity: The Specific Gravity wanted
+    :return: The volume with the target gravity
+    :rtype: float
+    :raises SugarException: If the volume is not greater than zero or a gravity is not greater than 1.0
+    """  # noqa
+    if original_volume <= 0.0:
+        raise SugarException(u"Volumes must be greater than zero")
+    if gravity <= 1.0 or target_gravity <= 1.0:
+        raise SugarException(u"Gravities must be greater than 1.0")
+    return original_volume * sg_to_gu(gravity) / sg_to_gu(target_gravity)
+
+
+def top_up_volume(original_volume, gravity, target_gravity):
+    """
+    Water to add for a target gravity
+
+    :param float original_volume: The volume at the gravity
+    :param float gravity: Specific Gravity at the original volume
+    :param float target_gravity: The Specific Gravity wanted
+    :return: The volume of water to add, negative when the volume must be boiled down instead
+    :rtype: float
+    :raises SugarException: If the volume is not greater than zero or a gravity is not greater than 1.0
+    """  # noqa
+    volume = volume_for_gravity(original_volume, gravity, target_gravity)
+    return volume - original_volume
+
+
+def dilute_gravity_array(original_volume, final_volume, gravity):
+    """
+    Gravity after diluting or concentrating to a new volume for many values
+
+    :param original_volume: Volumes at the gravity as a sequence, NumPy array or buffer
+    :param final_volume: Volumes after adding or removing water as a sequence, NumPy array or buffer
+    :param gravity: Specific Gravity values at the original volume as a sequence, NumPy array or buffer
+    :return: Specific Gravity at the final volume with values masked where a volume is not greater than zero
+    :rtype: numpy.ma.MaskedArray or list
+    """  # noqa
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            dilute_gravity,
+            [original_volume, final_volume, gravity],
+            exceptions=(SugarException,),
+        )
+    original_volume = as_array(original_volume)
+    final_volume = as_array(final_volume)
+    invalid = (original_volume <= 0.0) | (final_volume <= 0.0)
+    with np.errstate(divide=u"ignore", invalid=u"ignore"):
+        out = gu_to_sg(sg_to_gu(as_array(gravity)) * original_volume / final_volume)
+    return masked(out, invalid)
+
+
+def volume_for_gravity_array(original_volume, gravity, target_gravity):
+    """
+    Volume to dilute or concentrate to for a target gravity for many values
+
+    :param original_volume: Volumes at the gravity as a sequence, NumPy array or buffer
+    :param gravity: Specific Gravity values at the original volume as a sequence, NumPy array or buffer
+    :param target_gravity: The Specific Gravity values wanted as a sequence, NumPy array or buffer
+    :return: The volumes with the target gravity with values masked where the volume is not greater than zero or a gravity is not greater than 1.0
+    :rtype: numpy.ma.MaskedArray or list
+    """  # noqa
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            volume_for_gravity,
+            [original_volume, gravity, target_gravity],
+            exceptions=(SugarException,),
+        )
+    original_volume = as_array(original_volume)
+    gravity = as_array(gravity)
+    target_gravity = as_array(target_gravity)
+    invalid = (original_volume <= 0.0) | (gravity <= 1.0) | (target_gravity <= 1.0)
+    with np.errstate(divide=u"ignore", invalid=u"ignore"):
+        out = original_volume * sg_to_gu(gravity) / sg_to_gu(target_gravity)
+    return masked(out, invalid)
+
+
+def top_up_volume_array(original_volume, gravity, target_gravity):
+    """
+    Water to add for a target gravity for many values
+
+    :param original_volume: Volumes at the gravity as a sequence, NumPy array or buffer
+    :param gravity: Specific Gravity values at the original volume as a sequence, NumPy array or buffer
+    :param target_gravity: The Specific Gravity values wanted as a sequence, NumPy array or buffer
+    :return: The volumes of water to add with values masked where the volume is not greater than zero or a gravity is not greater than 1.0
+    :rtype: numpy.ma.MaskedArray or list
+
+    Negative volumes must be boiled down instead.
+    """  # noqa
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            top_up_volume,
+            [original_volume, gravity, target_gravity],
+            exceptions=(SugarException,),
+        )
+    original_volume = as_array(original_volume)
+    volume = volume_for_gravity_array(original_volume, gravity, target_gravity)
+    return volume - original_volume
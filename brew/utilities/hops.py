@@ -1,5 +1,11 @@
 # -*- coding: utf-8 -*-
+import copy
+import json
 import math
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from ..constants import HOP_TYPE_PELLET
 from ..constants import HOP_TYPE_PLUG
@@ -13,10 +19,16 @@ from ..constants import IMPERIAL_TYPES
 from ..constants import IMPERIAL_UNITS
 from ..constants import SI_TYPES
 from ..constants import SI_UNITS
+from ..exceptions import HopException
 from ..validators import validate_units
+from .arrays import as_array
+from .arrays import get_numpy
+from .arrays import map_scalar
+from .versions import bump_version
 
 __all__ = [
     u"hop_type_weight_conversion",
+    u"UtilizationSurface",
     u"HopsUtilization",
     u"HopsUtilizationJackieRager",
     u"HopsUtilizationGlennTinseth",
@@ -56,14 +68,368 @@ def hop_type_weight_conversion(weight, old_type, new_type):
     return weight * conversion
 
 
+#: The most utilization surfaces and tables kept in each cache
+UTILIZATION_CACHE_SIZE = 16
+
+#: A cache of utilization surfaces by class, file and resolution
+_UTILIZATION_SURFACES = OrderedDict()
+
+#: A cache of utilization tables by class, gravities, boil times and rounding
+_UTILIZATION_TABLES = OrderedDict()
+
+#: The default resolution of a utilization surface, see UtilizationSurface.build
+UTILIZATION_SURFACE_RESOLUTION = {
+    u"sg_min": 1.000,
+    u"sg_max": 1.150,
+    u"sg_step": 0.001,
+    u"boil_time_min": 0.0,
+    u"boil_time_max": 120.0,
+    u"boil_time_step": 1.0,
+}
+
+#: The utilization surfaces in use by class in each thread
+_ACTIVE_SURFACES = threading.local()
+
+#: A cache of shared utilization objects by class and kwargs
+_SHARED_UTILIZATIONS = {}
+
+
+def _get_linear_error_bound(step, curvature, slope_jump=0.0):
+    """
+    Get the largest error of linear interpolation over one step
+
+    :param float step: The width of the step
+    :param float curvature: The largest absolute second derivative in the step
+    :param float slope_jump: The absolute change in slope at a kink in the step
+    :return: The error bound
+    :rtype: float
+    """
+    return step * step * curvature / 8.0 + step * slope_jump / 4.0
+
+
+def _cache_get(cache, key):
+    """
+    Get a value from a bounded cache and mark it as recently used
+    """
+    value = cache.pop(key, None)
+    if value is not None:
+        cache[key] = value
+    return value
+
+
+def _cache_set(cache, key, value):
+    """
+    Store a value in a bounded cache, evicting the least recently used
+    """
+    cache[key] = value
+    while len(cache) > UTILIZATION_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+class UtilizationSurface(object):
+    """
+    A precomputed grid of percent utilization for specific gravity vs boil
+    time which is evaluated with bilinear interpolation.
+
+    The error bound is derived from the grid spacing and the second
+    derivatives of the utilization, see
+    :meth:`HopsUtilization.get_interpolation_error_bound`, so it holds at
+    every point inside the surface.  It is checked against the error at the
+    center and edge midpoints of every cell when the surface is built.
+    """
+
+    def __init__(
+        self,
+        utilization_cls_name,
+        sg_min,
+        sg_step,
+        boil_time_min,
+        boil_time_step,
+        table,
+        error_bound=None,
+    ):
+        """
+        :param str utilization_cls_name: The name of the utilization class
+        :param float sg_min: The lowest specific gravity in the grid
+        :param float sg_step: The step between specific gravities
+        :param float boil_time_min: The lowest boil time in the grid
+        :param float boil_time_step: The step between boil times
+        :param list table: Utilization by boil time row and gravity column
+        :param float error_bound: The maximum interpolation error
+        """
+        self.utilization_cls_name = utilization_cls_name
+        self.sg_min = sg_min
+        self.sg_step = sg_step
+        self.boil_time_min = boil_time_min
+        self.boil_time_step = boil_time_step
+        self.table = table
+        self.error_bound = error_bound
+        self.sg_max = sg_min + sg_step * (len(table[0]) - 1)
+        self.boil_time_max = boil_time_min + boil_time_step * (len(table) - 1)
+        # The table as a NumPy array, made on first use
+        self._array = None
+
+    @classmethod
+    def build(
+        cls,
+        utilization_cls,
+        sg_min=UTILIZATION_SURFACE_RESOLUTION[u"sg_min"],
+        sg_max=UTILIZATION_SURFACE_RESOLUTION[u"sg_max"],
+        sg_step=UTILIZATION_SURFACE_RESOLUTION[u"sg_step"],
+        boil_time_min=UTILIZATION_SURFACE_RESOLUTION[u"boil_time_min"],
+        boil_time_max=UTILIZATION_SURFACE_RESOLUTION[u"boil_time_max"],
+        boil_time_step=UTILIZATION_SURFACE_RESOLUTION[u"boil_time_step"],
+    ):
+        """
+        Build a surface from the exact utilization calculation
+
+        :param HopsUtilization utilization_cls: The utilization class
+        :param float sg_min: The lowest specific gravity in the grid
+        :param float sg_max: The highest specific gravity in the grid
+        :param float sg_step: The step between specific gravities
+        :param float boil_time_min: The lowest boil time in the grid
+        :param float boil_time_max: The highest boil time in the grid
+        :param float boil_time_step: The step between boil times
+        :return: The utilization surface
+        :rtype: UtilizationSurface
+        :raises HopException: If the grid is smaller than 2x2
+        :raises HopException: If the interpolation error exceeds the error bound
+        """
+        sg_count = int(round((sg_max - sg_min) / sg_step)) + 1
+        boil_time_count = (
+            int(round((boil_time_max - boil_time_min) / boil_time_step)) + 1
+        )
+        if sg_count < 2 or boil_time_count < 2:
+            raise HopException(u"Utilization surface needs at least a 2x2 grid")
+        calculate = utilization_cls.calculate_percent_utilization
+        table = [
+            [
+                calculate(sg_min + sg_step * i, boil_time_min + boil_time_step * j)
+                for i in range(sg_count)
+            ]
+            for j in range(boil_time_count)
+        ]
+        surface = cls(
+            utilization_cls.__name__,
+            sg_min,
+            sg_step,
+            boil_time_min,
+            boil_time_step,
+            table,
+        )
+        surface.error_bound = surface.get_error_bound(utilization_cls)
+        error = surface.measure_error(utilization_cls)
+        # Allow for rounding in the interpolation itself
+        if error > surface.error_bound + 1e-12:
+            raise HopException(
+                u"Utilization surface error {} exceeds the bound {}".format(
+                    error, surface.error_bound
+                )
+            )
+        return surface
+
+    def get_error_bound(self, utilization_cls):
+        """
+        Get the maximum interpolation error from the bound on every cell
+
+        :param HopsUtilization utilization_cls: The utilization class
+        :return: The maximum absolute error inside the surface
+        :rtype: float
+        """
+        get_bound = utilization_cls.get_interpolation_error_bound
+        error = 0.0
+        for j in range(len(self.table) - 1):
+            boil_time_low = self.boil_time_min + self.boil_time_step * j
+            boil_time_high = boil_time_low + self.boil_time_step
+            for i in range(len(self.table[0]) - 1):
+                sg_low = self.sg_min + self.sg_step * i
+                sg_high = sg_low + self.sg_step
+                error = max(
+                    error, get_bound(sg_low, sg_high, boil_time_low, boil_time_high)
+                )
+        return error
+
+    def measure_error(self, utilization_cls):
+        """
+        Measure the maximum interpolation error against the exact calculation
+
+        :param HopsUtilization utilization_cls: The utilization class
+        :return: The maximum absolute error at the sampled points
+        :rtype: float
+
+        The error is sampled at the center and edge midpoints of every cell.
+        """
+        calculate = utilization_cls.calculate_percent_utilization
+        error = 0.0
+        for j in range(len(self.table) - 1):
+            for i in range(len(self.table[0]) - 1):
+                for di, dj in [(0.5, 0.5), (0.5, 0.0), (0.0, 0.5)]:
+                    sg = self.sg_min + self.sg_step * (i + di)
+                    boil_time = self.boil_time_min + self.boil_time_step * (j + dj)
+                    exact = calculate(sg, boil_time)
+                    error = max(error, abs(self.interpolate(sg, boil_time) - exact))
+        return error
+
+    def contains(self, sg, boil_time):
+        """
+        Determine if a point is inside the surface
+
+        :param float sg: Specific Gravity
+        :param float boil_time: The Boil Time in minutes
+        :return: True if inside the surface, otherwise False
+        :rtype: bool
+        """
+        return (
+            self.sg_min <= sg <= self.sg_max
+            and self.boil_time_min <= boil_time <= self.boil_time_max
+        )
+
+    def contains_array(self, sg, boil_time):
+        """
+        Determine which points are inside the surface
+
+        :param numpy.ndarray sg: Specific Gravities
+        :param numpy.ndarray boil_time: The Boil Times in minutes
+        :return: True where the point is inside the surface
+        :rtype: numpy.ndarray
+        """
+        return (
+            (self.sg_min <= sg)
+            & (sg <= self.sg_max)
+            & (self.boil_time_min <= boil_time)
+            & (boil_time <= self.boil_time_max)
+        )
+
+    def interpolate(self, sg, boil_time):
+        """
+        Get the percent utilization by bilinear interpolation
+
+        :param float sg: Specific Gravity
+        :param float boil_time: The Boil Time in minutes
+        :return: The percent utilization
+        :rtype: float
+        """
+        x = (sg - self.sg_min) / self.sg_step
+        y = (boil_time - self.boil_time_min) / self.boil_time_step
+        i = min(int(x), len(self.table[0]) - 2)
+        j = min(int(y), len(self.table) - 2)
+        fx = x - i
+        fy = y - j
+        row = self.table[j]
+        next_row = self.table[j + 1]
+        low = row[i] + (row[i + 1] - row[i]) * fx
+        high = next_row[i] + (next_row[i + 1] - next_row[i]) * fx
+        return low + (high - low) * fy
+
+    def interpolate_array(self, sg, boil_time):
+        """
+        Get the percent utilization by bilinear interpolation for many points
+
+        :param numpy.ndarray sg: Specific Gravities inside the surface
+        :param numpy.ndarray boil_time: The Boil Times in minutes inside the surface
+        :return: The percent utilization
+        :rtype: numpy.ndarray
+        """  # noqa
+        np = get_numpy()
+        if self._array is None:
+            self._array = np.asarray(self.table, dtype=float)
+        table = self._array
+        x = (sg - self.sg_min) / self.sg_step
+        y = (boil_time - self.boil_time_min) / self.boil_time_step
+        i = np.minimum(x.astype(int), table.shape[1] - 2)
+        j = np.minimum(y.astype(int), table.shape[0] - 2)
+        fx = x - i
+        fy = y - j
+        low = table[j, i] + (table[j, i + 1] - table[j, i]) * fx
+        high = table[j + 1, i] + (table[j + 1, i + 1] - table[j + 1, i]) * fx
+        return low + (high - low) * fy
+
+    def get_resolution(self):
+        """
+        Get the resolution the surface was built with
+
+        :return: The arguments of :meth:`build` giving this grid
+        :rtype: dict
+        """
+        return {
+            u"sg_min": self.sg_min,
+            u"sg_max": self.sg_max,
+            u"sg_step": self.sg_step,
+            u"boil_time_min": self.boil_time_min,
+            u"boil_time_max": self.boil_time_max,
+            u"boil_time_step": self.boil_time_step,
+        }
+
+    def has_resolution(self, **kwargs):
+        """
+        Determine if the surface was built with a resolution
+
+        :param kwargs: The resolution passed to :meth:`build`
+        :return: True if every value matches, otherwise False
+        :rtype: bool
+
+        Values missing from the kwargs take their defaults.
+        """
+        resolution = dict(UTILIZATION_SURFACE_RESOLUTION)
+        resolution.update(kwargs)
+        current = self.get_resolution()
+        # The maximums are recomputed from the steps so allow for rounding
+        return all(
+            abs(current.get(key, float(u"nan")) - value) <= 1e-9
+            for key, value in resolution.items()
+        )
+
+    def to_dict(self):
+        out = {
+            u"utilization_cls": self.utilization_cls_name,
+            u"error_bound": self.error_bound,
+            u"table": self.table,
+        }
+        out.update(self.get_resolution())
+        return out
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    def save(self, filename):
+        """
+        Save the surface to a JSON file
+
+        :param str filename: The filename to write
+        """
+        with open(filename, "w") as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a surface from a JSON file
+
+        :param str filename: The filename to read
+        :return: The utilization surface
+        :rtype: UtilizationSurface
+        """
+        with open(filename, "r") as f:
+            data = json.loads(f.read())
+        return cls(
+            data[u"utilization_cls"],
+            data[u"sg_min"],
+            data[u"sg_step"],
+            data[u"boil_time_min"],
+            data[u"boil_time_step"],
+            data[u"table"],
+            error_bound=data[u"error_bound"],
+        )
+
+
 class HopsUtilization(object):
     """
     http://www.boondocks-brewing.com/hops
     """
 
-    def __init__(self, hop_addition, units=IMPERIAL_UNITS):
+    def __init__(self, hop_addition=None, units=IMPERIAL_UNITS):
         """
-        :param HopAddition hop_addition: A hop addition
+        :param HopAddition hop_addition: A hop addition (optional)
         :param str units: The units
         """
         self.hop_addition = hop_addition
@@ -71,6 +437,43 @@ class HopsUtilization(object):
         # Manage units
         self.set_units(units)
 
+    @classmethod
+    def get_shared(cls, **kwargs):
+        """
+        Get a utilization object shared by every hop addition using it
+
+        :param kwargs: The kwargs to initialize the utilization object
+        :return: The utilization object
+        :rtype: HopsUtilization
+
+        The shared object is not bound to a hop addition, the hop addition is
+        passed to :meth:`get_ibus` instead or :meth:`bind` is used to get a
+        bound copy.  It must not be changed in place, use :meth:`change_units`
+        to get a new object.  A new object is made each time if the kwargs
+        cannot be hashed.
+        """
+        try:
+            key = (cls, tuple(sorted(kwargs.items())))
+            utilization = _SHARED_UTILIZATIONS.get(key)
+        except TypeError:
+            return cls(None, **kwargs)
+        if utilization is None:
+            utilization = cls(None, **kwargs)
+            _SHARED_UTILIZATIONS[key] = utilization
+        return utilization
+
+    def bind(self, hop_addition):
+        """
+        Get a copy of the utilization object bound to a hop addition
+
+        :param HopAddition hop_addition: The hop addition
+        :return: The bound utilization object
+        :rtype: HopsUtilization
+        """
+        utilization = copy.copy(self)
+        utilization.hop_addition = hop_addition
+        return utilization
+
     def set_units(self, units):
         """
         Set the units and unit types
@@ -96,36 +499,142 @@ class HopsUtilization(object):
             units = IMPERIAL_UNITS
         return HopsUtilization(self.hop_addition, units=units)
 
-    def get_ibus(self, sg, final_volume):
+    def get_ibus(self, sg, final_volume, hop_addition=None):
         """
         Get the IBUs
 
         :param float sg: Specific Gravity
         :param float final_volume: The Final Volume of the wort
+        :param HopAddition hop_addition: The hop addition (default: the bound hop addition)
+        :return: The IBUs of the wort
+        :rtype: float
+        """  # noqa
+        if hop_addition is None:
+            hop_addition = self.hop_addition
+        return self.calculate_ibus(
+            hop_addition.weight,
+            hop_addition.hop.percent_alpha_acids,
+            hop_addition.boil_time,
+            hop_addition.hop_type,
+            sg,
+            final_volume,
+            units=self.units,
+        )
+
+    @classmethod
+    def calculate_ibus(
+        cls,
+        weight,
+        percent_alpha_acids,
+        boil_time,
+        hop_type,
+        sg,
+        final_volume,
+        units=IMPERIAL_UNITS,
+    ):
+        """
+        Calculate the IBUs of a single hop addition
+
+        :param float weight: The weight of the hop addition
+        :param float percent_alpha_acids: The percent alpha acids in the hop
+        :param float boil_time: The Boil Time in minutes
+        :param str hop_type: The type of the hop being used
+        :param float sg: Specific Gravity
+        :param float final_volume: The Final Volume of the wort
+        :param str units: The units
         :return: The IBUs of the wort
         :rtype: float
         """
         hops_constant = HOPS_CONSTANT_IMPERIAL
-        if self.units == SI_UNITS:
+        if units == SI_UNITS:
             hops_constant = HOPS_CONSTANT_SI
-        utilization = self.get_percent_utilization(sg, self.hop_addition.boil_time)
+        utilization = cls.get_percent_utilization(sg, boil_time)
         # Hop weight for wet is greater than dry
-        hop_weight = self.hop_addition.weight
-        if self.hop_addition.hop_type == HOP_TYPE_WHOLE_WET:
+        hop_weight = weight
+        if hop_type == HOP_TYPE_WHOLE_WET:
             hop_weight = hop_type_weight_conversion(
-                hop_weight, self.hop_addition.hop_type, HOP_TYPE_WHOLE
+                hop_weight, hop_type, HOP_TYPE_WHOLE
             )
         # Utilization is 10% higher for pellet vs whole/plug
-        if self.hop_addition.hop_type == HOP_TYPE_PELLET:
+        if hop_type == HOP_TYPE_PELLET:
             utilization *= HOP_UTILIZATION_SCALE_PELLET
-        num = (
-            hop_weight
-            * utilization
-            * self.hop_addition.hop.percent_alpha_acids
-            * hops_constant
-        )
+        num = hop_weight * utilization * percent_alpha_acids * hops_constant
         return num / final_volume
 
+    @classmethod
+    def get_ibus_array(
+        cls,
+        weight,
+        percent_alpha_acids,
+        boil_time,
+        hop_type,
+        sg,
+        final_volume,
+        units=IMPERIAL_UNITS,
+    ):
+        """
+        Get the IBUs for many hop additions in one call
+
+        :param weight: The weights of the hop additions
+        :param percent_alpha_acids: The percent alpha acids in the hops
+        :param boil_time: The Boil Times in minutes
+        :param hop_type: The types of the hops being used
+        :param sg: Specific Gravities
+        :param final_volume: The Final Volumes of the wort
+        :param str units: The units
+        :return: The IBUs of each hop addition
+        :rtype: numpy.ndarray or list
+
+        Each argument may be a single value or a column given as a sequence,
+        NumPy array or buffer.  The columns must all be the same length.
+        """
+        validate_units(units)
+        np = get_numpy()
+        if np is None:
+            return map_scalar(
+                cls.calculate_ibus,
+                [weight, percent_alpha_acids, boil_time, hop_type, sg, final_volume],
+                kwargs={u"units": units},
+            )
+        hops_constant = HOPS_CONSTANT_IMPERIAL
+        if units == SI_UNITS:
+            hops_constant = HOPS_CONSTANT_SI
+        weight = as_array(weight)
+        percent_alpha_acids = as_array(percent_alpha_acids)
+        final_volume = as_array(final_volume)
+        hop_type = np.asarray(hop_type)
+        utilization = cls.get_percent_utilization_array(sg, boil_time)
+        # Work in place on one array of the full size to avoid temporaries
+        ibus = np.empty(
+            np.broadcast(
+                utilization, weight, percent_alpha_acids, final_volume, hop_type
+            ).shape
+        )
+        ibus[...] = utilization
+        ibus *= weight
+        ibus *= percent_alpha_acids
+        ibus *= hops_constant
+        ibus /= final_volume
+        # Hop weight for wet is greater than dry and utilization is 10%
+        # higher for pellet vs whole/plug
+        if hop_type.ndim == 0:
+            ibus *= cls._get_hop_type_factor(hop_type.item())
+            return ibus
+        factor = np.where(
+            hop_type == HOP_TYPE_PELLET, HOP_UTILIZATION_SCALE_PELLET, 1.0
+        )
+        factor[hop_type == HOP_TYPE_WHOLE_WET] = 1.0 / HOP_WHOLE_DRY_TO_WET
+        ibus *= factor
+        return ibus
+
+    @classmethod
+    def _get_hop_type_factor(cls, hop_type):
+        if hop_type == HOP_TYPE_PELLET:
+            return HOP_UTILIZATION_SCALE_PELLET
+        if hop_type == HOP_TYPE_WHOLE_WET:
+            return 1.0 / HOP_WHOLE_DRY_TO_WET
+        return 1.0
+
     @classmethod
     def get_percent_utilization(cls, sg, boil_time):
         """
@@ -133,6 +642,173 @@ class HopsUtilization(object):
 
         :param float sg: Specific Gravity
         :param float boil_time: The Boil Time in minutes
+        :return: The percent utilization
+        :rtype: float
+
+        When a utilization surface is in use and the point is inside it the
+        value is interpolated from the surface, otherwise it is calculated.
+        """
+        surface = cls.get_active_utilization_surface()
+        if surface is not None and surface.contains(sg, boil_time):
+            return surface.interpolate(sg, boil_time)
+        return cls.calculate_percent_utilization(sg, boil_time)
+
+    @classmethod
+    def calculate_percent_utilization(cls, sg, boil_time):
+        """
+        Calculate the exact percent utilization
+
+        :param float sg: Specific Gravity
+        :param float boil_time: The Boil Time in minutes
+        :raise NotImplementedError: This must be overridden
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_interpolation_error_bound(
+        cls, sg_low, sg_high, boil_time_low, boil_time_high
+    ):
+        """
+        Get the largest bilinear interpolation error inside a grid cell
+
+        :param float sg_low: The lowest specific gravity of the cell
+        :param float sg_high: The highest specific gravity of the cell
+        :param float boil_time_low: The lowest boil time of the cell
+        :param float boil_time_high: The highest boil time of the cell
+        :raise NotImplementedError: This must be overridden
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_utilization_surface(cls, filename=None, **kwargs):
+        """
+        Get a cached utilization surface for the class
+
+        :param str filename: A file to load the surface from or save it to
+        :param kwargs: The resolution passed to :meth:`UtilizationSurface.build`
+        :return: The utilization surface
+        :rtype: UtilizationSurface
+        :raises HopException: If the file holds a surface for another class
+
+        A file holding a surface with another resolution is rebuilt and
+        saved again.
+        """
+        key = (cls, filename, tuple(sorted(kwargs.items())))
+        surface = _cache_get(_UTILIZATION_SURFACES, key)
+        if surface is not None:
+            return surface
+
+        surface = None
+        if filename and os.path.exists(filename):
+            surface = UtilizationSurface.load(filename)
+            if surface.utilization_cls_name != cls.__name__:
+                raise HopException(
+                    u"Utilization surface in '{}' is for {} not {}".format(
+                        filename, surface.utilization_cls_name, cls.__name__
+                    )
+                )
+            if not surface.has_resolution(**kwargs):
+                surface = None
+        if surface is None:
+            surface = UtilizationSurface.build(cls, **kwargs)
+            if filename:
+                surface.save(filename)
+        _cache_set(_UTILIZATION_SURFACES, key, surface)
+        return surface
+
+    @classmethod
+    def get_active_utilization_surface(cls):
+        """
+        Get the utilization surface in use by the class in this thread
+
+        :return: The utilization surface or None
+        :rtype: UtilizationSurface
+        """
+        surfaces = getattr(_ACTIVE_SURFACES, u"surfaces", None)
+        if not surfaces:
+            return None
+        return surfaces.get(cls)
+
+    @classmethod
+    @contextmanager
+    def use_utilization_surface(cls, tolerance=1e-4, filename=None, **kwargs):
+        """
+        Use a utilization surface inside a with block when its error is within the tolerance
+
+        :param float tolerance: The maximum acceptable interpolation error
+        :param str filename: A file to load the surface from or save it to
+        :param kwargs: The resolution passed to :meth:`UtilizationSurface.build`
+        :return: A context manager giving the surface in use or None
+
+        The tolerance is compared with the error bound of the surface, see
+        :class:`UtilizationSurface`.  The surface is only used
+        by this class, in this thread and until the block exits::
+
+            with HopsUtilizationGlennTinseth.use_utilization_surface() as surface:
+                ibus = HopsUtilizationGlennTinseth.get_ibus_array(...)
+        """  # noqa
+        surface = cls.get_utilization_surface(filename=filename, **kwargs)
+        if surface.error_bound > tolerance:
+            surface = None
+        surfaces = getattr(_ACTIVE_SURFACES, u"surfaces", None)
+        if surfaces is None:
+            surfaces = _ACTIVE_SURFACES.surfaces = {}
+        previous = surfaces.get(cls)
+        surfaces[cls] = surface
+        # Metrics cached on recipes depend on the surface in use
+        bump_version()
+        try:
+            yield surface
+        finally:
+            if previous is None:
+                surfaces.pop(cls, None)
+            else:
+                surfaces[cls] = previous
+            bump_version()
+
+    @classmethod
+    def get_percent_utilization_array(cls, sg, boil_time):
+        """
+        Get the percent utilization for many values
+
+        :param sg: Specific Gravities
+        :param boil_time: The Boil Times in minutes
+        :return: The percent utilization
+        :rtype: numpy.ndarray or list
+
+        Like :meth:`get_percent_utilization` the points inside a utilization
+        surface in use are interpolated and the rest are calculated.
+        Without NumPy this falls back to :meth:`get_percent_utilization`.
+        """
+        np = get_numpy()
+        if np is None:
+            return map_scalar(cls.get_percent_utilization, [sg, boil_time])
+        sg, boil_time = np.broadcast_arrays(as_array(sg), as_array(boil_time))
+        if sg.ndim == 0:
+            utilization = cls.get_percent_utilization_array(
+                sg.reshape(1), boil_time.reshape(1)
+            )
+            return utilization[0]
+        surface = cls.get_active_utilization_surface()
+        if surface is None:
+            return cls.calculate_percent_utilization_array(sg, boil_time)
+        inside = surface.contains_array(sg, boil_time)
+        utilization = np.empty(sg.shape)
+        utilization[inside] = surface.interpolate_array(sg[inside], boil_time[inside])
+        outside = ~inside
+        if outside.any():
+            utilization[outside] = cls.calculate_percent_utilization_array(
+                sg[outside], boil_time[outside]
+            )
+        return utilization
+
+    @classmethod
+    def calculate_percent_utilization_array(cls, sg, boil_time):
+        """
+        Calculate the exact percent utilization for many values with NumPy
+
+        :param numpy.ndarray sg: Specific Gravities
+        :param numpy.ndarray boil_time: The Boil Times in minutes
         :raise NotImplementedError: This must be overridden
         """
         raise NotImplementedError
@@ -148,14 +824,18 @@ class HopsUtilization(object):
         :return: A table of utilization for specific gravity vs boil time
         :rtype: list
         """
-        table = []
-        for boil_time in boil_time_list:
-            line = []
-            for sg in gravity_list:
-                aau = cls.get_percent_utilization(sg / 1000.0, boil_time)
-                line.append(round(aau, sig))
-            table.append(line)
-        return table
+        key = (cls, tuple(gravity_list), tuple(boil_time_list), sig)
+        table = _cache_get(_UTILIZATION_TABLES, key)
+        if table is None:
+            table = []
+            for boil_time in boil_time_list:
+                line = []
+                for sg in gravity_list:
+                    aau = cls.calculate_percent_utilization(sg / 1000.0, boil_time)
+                    line.append(round(aau, sig))
+                table.append(line)
+            _cache_set(_UTILIZATION_TABLES, key, table)
+        return [list(line) for line in table]
 
     @classmethod
     def format_utilization_table(cls):
@@ -227,9 +907,9 @@ class HopsUtilizationJackieRager(HopsUtilization):
         return cgravity
 
     @classmethod
-    def get_percent_utilization(cls, sg, boil_time):
+    def calculate_percent_utilization(cls, sg, boil_time):
         """
-        Get the percent utilization
+        Calculate the exact percent utilization
 
         :param float sg: Specific Gravity
         :param float boil_time: The Boil Time in minutes
@@ -243,6 +923,81 @@ class HopsUtilizationJackieRager(HopsUtilization):
         num = (18.11 + 13.86 * math.tanh((boil_time - 31.32) / 18.27)) / 100.0
         return num / cls.get_c_gravity(sg)
 
+    @classmethod
+    def get_interpolation_error_bound(
+        cls, sg_low, sg_high, boil_time_low, boil_time_high
+    ):
+        """
+        Get the largest bilinear interpolation error inside a grid cell
+
+        :param float sg_low: The lowest specific gravity of the cell
+        :param float sg_high: The highest specific gravity of the cell
+        :param float boil_time_low: The lowest boil time of the cell
+        :param float boil_time_high: The highest boil time of the cell
+        :return: The error bound
+        :rtype: float
+
+        The utilization is a boil time term divided by Cgravity.  The error
+        is at most the largest boil time term times the linear interpolation
+        error of 1 / Cgravity plus the largest 1 / Cgravity times the error of
+        the boil time term.  1 / Cgravity has a kink at 1.050.
+        """
+        # tanh''(x) = -2 tanh(x) sech(x) ** 2 peaks where tanh(x) ** 2 = 1 / 3
+        scale = 18.27
+        low = (boil_time_low - 31.32) / scale
+        high = (boil_time_high - 31.32) / scale
+        peak = math.atanh(1.0 / math.sqrt(3.0))
+
+        def tanh_curvature(x):
+            return 2.0 * abs(math.tanh(x)) / math.cosh(x) ** 2
+
+        if low <= peak <= high or low <= -peak <= high:
+            tanh_curvature_max = tanh_curvature(peak)
+        else:
+            tanh_curvature_max = max(tanh_curvature(low), tanh_curvature(high))
+        boil_time_curvature = 13.86 / 100.0 * tanh_curvature_max / scale ** 2
+        boil_time_max = (18.11 + 13.86 * math.tanh(high)) / 100.0
+
+        # 1 / Cgravity is 1 up to 1.050 and 0.2 / (sg - 0.850) above it
+        gravity_max = 1.0 / cls.get_c_gravity(sg_low)
+        gravity_curvature = 0.0
+        gravity_slope_jump = 0.0
+        if sg_high > 1.050:
+            c_gravity = cls.get_c_gravity(max(sg_low, 1.050))
+            gravity_curvature = 2.0 / (0.2 ** 2 * c_gravity ** 3)
+            if sg_low < 1.050:
+                gravity_slope_jump = 1.0 / 0.2
+
+        return boil_time_max * _get_linear_error_bound(
+            sg_high - sg_low, gravity_curvature, gravity_slope_jump
+        ) + gravity_max * _get_linear_error_bound(
+            boil_time_high - boil_time_low, boil_time_curvature
+        )
+
+    @classmethod
+    def calculate_percent_utilization_array(cls, sg, boil_time):
+        """
+        Calculate the exact percent utilization for many values with NumPy
+
+        :param numpy.ndarray sg: Specific Gravities
+        :param numpy.ndarray boil_time: The Boil Times in minutes
+        :return: The percent utilization
+        :rtype: numpy.ndarray
+        """
+        np = get_numpy()
+        cgravity = np.maximum(sg, 1.050)
+        cgravity -= 1.050
+        cgravity /= 0.2
+        cgravity += 1.0
+        utilization = boil_time - 31.32
+        utilization /= 18.27
+        np.tanh(utilization, out=utilization)
+        utilization *= 13.86
+        utilization += 18.11
+        utilization /= 100.0
+        utilization /= cgravity
+        return utilization
+
 
 class HopsUtilizationGlennTinseth(HopsUtilization):
     """
@@ -288,9 +1043,9 @@ class HopsUtilizationGlennTinseth(HopsUtilization):
         return (1 - math.exp(-0.04 * boil_time)) / 4.15
 
     @classmethod
-    def get_percent_utilization(cls, sg, boil_time):
+    def calculate_percent_utilization(cls, sg, boil_time):
         """
-        Get the percent utilization
+        Calculate the exact percent utilization
 
         :param float sg: Specific Gravity
         :param float boil_time: The Boil Time in minutes
@@ -305,3 +1060,62 @@ class HopsUtilizationGlennTinseth(HopsUtilization):
         bigness_factor = cls.get_bigness_factor(sg)
         boil_time_factor = cls.get_boil_time_factor(boil_time)
         return bigness_factor * boil_time_factor
+
+    @classmethod
+    def get_interpolation_error_bound(
+        cls, sg_low, sg_high, boil_time_low, boil_time_high
+    ):
+        """
+        Get the largest bilinear interpolation error inside a grid cell
+
+        :param float sg_low: The lowest specific gravity of the cell
+        :param float sg_high: The highest specific gravity of the cell
+        :param float boil_time_low: The lowest boil time of the cell
+        :param float boil_time_high: The highest boil time of the cell
+        :return: The error bound
+        :rtype: float
+
+        The utilization is the Bigness factor times the Boil Time factor.
+        The error is at most the largest Boil Time factor times the linear
+        interpolation error of the Bigness factor plus the largest Bigness
+        factor times the error of the Boil Time factor.
+        """
+        # The Bigness factor falls with gravity and so does its curvature
+        bigness_max = cls.get_bigness_factor(sg_low)
+        bigness_curvature = math.log(0.000125) ** 2 * bigness_max
+        # The Boil Time factor curvature falls with boil time
+        boil_time_max = max(
+            abs(cls.get_boil_time_factor(boil_time_low)),
+            abs(cls.get_boil_time_factor(boil_time_high)),
+        )
+        boil_time_curvature = 0.04 ** 2 * math.exp(-0.04 * boil_time_low) / 4.15
+
+        return boil_time_max * _get_linear_error_bound(
+            sg_high - sg_low, bigness_curvature
+        ) + bigness_max * _get_linear_error_bound(
+            boil_time_high - boil_time_low, boil_time_curvature
+        )
+
+    @classmethod
+    def calculate_percent_utilization_array(cls, sg, boil_time):
+        """
+        Calculate the exact percent utilization for many values with NumPy
+
+        :param numpy.ndarray sg: Specific Gravities
+        :param numpy.ndarray boil_time: The Boil Times in minutes
+        :return: The percent utilization
+        :rtype: numpy.ndarray
+
+        The powers are evaluated as exponentials which is faster in NumPy.
+        """
+        np = get_numpy()
+        # 1.65 * 0.000125 ** (sg - 1)
+        utilization = sg - 1.0
+        utilization *= math.log(0.000125)
+        np.exp(utilization, out=utilization)
+        # (1 - e ** (-0.04 * boil_time)) / 4.15
+        boil_time_factor = boil_time * -0.04
+        np.expm1(boil_time_factor, out=boil_time_factor)
+        utilization *= boil_time_factor
+        utilization *= -1.65 / 4.15
+        return utilization
@@ -4,6 +4,10 @@ from ..constants import IMPERIAL_UNITS
 from ..constants import SI_UNITS
 from ..exceptions import SugarException
 from ..validators import validate_units
+from .arrays import as_array
+from .arrays import get_numpy
+from .arrays import map_scalar
+from .arrays import masked
 from .temperature import celsius_to_fahrenheit
 
 __all__ = [
@@ -18,8 +22,19 @@ __all__ = [
     u"apparent_extract_to_real_extract",
     u"hydrometer_adjustment",
     u"refractometer_adjustment",
+    u"sg_to_plato_array",
+    u"plato_to_sg_array",
+    u"sg_to_brix_array",
+    u"brix_to_sg_array",
+    u"brix_to_plato_array",
+    u"plato_to_brix_array",
+    u"hydrometer_adjustment_array",
+    u"refractometer_adjustment_array",
 ]
 
+#: Above 40 degBx the Brix polynomial no longer works
+SG_MAX_BRIX = 1.17874
+
 
 def sg_to_gu(sg):
     """
@@ -116,7 +131,7 @@ def sg_to_brix(sg):
     * http://en.wikipedia.org/wiki/Brix
     * http://www.brewersfriend.com/brix-converter/
     """
-    if sg > 1.17874:
+    if sg > SG_MAX_BRIX:
         raise SugarException(u"Above 40 degBx this function no longer works")
     return ((182.4601 * sg - 775.6821) * sg + 1262.7794) * sg - 669.5622
 
@@ -255,3 +270,165 @@ def refractometer_adjustment(og, fg, wort_correction_factor=1.04):
         + 0.0000632929 * (fg_brix ** 3)
     )
     return new_fg
+
+
+def sg_to_plato_array(sg):
+    """
+    Specific Gravity to Degrees Plato for many values
+
+    :param sg: Specific Gravity values as a sequence, NumPy array or buffer
+    :return: Degrees Plato
+    :rtype: numpy.ndarray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(sg_to_plato, [sg])
+    return sg_to_plato(as_array(sg))
+
+
+def plato_to_sg_array(deg_plato):
+    """
+    Degrees Plato to Specific Gravity for many values
+
+    :param deg_plato: Degrees Plato values as a sequence, NumPy array or buffer
+    :return: Specific Gravity
+    :rtype: numpy.ndarray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(plato_to_sg, [deg_plato])
+    return plato_to_sg(as_array(deg_plato))
+
+
+def brix_to_sg_array(brix):
+    """
+    Degrees Brix to Specific Gravity for many values
+
+    :param brix: Degrees Brix values as a sequence, NumPy array or buffer
+    :return: Specific Gravity
+    :rtype: numpy.ndarray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(brix_to_sg, [brix])
+    return brix_to_sg(as_array(brix))
+
+
+def sg_to_brix_array(sg):
+    """
+    Specific Gravity to Degrees Brix for many values
+
+    :param sg: Specific Gravity values as a sequence, NumPy array or buffer
+    :return: Degrees Brix with values above 40 degBx masked
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(sg_to_brix, [sg], exceptions=(SugarException,))
+    sg = as_array(sg)
+    brix = ((182.4601 * sg - 775.6821) * sg + 1262.7794) * sg - 669.5622
+    return masked(brix, sg > SG_MAX_BRIX)
+
+
+def brix_to_plato_array(brix):
+    """
+    Degrees Brix to Degrees Plato for many values
+
+    :param brix: Degrees Brix values as a sequence, NumPy array or buffer
+    :return: Degrees Plato
+    :rtype: numpy.ndarray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(brix_to_plato, [brix])
+    return brix_to_plato(as_array(brix))
+
+
+def plato_to_brix_array(plato):
+    """
+    Degrees Plato to Degrees Brix for many values
+
+    :param plato: Degrees Plato values as a sequence, NumPy array or buffer
+    :return: Degrees Brix with values above 40 degBx masked
+    :rtype: numpy.ma.MaskedArray or list
+    """
+    np = get_numpy()
+    if np is None:
+        return map_scalar(plato_to_brix, [plato], exceptions=(SugarException,))
+    return sg_to_brix_array(plato_to_sg_array(plato))
+
+
+def hydrometer_adjustment_array(sg, temp, units=IMPERIAL_UNITS):
+    """
+    Adjust the Hydrometer if the temperature deviates from 59degF for many values
+
+    :param sg: Specific Gravity values as a sequence, NumPy array or buffer
+    :param temp: Temperature values as a sequence, NumPy array or buffer
+    :param str units: The units
+    :return: Specific Gravity corrected for temperature with values masked where the temperature is outside freezing to boiling range of water
+    :rtype: numpy.ma.MaskedArray or list
+
+    See :func:`hydrometer_adjustment` for the correction formula.
+    """  # noqa
+    validate_units(units)
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            hydrometer_adjustment,
+            [sg, temp],
+            exceptions=(SugarException,),
+            kwargs={u"units": units},
+        )
+    sg = as_array(sg)
+    temp = as_array(temp)
+    if units == SI_UNITS:
+        invalid = (temp < 0.0) | (100.0 < temp)
+        temp = celsius_to_fahrenheit(temp)
+    else:
+        invalid = (temp < 0.0) | (212.0 < temp)
+
+    correction = (
+        1.313454
+        - 0.132674 * temp
+        + (2.057793 * 10 ** -3) * (temp ** 2)
+        - (2.627634 * 10 ** -6) * (temp ** 3)
+    )
+    adjusted = np.where(
+        temp == HYDROMETER_ADJUSTMENT_TEMP, sg, sg + (correction * 0.001)
+    )
+    return masked(adjusted, invalid)
+
+
+def refractometer_adjustment_array(og, fg, wort_correction_factor=1.04):
+    """
+    Adjust the Refractometer for the presence of alcohol for many values
+
+    :param og: Original Gravity values as a sequence, NumPy array or buffer
+    :param fg: Final Gravity values as a sequence, NumPy array or buffer
+    :param float wort_correction_factor: A correction to the reading given by the refractometer
+    :return: Final Gravity adjusted with values masked where a gravity is above 40 degBx
+    :rtype: numpy.ma.MaskedArray or list
+
+    See :func:`refractometer_adjustment` for the formula.
+    """  # noqa
+    np = get_numpy()
+    if np is None:
+        return map_scalar(
+            refractometer_adjustment,
+            [og, fg],
+            exceptions=(SugarException,),
+            kwargs={u"wort_correction_factor": wort_correction_factor},
+        )
+    og_brix = sg_to_brix_array(og) / wort_correction_factor
+    fg_brix = sg_to_brix_array(fg) / wort_correction_factor
+
+    new_fg = (
+        1.0000
+        - 0.0044993 * og_brix
+        + 0.0117741 * fg_brix
+        + 0.000275806 * (og_brix ** 2)
+        - 0.00127169 * (fg_brix ** 2)
+        - 0.00000727999 * (og_brix ** 3)
+        + 0.0000632929 * (fg_brix ** 3)
+    )
+    return new_fg
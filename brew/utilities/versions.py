@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Track changes to ingredients and additions so derived values can be cached.
+"""
+
+__all__ = [u"get_version", u"bump_version", u"Versioned", u"VersionedList"]
+
+#: The number of in place changes to ingredients and additions so far
+_VERSION = [0]
+
+
+def get_version():
+    """
+    Get the current version of the ingredients and additions
+
+    :return: The version
+    :rtype: int
+
+    The version changes whenever any ingredient, addition or list of
+    additions is changed in place, so a cached value is still valid while
+    the version it was computed at is the current version.
+    """
+    return _VERSION[0]
+
+
+def bump_version():
+    """
+    Change the version of the ingredients and additions
+    """
+    _VERSION[0] += 1
+
+
+class Versioned(object):
+    """
+    A mixin bumping the version when an attribute is changed
+
+    Setting an attribute for the first time, as in ``__init__``, does not
+    change the version so objects made while computing a cached value do not
+    clear the cache.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            bump_version()
+        super(Versioned, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        bump_version()
+        super(Versioned, self).__delattr__(name)
+
+
+def _bump(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args):
+        bump_version()
+        return method(self, *args)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class VersionedList(list):
+    """
+    A list bumping the version when it is changed in place
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _bump(u"__setitem__")
+    __delitem__ = _bump(u"__delitem__")
+    __iadd__ = _bump(u"__iadd__")
+    __imul__ = _bump(u"__imul__")
+    append = _bump(u"append")
+    extend = _bump(u"extend")
+    insert = _bump(u"insert")
+    pop = _bump(u"pop")
+    remove = _bump(u"remove")
+    reverse = _bump(u"reverse")
+
+    def sort(self, *args, **kwargs):
+        bump_version()
+        return super(VersionedList, self).sort(*args, **kwargs)
+
+    if hasattr(list, u"clear"):
+        clear = _bump(u"clear")
+
+    if hasattr(list, u"__setslice__"):
+        __setslice__ = _bump(u"__setslice__")
+        __delslice__ = _bump(u"__delslice__")
@@ -4,6 +4,7 @@ import sys
 import textwrap
 
 from .exceptions import YeastException
+from .utilities.versions import Versioned
 from .validators import validate_optional_fields
 from .validators import validate_percentage
 from .validators import validate_required_fields
@@ -11,11 +12,13 @@ from .validators import validate_required_fields
 __all__ = [u"Yeast"]
 
 
-class Yeast(object):
+class Yeast(Versioned):
     """
     A representation of a type of Yeast as added to a Recipe.
     """
 
+    __slots__ = (u"name", u"percent_attenuation")
+
     def __init__(self, name, percent_attenuation=0.75):
         """
         :param float percent_attenuation: The percentage the yeast is expected to attenuate the sugar in the yeast to create alcohol
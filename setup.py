@@ -25,12 +25,17 @@ setup(
     entry_points={
         "console_scripts": [
             "abv = brew.cli.abv:main",
+            "brewcall = brew.cli.client:main",
+            "brewd = brew.cli.server:main",
             "gv = brew.cli.gravity_volume:main",
+            "packdata = brew.cli.pack_data:main",
+            "recipes = brew.cli.recipes:main",
             "sugar = brew.cli.sugar:main",
             "temp = brew.cli.temp:main",
             "yeast = brew.cli.yeast:main",
         ]
     },
+    extras_require={"numpy": ["numpy"]},
     include_package_data=True,
     zip_safe=True,
     tests_require=[
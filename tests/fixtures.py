@@ -3,6 +3,7 @@ from brew.grains import Grain
 from brew.grains import GrainAddition
 from brew.hops import Hop
 from brew.hops import HopAddition
+from brew.parsers import DataLoader
 from brew.recipes import Recipe
 from brew.recipes import RecipeBuilder
 from brew.styles import Style
@@ -106,3 +107,26 @@ english_pale_ale_style = Style(
     ibu=[25, 35],
     color=[8, 14],
 )
+
+
+# Define Recipe Data
+class RecipeLoader(DataLoader):
+    def __init__(self):
+        pass
+
+    def get_item(self, dir_suffix, item_name):
+        if dir_suffix == u"cereals/":
+            return {u"color": 2.0, u"ppg": 37.0}
+        if dir_suffix == u"hops/":
+            return {u"percent_alpha_acids": 0.07}
+        return {u"percent_attenuation": 0.75}
+
+
+recipe_data = {
+    u"name": u"pale ale",
+    u"start_volume": 7.0,
+    u"final_volume": 5.0,
+    u"grains": [{u"name": u"pale 2-row", u"weight": 13.96}],
+    u"hops": [{u"name": u"cascade", u"weight": 0.76, u"boil_time": 60.0}],
+    u"yeast": {u"name": u"Wyeast 1056"},
+}
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
+import io
+import json
 import textwrap
 import unittest
 
+import mock
+
 from brew.cli.abv import get_abv
+from brew.cli.abv import get_abv_batch
 from brew.cli.abv import get_parser
 from brew.cli.abv import main
+from brew.cli.abv import run_batch
 from brew.constants import IMPERIAL_UNITS
 from brew.constants import SI_UNITS
 
@@ -69,6 +75,121 @@ class TestCliAbv(unittest.TestCase):
         self.assertEquals(out, expected)
 
 
+#: Readings with the error get_abv raises for each
+READINGS = [
+    (1.057, 1.013, 59.0, 59.0, False, None),
+    (1.057, 1.013, 70.0, 65.0, False, None),
+    (1.057, 1.013, 59.0, 59.0, True, None),
+    (1.050, 1.060, 59.0, 59.0, False, u"Original Gravity must be higher than Final Gravity"),  # noqa
+    (None, 1.010, 59.0, 59.0, False, u"Original gravity required"),
+    (1.050, None, 59.0, 59.0, False, u"Final gravity required"),
+    (1.060, 1.015, 300.0, 59.0, False, u"Correction does not work outside temps 0 - 212F"),  # noqa
+    (1.200, 1.010, 59.0, 59.0, True, u"Above 40 degBx this function no longer works"),  # noqa
+]
+
+
+class TestCliAbvBatch(unittest.TestCase):
+    def setUp(self):
+        self.columns = list(zip(*READINGS))[:5]
+
+    def check_batch(self, alternative=False):
+        og_adj, fg_adj, abv, errors = get_abv_batch(
+            *self.columns, alternative=alternative
+        )
+        for index, reading in enumerate(READINGS):
+            og, fg, og_temp, fg_temp, refractometer, error = reading
+            self.assertEquals(errors[index], error)
+            if error is not None:
+                self.assertEquals(abv[index], None)
+                continue
+            expected = get_abv(
+                og,
+                fg,
+                og_temp=og_temp,
+                fg_temp=fg_temp,
+                alternative=alternative,
+                refractometer=refractometer,
+            )
+            self.assertAlmostEquals(abv[index], expected, places=12)
+
+    def test_get_abv_batch(self):
+        self.check_batch()
+
+    def test_get_abv_batch_alternative(self):
+        self.check_batch(alternative=True)
+
+    @mock.patch(u"brew.cli.abv.get_numpy", return_value=None)
+    def test_get_abv_batch_no_numpy(self, mock_get_numpy):
+        self.check_batch()
+
+    def test_get_abv_batch_empty(self):
+        out = get_abv_batch([], [], [], [], [])
+        self.assertEquals(out, ([], [], [], []))
+
+    def test_get_abv_batch_bad_units(self):
+        with self.assertRaises(Exception):
+            get_abv_batch(*self.columns, units=u"bad")
+
+    def test_run_batch_csv(self):
+        lines = io.StringIO(
+            u"og,fg,og_temp,refractometer\n"
+            u"1.057,1.013,,\n"
+            u"1.057,1.013,70,yes\n"
+            u"1.050,abc,,\n"
+            u"1.050,1.060,,\n"
+        )
+        output = io.StringIO()
+        stats = run_batch(lines, output, chunksize=3)
+        self.assertEquals(stats, {u"rows": 4, u"errors": 2})
+        out = output.getvalue().splitlines()
+        self.assertEquals(
+            out[0],
+            u"line,og,fg,og_temp,fg_temp,refractometer,og_adjusted,fg_adjusted,abv,error",  # noqa
+        )
+        self.assertEquals(
+            out[1], u"2,1.057,1.013,59.0,59.0,False,1.057,1.013,{!r},".format(
+                get_abv(1.057, 1.013)
+            )
+        )
+        self.assertTrue(out[2].startswith(u"3,1.057,1.013,70.0,59.0,True,"))
+        self.assertTrue(out[3].startswith(u"4,,,,,,,,,could not convert"))
+        self.assertEquals(
+            out[4],
+            u"5,1.05,1.06,59.0,59.0,False,,,,"
+            u"Original Gravity must be higher than Final Gravity",
+        )
+
+    def test_run_batch_ndjson(self):
+        lines = io.StringIO(
+            u'{"og": 1.057, "fg": 1.013, "refractometer": true}\n'
+            u"\n"
+            u"not json\n"
+            u'{"og": 1.057, "fg": 1.013, "fg_temp": 150.0}\n'
+        )
+        output = io.StringIO()
+        stats = run_batch(lines, output, fmt=u"ndjson", units=SI_UNITS)
+        self.assertEquals(stats, {u"rows": 3, u"errors": 2})
+        out = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEquals([o[u"line"] for o in out], [1, 3, 4])
+        self.assertEquals(
+            out[0][u"abv"], get_abv(1.057, 1.013, refractometer=True, units=SI_UNITS)
+        )
+        self.assertEquals(out[0][u"error"], None)
+        self.assertEquals(out[1][u"abv"], None)
+        self.assertTrue(out[1][u"error"] is not None)
+        self.assertEquals(out[2][u"fg_temp"], 150.0)
+        expected = u"Correction does not work outside temps 0 - 100C"
+        self.assertEquals(out[2][u"error"], expected)
+
+    def test_run_batch_bad_format(self):
+        with self.assertRaises(Exception):
+            run_batch([], io.StringIO(), fmt=u"xml")
+
+    def test_run_batch_bad_chunksize(self):
+        with self.assertRaises(Exception):
+            run_batch([], io.StringIO(), chunksize=0)
+
+
 class TestCliArgparserAbv(unittest.TestCase):
     def setUp(self):
         self.parser = get_parser()
@@ -85,6 +206,20 @@ class TestCliArgparserAbv(unittest.TestCase):
         with self.assertRaises(SystemExit):
             self.parser.parse_args([u"-o", u"1.060"])
 
+    def test_get_parser_batch(self):
+        out = self.parser.parse_args([u"-i", u"-", u"--format", u"ndjson"])
+        self.assertEquals(out.og, None)
+        self.assertEquals(out.fg, None)
+        self.assertEquals(out.format, u"ndjson")
+
+    def test_get_parser_chunksize(self):
+        out = self.parser.parse_args([u"-i", u"-", u"--chunksize", u"1"])
+        self.assertEquals(out.chunksize, 1)
+        for chunksize in [u"0", u"-1", u"abc"]:
+            with mock.patch(u"sys.stderr"):
+                with self.assertRaises(SystemExit):
+                    self.parser.parse_args([u"-i", u"-", u"--chunksize", chunksize])
+
     def test_get_parser_og_and_fg(self):
         args = [u"-o", u"1.060", u"-f", u"1.010"]
         out = self.parser.parse_args(args)
@@ -240,3 +375,43 @@ class TestCliMainAbv(unittest.TestCase):
             }
         }
         self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_batch(self):
+        output = io.StringIO()
+        args = {
+            u"output": {
+                u"og": None,
+                u"fg": None,
+                u"og_temp": 59.0,
+                u"fg_temp": 59.0,
+                u"alternative": False,
+                u"refractometer": False,
+                u"units": u"imperial",
+                u"verbose": False,
+                u"input": io.StringIO(u'{"og": 1.057, "fg": 1.013}\n'),
+                u"format": u"ndjson",
+                u"output": output,
+            }
+        }
+        self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+        out = json.loads(output.getvalue())
+        self.assertEquals(out[u"abv"], get_abv(1.057, 1.013))
+
+    def test_main_batch_errors(self):
+        args = {
+            u"output": {
+                u"og": None,
+                u"fg": None,
+                u"og_temp": 59.0,
+                u"fg_temp": 59.0,
+                u"alternative": False,
+                u"refractometer": False,
+                u"units": u"imperial",
+                u"verbose": False,
+                u"input": io.StringIO(u'{"og": 1.013, "fg": 1.057}\n'),
+                u"format": u"ndjson",
+                u"output": io.StringIO(),
+            }
+        }
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
@@ -1,9 +1,18 @@
 # -*- coding: utf-8 -*-
+import io
+import json
 import unittest
 
+import mock
+
+from brew.cli.gravity_volume import get_dilution
+from brew.cli.gravity_volume import get_dilution_batch
 from brew.cli.gravity_volume import get_parser
 from brew.cli.gravity_volume import get_gravity
+from brew.cli.gravity_volume import iter_grid_rows
 from brew.cli.gravity_volume import main
+from brew.cli.gravity_volume import run_batch
+from brew.utilities.batch import iter_batch_rows
 
 
 class TestCliTemp(unittest.TestCase):
@@ -16,6 +25,137 @@ class TestCliTemp(unittest.TestCase):
         out = get_gravity(self.ov, self.fv, self.gravity)
         self.assertEquals(out, 1.015)
 
+    def test_get_dilution_final_volume(self):
+        out = get_dilution(10.0, 1.060, final_volume=12.0)
+        self.assertEquals(out, (12.0, get_gravity(10.0, 12.0, 1.060), 2.0))
+
+    def test_get_dilution_target_gravity(self):
+        volume, gravity, top_up = get_dilution(10.0, 1.060, target_gravity=1.050)
+        self.assertEquals(round(volume, 3), 12.0)
+        self.assertEquals(gravity, 1.050)
+        self.assertEquals(round(top_up, 3), 2.0)
+
+    def test_get_dilution_raises(self):
+        with self.assertRaises(Exception):
+            get_dilution(None, 1.060, final_volume=12.0)
+        with self.assertRaises(Exception):
+            get_dilution(10.0, None, final_volume=12.0)
+        with self.assertRaises(Exception):
+            get_dilution(10.0, 1.060)
+        with self.assertRaises(Exception):
+            get_dilution(10.0, 1.060, final_volume=12.0, target_gravity=1.050)
+
+
+class TestCliGravityVolumeBatch(unittest.TestCase):
+    def setUp(self):
+        # original volume, gravity, final volume, target gravity
+        self.records = [
+            (10.0, 1.060, 12.0, None),
+            (10.0, 1.060, None, 1.050),
+            (10.0, 1.040, None, 1.080),
+            (10.0, 1.060, None, None),
+            (0.0, 1.060, 12.0, None),
+            (10.0, 1.060, None, 1.0),
+            (None, 1.060, 12.0, None),
+        ]
+        self.columns = [list(column) for column in zip(*self.records)]
+
+    def check_batch(self):
+        volumes, gravities, top_ups, errors = get_dilution_batch(*self.columns)
+        for index, record in enumerate(self.records):
+            try:
+                expected = get_dilution(
+                    record[0],
+                    record[1],
+                    final_volume=record[2],
+                    target_gravity=record[3],
+                )
+                error = None
+            except Exception as e:
+                expected = (None, None, None)
+                error = u"{}".format(e)
+            self.assertEquals(errors[index], error)
+            out = (volumes[index], gravities[index], top_ups[index])
+            if error is None:
+                out = tuple(round(value, 9) for value in out)
+                expected = tuple(round(value, 9) for value in expected)
+            self.assertEquals(out, expected)
+
+    def test_get_dilution_batch(self):
+        self.check_batch()
+
+    @mock.patch(u"brew.cli.gravity_volume.get_numpy", return_value=None)
+    def test_get_dilution_batch_no_numpy(self, mock_get_numpy):
+        self.check_batch()
+
+    def test_get_dilution_batch_empty(self):
+        out = get_dilution_batch([], [], [], [])
+        self.assertEquals(out, ([], [], [], []))
+
+    def test_iter_grid_rows(self):
+        out = list(iter_grid_rows(10.0, 1.060, 10.0, 12.0, 1.0))
+        self.assertEquals([row[0] for row in out], [1, 2, 3])
+        self.assertEquals([row[1][u"final_volume"] for row in out], [10.0, 11.0, 12.0])
+
+    def test_run_batch_csv(self):
+        lines = io.StringIO(
+            u"original_volume,gravity,final_volume,target_gravity\n"
+            u"10,1.060,12,\n"
+            u"10,1.060,,\n"
+            u"10,abc,,\n"
+            u"20,1.060,,1.050\n"
+        )
+        output = io.StringIO()
+        stats = run_batch(
+            iter_batch_rows(lines), output, target_gravity=1.040, chunksize=3
+        )
+        self.assertEquals(stats, {u"rows": 4, u"errors": 1})
+        out = output.getvalue().splitlines()
+        self.assertEquals(
+            out[0],
+            u"line,original_volume,gravity,final_volume,final_gravity,top_up,error",
+        )
+        self.assertEquals(
+            out[1],
+            u"2,10.0,1.06,12.0,{!r},2.0,".format(get_gravity(10.0, 12.0, 1.060)),
+        )
+        self.assertTrue(out[2].startswith(u"3,10.0,1.06,15.0"))
+        self.assertTrue(out[3].startswith(u"4,,,,,,could not convert"))
+        self.assertTrue(out[4].startswith(u"5,20.0,1.06,24.0"))
+
+    def test_run_batch_ndjson(self):
+        lines = io.StringIO(
+            u'{"original_volume": 10.0, "gravity": 1.060, "target_gravity": 1.050}\n'
+            u"\n"
+            u"not json\n"
+            u'{"original_volume": 10.0, "gravity": 1.060}\n'
+        )
+        output = io.StringIO()
+        stats = run_batch(iter_batch_rows(lines, fmt=u"ndjson"), output, fmt=u"ndjson")
+        self.assertEquals(stats, {u"rows": 3, u"errors": 2})
+        out = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEquals([o[u"line"] for o in out], [1, 3, 4])
+        self.assertEquals(round(out[0][u"top_up"], 3), 2.0)
+        self.assertEquals(out[0][u"error"], None)
+        self.assertTrue(out[1][u"error"] is not None)
+        self.assertEquals(out[2][u"error"], u"Final volume or target gravity required")
+
+    def test_run_batch_grid(self):
+        output = io.StringIO()
+        rows = iter_grid_rows(10.0, 1.060, 10.0, 12.0, 1.0)
+        stats = run_batch(rows, output, chunksize=2)
+        self.assertEquals(stats, {u"rows": 3, u"errors": 0})
+        expected = u"3,10.0,1.06,12.0,{!r},2.0,".format(get_gravity(10.0, 12.0, 1.060))
+        self.assertEquals(output.getvalue().splitlines()[3], expected)
+
+    def test_run_batch_bad_format(self):
+        with self.assertRaises(Exception):
+            run_batch([], io.StringIO(), fmt=u"xml")
+
+    def test_run_batch_bad_chunksize(self):
+        with self.assertRaises(Exception):
+            run_batch([], io.StringIO(), chunksize=0)
+
 
 class TestCliArgparserTemp(unittest.TestCase):
     def setUp(self):
@@ -27,6 +167,38 @@ class TestCliArgparserTemp(unittest.TestCase):
         expected = {u"original_volume": 3.0, u"final_volume": 10.0, u"gravity": 1.050}
         self.assertEquals(out.__dict__, expected)
 
+    def test_get_parser_target_gravity(self):
+        args = [u"-o", u"10.0", u"-g", u"1.060", u"-t", u"1.050"]
+        out = self.parser.parse_args(args)
+        expected = {
+            u"original_volume": 10.0,
+            u"final_volume": None,
+            u"gravity": 1.060,
+            u"target_gravity": 1.050,
+        }
+        self.assertEquals(out.__dict__, expected)
+
+    def test_get_parser_grid(self):
+        args = [u"-o", u"10.0", u"-g", u"1.060", u"--grid", u"10", u"20", u"1"]
+        out = self.parser.parse_args(args)
+        self.assertEquals(out.grid, [10.0, 20.0, 1.0])
+
+    def test_get_parser_grid_target_gravity(self):
+        args = [u"-o", u"10.0", u"-g", u"1.060", u"-t", u"1.050"]
+        args += [u"--grid", u"10", u"20", u"1"]
+        with mock.patch(u"sys.stderr"):
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args(args)
+
+    def test_get_parser_required(self):
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args([u"-o", u"10.0", u"-g", u"1.060"])
+
+    def test_get_parser_chunksize(self):
+        with mock.patch(u"sys.stderr"):
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args([u"-i", u"-", u"--chunksize", u"0"])
+
 
 class TestCliMainTemp(unittest.TestCase):
     def setUp(self):
@@ -74,3 +246,47 @@ class TestCliMainTemp(unittest.TestCase):
             }
         }
         self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_target_gravity(self):
+        args = {
+            u"output": {
+                u"original_volume": 10.0,
+                u"final_volume": None,
+                u"gravity": 1.060,
+                u"target_gravity": 1.050,
+            }
+        }
+        self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+        args[u"output"][u"target_gravity"] = 1.0
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_grid(self):
+        output = io.StringIO()
+        output.name = u"plan.ndjson"
+        args = {
+            u"output": {
+                u"original_volume": 10.0,
+                u"final_volume": None,
+                u"gravity": 1.060,
+                u"grid": [10.0, 12.0, 1.0],
+                u"output": output,
+            }
+        }
+        self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+        out = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEquals([o[u"top_up"] for o in out], [0.0, 1.0, 2.0])
+
+    def test_main_batch_errors(self):
+        args = {
+            u"output": {
+                u"original_volume": None,
+                u"final_volume": None,
+                u"gravity": None,
+                u"input": io.StringIO(u"original_volume,gravity\n10,1.060\n"),
+                u"format": u"csv",
+                u"output": io.StringIO(),
+            }
+        }
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
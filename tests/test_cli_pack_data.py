@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from brew.cli.pack_data import get_parser
+from brew.cli.pack_data import main
+from brew.parsers import PackedDataLoader
+
+
+class TestCliArgparserPackData(unittest.TestCase):
+    def setUp(self):
+        self.parser = get_parser()
+
+    def test_get_parser(self):
+        args = [u"-d", u"data/", u"-o", u"data.jsonl"]
+        out = self.parser.parse_args(args)
+        expected = {u"data_dir": u"data/", u"output": u"data.jsonl"}
+        self.assertEquals(out.__dict__, expected)
+
+
+class TestCliMainPackData(unittest.TestCase):
+    def setUp(self):
+        class Parser(object):
+            def __init__(self, output):
+                self.output = output
+
+            def parse_args(self):
+                class Args(object):
+                    pass
+
+                args = Args()
+                if self.output:
+                    for k, v in self.output.items():
+                        setattr(args, k, v)
+                return args
+
+        def g_parser(output=None):
+            return Parser(output)
+
+        self.parser_fn = g_parser
+        self.main = main
+
+        self.data_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.data_dir, u"cereals"))
+        filename = os.path.join(self.data_dir, u"cereals", u"crystal_20.json")
+        with open(filename, "w") as f:
+            f.write(json.dumps({u"color": 20.0}))
+        self.output = os.path.join(self.data_dir, u"data.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_main_no_args(self):
+        args = {u"output": {u"data_dir": None, u"output": None}}
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_no_kwargs(self):
+        with self.assertRaises(AttributeError):
+            self.main(parser_fn=self.parser_fn)
+
+    def test_main_bad_data_dir(self):
+        args = {
+            u"output": {
+                u"data_dir": os.path.join(self.data_dir, u"missing"),
+                u"output": self.output,
+            }
+        }
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_all_args(self):
+        args = {u"output": {u"data_dir": self.data_dir, u"output": self.output}}
+        self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+        loader = PackedDataLoader(self.output)
+        out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertEquals(out, {u"color": 20.0})
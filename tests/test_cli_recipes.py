@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import mock
+
+from brew.cli.recipes import get_loader
+from brew.cli.recipes import get_parser
+from brew.cli.recipes import main
+from brew.parsers import JSONDataLoader
+from brew.parsers import PackedDataLoader
+
+
+class TestCliRecipes(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.data_dir, u"cereals"))
+        filename = os.path.join(self.data_dir, u"cereals", u"pale_2_row.json")
+        with open(filename, "w") as f:
+            f.write(json.dumps({u"color": 2.0, u"ppg": 37.0}))
+        self.packed = os.path.join(self.data_dir, u"data.jsonl")
+        PackedDataLoader.build(self.data_dir, self.packed)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_get_loader_data_dir(self):
+        out = get_loader(data_dir=self.data_dir)
+        self.assertTrue(isinstance(out, JSONDataLoader))
+
+    def test_get_loader_packed(self):
+        out = get_loader(packed=self.packed)
+        self.assertTrue(isinstance(out, PackedDataLoader))
+
+
+class TestCliArgparserRecipes(unittest.TestCase):
+    def setUp(self):
+        self.parser = get_parser()
+
+    def test_get_parser(self):
+        args = [u"-d", u"data/", u"-w", u"4", u"-c", u"10"]
+        out = self.parser.parse_args(args)
+        expected = {
+            u"input": sys.stdin,
+            u"output": sys.stdout,
+            u"errors": sys.stderr,
+            u"data_dir": u"data/",
+            u"index_file": None,
+            u"packed": None,
+            u"workers": 4,
+            u"chunksize": 10,
+        }
+        self.assertEquals(out.__dict__, expected)
+
+    def test_get_parser_chunksize(self):
+        out = self.parser.parse_args([u"-d", u"data/", u"--chunksize", u"1"])
+        self.assertEquals(out.chunksize, 1)
+        for chunksize in [u"0", u"-1", u"abc"]:
+            with mock.patch(u"sys.stderr"):
+                with self.assertRaises(SystemExit):
+                    self.parser.parse_args([u"-d", u"data/", u"-c", chunksize])
+
+    def test_get_parser_workers(self):
+        out = self.parser.parse_args([u"-d", u"data/", u"--workers", u"1"])
+        self.assertEquals(out.workers, 1)
+        for workers in [u"0", u"-1", u"abc"]:
+            with mock.patch(u"sys.stderr"):
+                with self.assertRaises(SystemExit):
+                    self.parser.parse_args([u"-d", u"data/", u"-w", workers])
+
+
+class TestCliMainRecipes(unittest.TestCase):
+    def setUp(self):
+        class Parser(object):
+            def __init__(self, output):
+                self.output = output
+
+            def parse_args(self):
+                class Args(object):
+                    pass
+
+                args = Args()
+                if self.output:
+                    for k, v in self.output.items():
+                        setattr(args, k, v)
+                return args
+
+        def g_parser(output=None):
+            return Parser(output)
+
+        self.parser_fn = g_parser
+        self.main = main
+
+        self.data_dir = tempfile.mkdtemp()
+        for dir_name, name, data in [
+            (u"cereals", u"pale_2_row", {u"color": 2.0, u"ppg": 37.0}),
+            (u"hops", u"cascade", {u"percent_alpha_acids": 0.07}),
+            (u"yeast", u"wyeast_1056", {u"percent_attenuation": 0.75}),
+        ]:
+            item_dir = os.path.join(self.data_dir, dir_name)
+            os.mkdir(item_dir)
+            with open(os.path.join(item_dir, u"{}.json".format(name)), "w") as f:
+                f.write(json.dumps(data))
+        self.recipe = {
+            u"name": u"pale ale",
+            u"start_volume": 7.0,
+            u"final_volume": 5.0,
+            u"grains": [{u"name": u"pale 2-row", u"weight": 13.96}],
+            u"hops": [{u"name": u"cascade", u"weight": 0.76, u"boil_time": 60.0}],
+            u"yeast": {u"name": u"Wyeast 1056"},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def get_args(self, lines, **kwargs):
+        args = {
+            u"input": io.StringIO(u"".join(lines)),
+            u"output": io.StringIO(),
+            u"errors": io.StringIO(),
+            u"data_dir": self.data_dir,
+            u"index_file": None,
+            u"packed": None,
+            u"workers": 1,
+            u"chunksize": 100,
+        }
+        args.update(kwargs)
+        return args
+
+    def test_main_no_kwargs(self):
+        with self.assertRaises(AttributeError):
+            self.main(parser_fn=self.parser_fn)
+
+    def test_main_no_data(self):
+        args = self.get_args([], data_dir=None)
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs={u"output": args})
+
+    def test_main_bad_data_dir(self):
+        args = self.get_args([], data_dir=os.path.join(self.data_dir, u"missing"))
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs={u"output": args})
+
+    def test_main(self):
+        args = self.get_args([json.dumps(self.recipe) + u"\n"] * 2)
+        self.main(parser_fn=self.parser_fn, parser_kwargs={u"output": args})
+        lines = args[u"output"].getvalue().splitlines()
+        self.assertEquals(len(lines), 2)
+        self.assertEquals(json.loads(lines[0])[u"name"], u"pale ale")
+        self.assertEquals(args[u"errors"].getvalue(), u"")
+
+    def test_main_errors(self):
+        args = self.get_args([u"not json\n"])
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs={u"output": args})
+        self.assertTrue(u'"line": 1' in args[u"errors"].getvalue())
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import mock
+from brew.cli.abv import get_abv
+from brew.cli.client import Client
+from brew.cli.client import get_parser as get_client_parser
+from brew.cli.client import main as client_main
+from brew.cli.client import parse_param
+from brew.cli.server import MAX_REQUEST_SIZE
+from brew.cli.server import asyncio
+from brew.cli.server import CalculationProtocol
+from brew.cli.server import get_parser
+from brew.cli.server import handle_request
+from brew.cli.server import is_loopback
+from brew.cli.server import remove_stale_socket
+from brew.cli.server import start_server
+from brew.cli.temp import get_temp_conversion
+from brew.cli.yeast import get_yeast_pitch_calculation
+from brew.exceptions import ServerException
+from brew.utilities.yeast import KaiserYeastModel
+
+
+def request(method, params, request_id=1):
+    return json.dumps(
+        {u"id": request_id, u"method": method, u"params": params}
+    ).encode(u"utf-8")
+
+
+class TestHandleRequest(unittest.TestCase):
+    def test_handle_request(self):
+        out = handle_request(request(u"get_abv", {u"og": 1.057, u"fg": 1.013}))
+        expected = {u"id": 1, u"result": get_abv(1.057, 1.013)}
+        self.assertEquals(out, expected)
+
+    def test_handle_request_list(self):
+        out = handle_request(request(u"get_temp_conversion", [None, 25.0], 2))
+        expected = {u"id": 2, u"result": get_temp_conversion(None, 25.0)}
+        self.assertEquals(out, expected)
+
+    def test_handle_request_yeast_model(self):
+        out = handle_request(
+            request(u"get_yeast_pitch_calculation", {u"model": u"kaiser"})
+        )
+        expected = get_yeast_pitch_calculation(model_cls=KaiserYeastModel)
+        self.assertEquals(out[u"result"], expected)
+
+    def test_handle_request_yeast_model_unknown(self):
+        out = handle_request(
+            request(u"get_yeast_pitch_calculation", {u"model": u"other"})
+        )
+        self.assertTrue(u"Unknown Yeast Growth Model" in out[u"error"])
+
+    def test_handle_request_error(self):
+        out = handle_request(request(u"get_abv", {u"og": 1.013, u"fg": 1.057}))
+        expected = {
+            u"id": 1,
+            u"error": u"Exception: Original Gravity must be higher than Final Gravity",  # noqa
+        }
+        self.assertEquals(out, expected)
+
+    def test_handle_request_unknown_method(self):
+        out = handle_request(request(u"get_nothing", {}))
+        self.assertEquals(out[u"error"], u"ValueError: Unknown method 'get_nothing'")
+
+    def test_handle_request_bad_params(self):
+        out = handle_request(request(u"get_abv", {u"og": 1.057, u"bad": 1.0}))
+        self.assertTrue(out[u"error"].startswith(u"TypeError"))
+        out = handle_request(request(u"get_abv", 1.057))
+        self.assertEquals(
+            out[u"error"], u"ValueError: Params must be a JSON object or array"
+        )
+
+    def test_handle_request_not_json(self):
+        out = handle_request(b"not json")
+        self.assertEquals(out[u"id"], None)
+        self.assertTrue(u"error" in out)
+        out = handle_request(b"[1, 2]")
+        self.assertEquals(out[u"error"], u"ValueError: Request must be a JSON object")
+
+    def test_handle_request_methods(self):
+        methods = {u"add": lambda a, b: a + b}
+        out = handle_request(request(u"add", [1, 2]), methods=methods)
+        self.assertEquals(out[u"result"], 3)
+
+
+class TestCliClient(unittest.TestCase):
+    def test_parse_param(self):
+        self.assertEquals(parse_param(u"og=1.057"), (u"og", 1.057))
+        self.assertEquals(parse_param(u"verbose=true"), (u"verbose", True))
+        self.assertEquals(parse_param(u"units=metric"), (u"units", u"metric"))
+        self.assertEquals(parse_param(u"name=a=b"), (u"name", u"a=b"))
+
+    def test_parse_param_bad(self):
+        with self.assertRaises(ValueError):
+            parse_param(u"og")
+
+    def test_call_args_and_kwargs(self):
+        with self.assertRaises(ValueError):
+            Client().call(u"get_abv", 1.057, fg=1.013)
+
+    def test_get_parser(self):
+        args = [u"get_abv", u"og=1.057", u"fg=1.013", u"-s", u"brewd.sock"]
+        out = get_client_parser().parse_args(args)
+        expected = {
+            u"method": u"get_abv",
+            u"params": [u"og=1.057", u"fg=1.013"],
+            u"socket": u"brewd.sock",
+            u"host": u"127.0.0.1",
+            u"port": 8733,
+        }
+        self.assertEquals(out.__dict__, expected)
+
+    def test_get_server_parser(self):
+        out = get_parser().parse_args([u"-p", u"9000"])
+        expected = {
+            u"socket": None,
+            u"host": u"127.0.0.1",
+            u"port": 9000,
+            u"allow_remote": False,
+        }
+        self.assertEquals(out.__dict__, expected)
+
+    def test_get_server_parser_allow_remote(self):
+        out = get_parser().parse_args([u"--host", u"0.0.0.0", u"--allow-remote"])
+        self.assertTrue(out.allow_remote)
+
+    def test_is_loopback(self):
+        self.assertTrue(is_loopback(u"127.0.0.1"))
+        self.assertTrue(is_loopback(u"::1"))
+        self.assertFalse(is_loopback(u"0.0.0.0"))
+        self.assertFalse(is_loopback(u"192.0.2.1"))
+        self.assertFalse(is_loopback(u""))
+        self.assertFalse(is_loopback(None))
+
+
+class FakeTransport(object):
+    def __init__(self):
+        self.data = b""
+        self.reading = True
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    def pause_reading(self):
+        self.reading = False
+
+    def resume_reading(self):
+        self.reading = True
+
+    def close(self):
+        self.closed = True
+
+
+class TestCalculationProtocol(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.protocol = CalculationProtocol()
+        self.protocol.connection_made(self.transport)
+        self.lines = [
+            request(u"get_temp_conversion", [None, float(i)], i) for i in range(1, 6)
+        ]
+
+    def get_ids(self):
+        out = self.transport.data.decode(u"utf-8").splitlines()
+        return [json.loads(line)[u"id"] for line in out]
+
+    def test_data_received(self):
+        self.protocol.data_received(b"\n".join(self.lines[:2]) + b"\n" + self.lines[2])
+        self.assertEquals(self.get_ids(), [1, 2])
+        self.protocol.data_received(b"\n")
+        self.assertEquals(self.get_ids(), [1, 2, 3])
+        self.assertEquals(self.protocol.buffer, b"")
+
+    def test_writing_paused(self):
+        self.protocol.pause_writing()
+        self.protocol.data_received(b"\n".join(self.lines) + b"\n")
+        self.assertEquals(self.get_ids(), [])
+        self.assertTrue(self.transport.reading)
+        self.assertFalse(self.transport.closed)
+        self.protocol.resume_writing()
+        self.assertEquals(self.get_ids(), [1, 2, 3, 4, 5])
+
+    def test_buffer_limit(self):
+        data = b"\n".join(self.lines) + b"\n"
+        with mock.patch(u"brew.cli.server.MAX_BUFFER_SIZE", len(data) - 1):
+            self.protocol.pause_writing()
+            self.protocol.data_received(data)
+            self.assertFalse(self.transport.reading)
+            self.protocol.resume_writing()
+        self.assertTrue(self.transport.reading)
+        self.assertEquals(self.get_ids(), [1, 2, 3, 4, 5])
+
+    def test_request_too_long(self):
+        self.protocol.data_received(b"x" * (MAX_REQUEST_SIZE + 1))
+        self.assertTrue(self.transport.closed)
+        self.assertEquals(self.get_ids(), [None])
+
+
+@unittest.skipIf(asyncio is None, u"asyncio is not available")
+class TestCliServer(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.data_dir, u"brewd.sock")
+        self.loop = asyncio.new_event_loop()
+        self.servers = [
+            start_server(self.loop, path=self.path),
+            start_server(self.loop, port=0),
+        ]
+        self.port = self.servers[1].sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        for server in self.servers:
+            server.close()
+            self.loop.run_until_complete(server.wait_closed())
+        self.loop.close()
+        shutil.rmtree(self.data_dir)
+
+    def test_remote_host(self):
+        with self.assertRaises(ServerException):
+            start_server(self.loop, host=u"0.0.0.0", port=0)
+
+    def test_unix_socket_in_use(self):
+        with self.assertRaises(ServerException):
+            start_server(self.loop, path=self.path)
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_stale_unix_socket(self):
+        path = os.path.join(self.data_dir, u"stale.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(path)
+        sock.close()
+        remove_stale_socket(path)
+        self.assertFalse(os.path.exists(path))
+
+    def test_unix_socket(self):
+        with Client(path=self.path) as client:
+            out = client.call(u"get_abv", og=1.057, fg=1.013)
+            self.assertEquals(out, get_abv(1.057, 1.013))
+            out = client.get_temp_conversion(None, 25.0)
+            self.assertEquals(out, get_temp_conversion(None, 25.0))
+
+    def test_tcp(self):
+        with Client(port=self.port) as client:
+            out = client.get_abv(og=1.057, fg=1.013, verbose=True)
+            self.assertEquals(out, get_abv(1.057, 1.013, verbose=True))
+
+    def test_error(self):
+        with Client(path=self.path) as client:
+            with self.assertRaises(ServerException):
+                client.get_abv(og=1.013, fg=1.057)
+            # The connection is still usable
+            self.assertEquals(client.get_abv(og=1.057, fg=1.013), get_abv(1.057, 1.013))
+
+    def test_pipelined(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(5.0)
+        sock.connect(self.path)
+        lines = [
+            request(u"get_temp_conversion", [None, float(i)], i) for i in range(1, 6)
+        ]
+        sock.sendall(b"\n".join(lines) + b"\n\n")
+        reader = sock.makefile(u"rb")
+        out = [json.loads(reader.readline().decode(u"utf-8")) for _ in lines]
+        reader.close()
+        sock.close()
+        self.assertEquals([o[u"id"] for o in out], [1, 2, 3, 4, 5])
+
+    def test_request_too_long(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(5.0)
+        sock.connect(self.path)
+        sock.sendall(b"x" * (MAX_REQUEST_SIZE + 1))
+        reader = sock.makefile(u"rb")
+        out = json.loads(reader.readline().decode(u"utf-8"))
+        self.assertEquals(reader.readline(), b"")
+        reader.close()
+        sock.close()
+        self.assertTrue(out[u"error"].startswith(u"Request is longer"))
+
+    def test_concurrent_clients(self):
+        results = []
+
+        def worker(index):
+            with Client(path=self.path) as client:
+                for i in range(20):
+                    results.append(client.get_temp_conversion(None, float(index + i)))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEquals(len(results), 160)
+
+    def test_client_main(self):
+        class Parser(object):
+            def __init__(self, output):
+                self.output = output
+
+            def parse_args(self):
+                class Args(object):
+                    pass
+
+                args = Args()
+                for k, v in self.output.items():
+                    setattr(args, k, v)
+                return args
+
+        args = {
+            u"output": {
+                u"method": u"get_temp_conversion",
+                u"params": [u"fahrenheit=null", u"celsius=25.0"],
+                u"socket": self.path,
+                u"host": None,
+                u"port": None,
+            }
+        }
+        client_main(parser_fn=Parser, parser_kwargs=args)
+        args[u"output"][u"method"] = u"get_nothing"
+        with self.assertRaises(SystemExit):
+            client_main(parser_fn=Parser, parser_kwargs=args)
@@ -1,9 +1,27 @@
 # -*- coding: utf-8 -*-
+import io
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
+import mock
+
 from brew.cli.sugar import get_parser
 from brew.cli.sugar import get_sugar_conversion
+from brew.cli.sugar import get_sugar_table
+from brew.cli.sugar import get_table_format
+from brew.cli.sugar import iter_sugar_values
 from brew.cli.sugar import main
+from brew.cli.sugar import run_sugar_table
+from brew.utilities.arrays import get_numpy
+from brew.utilities.batch import iter_range
+from brew.utilities.sugar import brix_to_plato
+from brew.utilities.sugar import brix_to_sg
+from brew.utilities.sugar import plato_to_brix
+from brew.utilities.sugar import sg_to_brix
+from brew.utilities.sugar import sg_to_plato
 
 
 class TestCliSugar(unittest.TestCase):
@@ -64,6 +82,155 @@ class TestCliSugar(unittest.TestCase):
         self.assertEquals(out, expected)
 
 
+class TestCliSugarTable(unittest.TestCase):
+    def setUp(self):
+        self.sg = [1.040, 1.092, 1.200]
+
+    def check_table(self):
+        sg, plato, brix = [list(column) for column in get_sugar_table(self.sg)]
+        self.assertEquals(sg, self.sg)
+        self.assertEquals(plato, [sg_to_plato(value) for value in self.sg])
+        self.assertEquals(brix[:2], [sg_to_brix(value) for value in self.sg[:2]])
+        self.assertTrue(brix[2] is None or brix[2] is get_numpy().ma.masked)
+
+    def test_get_sugar_table_sg(self):
+        self.check_table()
+
+    @mock.patch(u"brew.utilities.sugar.get_numpy", return_value=None)
+    @mock.patch(u"brew.cli.sugar.get_numpy", return_value=None)
+    def test_get_sugar_table_sg_no_numpy(self, mock_cli, mock_sugar):
+        self.check_table()
+
+    def test_get_sugar_table_brix(self):
+        sg, plato, brix = get_sugar_table([22.0], sugar_in=u"b")
+        self.assertEquals(list(sg), [brix_to_sg(22.0)])
+        self.assertEquals(list(plato), [brix_to_plato(22.0)])
+        self.assertEquals(list(brix), [22.0])
+
+    def test_get_sugar_table_brix_above_range(self):
+        # Only Brix converted from SG or Plato is masked above 40 degBx
+        sg, plato, brix = get_sugar_table([50.0], sugar_in=u"b")
+        self.assertEquals(list(sg), [brix_to_sg(50.0)])
+        self.assertEquals(list(brix), [50.0])
+
+    def test_get_sugar_table_plato(self):
+        sg, plato, brix = get_sugar_table([22.0], sugar_in=u"p")
+        self.assertEquals(list(plato), [22.0])
+        self.assertAlmostEquals(list(brix)[0], plato_to_brix(22.0))
+
+    def test_get_sugar_table_bad_unit(self):
+        with self.assertRaises(Exception):
+            get_sugar_table([1.050], sugar_in=u"x")
+
+    def test_get_table_format(self):
+        self.assertEquals(get_table_format(u"table.csv"), u"csv")
+        self.assertEquals(get_table_format(u"table.NPZ"), u"npz")
+        self.assertEquals(get_table_format(u"table.jsonl"), u"ndjson")
+        self.assertEquals(get_table_format(u""), u"csv")
+
+    def test_iter_sugar_values(self):
+        lines = io.StringIO(u"1.040\n\n1.050, 1.060\n1.070 1.080\n")
+        out = list(iter_sugar_values(lines))
+        self.assertEquals(out, [1.04, 1.05, 1.06, 1.07, 1.08])
+
+    def test_iter_sugar_values_bad_value(self):
+        for token in [u"abc", u"nan", u"inf"]:
+            lines = io.StringIO(u"1.040\n{} 1.050\n".format(token))
+            out = list(iter_sugar_values(lines))
+            self.assertEquals(out[0], 1.04)
+            self.assertTrue(isinstance(out[1], ValueError))
+            self.assertEquals(
+                str(out[1]), u"Line 2: '{}' is not a number".format(token)
+            )
+            self.assertEquals(out[2], 1.05)
+
+    def test_run_sugar_table_csv(self):
+        output = io.StringIO()
+        stats = run_sugar_table(self.sg, output, chunksize=2)
+        self.assertEquals(stats, {u"rows": 3, u"errors": 0})
+        out = output.getvalue().splitlines()
+        self.assertEquals(out[0], u"sg,plato,brix,error")
+        self.assertEquals(
+            out[1],
+            u"1.04,{!r},{!r},".format(sg_to_plato(1.040), sg_to_brix(1.040)),
+        )
+        self.assertEquals(out[3], u"1.2,{!r},,".format(sg_to_plato(1.200)))
+
+    def test_run_sugar_table_bad_values(self):
+        lines = io.StringIO(u"1.040 abc\n1.092\nnan\n")
+        output = io.StringIO()
+        stats = run_sugar_table(iter_sugar_values(lines), output, chunksize=2)
+        self.assertEquals(stats, {u"rows": 4, u"errors": 2})
+        out = output.getvalue().splitlines()
+        self.assertEquals(len(out), 5)
+        self.assertTrue(out[1].startswith(u"1.04,"))
+        self.assertEquals(out[2], u",,,Line 1: 'abc' is not a number")
+        self.assertTrue(out[3].startswith(u"1.092,"))
+        self.assertEquals(out[4], u",,,Line 3: 'nan' is not a number")
+
+    @mock.patch(u"brew.utilities.sugar.get_numpy", return_value=None)
+    @mock.patch(u"brew.cli.sugar.get_numpy", return_value=None)
+    def test_run_sugar_table_bad_values_no_numpy(self, mock_cli, mock_sugar):
+        lines = io.StringIO(u"abc 1.040\n")
+        output = io.StringIO()
+        stats = run_sugar_table(iter_sugar_values(lines), output, fmt=u"ndjson")
+        self.assertEquals(stats, {u"rows": 2, u"errors": 1})
+        out = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEquals(out[0][u"sg"], None)
+        self.assertEquals(out[0][u"error"], u"Line 1: 'abc' is not a number")
+        self.assertEquals(out[1][u"sg"], 1.04)
+        self.assertEquals(out[1][u"error"], None)
+
+    def test_run_sugar_table_ndjson(self):
+        output = io.StringIO()
+        stats = run_sugar_table(
+            iter_range(10.0, 50.0, 10.0), output, sugar_in=u"b", fmt=u"ndjson"
+        )
+        self.assertEquals(stats, {u"rows": 5, u"errors": 0})
+        out = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEquals([o[u"brix"] for o in out], [10.0, 20.0, 30.0, 40.0, 50.0])
+        self.assertEquals(out[0][u"sg"], brix_to_sg(10.0))
+
+    @unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+    def test_run_sugar_table_npz(self):
+        np = get_numpy()
+        output = io.BytesIO()
+        values = self.sg + [ValueError(u"Line 4: 'abc' is not a number")]
+        stats = run_sugar_table(values, output, fmt=u"npz", chunksize=2)
+        self.assertEquals(stats, {u"rows": 4, u"errors": 1})
+        output.seek(0)
+        out = np.load(output)
+        self.assertEquals(out[u"sg"][:3].tolist(), self.sg)
+        self.assertEquals(out[u"plato"][1], sg_to_plato(1.092))
+        self.assertTrue(np.isnan(out[u"brix"][2]))
+        self.assertTrue(np.isnan(out[u"sg"][3]))
+        self.assertEquals(
+            out[u"error"].tolist(), [u"", u"", u"", u"Line 4: 'abc' is not a number"]
+        )
+
+    def test_run_sugar_table_npz_empty(self):
+        output = io.BytesIO()
+        if get_numpy() is None:
+            with self.assertRaises(Exception):
+                run_sugar_table([], output, fmt=u"npz")
+        else:
+            stats = run_sugar_table([], output, fmt=u"npz")
+            self.assertEquals(stats, {u"rows": 0, u"errors": 0})
+
+    @mock.patch(u"brew.cli.sugar.get_numpy", return_value=None)
+    def test_run_sugar_table_npz_no_numpy(self, mock_get_numpy):
+        with self.assertRaises(Exception):
+            run_sugar_table(self.sg, io.BytesIO(), fmt=u"npz")
+
+    def test_run_sugar_table_bad_format(self):
+        with self.assertRaises(Exception):
+            run_sugar_table(self.sg, io.StringIO(), fmt=u"xml")
+
+    def test_run_sugar_table_bad_chunksize(self):
+        with self.assertRaises(Exception):
+            run_sugar_table(self.sg, io.StringIO(), chunksize=0)
+
+
 class TestCliArgparserSugar(unittest.TestCase):
     def setUp(self):
         self.parser = get_parser()
@@ -92,6 +259,20 @@ class TestCliArgparserSugar(unittest.TestCase):
         expected = {u"brix": None, u"plato": None, u"sg": 1.060, u"out": u"b"}
         self.assertEquals(out.__dict__, expected)
 
+    def test_get_parser_range(self):
+        args = [u"-r", u"1.000", u"1.100", u"0.001", u"--in", u"s", u"--format", u"npz"]
+        out = self.parser.parse_args(args)
+        expected = {
+            u"brix": None,
+            u"plato": None,
+            u"sg": None,
+            u"out": None,
+            u"range": [1.0, 1.1, 0.001],
+            u"sugar_in": u"s",
+            u"format": u"npz",
+        }
+        self.assertEquals(out.__dict__, expected)
+
 
 class TestCliMainSugar(unittest.TestCase):
     def setUp(self):
@@ -132,3 +313,75 @@ class TestCliMainSugar(unittest.TestCase):
     def test_main_one_arg(self):
         args = {u"output": {u"brix": 22.0, u"plato": None, u"sg": None, u"out": None}}
         self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_table(self):
+        data_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(data_dir, u"table.ndjson")
+            args = {
+                u"output": {
+                    u"brix": None,
+                    u"plato": None,
+                    u"sg": None,
+                    u"out": None,
+                    u"input": io.StringIO(u"20.0\n22.0\n"),
+                    u"sugar_in": u"b",
+                    u"output": filename,
+                }
+            }
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+            with open(filename) as f:
+                out = [json.loads(line) for line in f]
+            self.assertEquals([o[u"brix"] for o in out], [20.0, 22.0])
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_main_table_bad_value(self):
+        data_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(data_dir, u"table.ndjson")
+            args = {
+                u"output": {
+                    u"brix": None,
+                    u"plato": None,
+                    u"sg": None,
+                    u"out": None,
+                    u"input": io.StringIO(u"20.0\nabc\n22.0\n"),
+                    u"sugar_in": u"b",
+                    u"output": filename,
+                }
+            }
+            with self.assertRaises(SystemExit):
+                self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+            with open(filename) as f:
+                out = [json.loads(line) for line in f]
+            self.assertEquals([o[u"brix"] for o in out], [20.0, None, 22.0])
+            self.assertEquals(out[1][u"error"], u"Line 2: 'abc' is not a number")
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_main_table_and_value(self):
+        args = {
+            u"output": {
+                u"brix": 22.0,
+                u"plato": None,
+                u"sg": None,
+                u"out": None,
+                u"range": [1.0, 1.1, 0.01],
+            }
+        }
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
+
+    def test_main_table_error(self):
+        args = {
+            u"output": {
+                u"brix": None,
+                u"plato": None,
+                u"sg": None,
+                u"out": None,
+                u"range": [1.1, 1.0, 0.01],
+            }
+        }
+        with self.assertRaises(SystemExit):
+            self.main(parser_fn=self.parser_fn, parser_kwargs=args)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from brew.exceptions import ColorException
+from brew.frames import RecipeFrame
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import HopAddition
+from brew.recipes import Recipe
+from brew.utilities.arrays import get_numpy
+from brew.utilities.hops import HopsUtilizationJackieRager
+from fixtures import RecipeLoader
+from fixtures import cascade
+from fixtures import recipe
+from fixtures import recipe_data
+from fixtures import recipe_dme
+from fixtures import recipe_lme
+from fixtures import yeast
+
+
+@unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+class TestRecipeFrame(unittest.TestCase):
+    def setUp(self):
+        rager = HopAddition(
+            cascade,
+            weight=0.76,
+            boil_time=30.0,
+            utilization_cls=HopsUtilizationJackieRager,
+        )
+        self.recipe_rager = Recipe(
+            u"rager",
+            grain_additions=recipe.grain_additions,
+            hop_additions=[rager],
+            yeast=yeast,
+            start_volume=7.0,
+            final_volume=5.0,
+        )
+        self.recipes = [
+            recipe,
+            recipe.change_units(),
+            recipe_dme,
+            recipe_lme,
+            self.recipe_rager,
+        ]
+        self.frame = RecipeFrame.from_recipes(self.recipes)
+
+    def test_len(self):
+        self.assertEquals(len(self.frame), 5)
+        self.assertEquals(len(self.frame[u"grain_name"]), 10)
+        self.assertEquals(list(self.frame.grain_offsets), [0, 2, 4, 6, 8, 10])
+        self.assertEquals(list(self.frame.hop_offsets), [0, 2, 4, 6, 8, 9])
+
+    def test_to_dict(self):
+        for index, expected in enumerate(self.recipes):
+            self.assertEquals(self.frame.to_dict(index), expected.to_dict())
+
+    def test_to_dicts(self):
+        out = list(self.frame.to_dicts())
+        self.assertEquals(out, [r.to_dict() for r in self.recipes])
+
+    def test_to_dict_evaporation(self):
+        out = self.frame.to_dict(0, evaporation=0.1)
+        self.assertNotEquals(out, recipe.to_dict())
+        self.assertEquals(self.frame.to_dict(0), recipe.to_dict())
+
+    def test_get_metrics(self):
+        metrics = self.frame.get_metrics()
+        self.assertEquals(len(metrics[u"original_gravity"]), 5)
+        self.assertEquals(len(metrics[u"ibus"]), 9)
+        self.assertEquals(
+            round(metrics[u"original_gravity"][0], 3),
+            round(recipe.get_original_gravity(), 3),
+        )
+        self.assertEquals(
+            round(metrics[u"total_ibu"][0], 1), round(recipe.get_total_ibu(), 1)
+        )
+        self.assertTrue(metrics is self.frame.get_metrics())
+
+    def test_get_metrics_masked(self):
+        metrics = self.frame.get_metrics()
+        # Mosher and Daniels are not valid below their minimum MCU
+        self.assertTrue(metrics[u"srm_daniels"].mask[2])
+        self.assertFalse(metrics[u"srm_morey"].mask[2])
+
+    def test_to_dict_color_exception(self):
+        black = Grain(u"black", color=500.0, ppg=25.0)
+        dark = Recipe(
+            u"dark",
+            grain_additions=[GrainAddition(black, weight=10.0)],
+            hop_additions=[],
+            yeast=yeast,
+        )
+        frame = RecipeFrame.from_recipes([dark])
+        with self.assertRaises(ColorException):
+            frame.to_dict(0)
+
+    def test_get_recipe(self):
+        for index, expected in enumerate(self.recipes):
+            out = self.frame.get_recipe(index)
+            self.assertEquals(out, expected)
+            self.assertEquals(out.to_dict(), expected.to_dict())
+
+    def test_to_recipes(self):
+        out = list(self.frame.to_recipes())
+        self.assertEquals(out, self.recipes)
+
+    def test_round_trip(self):
+        frame = RecipeFrame.from_recipes(self.frame.to_recipes())
+        self.assertEquals(list(frame.to_dicts()), list(self.frame.to_dicts()))
+
+    def test_from_dicts(self):
+        frame = RecipeFrame.from_dicts([recipe_data, recipe_data], RecipeLoader())
+        self.assertEquals(len(frame), 2)
+        self.assertEquals(frame.to_dict(0), frame.get_recipe(0).to_dict())
+        self.assertEquals(frame.to_dict(0)[u"name"], u"pale ale")
+
+    def test_empty(self):
+        frame = RecipeFrame.from_recipes([])
+        self.assertEquals(len(frame), 0)
+        self.assertEquals(list(frame.to_dicts()), [])
+        self.assertEquals(len(frame.get_metrics()[u"original_gravity"]), 0)
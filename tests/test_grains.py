@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import pickle
 import sys
 import textwrap
 import unittest
@@ -330,3 +331,12 @@ class TestGrainAdditions(unittest.TestCase):
         grain_add = grain_add.change_units()
         self.assertEquals(grain_add.units, IMPERIAL_UNITS)
         self.assertEquals(round(grain_add.weight, 2), 13.96)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.grain_add, u"__dict__"))
+        self.assertFalse(hasattr(self.grain_add.grain, u"__dict__"))
+
+    def test_pickle(self):
+        out = pickle.loads(pickle.dumps(self.grain_add))
+        self.assertEquals(out, self.grain_add)
+        self.assertEquals(out.to_dict(), self.grain_add.to_dict())
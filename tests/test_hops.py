@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import pickle
 import sys
 import textwrap
 import unittest
@@ -9,10 +10,12 @@ from brew.constants import SI_UNITS
 from brew.exceptions import HopException
 from brew.hops import Hop
 from brew.hops import HopAddition
+from brew.utilities.hops import HopsUtilizationGlennTinseth
 from brew.utilities.sugar import plato_to_sg
 from fixtures import cascade
 from fixtures import cascade_add
 from fixtures import centennial
+from fixtures import hop_additions
 
 
 class TestHops(unittest.TestCase):
@@ -223,3 +226,53 @@ class TestHopAdditions(unittest.TestCase):
         ha = self.hop_addition1.change_units()
         out = ha.get_alpha_acid_units()
         self.assertEquals(round(out, 2), 7.98)
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.hop1, u"__dict__"))
+        self.assertFalse(hasattr(self.hop_addition1, u"__dict__"))
+
+    def test_utilization_shared(self):
+        self.assertIs(self.hop_addition1.utilization, self.hop_addition2.utilization)
+        self.assertIsNone(self.hop_addition1.utilization.hop_addition)
+        ha = self.hop_addition1.change_units()
+        self.assertIsNot(ha.utilization, self.hop_addition1.utilization)
+
+    def test_utilization_cls_bound(self):
+        utilization = self.hop_addition1.utilization_cls
+        self.assertIs(utilization.hop_addition, self.hop_addition1)
+        self.assertIsInstance(utilization, HopsUtilizationGlennTinseth)
+        self.assertIsNone(self.hop_addition1.utilization.hop_addition)
+
+    def test_utilization_cls_get_ibus(self):
+        for hop_addition in hop_additions:
+            out = hop_addition.utilization_cls.get_ibus(self.sg, self.final_volume)
+            expected = hop_addition.get_ibus(self.sg, self.final_volume)
+            self.assertEquals(out, expected)
+
+    def test_utilization_unhashable_kwargs(self):
+        class Utilization(HopsUtilizationGlennTinseth):
+            def __init__(self, hop_addition=None, units=IMPERIAL_UNITS, extra=None):
+                super(Utilization, self).__init__(hop_addition, units=units)
+
+        kwargs = {u"utilization_cls": Utilization, u"boil_time": 60.0, u"weight": 0.5}
+        ha1 = HopAddition(self.hop1, utilization_cls_kwargs={u"extra": []}, **kwargs)
+        ha2 = HopAddition(self.hop1, utilization_cls_kwargs={u"extra": []}, **kwargs)
+        self.assertIsNot(ha1.utilization, ha2.utilization)
+        ha3 = HopAddition(self.hop1, utilization_cls_kwargs={u"extra": 1}, **kwargs)
+        ha4 = HopAddition(self.hop1, utilization_cls_kwargs={u"extra": 1}, **kwargs)
+        self.assertIs(ha3.utilization, ha4.utilization)
+
+    def test_get_ibus_shared_utilization(self):
+        ibu1 = self.hop_addition1.get_ibus(self.sg, self.final_volume)
+        ibu2 = self.hop_addition2.get_ibus(self.sg, self.final_volume)
+        self.assertNotEquals(ibu1, ibu2)
+        utilization = self.hop_addition1.utilization
+        out = utilization.get_ibus(
+            self.sg, self.final_volume, hop_addition=self.hop_addition2
+        )
+        self.assertEquals(out, ibu2)
+
+    def test_pickle(self):
+        out = pickle.loads(pickle.dumps(self.hop_addition1))
+        self.assertEquals(out, self.hop_addition1)
+        self.assertEquals(out.to_dict(), self.hop_addition1.to_dict())
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+from brew import instrumentation
+from brew import parsers
+from brew import recipes
+from brew.exceptions import ValidatorException
+from brew.instrumentation import CallbackSink
+from brew.instrumentation import PrometheusFileSink
+from brew.instrumentation import StatsdSink
+from brew.utilities import color
+from brew.utilities.hops import HopsUtilization
+from brew.utilities.hops import HopsUtilizationGlennTinseth
+from fixtures import RecipeLoader
+from fixtures import recipe
+from fixtures import recipe_data
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset_stats()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset_stats()
+
+    def test_enable_disable(self):
+        to_dict = recipes.Recipe.to_dict
+        parse_recipe = parsers.parse_recipe
+        calculate_srm = recipes.calculate_srm
+        get_utilization_table = HopsUtilization.__dict__[u"get_utilization_table"]
+        self.assertFalse(instrumentation.is_enabled())
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        self.assertFalse(recipes.Recipe.to_dict is to_dict)
+        self.assertFalse(parsers.parse_recipe is parse_recipe)
+        # Functions imported into other modules are replaced too
+        self.assertTrue(recipes.calculate_srm is color.calculate_srm)
+        self.assertFalse(recipes.calculate_srm is calculate_srm)
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertTrue(recipes.Recipe.to_dict is to_dict)
+        self.assertTrue(parsers.parse_recipe is parse_recipe)
+        self.assertTrue(recipes.calculate_srm is calculate_srm)
+        self.assertTrue(
+            HopsUtilization.__dict__[u"get_utilization_table"] is get_utilization_table
+        )
+
+    def test_enable_twice(self):
+        instrumentation.enable()
+        with self.assertRaises(RuntimeError):
+            instrumentation.enable()
+
+    def test_disabled(self):
+        recipe.to_dict()
+        self.assertEquals(instrumentation.get_stats(), {})
+
+    def test_get_stats(self):
+        expected = recipe.to_dict()
+        instrumentation.enable()
+        out = recipe.to_dict()
+        recipe.to_dict()
+        self.assertEquals(out, expected)
+        stats = instrumentation.get_stats()
+        self.assertEquals(stats[u"brew.recipes.Recipe.to_dict"][u"count"], 2)
+        self.assertTrue(stats[u"brew.recipes.Recipe.to_dict"][u"seconds"] > 0.0)
+        self.assertTrue(u"brew.utilities.color.calculate_srm" in stats)
+        instrumentation.reset_stats()
+        self.assertEquals(instrumentation.get_stats(), {})
+
+    def test_classmethod(self):
+        instrumentation.enable()
+        out = parsers.DataLoader.format_name(u"Pale 2-Row")
+        self.assertEquals(out, u"pale_2_row")
+        HopsUtilizationGlennTinseth.get_bigness_factor(1.050)
+        stats = instrumentation.get_stats()
+        self.assertEquals(stats[u"brew.parsers.DataLoader.format_name"][u"count"], 1)
+        name = u"brew.utilities.hops.HopsUtilizationGlennTinseth.get_bigness_factor"
+        self.assertEquals(stats[name][u"count"], 1)
+
+    def test_generator(self):
+        instrumentation.enable()
+        out = list(parsers.parse_recipes([recipe_data, recipe_data], RecipeLoader()))
+        self.assertEquals(len(out), 2)
+        stats = instrumentation.get_stats()
+        self.assertEquals(stats[u"brew.parsers.parse_recipes"][u"count"], 1)
+        self.assertEquals(stats[u"brew.parsers.parse_recipe"][u"count"], 2)
+
+    def test_exception(self):
+        instrumentation.enable()
+        with self.assertRaises(ValidatorException):
+            parsers.parse_recipe({}, RecipeLoader())
+        stats = instrumentation.get_stats()
+        self.assertEquals(stats[u"brew.parsers.parse_recipe"][u"count"], 1)
+
+    def test_modules(self):
+        instrumentation.enable(modules=[u"brew.utilities.color"])
+        recipe.to_dict()
+        stats = instrumentation.get_stats()
+        self.assertFalse(u"brew.recipes.Recipe.to_dict" in stats)
+        self.assertTrue(u"brew.utilities.color.calculate_srm" in stats)
+
+    def test_callback_sink(self):
+        calls = []
+        sink = CallbackSink(lambda name, seconds: calls.append(name))
+        with instrumentation.instrumented(sinks=[sink]):
+            recipe.get_original_gravity()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertTrue(u"brew.recipes.Recipe.get_original_gravity" in calls)
+        recipe.get_original_gravity()
+        self.assertEquals(calls.count(u"brew.recipes.Recipe.get_original_gravity"), 1)
+
+
+class TestPrometheusFileSink(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.data_dir, u"brew.prom")
+        self.sink = PrometheusFileSink(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_format(self):
+        stats = {u"brew.recipes.Recipe.to_dict": {u"count": 2, u"seconds": 0.5}}
+        out = self.sink.format(stats)
+        expected = u"\n".join(
+            [
+                u"# HELP brew_calls_total Number of calls",
+                u"# TYPE brew_calls_total counter",
+                u'brew_calls_total{function="brew.recipes.Recipe.to_dict"} 2',
+                u"# HELP brew_call_seconds_total Total time of calls in seconds",
+                u"# TYPE brew_call_seconds_total counter",
+                u'brew_call_seconds_total{function="brew.recipes.Recipe.to_dict"} 0.5',  # noqa
+                u"",
+            ]
+        )
+        self.assertEquals(out, expected)
+
+    def test_format_label(self):
+        out = PrometheusFileSink.format_label(u'a"b\\c\n')
+        self.assertEquals(out, u'a\\"b\\\\c\\n')
+
+    def test_flush(self):
+        with instrumentation.instrumented(sinks=[self.sink]):
+            recipe.to_dict()
+        instrumentation.reset_stats()
+        with open(self.filename) as f:
+            out = f.read()
+        expected = u'brew_calls_total{function="brew.recipes.Recipe.to_dict"} 1'
+        self.assertTrue(expected in out)
+        self.assertEquals(os.listdir(self.data_dir), [u"brew.prom"])
+
+
+class TestStatsdSink(unittest.TestCase):
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server.bind((u"127.0.0.1", 0))
+        self.server.settimeout(5.0)
+        self.sink = StatsdSink(port=self.server.getsockname()[1], prefix=u"app")
+
+    def tearDown(self):
+        self.sink.close()
+        self.server.close()
+
+    def test_format(self):
+        out = self.sink.format(u"brew.recipes.Recipe.to_dict", 0.0015)
+        self.assertEquals(out, u"app.brew.recipes.Recipe.to_dict:1.500000|ms")
+
+    def test_emit(self):
+        self.sink.emit(u"brew.recipes.Recipe.to_dict", 0.002)
+        out = self.server.recv(1024).decode(u"utf-8")
+        self.assertEquals(out, u"app.brew.recipes.Recipe.to_dict:2.000000|ms")
+
+    def test_emit_error(self):
+        sink = StatsdSink(host=u"127.0.0.1", port=0)
+        sink.emit(u"brew.recipes.Recipe.to_dict", 0.002)
+        sink.close()
@@ -1,17 +1,28 @@
 # -*- coding: utf-8 -*-
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
 import unittest
 import warnings
 
 import mock
+from brew import parsers
 from brew.exceptions import DataLoaderException
 from brew.exceptions import GrainException
 from brew.exceptions import HopException
+from brew.exceptions import ValidatorException
 from brew.exceptions import YeastException
 from brew.parsers import DataLoader
 from brew.parsers import JSONDataLoader
+from brew.parsers import MemoizedLoader
+from brew.parsers import PackedDataLoader
 from brew.parsers import parse_cereals
 from brew.parsers import parse_hops
 from brew.parsers import parse_recipe
+from brew.parsers import parse_recipes
 from brew.parsers import parse_yeast
 from brew.recipes import Recipe
 from fixtures import cascade_add
@@ -40,10 +51,22 @@ class YeastLoader(DataLoader):
         return yst
 
 
+class CountingLoader(DataLoader):
+    def __init__(self):
+        self.calls = []
+
+    def get_item(self, dir_suffix, item_name):
+        self.calls.append((dir_suffix, item_name))
+        if dir_suffix == u"cereals/":
+            return {u"color": 2.0, u"ppg": 37.0}
+        if dir_suffix == u"hops/":
+            return {u"percent_alpha_acids": 0.07}
+        return {u"percent_attenuation": 0.75}
+
+
 class TestDataLoader(unittest.TestCase):
     def setUp(self):
         self.loader = DataLoader("./")
-        self.loader.DATA = {}
         self.loader.EXT = "json"
 
     def test_data_dir_does_not_exist(self):
@@ -108,6 +131,320 @@ class TestJSONDataLoader(unittest.TestCase):
             self.assertEquals(out, expected)
 
 
+class TestJSONDataLoaderCache(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.other_dir = tempfile.mkdtemp()
+        self.write_item(self.data_dir, u"crystal_20", {u"color": 20.0})
+        self.write_item(self.other_dir, u"crystal_20", {u"color": 40.0})
+        self.index_file = os.path.join(self.other_dir, u"index.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+        shutil.rmtree(self.other_dir)
+
+    def write_item(self, data_dir, name, data, mtime=None):
+        item_dir = os.path.join(data_dir, u"cereals")
+        if not os.path.isdir(item_dir):
+            os.mkdir(item_dir)
+        filename = os.path.join(item_dir, u"{}.json".format(name))
+        with open(filename, "w") as f:
+            f.write(json.dumps(data))
+        if mtime is not None:
+            os.utime(filename, (mtime, mtime))
+        return filename
+
+    def test_cache_per_data_dir(self):
+        loader = JSONDataLoader(self.data_dir)
+        other = JSONDataLoader(self.other_dir)
+        self.assertEquals(loader.get_item(u"cereals/", u"crystal 20"), {u"color": 20.0})
+        self.assertEquals(other.get_item(u"cereals/", u"crystal 20"), {u"color": 40.0})
+
+    def test_cache_hit(self):
+        loader = JSONDataLoader(self.data_dir)
+        loader.get_item(u"cereals/", u"crystal 20")
+        with mock.patch.object(loader, u"read_data") as mock_read:
+            out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertFalse(mock_read.called)
+        self.assertEquals(out, {u"color": 20.0})
+
+    def test_cache_invalidated_on_change(self):
+        loader = JSONDataLoader(self.data_dir)
+        loader.get_item(u"cereals/", u"crystal 20")
+        self.write_item(self.data_dir, u"crystal_20", {u"color": 25.0}, mtime=1000)
+        out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertEquals(out, {u"color": 25.0})
+
+    def test_new_item_found(self):
+        loader = JSONDataLoader(self.data_dir)
+        loader.get_item(u"cereals/", u"crystal 20")
+        self.write_item(self.data_dir, u"crystal_40", {u"color": 40.0})
+        # Make sure the directory looks changed on coarse clocks
+        item_dir = os.path.join(self.data_dir, u"cereals/")
+        os.utime(item_dir, (1000, 1000))
+        out = loader.get_item(u"cereals/", u"crystal 40")
+        self.assertEquals(out, {u"color": 40.0})
+
+    def test_build_index(self):
+        loader = JSONDataLoader(self.data_dir)
+        self.write_item(self.data_dir, u"crystal_40", {u"color": 40.0})
+        count = loader.build_index(self.index_file)
+        self.assertEquals(count, 2)
+        self.assertEquals(loader.index_file, self.index_file)
+
+    def test_build_index_raises(self):
+        loader = JSONDataLoader(self.data_dir)
+        with self.assertRaises(DataLoaderException):
+            loader.build_index()
+
+    def test_get_item_from_index(self):
+        JSONDataLoader(self.data_dir).build_index(self.index_file)
+        loader = JSONDataLoader(self.data_dir, index_file=self.index_file)
+        with mock.patch(u"glob.glob") as mock_glob:
+            with mock.patch.object(loader, u"read_data") as mock_read:
+                out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertFalse(mock_read.called)
+        self.assertFalse(mock_glob.called)
+        self.assertEquals(out, {u"color": 20.0})
+
+    def test_get_item_stale_index(self):
+        JSONDataLoader(self.data_dir).build_index(self.index_file)
+        self.write_item(self.data_dir, u"crystal_20", {u"color": 25.0}, mtime=1000)
+        loader = JSONDataLoader(self.data_dir, index_file=self.index_file)
+        out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertEquals(out, {u"color": 25.0})
+
+    def test_get_item_missing_index(self):
+        loader = JSONDataLoader(self.data_dir, index_file=self.index_file)
+        out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertEquals(out, {u"color": 20.0})
+
+    def test_cache_hit_skips_index(self):
+        JSONDataLoader(self.data_dir).build_index(self.index_file)
+        loader = JSONDataLoader(self.data_dir, index_file=self.index_file)
+        loader.get_item(u"cereals/", u"crystal 20")
+        with mock.patch.object(loader, u"_get_index_item") as mock_index:
+            with mock.patch(u"os.path.isdir") as mock_isdir:
+                out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertFalse(mock_index.called)
+        self.assertFalse(mock_isdir.called)
+        self.assertEquals(out, {u"color": 20.0})
+
+    def test_cache_stamp_ttl(self):
+        loader = JSONDataLoader(self.data_dir, stamp_ttl=60.0)
+        loader.get_item(u"cereals/", u"crystal 20")
+        self.write_item(self.data_dir, u"crystal_20", {u"color": 25.0}, mtime=1000)
+        with mock.patch.object(loader, u"get_stamp") as mock_stamp:
+            out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertFalse(mock_stamp.called)
+        self.assertEquals(out, {u"color": 20.0})
+        # Once the ttl has passed the file is checked again
+        with mock.patch(u"time.time", return_value=time.time() + 61.0):
+            out = loader.get_item(u"cereals/", u"crystal 20")
+        self.assertEquals(out, {u"color": 25.0})
+
+    def test_cache_removed_item(self):
+        filename = self.write_item(self.data_dir, u"crystal_40", {u"color": 40.0})
+        loader = JSONDataLoader(self.data_dir)
+        loader.get_item(u"cereals/", u"crystal 40")
+        os.remove(filename)
+        # Make sure the directory looks changed on coarse clocks
+        os.utime(os.path.dirname(filename), (1000, 1000))
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter(u"always")
+            out = loader.get_item(u"cereals/", u"crystal 40")
+        self.assertEquals(out, {})
+
+    def test_pickle_with_index(self):
+        JSONDataLoader(self.data_dir).build_index(self.index_file)
+        loader = JSONDataLoader(self.data_dir, index_file=self.index_file)
+        loader.get_item(u"cereals/", u"crystal 20")
+        out = pickle.loads(pickle.dumps(loader))
+        self.assertEquals(out.get_item(u"cereals/", u"crystal 20"), {u"color": 20.0})
+
+
+class TestJSONDataLoaderLRU(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        item_dir = os.path.join(self.data_dir, u"cereals")
+        os.mkdir(item_dir)
+        for index in range(4):
+            filename = os.path.join(item_dir, u"grain_{}.json".format(index))
+            with open(filename, "w") as f:
+                f.write(json.dumps({u"color": float(index)}))
+        self.item_bytes = os.stat(filename).st_size
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_cache_stats(self):
+        loader = JSONDataLoader(self.data_dir)
+        loader.get_item(u"cereals/", u"grain 0")
+        loader.get_item(u"cereals/", u"grain 0")
+        out = loader.get_cache_stats()
+        expected = {
+            u"hits": 1,
+            u"misses": 1,
+            u"evictions": 0,
+            u"entries": 1,
+            u"bytes": self.item_bytes,
+        }
+        self.assertEquals(out, expected)
+        loader.reset_cache_stats()
+        out = loader.get_cache_stats()
+        self.assertEquals(out[u"hits"], 0)
+        self.assertEquals(out[u"entries"], 1)
+
+    def test_max_entries(self):
+        loader = JSONDataLoader(self.data_dir, max_entries=2)
+        loader.get_item(u"cereals/", u"grain 0")
+        loader.get_item(u"cereals/", u"grain 1")
+        # Use grain 0 so that grain 1 is the least recently used
+        loader.get_item(u"cereals/", u"grain 0")
+        loader.get_item(u"cereals/", u"grain 2")
+        out = loader.get_cache_stats()
+        self.assertEquals(out[u"entries"], 2)
+        self.assertEquals(out[u"evictions"], 1)
+        with mock.patch.object(loader, u"read_data") as mock_read:
+            loader.get_item(u"cereals/", u"grain 0")
+        self.assertFalse(mock_read.called)
+        out = loader.get_item(u"cereals/", u"grain 1")
+        self.assertEquals(out, {u"color": 1.0})
+        self.assertEquals(loader.get_cache_stats()[u"evictions"], 2)
+
+    def test_max_bytes(self):
+        loader = JSONDataLoader(self.data_dir, max_bytes=self.item_bytes * 3)
+        for index in range(4):
+            loader.get_item(u"cereals/", u"grain {}".format(index))
+        out = loader.get_cache_stats()
+        self.assertEquals(out[u"entries"], 3)
+        self.assertEquals(out[u"bytes"], self.item_bytes * 3)
+        self.assertEquals(out[u"evictions"], 1)
+
+    def test_preload(self):
+        loader = JSONDataLoader(self.data_dir)
+        count = loader.preload(u"cereals/", [u"grain 0", u"grain 1", u"missing"])
+        self.assertEquals(count, 2)
+        loader.reset_cache_stats()
+        loader.get_item(u"cereals/", u"grain 1")
+        self.assertEquals(loader.get_cache_stats()[u"hits"], 1)
+
+    def test_clear_cache(self):
+        loader = JSONDataLoader(self.data_dir)
+        loader.get_item(u"cereals/", u"grain 0")
+        loader.clear_cache()
+        out = loader.get_cache_stats()
+        self.assertEquals(out[u"entries"], 0)
+        self.assertEquals(out[u"bytes"], 0)
+
+
+class TestPackedDataLoader(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.items = {
+            u"cereals": {u"crystal_20": {u"color": 20.0, u"ppg": 35.0}},
+            u"hops": {u"cascade_us": {u"percent_alpha_acids": 0.07}},
+            u"yeast": {u"wyeast_1056": {u"percent_attenuation": 0.75}},
+        }
+        for dir_name, items in self.items.items():
+            item_dir = os.path.join(self.data_dir, dir_name)
+            os.mkdir(item_dir)
+            for name, data in items.items():
+                filename = os.path.join(item_dir, u"{}.json".format(name))
+                with open(filename, "w") as f:
+                    f.write(json.dumps(data))
+        self.filename = os.path.join(self.data_dir, u"packed.jsonl")
+        self.count = PackedDataLoader.build(self.data_dir, self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_build(self):
+        self.assertEquals(self.count, 3)
+
+    def test_file_does_not_exist(self):
+        with self.assertRaises(DataLoaderException):
+            PackedDataLoader(os.path.join(self.data_dir, u"missing.jsonl"))
+
+    def test_bad_file(self):
+        filename = os.path.join(self.data_dir, u"bad.jsonl")
+        with open(filename, "w") as f:
+            f.write(u"{}\n")
+        loader = PackedDataLoader(filename)
+        with self.assertRaises(DataLoaderException):
+            loader.get_item(u"cereals/", u"crystal 20")
+
+    def test_get_item(self):
+        loader = PackedDataLoader(self.filename)
+        self.assertEquals(
+            loader.get_item(u"cereals/", u"crystal 20"),
+            self.items[u"cereals"][u"crystal_20"],
+        )
+        self.assertEquals(
+            loader.get_item(u"hops/", u"cascade us"), self.items[u"hops"][u"cascade_us"]
+        )
+        self.assertEquals(
+            loader.get_item(u"yeast", u"Wyeast 1056"),
+            self.items[u"yeast"][u"wyeast_1056"],
+        )
+
+    def test_get_item_cached(self):
+        loader = PackedDataLoader(self.filename)
+        loader.get_item(u"cereals/", u"crystal 20")
+        loader.get_item(u"cereals/", u"crystal 20")
+        out = loader.get_cache_stats()
+        self.assertEquals(out[u"hits"], 1)
+        self.assertEquals(out[u"misses"], 1)
+
+    def test_get_item_dir_does_not_exist(self):
+        loader = PackedDataLoader(self.filename)
+        with self.assertRaises(DataLoaderException):
+            loader.get_item(u"baditemdir/", u"crystal 20")
+
+    def test_get_item_warns(self):
+        loader = PackedDataLoader(self.filename)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            out = loader.get_item(u"cereals/", u"crystal 40")
+            self.assertEqual(len(w), 1)
+            self.assertTrue("dir not found" in str(w[-1].message))
+        self.assertEquals(out, {})
+
+    def test_reload(self):
+        loader = PackedDataLoader(self.filename)
+        loader.get_item(u"cereals/", u"crystal 20")
+        filename = os.path.join(self.data_dir, u"cereals", u"crystal_40.json")
+        with open(filename, "w") as f:
+            f.write(json.dumps({u"color": 40.0}))
+        PackedDataLoader.build(self.data_dir, self.filename)
+        loader.reload()
+        out = loader.get_item(u"cereals/", u"crystal 40")
+        self.assertEquals(out, {u"color": 40.0})
+
+    def test_pickle(self):
+        loader = PackedDataLoader(self.filename)
+        loader.get_item(u"cereals/", u"crystal 20")
+        out = pickle.loads(pickle.dumps(loader))
+        self.assertEquals(
+            out.get_item(u"hops/", u"cascade us"), self.items[u"hops"][u"cascade_us"]
+        )
+
+    def test_parse_recipe(self):
+        loader = PackedDataLoader(self.filename)
+        recipe = {
+            u"name": u"Test",
+            u"start_volume": 7.0,
+            u"final_volume": 5.0,
+            u"grains": [{u"name": u"crystal 20", u"weight": 1.0}],
+            u"hops": [{u"name": u"cascade us", u"weight": 1.0, u"boil_time": 60.0}],
+            u"yeast": {u"name": u"Wyeast 1056"},
+        }
+        out = parse_recipe(recipe, loader)
+        self.assertEquals(out.grain_additions[0].grain.color, 20.0)
+        self.assertEquals(out.hop_additions[0].hop.percent_alpha_acids, 0.07)
+        self.assertEquals(out.yeast.percent_attenuation, 0.75)
+
+
 class TestCerealParser(unittest.TestCase):
     def setUp(self):
         self.grain_add = pale_add.to_dict()
@@ -291,3 +628,101 @@ class TestRecipeParser(unittest.TestCase):
             yeast_dir_suffix="/",
         )
         self.assertEquals(out, self.recipe)
+
+
+class TestParseRecipes(unittest.TestCase):
+    def setUp(self):
+        self.recipe_data = {
+            u"name": u"pale ale",
+            u"start_volume": 7.0,
+            u"final_volume": 5.0,
+            u"grains": [{u"name": u"pale 2-row", u"weight": 13.96}],
+            u"hops": [{u"name": u"cascade", u"weight": 0.76, u"boil_time": 60.0}],
+            u"yeast": {u"name": u"Wyeast 1056"},
+        }
+        self.bad_recipe_data = dict(self.recipe_data)
+        self.bad_recipe_data.pop(u"name")
+        self.recipes = [self.recipe_data, self.bad_recipe_data, self.recipe_data]
+        self.loader = CountingLoader()
+        self.expected = parse_recipe(self.recipe_data, self.loader)
+        self.loader.calls = []
+
+    def assertResults(self, results):
+        self.assertEquals([result.index for result in results], [0, 1, 2])
+        self.assertEquals(results[0].recipe, self.expected)
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].recipe)
+        self.assertTrue(isinstance(results[1].error, ValidatorException))
+        self.assertEquals(results[2].recipe, self.expected)
+
+    def test_parse_recipes(self):
+        results = list(parse_recipes(iter(self.recipes), self.loader))
+        self.assertResults(results)
+
+    def test_parse_recipes_memoizes_lookups(self):
+        list(parse_recipes(self.recipes, self.loader, chunksize=1))
+        self.assertEquals(len(self.loader.calls), 3)
+
+    def test_parse_recipes_separate_loaders(self):
+        cereals_loader = CountingLoader()
+        results = list(
+            parse_recipes(self.recipes, self.loader, cereals_loader=cereals_loader)
+        )
+        self.assertResults(results)
+        self.assertEquals(len(cereals_loader.calls), 1)
+        self.assertEquals(len(self.loader.calls), 2)
+
+    def test_parse_recipes_pool(self):
+        results = list(
+            parse_recipes(
+                self.recipes, self.loader, processes=2, chunksize=1, max_pending=2
+            )
+        )
+        self.assertResults(results)
+
+    def test_parse_recipes_bad_chunksize(self):
+        with self.assertRaises(ValueError):
+            list(parse_recipes(self.recipes, self.loader, chunksize=0))
+
+
+class TestMemoizedLoader(unittest.TestCase):
+    def test_get_item(self):
+        loader = CountingLoader()
+        memoized = MemoizedLoader(loader)
+        memoized.get_item(u"hops/", u"Cascade US")
+        out = memoized.get_item(u"hops/", u"cascade us")
+        self.assertEquals(out, {u"percent_alpha_acids": 0.07})
+        self.assertEquals(loader.calls, [(u"hops/", u"Cascade US")])
+
+    def test_get_item_max_entries(self):
+        loader = CountingLoader()
+        memoized = MemoizedLoader(loader, max_entries=2)
+        for item_name in [u"cascade", u"centennial", u"cascade", u"chinook"]:
+            memoized.get_item(u"hops/", item_name)
+        # Centennial was the least recently used so it is looked up again
+        memoized.get_item(u"hops/", u"centennial")
+        memoized.get_item(u"hops/", u"chinook")
+        expected = [u"cascade", u"centennial", u"chinook", u"centennial"]
+        self.assertEquals([call[1] for call in loader.calls], expected)
+        self.assertEquals(len(memoized._items), 2)
+
+    def test_max_entries_from_loader(self):
+        loader = JSONDataLoader(u"./", max_entries=5)
+        self.assertEquals(MemoizedLoader(loader).max_entries, 5)
+        loader = JSONDataLoader(u"./")
+        self.assertEquals(
+            MemoizedLoader(loader).max_entries, parsers.MEMOIZED_MAX_ENTRIES
+        )
+
+    def test_get_item_not_found(self):
+        class Loader(CountingLoader):
+            def get_item(self, dir_suffix, item_name):
+                self.calls.append((dir_suffix, item_name))
+                return {}
+
+        loader = Loader()
+        memoized = MemoizedLoader(loader)
+        memoized.get_item(u"hops/", u"missing")
+        out = memoized.get_item(u"hops/", u"missing")
+        self.assertEquals(out, {})
+        self.assertEquals(len(loader.calls), 2)
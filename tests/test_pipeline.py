@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+from collections import deque
+
+from brew.parsers import parse_recipe
+from brew.pipeline import format_error
+from brew.pipeline import iter_records
+from brew.pipeline import run_pipeline
+from fixtures import RecipeLoader
+from fixtures import recipe_data
+
+
+class TestIterRecords(unittest.TestCase):
+    def test_iter_records(self):
+        lines = [u'{"a": 1}\n', u"\n", u"not json\n", u'{"b": 2}\n']
+        errors = []
+        line_numbers = deque()
+
+        def on_error(line_number, error):
+            errors.append(line_number)
+
+        out = list(
+            iter_records(lines, on_error=on_error, line_numbers=line_numbers)
+        )
+        self.assertEquals(out, [{u"a": 1}, {u"b": 2}])
+        self.assertEquals(errors, [3])
+        self.assertEquals(list(line_numbers), [1, 4])
+
+    def test_format_error(self):
+        out = json.loads(format_error(3, ValueError(u"bad")))
+        self.assertEquals(out, {u"line": 3, u"error": u"ValueError: bad"})
+
+
+class TestRunPipeline(unittest.TestCase):
+    def setUp(self):
+        self.loader = RecipeLoader()
+        bad_recipe = dict(recipe_data)
+        bad_recipe.pop(u"name")
+        self.lines = [
+            json.dumps(recipe_data) + u"\n",
+            u"{not json\n",
+            json.dumps(bad_recipe) + u"\n",
+            json.dumps(recipe_data) + u"\n",
+        ]
+        self.expected = parse_recipe(recipe_data, self.loader).to_dict()
+
+    def run_pipeline(self, **kwargs):
+        output = io.StringIO()
+        errors = io.StringIO()
+        stats = run_pipeline(
+            iter(self.lines), output, self.loader, errors=errors, **kwargs
+        )
+        return stats, output.getvalue(), errors.getvalue()
+
+    def test_run_pipeline(self):
+        stats, output, errors = self.run_pipeline(chunksize=1)
+        self.assertEquals(stats, {u"records": 4, u"recipes": 2, u"errors": 2})
+        recipes = [json.loads(line) for line in output.splitlines()]
+        self.assertEquals(recipes, [self.expected, self.expected])
+        errors = [json.loads(line) for line in errors.splitlines()]
+        self.assertEquals([error[u"line"] for error in errors], [2, 3])
+        self.assertTrue(errors[1][u"error"].startswith(u"ValidatorException"))
+
+    def test_run_pipeline_pool(self):
+        stats, output, errors = self.run_pipeline(processes=2, chunksize=1)
+        self.assertEquals(stats, {u"records": 4, u"recipes": 2, u"errors": 2})
+        recipes = [json.loads(line) for line in output.splitlines()]
+        self.assertEquals(recipes, [self.expected, self.expected])
+
+    def test_run_pipeline_no_errors_stream(self):
+        output = io.StringIO()
+        stats = run_pipeline(iter(self.lines), output, self.loader)
+        self.assertEquals(stats[u"errors"], 2)
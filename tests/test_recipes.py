@@ -10,14 +10,22 @@ from brew.constants import IMPERIAL_UNITS
 from brew.constants import SI_UNITS
 from brew.exceptions import RecipeException
 from brew.exceptions import ValidatorException
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.hops import Hop
+from brew.hops import HopAddition
 from brew.recipes import Recipe
 from brew.recipes import RecipeBuilder
+from brew.recipes import scale_recipes
+from brew.utilities.hops import HopsUtilizationJackieRager
 from fixtures import builder
 from fixtures import grain_additions
 from fixtures import grain_list
 from fixtures import hop_additions
 from fixtures import hop_list
 from fixtures import recipe
+from fixtures import recipe_dme
+from fixtures import recipe_lme
 from fixtures import yeast
 
 
@@ -166,6 +174,274 @@ class TestRecipe(unittest.TestCase):
         hop_additions = self.recipe.get_hop_additions_by_type(HOP_TYPE_WHOLE)  # noqa
         self.assertEquals(hop_additions, [])
 
+    def test_lookups_per_instance(self):
+        recipe1 = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            hop_additions=hop_additions,
+            yeast=yeast,
+        )
+        recipe2 = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=6.98)],
+            hop_additions=[hop_additions[0]],
+            yeast=yeast,
+        )
+        self.assertIsNot(recipe1.grain_lookup, recipe2.grain_lookup)
+        self.assertIsNot(recipe1.hop_lookup, recipe2.hop_lookup)
+        self.assertEquals(
+            recipe1.grain_lookup[u"pale 2-row"], recipe1.grain_additions[0]
+        )
+        self.assertEquals(
+            recipe2.grain_lookup[u"pale 2-row"], recipe2.grain_additions[0]
+        )
+        self.assertEquals(len(recipe1.hop_lookup), 2)
+        self.assertEquals(len(recipe2.hop_lookup), 1)
+        self.assertTrue(u"Weight:            6.98 lbs" in recipe2.format())
+
+        recipe2.grain_additions = [GrainAddition(grain_list[1], weight=1.0)]
+        self.assertEquals(list(recipe2.grain_lookup.keys()), [u"crystal C20"])
+
+    def test_lookup_addition_in_place(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            hop_additions=[hop_additions[0]],
+            yeast=yeast,
+        )
+        recipe.format()
+        recipe.grain_additions.append(
+            GrainAddition(Grain(u"crystal C20", color=20.0, ppg=35.0), weight=0.78)
+        )
+        recipe.hop_additions.append(hop_additions[1])
+        out = recipe.format()
+        self.assertTrue(u"crystal C20" in out)
+        self.assertEquals(len(recipe.hop_lookup), 2)
+        recipe.grain_additions[1].grain.name = u"crystal C40"
+        self.assertEquals(
+            sorted(recipe.grain_lookup.keys()), [u"crystal C40", u"pale 2-row"]
+        )
+
+    def test_cache_stats(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=grain_additions,
+            hop_additions=hop_additions,
+            yeast=yeast,
+        )
+        recipe.og
+        recipe.fg
+        recipe.abv
+        stats = recipe.get_cache_stats()
+        self.assertEquals(stats[u"misses"], 1)
+        self.assertEquals(stats[u"hits"], 3)
+        self.assertEquals(stats[u"recomputes"], {u"total_points": 1})
+
+        recipe.reset_cache_stats()
+        stats = recipe.get_cache_stats()
+        self.assertEquals(stats[u"hits"], 0)
+        self.assertEquals(stats[u"recomputes"], {})
+
+    def test_cache_invalidated_on_set(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=grain_additions,
+            hop_additions=hop_additions,
+            yeast=yeast,
+        )
+        og = recipe.og
+        ibu = recipe.ibu
+        recipe.final_volume = 10.0
+        self.assertTrue(recipe.og < og)
+        self.assertTrue(recipe.ibu < ibu)
+        recipe.grain_additions = [grain_additions[0]]
+        recipe.to_dict()
+        stats = recipe.get_cache_stats()
+        self.assertEquals(stats[u"invalidations"], 2)
+        self.assertEquals(stats[u"recomputes"][u"total_points"], 3)
+
+    def test_to_dict_single_pass(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=grain_additions,
+            hop_additions=hop_additions,
+            yeast=yeast,
+        )
+        recipe.format()
+        recipe.get_percent_malt_bill(grain_additions[0])
+        recipe.get_percent_ibus(hop_additions[0])
+        recomputes = recipe.get_cache_stats()[u"recomputes"]
+        self.assertEquals(recomputes[u"grain_aggregates"], 1)
+        self.assertEquals(recomputes[u"hop_aggregates"], 1)
+
+    def test_invalidate_cache(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            yeast=yeast,
+        )
+        og = recipe.og
+        recipe.invalidate_cache()
+        self.assertEquals(recipe.og, og)
+        self.assertEquals(recipe.get_cache_stats()[u"invalidations"], 1)
+
+    def test_cache_grain_addition_in_place(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            yeast=yeast,
+        )
+        og = recipe.og
+        recipe.grain_additions[0].weight *= 2
+        self.assertTrue(recipe.og > og)
+        og = recipe.og
+        recipe.grain_additions.append(GrainAddition(grain_list[1], weight=1.0))
+        self.assertTrue(recipe.og > og)
+        og = recipe.og
+        recipe.grain_additions.pop()
+        self.assertTrue(recipe.og < og)
+
+    def test_cache_hop_addition_in_place(self):
+        hop_addition = HopAddition(
+            Hop(u"centennial", percent_alpha_acids=0.14), weight=0.57, boil_time=60.0
+        )
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            hop_additions=[hop_addition],
+            yeast=yeast,
+        )
+        ibu = recipe.ibu
+        recipe.hop_additions[0].weight *= 2
+        self.assertTrue(recipe.ibu > ibu)
+        ibu = recipe.ibu
+        recipe.hop_additions[0].hop.percent_alpha_acids = 0.07
+        self.assertTrue(recipe.ibu < ibu)
+        ibu = recipe.ibu
+        recipe.hop_additions.append(
+            HopAddition(
+                Hop(u"cascade", percent_alpha_acids=0.07), weight=1.0, boil_time=5.0
+            )
+        )
+        self.assertTrue(recipe.ibu > ibu)
+
+    def test_cache_utilization_surface_scope(self):
+        hop_addition = HopAddition(
+            Hop(u"centennial", percent_alpha_acids=0.14), weight=0.57, boil_time=61.3
+        )
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            hop_additions=[hop_addition],
+            yeast=yeast,
+        )
+        ibu = recipe.ibu
+        utilization_cls = type(hop_addition.utilization_cls)
+        with utilization_cls.use_utilization_surface(
+            tolerance=1.0, boil_time_step=30.0
+        ):
+            self.assertNotEqual(recipe.ibu, ibu)
+        self.assertEquals(recipe.ibu, ibu)
+
+    def test_cache_hit_unchanged(self):
+        recipe = Recipe(
+            name=u"pale ale",
+            grain_additions=[GrainAddition(grain_list[0], weight=13.96)],
+            yeast=yeast,
+        )
+        recipe.og
+        recipe.og
+        stats = recipe.get_cache_stats()
+        self.assertEquals(stats[u"invalidations"], 0)
+        self.assertEquals(stats[u"recomputes"][u"total_points"], 1)
+
+
+class TestRecipeScale(unittest.TestCase):
+    def assertPreserved(self, scaled, original):
+        self.assertEquals(round(scaled.og, 9), round(original.og, 9))
+        self.assertEquals(round(scaled.ibu, 9), round(original.ibu, 9))
+
+    def test_scale_final_volume(self):
+        out = recipe.scale(final_volume=10.0)
+        self.assertEquals(out.final_volume, 10.0)
+        self.assertEquals(out.start_volume, 14.0)
+        self.assertEquals(out.units, IMPERIAL_UNITS)
+        self.assertPreserved(out, recipe)
+        self.assertEquals(
+            round(out.grain_additions[0].weight, 6),
+            round(recipe.grain_additions[0].weight * 2.0, 6),
+        )
+
+    def test_scale_equipment(self):
+        out = recipe.scale(final_volume=20.0, start_volume=26.0, brew_house_yield=0.8)
+        self.assertEquals(out.start_volume, 26.0)
+        self.assertEquals(out.brew_house_yield, 0.8)
+        self.assertPreserved(out, recipe)
+        self.assertNotEqual(round(out.bg, 9), round(recipe.bg, 9))
+
+    def test_scale_extract(self):
+        for original in [recipe_dme, recipe_lme]:
+            out = original.scale(final_volume=3.0, brew_house_yield=0.5)
+            self.assertPreserved(out, original)
+
+    def test_scale_units(self):
+        out = recipe.scale(units=SI_UNITS)
+        self.assertEquals(out.units, SI_UNITS)
+        self.assertEquals(
+            round(out.final_volume, 6), round(recipe.change_units().final_volume, 6)
+        )
+        self.assertPreserved(out, recipe)
+        self.assertPreserved(out.scale(units=IMPERIAL_UNITS), recipe)
+        self.assertEquals(out.hop_additions[0].utilization_cls.units, SI_UNITS)
+
+    def test_scale_same(self):
+        out = recipe.scale()
+        self.assertEquals(out, recipe)
+
+    def test_scale_shares_ingredients(self):
+        out = recipe.scale(final_volume=10.0, units=SI_UNITS)
+        for scaled, original in zip(out.grain_additions, recipe.grain_additions):
+            self.assertTrue(scaled.grain is original.grain)
+        for scaled, original in zip(out.hop_additions, recipe.hop_additions):
+            self.assertTrue(scaled.hop is original.hop)
+        self.assertTrue(out.yeast is recipe.yeast)
+
+    def test_scale_keeps_addition_types(self):
+        hop_add = HopAddition(
+            hop_list[0],
+            weight=1.0,
+            boil_time=20.0,
+            hop_type=HOP_TYPE_WHOLE,
+            utilization_cls=HopsUtilizationJackieRager,
+        )
+        grain_add = GrainAddition(grain_list[0], weight=6.0, grain_type=GRAIN_TYPE_LME)
+        original = Recipe(
+            u"lme",
+            grain_additions=[grain_add],
+            hop_additions=[hop_add],
+            yeast=yeast,
+        )
+        out = original.scale(final_volume=8.0, start_volume=9.0, units=SI_UNITS)
+        self.assertEquals(out.grain_additions[0].grain_type, GRAIN_TYPE_LME)
+        self.assertEquals(out.hop_additions[0].hop_type, HOP_TYPE_WHOLE)
+        self.assertTrue(
+            isinstance(out.hop_additions[0].utilization_cls, HopsUtilizationJackieRager)
+        )
+        self.assertPreserved(out, original)
+
+    def test_scale_raises_bad_units(self):
+        with self.assertRaises(ValidatorException):
+            recipe.scale(units=u"bad")
+
+    def test_scale_recipes(self):
+        recipes = [recipe, recipe_dme, recipe_lme]
+        out = list(scale_recipes(recipes, final_volume=10.0, units=SI_UNITS))
+        self.assertEquals(len(out), 3)
+        for scaled, original in zip(out, recipes):
+            self.assertEquals(scaled.final_volume, 10.0)
+            self.assertEquals(scaled.units, SI_UNITS)
+            self.assertPreserved(scaled, original)
+
 
 class TestRecipeBuilder(unittest.TestCase):
     def setUp(self):
@@ -240,3 +516,12 @@ class TestRecipeBuilder(unittest.TestCase):
     def test_set_raises(self):
         with self.assertRaises(ValidatorException):
             self.builder.set_units(u"bad")
+
+    def test_lookups_per_instance(self):
+        builder1 = RecipeBuilder(u"pale ale", grain_list=grain_list)
+        builder2 = RecipeBuilder(u"pale ale", hop_list=hop_list)
+        self.assertFalse(hasattr(RecipeBuilder, u"grain_lookup"))
+        self.assertEquals(len(builder1.grain_lookup), 2)
+        self.assertEquals(builder1.hop_lookup, {})
+        self.assertEquals(builder2.grain_lookup, {})
+        self.assertEquals(len(builder2.hop_lookup), 2)
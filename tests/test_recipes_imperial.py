@@ -2,18 +2,24 @@
 import textwrap
 import unittest
 
+import mock
+
 from brew.constants import GRAIN_TYPE_DME
 from brew.constants import GRAIN_TYPE_LME
 from brew.constants import IMPERIAL_UNITS
 from brew.constants import SI_UNITS
 from brew.constants import SUCROSE_PLATO
 from brew.exceptions import RecipeException
+from brew.grains import Grain
 from brew.grains import GrainAddition
 from brew.recipes import Recipe
+from brew.recipes import RecipeBuilder
+from brew.recipes import _project_percentages
 from fixtures import builder
 from fixtures import grain_additions
 from fixtures import grain_list
 from fixtures import hop_additions
+from fixtures import hop_list
 from fixtures import pale_dme
 from fixtures import pale_lme
 from fixtures import ppg_crystal
@@ -428,3 +434,149 @@ class TestRecipeBuilderImperialUnits(unittest.TestCase):
         abv = 0.0749
         attenuation = self.builder.get_yeast_attenuation(abv)
         self.assertEquals(round(attenuation, 2), 0.75)
+
+    def get_recipe(self, builder, grain_additions, hop_additions):
+        return Recipe(
+            u"solved",
+            grain_additions=grain_additions,
+            hop_additions=hop_additions,
+            yeast=yeast,
+            brew_house_yield=builder.brew_house_yield,
+            start_volume=builder.start_volume,
+            final_volume=builder.final_volume,
+            units=builder.units,
+        )
+
+    def test_solve_additions(self):
+        grain_adds, hop_adds = self.builder.solve_additions(
+            target_og=1.060,
+            target_srm=10.0,
+            target_bu_to_gu=0.8,
+            hop_percent_list=[0.8, 0.2],
+            boil_time_list=[60.0, 5.0],
+        )
+        recipe = self.get_recipe(self.builder, grain_adds, hop_adds)
+        self.assertEquals(round(recipe.og, 6), 1.060)
+        self.assertEquals(round(recipe.color, 6), 10.0)
+        self.assertEquals(round(recipe.get_bu_to_gu(), 6), 0.8)
+        ibus = hop_adds[0].get_ibus(recipe.bg, 5.0)
+        self.assertEquals(round(ibus, 3), round(recipe.ibu * 0.8, 3))
+
+    def test_solve_additions_defaults(self):
+        grain_adds, hop_adds = self.builder.solve_additions()
+        recipe = self.get_recipe(self.builder, grain_adds, [])
+        self.assertEquals(hop_adds, [])
+        self.assertEquals(round(recipe.og, 6), round(self.builder.target_og, 6))
+        self.assertEquals(
+            round(grain_adds[0].weight, 6), round(grain_adds[1].weight, 6)
+        )
+
+    def test_solve_additions_percent_list(self):
+        grain_adds, _ = self.builder.solve_additions(percent_list=[0.95, 0.05])
+        total = sum(g.weight for g in grain_adds)
+        percents = [round(g.weight / total, 6) for g in grain_adds]
+        self.assertEquals(percents, [0.95, 0.05])
+
+    def test_solve_additions_target_ibu(self):
+        grain_adds, hop_adds = self.builder.solve_additions(
+            hop_percent_list=[0.5, 0.5], boil_time_list=[60.0, 15.0]
+        )
+        recipe = self.get_recipe(self.builder, grain_adds, hop_adds)
+        self.assertEquals(round(recipe.ibu, 6), self.builder.target_ibu)
+
+    def test_solve_additions_bounds(self):
+        black = Grain(u"black patent", color=500.0, ppg=25.0)
+        builder = RecipeBuilder(
+            u"porter",
+            grain_list=grain_list + [black],
+            hop_list=hop_list,
+            target_og=1.055,
+        )
+        grain_adds, hop_adds = builder.solve_additions(
+            target_srm=30.0,
+            target_bu_to_gu=0.6,
+            percent_bounds={u"crystal C20": (0.05, 0.15)},
+            fixed_percents={u"pale 2-row": 0.8},
+            hop_percent_list=[1.0, 0.0],
+            boil_time_list=[60.0, 5.0],
+        )
+        recipe = self.get_recipe(builder, grain_adds, hop_adds)
+        self.assertEquals(round(recipe.og, 6), 1.055)
+        self.assertEquals(round(recipe.color, 6), 30.0)
+        self.assertEquals(round(recipe.get_bu_to_gu(), 6), 0.6)
+        total = sum(g.weight for g in grain_adds)
+        percents = [g.weight / total for g in grain_adds]
+        self.assertEquals(round(percents[0], 6), 0.8)
+        self.assertTrue(0.05 - 1e-6 <= percents[1] <= 0.15 + 1e-6)
+        self.assertEquals(hop_adds[1].weight, 0.0)
+
+    def test_solve_additions_raises_infeasible(self):
+        with self.assertRaises(RecipeException) as ctx:
+            self.builder.solve_additions(
+                target_srm=10.0, fixed_percents={u"pale 2-row": 0.85}
+            )
+        self.assertEquals(
+            str(ctx.exception),
+            u"The targets cannot be met within the percentage bounds",
+        )
+
+    def test_solve_additions_raises_infeasible_before_solving(self):
+        with mock.patch(u"brew.recipes._solve_shift") as mock_solve:
+            with self.assertRaises(RecipeException):
+                self.builder.solve_additions(
+                    target_srm=10.0, fixed_percents={u"pale 2-row": 0.85}
+                )
+        self.assertFalse(mock_solve.called)
+
+    def test_project_percentages(self):
+        lower = [0.0, 0.05, 0.0]
+        upper = [1.0, 0.15, 1.0]
+        direction = [-1.0, 2.0, 40.0]
+        out = _project_percentages([0.6, 0.3, 0.1], lower, upper, direction)
+        self.assertAlmostEqual(sum(out), 1.0, places=9)
+        self.assertAlmostEqual(
+            sum(d * v for d, v in zip(direction, out)), 0.0, places=7
+        )
+        for value, low, high in zip(out, lower, upper):
+            self.assertTrue(low <= value <= high)
+
+    def test_project_percentages_infeasible(self):
+        out = _project_percentages([0.5, 0.5], [0.6, 0.6], [1.0, 1.0])
+        self.assertIsNone(out)
+        out = _project_percentages([0.5, 0.5], [0.0, 0.0], [1.0, 1.0], [1.0, 2.0])
+        self.assertIsNone(out)
+
+    def test_project_percentages_raises_not_converged(self):
+        with self.assertRaises(RecipeException):
+            _project_percentages(
+                [0.6, 0.3, 0.1],
+                [0.0, 0.0, 0.0],
+                [1.0, 1.0, 1.0],
+                [-1.0, 2.0, 40.0],
+                max_iterations=1,
+            )
+
+    def test_solve_additions_raises_color(self):
+        with self.assertRaises(RecipeException):
+            self.builder.solve_additions(target_srm=60.0)
+
+    def test_solve_additions_raises_unknown_grain(self):
+        with self.assertRaises(RecipeException) as ctx:
+            self.builder.solve_additions(fixed_percents={u"rye": 0.1})
+        self.assertEquals(str(ctx.exception), u"Grain 'rye' is not in grain_list")
+
+    def test_solve_additions_raises_percent_length_mismatch(self):
+        with self.assertRaises(RecipeException):
+            self.builder.solve_additions(percent_list=[1.0])
+
+    def test_solve_additions_raises_hop_length_mismatch(self):
+        with self.assertRaises(RecipeException):
+            self.builder.solve_additions(
+                hop_percent_list=[1.0], boil_time_list=[60.0]
+            )
+        with self.assertRaises(RecipeException):
+            self.builder.solve_additions(hop_percent_list=[0.5, 0.5])
+
+    def test_solve_additions_raises_empty_grain_list(self):
+        with self.assertRaises(RecipeException):
+            RecipeBuilder(u"empty").solve_additions()
@@ -437,6 +437,27 @@ class TestRecipeBuilderSIUnits(unittest.TestCase):
             u"The length of boil_time_list must equal length of self.hop_list",
         )  # noqa
 
+    def test_solve_additions(self):
+        grain_adds, hop_adds = self.builder.solve_additions(
+            target_og=1.060,
+            target_srm=10.0,
+            target_bu_to_gu=0.8,
+            hop_percent_list=[0.8, 0.2],
+            boil_time_list=[60.0, 5.0],
+        )
+        recipe = Recipe(
+            u"solved",
+            grain_additions=grain_adds,
+            hop_additions=hop_adds,
+            yeast=yeast,
+            start_volume=self.builder.start_volume,
+            final_volume=self.builder.final_volume,
+            units=SI_UNITS,
+        )
+        self.assertEquals(round(recipe.og, 6), 1.060)
+        self.assertEquals(round(recipe.color, 6), 10.0)
+        self.assertEquals(round(recipe.get_bu_to_gu(), 6), 0.8)
+
     def test_get_yeast_attenuation(self):
         abv = 0.0749
         attenuation = self.builder.get_yeast_attenuation(abv)
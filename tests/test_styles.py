@@ -1,12 +1,26 @@
 # -*- coding: utf-8 -*-
+import json
+import os
+import pickle
+import shutil
 import sys
+import tempfile
 import textwrap
+import threading
 import unittest
 
+import mock
+
+from brew.exceptions import ColorException
 from brew.exceptions import StyleException
 from brew.grains import GrainAddition
 from brew.recipes import Recipe
+from brew.styles import get_recipe_metrics
+from brew.styles import get_style_index
 from brew.styles import Style
+from brew.styles import StyleFactory
+from brew.styles import StyleIndex
+from brew.styles import StyleScanner
 from fixtures import american_pale_ale_style
 from fixtures import crystal
 from fixtures import hop_additions
@@ -317,3 +331,346 @@ class TestStyle(unittest.TestCase):
     def test_validate(self):
         data = self.style.to_dict()
         Style.validate(data)
+
+
+STYLES = {
+    u"18": {
+        u"B": {
+            u"style": u"American Pale Ale",
+            u"category": u"18",
+            u"subcategory": u"B",
+            u"og": [1.045, 1.06],
+            u"fg": [1.01, 1.015],
+            u"abv": [0.045, 0.062],
+            u"ibu": [30, 50],
+            u"color": [5, 10],
+        }
+    },
+    u"21": {
+        u"A": {
+            u"style": u"American IPA",
+            u"category": u"21",
+            u"subcategory": u"A",
+            u"og": [1.056, 1.07],
+            u"fg": [1.008, 1.014],
+            u"abv": [0.055, 0.075],
+            u"ibu": [40, 70],
+            u"color": [6, 14],
+        }
+    },
+    u"90": {
+        u"A": {
+            u"style": u"Strong Ale",
+            u"category": u"90",
+            u"subcategory": u"A",
+            u"og": [1.06, 1.09],
+            u"fg": [1.01, 1.025],
+            u"abv": [0.06, 0.09],
+            u"ibu": [20, 50],
+            u"color": [4, 12],
+        },
+        u"B": {
+            u"style": u"Any Ale",
+            u"category": u"90",
+            u"subcategory": u"B",
+            u"og": [1.03, 1.12],
+            u"fg": [1.0, 1.04],
+            u"abv": [0.03, 0.12],
+            u"ibu": [0, 100],
+            u"color": [1, 40],
+        },
+        u"C": {
+            u"style": u"Broken Ale",
+            u"category": u"90",
+            u"subcategory": u"C",
+            u"og": [1.06, 1.05],
+            u"fg": [1.01, 1.015],
+            u"abv": [0.045, 0.062],
+            u"ibu": [30, 50],
+            u"color": [5, 10],
+        },
+    },
+}
+
+
+class TestStyleFactory(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.data_dir, u"styles.json")
+        with open(self.filename, u"w") as f:
+            json.dump(STYLES, f)
+        self.factory = StyleFactory(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_create_style(self):
+        out = self.factory.create_style(18, u"B")
+        self.assertEquals(out, american_pale_ale_style)
+
+    def test_create_style_memoized(self):
+        out = self.factory.create_style(u"18", u"B")
+        self.assertTrue(self.factory.create_style(18, u"B") is out)
+
+    def test_create_style_validates_once(self):
+        with mock.patch.object(
+            Style, u"_validate_input_list", side_effect=Style._validate_input_list
+        ) as mock_validate:
+            self.factory.create_style(18, u"B")
+            self.factory.create_style(18, u"B")
+        self.assertEquals(mock_validate.call_count, 5)
+
+    def test_create_style_invalid(self):
+        for _ in range(2):
+            with self.assertRaises(StyleException):
+                self.factory.create_style(90, u"C")
+
+    def test_create_style_missing(self):
+        with self.assertRaises(StyleException) as ctx:
+            self.factory.create_style(99, u"Z")
+        self.assertEquals(str(ctx.exception), u"Style 99Z does not exist")
+        self.assertFalse((u"99", u"Z") in self.factory._styles)
+        with self.assertRaises(StyleException):
+            self.factory.create_style(18, u"Z")
+        self.assertEquals(list(self.factory._styles), [])
+
+    def test_create_style_threads(self):
+        out = []
+
+        def create():
+            out.append(self.factory.create_style(21, u"A"))
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEquals(len(out), 8)
+        self.assertTrue(all(style is out[0] for style in out))
+
+    def test_lazy(self):
+        factory = StyleFactory(os.path.join(self.data_dir, u"missing.json"), lazy=True)
+        with self.assertRaises(IOError):
+            factory.create_style(18, u"B")
+        factory = StyleFactory(self.filename, lazy=True)
+        self.assertEquals(factory._data, None)
+        self.assertEquals(factory.create_style(18, u"B"), american_pale_ale_style)
+
+    def test_clear_cache(self):
+        out = self.factory.create_style(18, u"B")
+        self.factory.clear_cache()
+        self.assertEquals(self.factory._data, None)
+        self.assertFalse(self.factory.create_style(18, u"B") is out)
+
+    def test_pickle(self):
+        self.factory.create_style(18, u"B")
+        factory = pickle.loads(pickle.dumps(self.factory))
+        self.assertEquals(factory.create_style(18, u"B"), american_pale_ale_style)
+
+    def test_format(self):
+        out = self.factory.format()
+        self.assertTrue(u"90C Broken Ale - Not parseable" in out)
+        self.assertTrue(u"18B American Pale Ale\n" in out)
+
+    def test_iter_styles(self):
+        out = [str(style) for style in self.factory.iter_styles()]
+        expected = [
+            u"18B American Pale Ale",
+            u"21A American IPA",
+            u"90A Strong Ale",
+            u"90B Any Ale",
+        ]
+        self.assertEquals(out, expected)
+
+
+class TestStyleScanner(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        filename = os.path.join(self.data_dir, u"styles.json")
+        with open(filename, u"w") as f:
+            json.dump(STYLES, f)
+        self.scanner = StyleScanner.from_factory(StyleFactory(filename))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_len(self):
+        self.assertEquals(len(self.scanner), 4)
+
+    def test_get_recipe_metrics(self):
+        out = get_recipe_metrics(recipe)
+        expected = (recipe.og, recipe.fg, recipe.abv, recipe.ibu, recipe.color)
+        self.assertEquals(out, expected)
+
+    def test_get_recipe_metrics_color_exception(self):
+        with mock.patch.object(
+            Recipe, u"get_total_wort_color", side_effect=ColorException
+        ):
+            out = get_recipe_metrics(recipe)
+        self.assertEquals(out[4], None)
+
+    def test_scan(self):
+        out = self.scanner.scan(recipe)
+        names = [str(match.style) for match in out]
+        self.assertEquals(names, [u"90A Strong Ale", u"90B Any Ale"])
+        self.assertTrue(out[0].distance < out[1].distance)
+        self.assertEquals(
+            sorted(out[0].distances.keys()), [u"abv", u"color", u"fg", u"ibu", u"og"]
+        )
+        for match in out:
+            self.assertTrue(match.style.recipe_matches(recipe))
+            self.assertTrue(max(match.distances.values()) <= 1.0)
+
+    def test_scan_distances(self):
+        out = self.scanner.scan(recipe)
+        og = (recipe.og - 1.075) / 0.015
+        self.assertEquals(round(out[0].distances[u"og"], 6), round(og, 6))
+
+    def test_scan_agrees_with_recipe_matches(self):
+        matched = set(str(match.style) for match in self.scanner.scan(recipe))
+        expected = set(
+            str(style)
+            for style in self.scanner.styles
+            if style.recipe_matches(recipe)
+        )
+        self.assertEquals(matched, expected)
+
+    def test_scan_limit(self):
+        out = self.scanner.scan(recipe, limit=1)
+        self.assertEquals([str(match.style) for match in out], [u"90A Strong Ale"])
+
+    def test_scan_max_distance(self):
+        out = self.scanner.scan(recipe, max_distance=float(u"inf"))
+        self.assertEquals(len(out), 4)
+        self.assertEquals(str(out[-1].style), u"18B American Pale Ale")
+
+    def test_scan_metrics_no_color(self):
+        metrics = get_recipe_metrics(recipe)[:4] + (None,)
+        self.assertEquals(self.scanner.scan_metrics(metrics), [])
+
+    def test_scan_metrics_zero_width(self):
+        style = Style(
+            u"Exact",
+            og=[1.05, 1.05],
+            fg=[1.01, 1.01],
+            abv=[0.05, 0.05],
+            ibu=[30, 30],
+            color=[5, 5],
+        )
+        scanner = StyleScanner([style])
+        self.assertEquals(len(scanner.scan_metrics((1.05, 1.01, 0.05, 30, 5))), 1)
+        self.assertEquals(len(scanner.scan_metrics((1.05, 1.01, 0.05, 30, 6))), 0)
+
+    def test_scan_recipes(self):
+        recipes = [recipe, recipe]
+        out = list(self.scanner.scan_recipes(recipes, chunksize=1))
+        self.assertEquals(out, [self.scanner.scan(recipe)] * 2)
+
+    def test_scan_recipes_processes(self):
+        recipes = [recipe] * 5
+        out = list(
+            self.scanner.scan_recipes(
+                recipes, processes=2, chunksize=2, max_pending=1
+            )
+        )
+        self.assertEquals(out, [self.scanner.scan(recipe)] * 5)
+
+    def test_scan_recipes_raises_bad_chunksize(self):
+        with self.assertRaises(ValueError):
+            list(self.scanner.scan_recipes([recipe], chunksize=0))
+
+
+@mock.patch(u"brew.styles.get_numpy", return_value=None)
+class TestStyleScannerFallback(unittest.TestCase):
+    def test_scan(self, mock_numpy):
+        styles = [
+            Style(**STYLES[category][subcategory])
+            for category, subcategory in [(u"18", u"B"), (u"90", u"A"), (u"90", u"B")]
+        ]
+        scanner = StyleScanner(styles)
+        out = scanner.scan(recipe)
+        names = [str(match.style) for match in out]
+        self.assertEquals(names, [u"90A Strong Ale", u"90B Any Ale"])
+        self.assertEquals(
+            round(out[0].distances[u"og"], 6), round((recipe.og - 1.075) / 0.015, 6)
+        )
+        self.assertEquals(len(scanner.scan(recipe, limit=1)), 1)
+
+
+class TestStyleIndex(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.data_dir, u"styles.json")
+        with open(self.filename, u"w") as f:
+            json.dump(STYLES, f)
+        self.index = StyleIndex.from_factory(StyleFactory(self.filename))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def names(self, styles):
+        return [str(style) for style in styles]
+
+    def test_len(self):
+        self.assertEquals(len(self.index), 4)
+
+    def test_get_styles(self):
+        out = self.index.get_styles(*get_recipe_metrics(recipe))
+        self.assertEquals(self.names(out), [u"90A Strong Ale", u"90B Any Ale"])
+
+    def test_get_styles_agrees_with_scanner(self):
+        scanner = StyleScanner(self.index.styles)
+        for og in [1.02, 1.05, 1.065, 1.08, 1.13]:
+            for ibu in [10, 35, 60]:
+                metrics = (og, 1.012, 0.06, ibu, 8)
+                expected = [match.style for match in scanner.scan_metrics(metrics)]
+                out = self.index.get_styles(*metrics)
+                self.assertEquals(set(self.names(out)), set(self.names(expected)))
+
+    def test_get_styles_partial(self):
+        out = self.index.get_styles(og=1.058)
+        expected = [u"18B American Pale Ale", u"21A American IPA", u"90B Any Ale"]
+        self.assertEquals(self.names(out), expected)
+        self.assertEquals(len(self.index.get_styles()), 4)
+
+    def test_get_styles_bounds_inclusive(self):
+        out = self.index.get_styles(og=1.045, color=10)
+        self.assertEquals(self.names(out), [u"18B American Pale Ale", u"90B Any Ale"])
+
+    def test_get_styles_none(self):
+        self.assertEquals(self.index.get_styles(og=1.2), [])
+
+    def test_get_nearest_styles(self):
+        out = self.index.get_nearest_styles(og=1.2, limit=2)
+        names = self.names(match.style for match in out)
+        self.assertEquals(names, [u"90B Any Ale", u"90A Strong Ale"])
+        self.assertEquals(list(out[0].distances.keys()), [u"og"])
+        self.assertTrue(out[0].distance < out[1].distance)
+
+    def test_find_styles(self):
+        out = self.index.find_styles(og=1.058, ibu=60)
+        self.assertEquals(self.names(out), [u"21A American IPA", u"90B Any Ale"])
+
+    def test_find_styles_nearest(self):
+        out = self.index.find_styles(og=1.2)
+        self.assertEquals(self.names(out), [u"90B Any Ale"])
+        self.assertEquals(self.index.find_styles(og=1.2, nearest=0), [])
+
+    def test_find_recipe_styles(self):
+        out = self.index.find_recipe_styles(recipe)
+        self.assertEquals(self.names(out), [u"90A Strong Ale", u"90B Any Ale"])
+
+    def test_get_style_index(self):
+        index = get_style_index(self.filename)
+        self.assertEquals(len(index), 4)
+        self.assertTrue(get_style_index(self.filename) is index)
+
+    def test_get_style_index_file_changed(self):
+        index = get_style_index(self.filename)
+        styles = dict(STYLES)
+        styles.pop(u"21")
+        with open(self.filename, u"w") as f:
+            json.dump(styles, f)
+        out = get_style_index(self.filename)
+        self.assertFalse(out is index)
+        self.assertEquals(len(out), 3)
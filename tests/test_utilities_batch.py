@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from brew.utilities.batch import get_batch_format
+from brew.utilities.batch import get_file_stamp
+from brew.utilities.batch import iter_batch_rows
+from brew.utilities.batch import iter_chunks
+from brew.utilities.batch import iter_range
+from brew.utilities.batch import positive_int
+
+
+class TestBatchUtilities(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_file_stamp(self):
+        filename = os.path.join(self.tmpdir, u"item.json")
+        with open(filename, "w") as f:
+            f.write(u"{}")
+        os.utime(filename, (1000, 1000))
+        self.assertEquals(get_file_stamp(filename), (1000, 2))
+
+    def test_get_file_stamp_missing(self):
+        filename = os.path.join(self.tmpdir, u"missing.json")
+        self.assertIsNone(get_file_stamp(filename))
+
+    def test_iter_chunks(self):
+        out = list(iter_chunks(iter(range(5)), 2))
+        self.assertEquals(out, [(0, [0, 1]), (2, [2, 3]), (4, [4])])
+
+    def test_iter_chunks_empty(self):
+        self.assertEquals(list(iter_chunks([], 2)), [])
+
+    def test_get_batch_format(self):
+        self.assertEquals(get_batch_format(u"log.csv"), u"csv")
+        self.assertEquals(get_batch_format(u"log.NDJSON"), u"ndjson")
+        self.assertEquals(get_batch_format(u"log.jsonl"), u"ndjson")
+        self.assertEquals(get_batch_format(u"<stdin>"), u"csv")
+
+    def test_iter_batch_rows_csv(self):
+        lines = io.StringIO(u"og,fg\n1.050,1.010\n1.060,1.012\n")
+        out = list(iter_batch_rows(lines))
+        self.assertEquals(
+            out,
+            [
+                (2, {u"og": u"1.050", u"fg": u"1.010"}, None),
+                (3, {u"og": u"1.060", u"fg": u"1.012"}, None),
+            ],
+        )
+
+    def test_iter_batch_rows_ndjson(self):
+        lines = io.StringIO(u'{"og": 1.05}\n\n[1]\nbad\n')
+        out = list(iter_batch_rows(lines, fmt=u"ndjson"))
+        self.assertEquals(out[0], (1, {u"og": 1.05}, None))
+        self.assertEquals([line_number for line_number, _, _ in out], [1, 3, 4])
+        self.assertIsNone(out[1][1])
+        self.assertTrue(isinstance(out[1][2], ValueError))
+        self.assertTrue(isinstance(out[2][2], ValueError))
+
+    def test_iter_range(self):
+        out = list(iter_range(1.000, 1.010, 0.002))
+        self.assertEquals(out, [1.0, 1.002, 1.004, 1.006, 1.008, 1.01])
+        out = list(iter_range(20.0, 10.0, -5.0))
+        self.assertEquals(out, [20.0, 15.0, 10.0])
+
+    def test_iter_range_bad_step(self):
+        with self.assertRaises(ValueError):
+            iter_range(1.0, 1.1, 0.0)
+        with self.assertRaises(ValueError):
+            iter_range(1.1, 1.0, 0.01)
+
+    def test_positive_int(self):
+        self.assertEquals(positive_int(u"3"), 3)
+        with self.assertRaises(argparse.ArgumentTypeError):
+            positive_int(u"0")
+        with self.assertRaises(ValueError):
+            positive_int(u"abc")
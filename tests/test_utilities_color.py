@@ -1,24 +1,39 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+import mock
+
 from brew.constants import KG_PER_POUND
 from brew.constants import LITER_PER_GAL
 from brew.constants import SI_UNITS
 from brew.exceptions import ColorException
+from brew.exceptions import ValidatorException
+from brew.utilities.arrays import get_numpy
 from brew.utilities.color import calculate_mcu
+from brew.utilities.color import calculate_mcu_array
 from brew.utilities.color import calculate_srm
+from brew.utilities.color import calculate_srm_array
 from brew.utilities.color import calculate_srm_daniels
+from brew.utilities.color import calculate_srm_daniels_array
 from brew.utilities.color import calculate_srm_daniels_power
+from brew.utilities.color import calculate_srm_daniels_power_array
+from brew.utilities.color import calculate_srm_models
+from brew.utilities.color import calculate_srm_models_array
 from brew.utilities.color import calculate_srm_morey
+from brew.utilities.color import calculate_srm_morey_array
 from brew.utilities.color import calculate_srm_morey_hybrid
+from brew.utilities.color import calculate_srm_morey_hybrid_array
 from brew.utilities.color import calculate_srm_mosher
+from brew.utilities.color import calculate_srm_mosher_array
 from brew.utilities.color import calculate_srm_noonan_power
+from brew.utilities.color import calculate_srm_noonan_power_array
 from brew.utilities.color import ebc_to_a430
 from brew.utilities.color import ebc_to_srm
 from brew.utilities.color import lovibond_to_srm
 from brew.utilities.color import srm_to_a430
 from brew.utilities.color import srm_to_ebc
 from brew.utilities.color import srm_to_lovibond
+from brew.utilities.color import srm_to_mcu
 
 
 class TestColorUtilities(unittest.TestCase):
@@ -139,6 +154,16 @@ class TestColorUtilities(unittest.TestCase):
         with self.assertRaises(ColorException):
             calculate_srm(mcu)
 
+    def test_srm_to_mcu(self):
+        mcu = srm_to_mcu(calculate_srm_morey(12.0))
+        self.assertEquals(round(mcu, 6), 12.0)
+
+    def test_srm_to_mcu_raises(self):
+        with self.assertRaises(ColorException):
+            srm_to_mcu(51.0)
+        with self.assertRaises(ColorException):
+            srm_to_mcu(-1.0)
+
     def test_lovibond_to_srm(self):
         out = lovibond_to_srm(30)
         self.assertEquals(round(out, 2), 39.88)
@@ -154,3 +179,112 @@ class TestColorUtilities(unittest.TestCase):
     def test_ebc_to_a430(self):
         out = ebc_to_a430(60)
         self.assertEquals(round(out, 2), 2.4)
+
+    def test_calculate_srm_models(self):
+        out = calculate_srm_models(12.0)
+        self.assertEquals(out[u"morey"], calculate_srm_morey(12.0))
+        self.assertEquals(out[u"daniels"], calculate_srm_daniels(12.0))
+        self.assertEquals(out[u"mosher"], calculate_srm_mosher(12.0))
+
+    def test_calculate_srm_models_out_of_range(self):
+        out = calculate_srm_models(5.0)
+        self.assertEquals(out[u"daniels"], None)
+        self.assertEquals(out[u"mosher"], None)
+        out = calculate_srm_models(500.0)
+        self.assertEquals(out[u"morey"], None)
+
+
+@unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+class TestColorArrayUtilities(unittest.TestCase):
+    def setUp(self):
+        self.mcu = [1.0, 5.0, 8.0, 10.5, 12.0, 40.0, 60.0, 500.0]
+
+    def assertMatchesScalar(self, out, func, values):
+        expected = []
+        for value in values:
+            try:
+                expected.append(round(func(value), 6))
+            except ColorException:
+                expected.append(None)
+        self.assertEquals(
+            [None if m else round(v, 6) for v, m in zip(out.data, out.mask)],
+            expected,
+        )
+
+    def test_calculate_mcu_array(self):
+        out = calculate_mcu_array([1.0, 2.0], [30.0, 10.0], 5.5)
+        self.assertEquals(round(out[0], 2), 5.45)
+        self.assertEquals(round(out[1], 2), 3.64)
+
+    def test_calculate_mcu_array_si_units(self):
+        out = calculate_mcu_array(
+            [1.0 * KG_PER_POUND], [30.0], 5.5 * LITER_PER_GAL, units=SI_UNITS
+        )
+        self.assertEquals(round(out[0], 2), 5.45)
+
+    def test_calculate_mcu_array_raises_bad_units(self):
+        with self.assertRaises(ValidatorException):
+            calculate_mcu_array([1.0], [30.0], 5.5, units=u"bad")
+
+    def test_calculate_srm_mosher_array(self):
+        out = calculate_srm_mosher_array(self.mcu)
+        self.assertMatchesScalar(out, calculate_srm_mosher, self.mcu)
+
+    def test_calculate_srm_daniels_array(self):
+        out = calculate_srm_daniels_array(self.mcu)
+        self.assertMatchesScalar(out, calculate_srm_daniels, self.mcu)
+
+    def test_calculate_srm_daniels_power_array(self):
+        out = calculate_srm_daniels_power_array(self.mcu)
+        self.assertMatchesScalar(out, calculate_srm_daniels_power, self.mcu)
+
+    def test_calculate_srm_noonan_power_array(self):
+        out = calculate_srm_noonan_power_array(self.mcu)
+        self.assertMatchesScalar(out, calculate_srm_noonan_power, self.mcu)
+
+    def test_calculate_srm_morey_hybrid_array(self):
+        mcu = [0.0] + self.mcu
+        out = calculate_srm_morey_hybrid_array(mcu)
+        self.assertMatchesScalar(out, calculate_srm_morey_hybrid, mcu)
+
+    def test_calculate_srm_morey_array(self):
+        out = calculate_srm_morey_array(self.mcu)
+        self.assertMatchesScalar(out, calculate_srm_morey, self.mcu)
+
+    def test_calculate_srm_array(self):
+        out = calculate_srm_array(self.mcu)
+        self.assertMatchesScalar(out, calculate_srm, self.mcu)
+
+    def test_calculate_srm_models_array(self):
+        out = calculate_srm_models_array(self.mcu)
+        self.assertMatchesScalar(out[u"morey"], calculate_srm_morey, self.mcu)
+        self.assertMatchesScalar(out[u"daniels"], calculate_srm_daniels, self.mcu)
+        self.assertMatchesScalar(out[u"mosher"], calculate_srm_mosher, self.mcu)
+
+
+@mock.patch(u"brew.utilities.color.get_numpy", return_value=None)
+class TestColorArrayUtilitiesFallback(unittest.TestCase):
+    def test_calculate_mcu_array(self, mock_numpy):
+        out = calculate_mcu_array([1.0, 2.0], [30.0, 10.0], 5.5)
+        self.assertEquals(
+            out, [calculate_mcu(1.0, 30.0, 5.5), calculate_mcu(2.0, 10.0, 5.5)]
+        )
+
+    def test_calculate_srm_mosher_array(self, mock_numpy):
+        out = calculate_srm_mosher_array([5.0, 8.0])
+        self.assertEquals(out, [None, calculate_srm_mosher(8.0)])
+
+    def test_calculate_srm_morey_hybrid_array(self, mock_numpy):
+        out = calculate_srm_morey_hybrid_array([5.0, 60.0])
+        self.assertEquals(out, [5.0, None])
+
+    def test_calculate_srm_array_scalar(self, mock_numpy):
+        self.assertEquals(calculate_srm_array(12.0), calculate_srm(12.0))
+        self.assertEquals(calculate_srm_array(500.0), None)
+
+    def test_calculate_srm_models_array(self, mock_numpy):
+        out = calculate_srm_models_array([5.0, 12.0])
+        self.assertEquals(
+            out[u"morey"], [calculate_srm_morey(5.0), calculate_srm_morey(12.0)]
+        )
+        self.assertEquals(out[u"daniels"], [None, calculate_srm_daniels(12.0)])
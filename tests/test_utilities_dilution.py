@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import mock
+from brew.exceptions import SugarException
+from brew.utilities.arrays import get_numpy
+from brew.utilities.dilution import dilute_gravity
+from brew.utilities.dilution import dilute_gravity_array
+from brew.utilities.dilution import top_up_volume
+from brew.utilities.dilution import top_up_volume_array
+from brew.utilities.dilution import volume_for_gravity
+from brew.utilities.dilution import volume_for_gravity_array
+
+
+class TestDilutionUtilities(unittest.TestCase):
+    def test_dilute_gravity(self):
+        self.assertEquals(round(dilute_gravity(3.0, 10.0, 1.050), 3), 1.015)
+        self.assertEquals(round(dilute_gravity(10.0, 5.0, 1.040), 3), 1.080)
+
+    def test_dilute_gravity_raises(self):
+        with self.assertRaises(SugarException):
+            dilute_gravity(3.0, 0.0, 1.050)
+        with self.assertRaises(SugarException):
+            dilute_gravity(-1.0, 10.0, 1.050)
+
+    def test_volume_for_gravity(self):
+        self.assertEquals(round(volume_for_gravity(10.0, 1.060, 1.050), 3), 12.0)
+        self.assertEquals(round(volume_for_gravity(10.0, 1.040, 1.080), 3), 5.0)
+
+    def test_volume_for_gravity_raises(self):
+        with self.assertRaises(SugarException):
+            volume_for_gravity(0.0, 1.060, 1.050)
+        with self.assertRaises(SugarException):
+            volume_for_gravity(10.0, 1.060, 1.000)
+        with self.assertRaises(SugarException):
+            volume_for_gravity(10.0, 0.990, 1.050)
+
+    def test_top_up_volume(self):
+        self.assertEquals(round(top_up_volume(10.0, 1.060, 1.050), 3), 2.0)
+        self.assertEquals(round(top_up_volume(10.0, 1.040, 1.080), 3), -5.0)
+
+
+@unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+class TestDilutionArrayUtilities(unittest.TestCase):
+    def test_dilute_gravity_array(self):
+        out = dilute_gravity_array(10.0, [10.0, 12.0, 0.0], [1.060, 1.060, 1.060])
+        self.assertEquals(round(out[1], 3), 1.050)
+        self.assertEquals(out.mask.tolist(), [False, False, True])
+
+    def test_volume_for_gravity_array(self):
+        out = volume_for_gravity_array([10.0, 10.0, 10.0], 1.060, [1.050, 1.0, 1.080])
+        self.assertEquals(round(out[0], 3), 12.0)
+        self.assertEquals(out.mask.tolist(), [False, True, False])
+
+    def test_top_up_volume_array(self):
+        out = top_up_volume_array([10.0, 20.0, -1.0], 1.060, 1.050)
+        self.assertEquals([round(v, 3) for v in out[:2].tolist()], [2.0, 4.0])
+        self.assertEquals(out.mask.tolist(), [False, False, True])
+
+
+@mock.patch(u"brew.utilities.dilution.get_numpy", return_value=None)
+class TestDilutionArrayUtilitiesFallback(unittest.TestCase):
+    def test_dilute_gravity_array(self, mock_numpy):
+        out = dilute_gravity_array(10.0, [12.0, 0.0], 1.060)
+        self.assertEquals(out, [dilute_gravity(10.0, 12.0, 1.060), None])
+
+    def test_volume_for_gravity_array(self, mock_numpy):
+        out = volume_for_gravity_array([10.0, 10.0], 1.060, [1.050, 1.0])
+        self.assertEquals(out, [volume_for_gravity(10.0, 1.060, 1.050), None])
+
+    def test_top_up_volume_array(self, mock_numpy):
+        self.assertEquals(round(top_up_volume_array(10.0, 1.060, 1.050), 3), 2.0)
+        self.assertEquals(top_up_volume_array(10.0, 1.060, 1.0), None)
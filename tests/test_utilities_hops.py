@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 
+import mock
 from brew.constants import HOP_TYPE_PELLET
 from brew.constants import HOP_TYPE_PLUG
 from brew.constants import HOP_TYPE_WHOLE
@@ -9,14 +14,20 @@ from brew.constants import HOP_UTILIZATION_SCALE_PELLET
 from brew.constants import HOP_WHOLE_DRY_TO_WET
 from brew.constants import IMPERIAL_UNITS
 from brew.constants import SI_UNITS
+from brew.exceptions import HopException
 from brew.hops import HopAddition
+from brew.utilities import hops as hops_utilities
+from brew.utilities.arrays import get_numpy
 from brew.utilities.hops import hop_type_weight_conversion
 from brew.utilities.hops import HopsUtilization
 from brew.utilities.hops import HopsUtilizationGlennTinseth
 from brew.utilities.hops import HopsUtilizationJackieRager
+from brew.utilities.hops import UtilizationSurface
 from brew.utilities.sugar import plato_to_sg
 from fixtures import centennial
 
+UTILIZATION_CLASSES = [HopsUtilizationGlennTinseth, HopsUtilizationJackieRager]
+
 
 class TestHopUtilities(unittest.TestCase):
     def test_hope_type_weight_conversion_same_type(self):
@@ -272,3 +283,329 @@ class TestHopsUtilizationGlennTinseth(unittest.TestCase):
             self.sg, self.boil_time
         )
         self.assertEquals(round(utilization * 100, 2), 21.69)
+
+
+class TestHopsUtilizationArrays(unittest.TestCase):
+    def setUp(self):
+        self.weight = [0.57, 0.76, 1.5, 2.0]
+        self.percent_alpha_acids = [0.14, 0.07, 0.05, 0.11]
+        self.boil_time = [60.0, 5.0, 20.0, 0.0]
+        self.hop_type = [
+            HOP_TYPE_PELLET,
+            HOP_TYPE_WHOLE,
+            HOP_TYPE_WHOLE_WET,
+            HOP_TYPE_PLUG,
+        ]
+        self.sg = [1.040, 1.057, 1.070, 1.100]
+        self.final_volume = 5.0
+
+    def get_scalar_ibus(self, utilization_cls, units=IMPERIAL_UNITS):
+        return [
+            utilization_cls.calculate_ibus(
+                self.weight[index],
+                self.percent_alpha_acids[index],
+                self.boil_time[index],
+                self.hop_type[index],
+                self.sg[index],
+                self.final_volume,
+                units=units,
+            )
+            for index in range(len(self.weight))
+        ]
+
+    def get_array_ibus(self, utilization_cls, units=IMPERIAL_UNITS):
+        return utilization_cls.get_ibus_array(
+            self.weight,
+            self.percent_alpha_acids,
+            self.boil_time,
+            self.hop_type,
+            self.sg,
+            self.final_volume,
+            units=units,
+        )
+
+    def assertAlmostEqualLists(self, first, second):
+        self.assertEquals(len(first), len(second))
+        for a, b in zip(first, second):
+            self.assertAlmostEqual(a, b, places=12)
+
+    def test_calculate_ibus_matches_hop_addition(self):
+        hop_addition = HopAddition(centennial, boil_time=60.0, weight=0.57)
+        ibu = HopsUtilizationGlennTinseth.calculate_ibus(
+            0.57, 0.14, 60.0, HOP_TYPE_PELLET, 1.057, 5.0
+        )
+        self.assertEquals(ibu, hop_addition.get_ibus(1.057, 5.0))
+
+    @unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+    def test_get_ibus_array_glenn_tinseth(self):
+        out = self.get_array_ibus(HopsUtilizationGlennTinseth)
+        expected = self.get_scalar_ibus(HopsUtilizationGlennTinseth)
+        self.assertAlmostEqualLists(out.tolist(), expected)
+
+    @unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+    def test_get_ibus_array_jackie_rager(self):
+        out = self.get_array_ibus(HopsUtilizationJackieRager)
+        expected = self.get_scalar_ibus(HopsUtilizationJackieRager)
+        self.assertAlmostEqualLists(out.tolist(), expected)
+
+    @unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+    def test_get_ibus_array_si_units(self):
+        out = self.get_array_ibus(HopsUtilizationGlennTinseth, units=SI_UNITS)
+        expected = self.get_scalar_ibus(HopsUtilizationGlennTinseth, units=SI_UNITS)
+        self.assertAlmostEqualLists(out.tolist(), expected)
+
+    @mock.patch(u"brew.utilities.hops.get_numpy", return_value=None)
+    def test_get_ibus_array_fallback(self, mock_numpy):
+        for utilization_cls in UTILIZATION_CLASSES:
+            out = self.get_array_ibus(utilization_cls)
+            expected = self.get_scalar_ibus(utilization_cls)
+            self.assertEquals(out, expected)
+
+    @unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+    def test_get_ibus_array_broadcast(self):
+        for utilization_cls in UTILIZATION_CLASSES:
+            out = utilization_cls.get_ibus_array(
+                self.weight, 0.14, 60.0, HOP_TYPE_PELLET, 1.057, self.final_volume
+            )
+            expected = [
+                utilization_cls.calculate_ibus(
+                    weight, 0.14, 60.0, HOP_TYPE_PELLET, 1.057, self.final_volume
+                )
+                for weight in self.weight
+            ]
+            self.assertAlmostEqualLists(out.tolist(), expected)
+
+    @unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+    def test_get_ibus_array_utilization_surface(self):
+        kwargs = {
+            u"sg_min": 1.030,
+            u"sg_max": 1.080,
+            u"sg_step": 0.002,
+            u"boil_time_min": 0.0,
+            u"boil_time_max": 90.0,
+            u"boil_time_step": 5.0,
+        }
+        for utilization_cls in UTILIZATION_CLASSES:
+            with utilization_cls.use_utilization_surface(tolerance=1.0, **kwargs):
+                out = self.get_array_ibus(utilization_cls)
+                expected = self.get_scalar_ibus(utilization_cls)
+                with mock.patch(u"brew.utilities.hops.get_numpy", return_value=None):
+                    fallback = self.get_array_ibus(utilization_cls)
+            self.assertAlmostEqualLists(out.tolist(), expected)
+            self.assertAlmostEqualLists(fallback, expected)
+            # Inside the surface the values are interpolated
+            self.assertNotEqual(out[1], self.get_scalar_ibus(utilization_cls)[1])
+            # Outside the surface the values are calculated
+            self.assertAlmostEqual(out[3], self.get_scalar_ibus(utilization_cls)[3])
+
+    def test_get_percent_utilization_array_raises(self):
+        with self.assertRaises(NotImplementedError):
+            HopsUtilization.get_percent_utilization_array([1.057], [60.0])
+
+
+class TestUtilizationSurface(unittest.TestCase):
+    def setUp(self):
+        self.kwargs = {
+            u"sg_min": 1.030,
+            u"sg_max": 1.090,
+            u"sg_step": 0.002,
+            u"boil_time_min": 0.0,
+            u"boil_time_max": 90.0,
+            u"boil_time_step": 5.0,
+        }
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_build_grid_points_are_exact(self):
+        surface = UtilizationSurface.build(HopsUtilizationGlennTinseth, **self.kwargs)
+        self.assertEquals(surface.sg_max, 1.090)
+        self.assertEquals(surface.boil_time_max, 90.0)
+        out = surface.interpolate(1.050, 60.0)
+        expected = HopsUtilizationGlennTinseth.calculate_percent_utilization(
+            1.050, 60.0
+        )
+        self.assertAlmostEqual(out, expected, places=12)
+
+    def test_interpolate_within_error_bound(self):
+        for utilization_cls in UTILIZATION_CLASSES:
+            surface = UtilizationSurface.build(utilization_cls, **self.kwargs)
+            for sg, boil_time in [(1.0571, 61.3), (1.0333, 2.5), (1.0899, 89.9)]:
+                out = surface.interpolate(sg, boil_time)
+                expected = utilization_cls.calculate_percent_utilization(
+                    sg, boil_time
+                )
+                self.assertLessEqual(abs(out - expected), surface.error_bound)
+
+    def test_error_bound_holds_on_dense_grid(self):
+        for utilization_cls in UTILIZATION_CLASSES:
+            surface = UtilizationSurface.build(utilization_cls, **self.kwargs)
+            for j in range(91):
+                boil_time = 90.0 * j / 90
+                for i in range(61):
+                    sg = 1.030 + 0.060 * i / 60
+                    out = surface.interpolate(sg, boil_time)
+                    expected = utilization_cls.calculate_percent_utilization(
+                        sg, boil_time
+                    )
+                    self.assertLessEqual(abs(out - expected), surface.error_bound)
+
+    def test_build_raises_error_bound_exceeded(self):
+        with mock.patch.object(
+            HopsUtilizationGlennTinseth,
+            u"get_interpolation_error_bound",
+            return_value=0.0,
+        ):
+            with self.assertRaises(HopException):
+                UtilizationSurface.build(HopsUtilizationGlennTinseth, **self.kwargs)
+
+    def test_contains(self):
+        surface = UtilizationSurface.build(HopsUtilizationGlennTinseth, **self.kwargs)
+        self.assertTrue(surface.contains(1.030, 0.0))
+        self.assertTrue(surface.contains(1.090, 90.0))
+        self.assertFalse(surface.contains(1.100, 60.0))
+        self.assertFalse(surface.contains(1.050, 120.0))
+
+    def test_build_raises(self):
+        with self.assertRaises(HopException):
+            UtilizationSurface.build(
+                HopsUtilizationGlennTinseth, sg_min=1.050, sg_max=1.050
+            )
+
+    def test_save_and_load(self):
+        filename = os.path.join(self.tmpdir, u"surface.json")
+        surface = UtilizationSurface.build(HopsUtilizationJackieRager, **self.kwargs)
+        surface.save(filename)
+        loaded = UtilizationSurface.load(filename)
+        self.assertEquals(loaded.to_dict(), surface.to_dict())
+
+    def test_get_utilization_surface_cached(self):
+        surface = HopsUtilizationGlennTinseth.get_utilization_surface(**self.kwargs)
+        out = HopsUtilizationGlennTinseth.get_utilization_surface(**self.kwargs)
+        self.assertIs(out, surface)
+
+    def test_get_utilization_surface_file(self):
+        filename = os.path.join(self.tmpdir, u"surface.json")
+        surface = HopsUtilizationJackieRager.get_utilization_surface(
+            filename=filename, **self.kwargs
+        )
+        self.assertTrue(os.path.exists(filename))
+        self.assertEquals(
+            UtilizationSurface.load(filename).to_dict(), surface.to_dict()
+        )
+
+    def test_get_utilization_surface_file_resolution(self):
+        filename = os.path.join(self.tmpdir, u"surface.json")
+        HopsUtilizationJackieRager.get_utilization_surface(
+            filename=filename, **self.kwargs
+        )
+        kwargs = dict(self.kwargs, boil_time_step=10.0)
+        surface = HopsUtilizationJackieRager.get_utilization_surface(
+            filename=filename, **kwargs
+        )
+        self.assertEquals(surface.boil_time_step, 10.0)
+        self.assertTrue(surface.has_resolution(**kwargs))
+        self.assertFalse(surface.has_resolution(**self.kwargs))
+        self.assertEquals(UtilizationSurface.load(filename).boil_time_step, 10.0)
+
+    def test_get_utilization_surface_file_wrong_class(self):
+        filename = os.path.join(self.tmpdir, u"surface.json")
+        UtilizationSurface.build(HopsUtilizationJackieRager, **self.kwargs).save(
+            filename
+        )
+        with self.assertRaises(HopException):
+            HopsUtilizationGlennTinseth.get_utilization_surface(
+                filename=filename, **self.kwargs
+            )
+
+    def test_use_utilization_surface(self):
+        utilization_cls = HopsUtilizationGlennTinseth
+        with utilization_cls.use_utilization_surface(
+            tolerance=1.0, **self.kwargs
+        ) as surface:
+            self.assertIs(utilization_cls.get_active_utilization_surface(), surface)
+            self.assertEquals(
+                utilization_cls.get_percent_utilization(1.0571, 61.3),
+                surface.interpolate(1.0571, 61.3),
+            )
+            # Outside the surface the exact calculation is used
+            self.assertEquals(
+                utilization_cls.get_percent_utilization(1.100, 60.0),
+                utilization_cls.calculate_percent_utilization(1.100, 60.0),
+            )
+            # The surface is only used by the class it is in use on
+            self.assertIsNone(
+                HopsUtilizationJackieRager.get_active_utilization_surface()
+            )
+        self.assertIsNone(utilization_cls.get_active_utilization_surface())
+        self.assertEquals(
+            utilization_cls.get_percent_utilization(1.0571, 61.3),
+            utilization_cls.calculate_percent_utilization(1.0571, 61.3),
+        )
+
+    def test_use_utilization_surface_tolerance(self):
+        with HopsUtilizationGlennTinseth.use_utilization_surface(
+            tolerance=0.0, **self.kwargs
+        ) as surface:
+            self.assertIsNone(surface)
+            self.assertIsNone(
+                HopsUtilizationGlennTinseth.get_active_utilization_surface()
+            )
+
+    def test_use_utilization_surface_nested(self):
+        utilization_cls = HopsUtilizationGlennTinseth
+        with utilization_cls.use_utilization_surface(
+            tolerance=1.0, **self.kwargs
+        ) as outer:
+            with utilization_cls.use_utilization_surface(tolerance=0.0) as inner:
+                self.assertIsNone(inner)
+                self.assertIsNone(utilization_cls.get_active_utilization_surface())
+            self.assertIs(utilization_cls.get_active_utilization_surface(), outer)
+        self.assertIsNone(utilization_cls.get_active_utilization_surface())
+
+    def test_use_utilization_surface_restored_on_error(self):
+        utilization_cls = HopsUtilizationGlennTinseth
+        with self.assertRaises(ValueError):
+            with utilization_cls.use_utilization_surface(tolerance=1.0, **self.kwargs):
+                raise ValueError(u"error")
+        self.assertIsNone(utilization_cls.get_active_utilization_surface())
+
+    def test_use_utilization_surface_thread(self):
+        utilization_cls = HopsUtilizationGlennTinseth
+        out = []
+
+        def get_surface():
+            out.append(utilization_cls.get_active_utilization_surface())
+
+        with utilization_cls.use_utilization_surface(tolerance=1.0, **self.kwargs):
+            thread = threading.Thread(target=get_surface)
+            thread.start()
+            thread.join()
+        self.assertEquals(out, [None])
+
+    def test_utilization_caches_bounded(self):
+        size = hops_utilities.UTILIZATION_CACHE_SIZE
+        for boil_time in range(size + 2):
+            HopsUtilizationGlennTinseth.get_utilization_table([1050], [boil_time])
+            HopsUtilizationGlennTinseth.get_utilization_surface(
+                boil_time_max=boil_time + 1.0
+            )
+        self.assertEquals(len(hops_utilities._UTILIZATION_TABLES), size)
+        self.assertEquals(len(hops_utilities._UTILIZATION_SURFACES), size)
+        # The most recently used are kept
+        surface = HopsUtilizationGlennTinseth.get_utilization_surface(
+            boil_time_max=size + 1.0
+        )
+        self.assertIs(
+            HopsUtilizationGlennTinseth.get_utilization_surface(
+                boil_time_max=size + 1.0
+            ),
+            surface,
+        )
+
+    def test_get_utilization_table_returns_copy(self):
+        table = HopsUtilizationGlennTinseth.get_utilization_table([1050], [60])
+        table[0][0] = 0.0
+        out = HopsUtilizationGlennTinseth.get_utilization_table([1050], [60])
+        self.assertNotEquals(out[0][0], 0.0)
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
+import array
 import unittest
 
+import mock
 from brew.constants import SI_UNITS
 from brew.exceptions import SugarException
 from brew.exceptions import ValidatorException
+from brew.utilities.arrays import get_numpy
 from brew.utilities.sugar import apparent_extract_to_real_extract
 from brew.utilities.sugar import brix_to_plato
 from brew.utilities.sugar import brix_to_sg
@@ -15,6 +18,14 @@ from brew.utilities.sugar import refractometer_adjustment
 from brew.utilities.sugar import sg_to_brix
 from brew.utilities.sugar import sg_to_gu
 from brew.utilities.sugar import sg_to_plato
+from brew.utilities.sugar import brix_to_plato_array
+from brew.utilities.sugar import brix_to_sg_array
+from brew.utilities.sugar import hydrometer_adjustment_array
+from brew.utilities.sugar import plato_to_brix_array
+from brew.utilities.sugar import plato_to_sg_array
+from brew.utilities.sugar import refractometer_adjustment_array
+from brew.utilities.sugar import sg_to_brix_array
+from brew.utilities.sugar import sg_to_plato_array
 
 
 class TestSugarUtilities(unittest.TestCase):
@@ -110,3 +121,98 @@ class TestSugarUtilities(unittest.TestCase):
     def test_refractometer_adjustment(self):
         fg = refractometer_adjustment(1.053, 1.032)
         self.assertEquals(round(fg, 3), 1.017)
+
+
+@unittest.skipIf(get_numpy() is None, u"NumPy is not installed")
+class TestSugarArrayUtilities(unittest.TestCase):
+    def setUp(self):
+        self.sg = [1.040, 1.057, 1.092]
+
+    def assertMatchesScalar(self, out, func, values):
+        self.assertEquals(
+            [round(v, 6) for v in out.tolist()], [round(func(v), 6) for v in values]
+        )
+
+    def test_sg_to_plato_array(self):
+        out = sg_to_plato_array(self.sg)
+        self.assertMatchesScalar(out, sg_to_plato, self.sg)
+
+    def test_plato_to_sg_array(self):
+        out = plato_to_sg_array([10.0, 14.0, 22.0])
+        self.assertMatchesScalar(out, plato_to_sg, [10.0, 14.0, 22.0])
+
+    def test_brix_to_sg_array(self):
+        out = brix_to_sg_array([10.0, 22.0])
+        self.assertMatchesScalar(out, brix_to_sg, [10.0, 22.0])
+
+    def test_brix_to_plato_array(self):
+        out = brix_to_plato_array([10.0, 22.0])
+        self.assertMatchesScalar(out, brix_to_plato, [10.0, 22.0])
+
+    def test_plato_to_brix_array(self):
+        out = plato_to_brix_array([14.0, 50.0])
+        self.assertEquals(round(out[0], 3), 14.002)
+        self.assertEquals(out.mask.tolist(), [False, True])
+
+    def test_sg_to_brix_array(self):
+        out = sg_to_brix_array([1.092, 1.18])
+        self.assertEquals(round(out[0], 1), 22.0)
+        self.assertEquals(out.mask.tolist(), [False, True])
+
+    def test_sg_to_brix_array_buffer(self):
+        out = sg_to_brix_array(memoryview(array.array(u"d", [1.092, 1.18])))
+        self.assertEquals(round(out[0], 1), 22.0)
+        self.assertEquals(out.mask.tolist(), [False, True])
+
+    def test_hydrometer_adjustment_array(self):
+        out = hydrometer_adjustment_array(1.050, [70.0, 59.0, -1.0, 213.0])
+        self.assertEquals(round(out[0], 3), 1.051)
+        self.assertEquals(out[1], 1.050)
+        self.assertEquals(out.mask.tolist(), [False, False, True, True])
+
+    def test_hydrometer_adjustment_array_si_units(self):
+        out = hydrometer_adjustment_array(
+            [1.050, 1.050, 1.050], [16.0, -1.0, 101.0], units=SI_UNITS
+        )
+        self.assertEquals(round(out[0], 3), 1.050)
+        self.assertEquals(out.mask.tolist(), [False, True, True])
+
+    def test_hydrometer_adjustment_array_raises_bad_units(self):
+        with self.assertRaises(ValidatorException):
+            hydrometer_adjustment_array([1.050], [16.0], units=u"bad")
+
+    def test_refractometer_adjustment_array(self):
+        out = refractometer_adjustment_array([1.053, 1.053], [1.032, 1.18])
+        self.assertEquals(round(out[0], 3), 1.017)
+        self.assertEquals(out.mask.tolist(), [False, True])
+
+
+@mock.patch(u"brew.utilities.sugar.get_numpy", return_value=None)
+class TestSugarArrayUtilitiesFallback(unittest.TestCase):
+    def test_sg_to_plato_array(self, mock_numpy):
+        out = sg_to_plato_array([1.057, 1.092])
+        self.assertEquals(out, [sg_to_plato(1.057), sg_to_plato(1.092)])
+
+    def test_sg_to_brix_array(self, mock_numpy):
+        out = sg_to_brix_array([1.092, 1.18])
+        self.assertEquals(round(out[0], 1), 22.0)
+        self.assertEquals(out[1], None)
+
+    def test_sg_to_brix_array_scalar(self, mock_numpy):
+        self.assertEquals(round(sg_to_brix_array(1.092), 1), 22.0)
+        self.assertEquals(sg_to_brix_array(1.18), None)
+
+    def test_plato_to_brix_array(self, mock_numpy):
+        out = plato_to_brix_array([14.0, 50.0])
+        self.assertEquals(round(out[0], 3), 14.002)
+        self.assertEquals(out[1], None)
+
+    def test_hydrometer_adjustment_array(self, mock_numpy):
+        out = hydrometer_adjustment_array(1.050, [70.0, -1.0])
+        self.assertEquals(round(out[0], 3), 1.051)
+        self.assertEquals(out[1], None)
+
+    def test_refractometer_adjustment_array(self, mock_numpy):
+        out = refractometer_adjustment_array([1.053, 1.053], [1.032, 1.18])
+        self.assertEquals(round(out[0], 3), 1.017)
+        self.assertEquals(out[1], None)
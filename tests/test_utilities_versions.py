@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from brew.grains import Grain
+from brew.grains import GrainAddition
+from brew.utilities.versions import VersionedList
+from brew.utilities.versions import bump_version
+from brew.utilities.versions import get_version
+
+
+class TestVersionsUtilities(unittest.TestCase):
+    def test_bump_version(self):
+        version = get_version()
+        bump_version()
+        self.assertEquals(get_version(), version + 1)
+
+    def test_versioned_new_object(self):
+        version = get_version()
+        Grain(u"pale 2-row", color=2.0, ppg=37.0)
+        self.assertEquals(get_version(), version)
+
+    def test_versioned_set_attribute(self):
+        grain = Grain(u"pale 2-row", color=2.0, ppg=37.0)
+        grain_add = GrainAddition(grain, weight=13.96)
+        version = get_version()
+        grain.color = 3.0
+        self.assertNotEqual(get_version(), version)
+        version = get_version()
+        grain_add.weight = 1.0
+        self.assertNotEqual(get_version(), version)
+
+    def test_versioned_list(self):
+        items = VersionedList([3, 1, 2])
+        self.assertEquals(items, [3, 1, 2])
+        for method, args in [
+            (u"append", (4,)),
+            (u"extend", ([5],)),
+            (u"insert", (0, 6)),
+            (u"pop", ()),
+            (u"remove", (6,)),
+            (u"reverse", ()),
+            (u"sort", ()),
+            (u"__setitem__", (0, 7)),
+            (u"__delitem__", (0,)),
+        ]:
+            version = get_version()
+            getattr(items, method)(*args)
+            self.assertNotEqual(get_version(), version, method)
+        self.assertEquals(items, [2, 3, 4])
@@ -83,3 +83,6 @@ class TestYeasts(unittest.TestCase):
         self.assertEquals(
             str(ctx.exception), u"Wyeast 1056: Must provide percent attenuation"
         )
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self.yeast, u"__dict__"))